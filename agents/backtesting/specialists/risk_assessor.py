@@ -39,6 +39,10 @@ class RiskAssessorAgent:
         self.min_calmar = 1.0
         self.min_sharpe = 1.0
 
+        # Monte Carlo resampling (needs enough trades to be meaningful)
+        self.monte_carlo_min_trades = 10
+        self.monte_carlo_paths = 10000
+
         logger.info("RiskAssessorAgent initialized")
 
     def analyze(
@@ -73,12 +77,20 @@ class RiskAssessorAgent:
             backtest_result.equity_curve
         )
 
-        # 4. Assess risk levels
+        # 4. Resample trades into alternative equity paths
+        monte_carlo = None
+        if len(backtest_result.trades) >= self.monte_carlo_min_trades:
+            logger.info("  Simulating Monte Carlo equity paths...")
+            monte_carlo = self.risk_calculator.simulate_paths(
+                backtest_result, n_paths=self.monte_carlo_paths, method='block'
+            )
+
+        # 5. Assess risk levels
         issues, warnings = self._assess_risk_levels(
             risk_metrics, performance_metrics, recovery_stats
         )
 
-        # 5. Determine overall status
+        # 6. Determine overall status
         if len(issues) > 0:
             status = 'FAIL'
             rating = '🔴'
@@ -95,6 +107,7 @@ class RiskAssessorAgent:
             'risk_metrics': risk_metrics,
             'underwater_periods': underwater_periods,
             'recovery_stats': recovery_stats,
+            'monte_carlo': monte_carlo,
             'issues': issues,
             'warnings': warnings,
             'recommendations': self._generate_recommendations(
@@ -254,6 +254,13 @@ class StrategyConsultantAgent:
             backtest_period_years=period_years
         )
 
+        # Judge on resampled intervals when available
+        monte_carlo = risk_assessment.get('monte_carlo')
+        if monte_carlo is not None and monte_carlo.n_paths > 0:
+            summary.max_drawdown_ci_pct = monte_carlo.confidence_interval('max_drawdown_pct')
+            summary.cagr_ci_pct = monte_carlo.confidence_interval('cagr_pct')
+            summary.ruin_probability = monte_carlo.ruin_probability
+
         # Determine final decision
         summary.determine_decision()
 
@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 import importlib.util
+import inspect
 
 # Add to path
 project_root = Path(__file__).parent.parent.parent.parent
@@ -117,7 +118,8 @@ class BacktestExecutorTool:
         Args:
             strategy: Strategy instance with generate_signal() method
             symbol: Stock symbol
-            data: Multi-timeframe data dict
+            data: Multi-timeframe data dict ('daily', optional 'market'
+                index closes for beta)
             start_date: Backtest start date
             end_date: Backtest end date
 
@@ -147,6 +149,19 @@ class BacktestExecutorTool:
         if daily_data.index.tz is not None:
             daily_data.index = daily_data.index.tz_localize(None)
 
+        # Strategies with an as-of API evaluate each bar against preloaded
+        # history (including the warm-up before start_date) instead of
+        # fetching live data on every bar
+        data_view = None
+        if 'data_view' in inspect.signature(strategy.generate_signal).parameters:
+            from strategies.multi_timeframe_breakout import MultiTimeframeDataView
+            market = data.get('market')
+            data_view = MultiTimeframeDataView(
+                symbol,
+                daily_data,
+                market_close=market['close'] if isinstance(market, pd.DataFrame) else market
+            )
+
         # Filter to backtest period
         daily_data = daily_data[
             (daily_data.index >= start_date) &
@@ -183,7 +198,12 @@ class BacktestExecutorTool:
             if position is None and len(trades) < 1000:  # Safety limit
                 # Generate signal using strategy
                 try:
-                    signal = strategy.generate_signal(symbol)
+                    if data_view is not None:
+                        signal = strategy.generate_signal(
+                            symbol, as_of=current_date, data_view=data_view, verbose=False
+                        )
+                    else:
+                        signal = strategy.generate_signal(symbol)
 
                     if signal is not None:
                         # Open new position
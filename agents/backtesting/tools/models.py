@@ -7,7 +7,8 @@ Following research-backed thresholds from BMAD architecture.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -154,6 +155,57 @@ class RiskMetrics:
             self.drawdown_risk_level = self.assess_drawdown_risk()
 
 
+
+@dataclass
+class MonteCarloAnalysis:
+    """Distributions from trade-resampled equity paths"""
+    n_paths: int = 0
+    n_trades: int = 0
+    method: str = "bootstrap"  # bootstrap, block
+    block_size: int = 1
+    ruin_threshold_pct: float = 50.0  # Ruin = equity falls this far below start
+
+    # Per-path distributions (one value per simulated path)
+    max_drawdown_pct: np.ndarray = field(default_factory=lambda: np.empty(0))  # Positive %
+    underwater_fraction: np.ndarray = field(default_factory=lambda: np.empty(0))  # Share of trades below peak
+    longest_underwater_trades: np.ndarray = field(default_factory=lambda: np.empty(0))
+    cagr_pct: np.ndarray = field(default_factory=lambda: np.empty(0))
+    final_equity_multiple: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    ruin_probability: float = 0.0
+
+    def confidence_interval(self, metric: str, level: float = 0.90) -> Tuple[float, float]:
+        """
+        Two-sided percentile interval of a per-path metric
+
+        Args:
+            metric: Distribution field name (e.g. 'max_drawdown_pct', 'cagr_pct')
+            level: Coverage (default 90%: 5th to 95th percentile)
+        """
+        values = getattr(self, metric)
+        if len(values) == 0:
+            return 0.0, 0.0
+        tail = (1 - level) / 2 * 100
+        low, high = np.percentile(values, [tail, 100 - tail])
+        return float(low), float(high)
+
+    def summary(self, level: float = 0.90) -> Dict:
+        """Medians and confidence intervals of every distribution"""
+        result = {
+            'n_paths': self.n_paths,
+            'method': self.method,
+            'ruin_probability': self.ruin_probability
+        }
+        for metric in ('max_drawdown_pct', 'underwater_fraction', 'longest_underwater_trades',
+                       'cagr_pct', 'final_equity_multiple'):
+            values = getattr(self, metric)
+            result[metric] = {
+                'median': float(np.median(values)) if len(values) else 0.0,
+                'ci': self.confidence_interval(metric, level)
+            }
+        return result
+
+
 @dataclass
 class StrategyComplexity:
     """Strategy complexity analysis"""
@@ -329,8 +381,50 @@ class ExecutiveSummary:
     sample_size: int = 0
     backtest_period_years: float = 0.0
 
+    # Monte Carlo intervals (None when no resampling was run)
+    max_drawdown_ci_pct: Optional[Tuple[float, float]] = None  # Positive %, (low, high)
+    cagr_ci_pct: Optional[Tuple[float, float]] = None
+    ruin_probability: Optional[float] = None
+
+    def apply_confidence_intervals(self):
+        """
+        Judge risk and performance on resampled intervals, not point estimates
+
+        - Ruin probability above 1% is a critical issue
+        - Risk status follows the pessimistic drawdown bound (>= 30% red,
+          >= 20% at most yellow)
+        - Performance cannot be green if the CAGR interval includes losses
+
+        Safe to call repeatedly: a message already recorded is not added again.
+        """
+        def note(messages: List[str], message: str):
+            if message not in messages:
+                messages.append(message)
+
+        if self.ruin_probability is not None and self.ruin_probability > 0.01:
+            note(self.critical_issues, f"CRITICAL: {self.ruin_probability:.1%} of resampled paths hit ruin")
+
+        if self.max_drawdown_ci_pct is not None:
+            worst_dd = self.max_drawdown_ci_pct[1]
+            if worst_dd >= 30:
+                self.risk_status = "red"
+            elif worst_dd >= 20 and self.risk_status == "green":
+                self.risk_status = "yellow"
+            if worst_dd >= 20:
+                note(self.warnings, f"Max drawdown could reach {worst_dd:.1f}% (Monte Carlo upper bound)")
+
+        if self.cagr_ci_pct is not None and self.cagr_ci_pct[0] < 0:
+            if self.performance_status == "green":
+                self.performance_status = "yellow"
+            note(
+                self.warnings,
+                f"CAGR interval includes losses ({self.cagr_ci_pct[0]:.1f}% to {self.cagr_ci_pct[1]:.1f}%)"
+            )
+
     def determine_decision(self):
         """Determine final go/no-go decision"""
+        self.apply_confidence_intervals()
+
         green_count = sum([
             self.performance_status == "green",
             self.risk_status == "green",
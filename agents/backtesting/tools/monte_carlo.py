@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Engine - Trade Resampling Path Risk
+
+Resamples a backtest's trade returns into many alternative equity paths
+and reports the distribution of path-dependent risk:
+- Maximum drawdown
+- Time under water (fraction and longest stretch)
+- Probability of ruin
+- CAGR
+
+Paths are built as 2-D (paths x trades) arrays in memory-bounded chunks,
+so 100k paths over a few hundred trades run on a laptop.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import numpy as np
+from typing import Optional
+import logging
+
+from agents.backtesting.tools.models import BacktestResult, MonteCarloAnalysis
+from agents.backtesting.tools.risk_tools import longest_true_run
+
+logger = logging.getLogger(__name__)
+
+
+class MonteCarloEngine:
+    """
+    Bootstrap and block-bootstrap equity path simulator
+
+    Each trade's return is its P&L relative to equity before the trade
+    (trades ordered by exit date). Paths draw n_trades returns with
+    replacement - independently ('bootstrap') or as circular runs of
+    block_size consecutive trades ('block') to keep streaks together -
+    and compound them from 1.0.
+    """
+
+    METHODS = ('bootstrap', 'block')
+
+    def __init__(
+        self,
+        n_paths: int = 10000,
+        method: str = 'bootstrap',
+        block_size: int = 5,
+        ruin_threshold_pct: float = 50.0,
+        max_chunk_bytes: int = 64 * 1024 * 1024,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize engine
+
+        Args:
+            n_paths: Number of simulated equity paths
+            method: 'bootstrap' (i.i.d. trades) or 'block' (circular blocks)
+            block_size: Consecutive trades per block (block method only)
+            ruin_threshold_pct: Drawdown from starting equity counted as ruin
+            max_chunk_bytes: Upper bound on one chunk's float64 path array
+            seed: Random seed for reproducible paths
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+        if n_paths < 1 or block_size < 1:
+            raise ValueError("n_paths and block_size must be positive")
+
+        self.n_paths = n_paths
+        self.method = method
+        self.block_size = block_size
+        self.ruin_threshold_pct = ruin_threshold_pct
+        self.max_chunk_bytes = max_chunk_bytes
+        self.seed = seed
+
+    @staticmethod
+    def trade_returns(backtest_result: BacktestResult) -> np.ndarray:
+        """
+        Per-trade returns on equity, in exit-date order
+
+        Args:
+            backtest_result: Backtest with trades and initial capital
+
+        Returns:
+            Array of fractional returns (0.02 = +2% of equity)
+        """
+        trades = sorted(backtest_result.trades, key=lambda t: t.exit_date)
+        pnl = np.array([t.pnl for t in trades], dtype=float)
+        equity_before = backtest_result.initial_capital + np.concatenate([[0.0], np.cumsum(pnl)[:-1]])
+        return pnl / equity_before
+
+    def simulate(self, backtest_result: BacktestResult) -> MonteCarloAnalysis:
+        """
+        Simulate resampled equity paths for a backtest
+
+        Args:
+            backtest_result: Backtest to resample
+
+        Returns:
+            MonteCarloAnalysis with per-path distributions
+        """
+        returns = self.trade_returns(backtest_result)
+        years = (backtest_result.end_date - backtest_result.start_date).days / 365.25
+        return self.simulate_returns(returns, years)
+
+    def simulate_returns(self, returns: np.ndarray, years: float) -> MonteCarloAnalysis:
+        """
+        Simulate paths from raw trade returns
+
+        Args:
+            returns: Fractional trade returns in chronological order
+            years: Calendar span the trades cover (for CAGR)
+
+        Returns:
+            MonteCarloAnalysis with per-path distributions
+        """
+        returns = np.asarray(returns, dtype=float)
+        n_trades = len(returns)
+        analysis = MonteCarloAnalysis(
+            n_paths=self.n_paths,
+            n_trades=n_trades,
+            method=self.method,
+            block_size=self.block_size if self.method == 'block' else 1,
+            ruin_threshold_pct=self.ruin_threshold_pct
+        )
+        if n_trades == 0:
+            analysis.n_paths = 0
+            return analysis
+
+        rng = np.random.default_rng(self.seed)
+        # Several (paths x trades) float arrays are alive at once per chunk
+        chunk = max(1, min(self.n_paths, self.max_chunk_bytes // (8 * 4 * n_trades)))
+        ruin_level = 1 - self.ruin_threshold_pct / 100
+
+        max_dd = np.empty(self.n_paths)
+        underwater = np.empty(self.n_paths)
+        longest = np.empty(self.n_paths, dtype=int)
+        final = np.empty(self.n_paths)
+        ruined = np.empty(self.n_paths, dtype=bool)
+
+        for lo in range(0, self.n_paths, chunk):
+            hi = min(lo + chunk, self.n_paths)
+            equity = np.cumprod(1 + returns[self._sample_indices(rng, hi - lo, n_trades)], axis=1)
+
+            peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+            below_peak = equity < peak
+
+            max_dd[lo:hi] = (1 - equity / peak).max(axis=1) * 100
+            underwater[lo:hi] = below_peak.mean(axis=1)
+            longest[lo:hi] = longest_true_run(below_peak)
+            final[lo:hi] = equity[:, -1]
+            ruined[lo:hi] = (equity <= ruin_level).any(axis=1)
+
+        analysis.max_drawdown_pct = max_dd
+        analysis.underwater_fraction = underwater
+        analysis.longest_underwater_trades = longest
+        analysis.final_equity_multiple = final
+        analysis.ruin_probability = float(ruined.mean())
+        if years > 0:
+            analysis.cagr_pct = (np.maximum(final, 0.0) ** (1 / years) - 1) * 100
+        else:
+            analysis.cagr_pct = np.zeros(self.n_paths)
+
+        logger.info(
+            f"Monte Carlo ({self.method}, {self.n_paths} paths x {n_trades} trades): "
+            f"median max DD {np.median(max_dd):.1f}%, ruin {analysis.ruin_probability:.2%}"
+        )
+        return analysis
+
+    def _sample_indices(self, rng: np.random.Generator, paths: int, n_trades: int) -> np.ndarray:
+        """Trade indices for one chunk of paths, shape (paths, n_trades)"""
+        if self.method == 'bootstrap':
+            return rng.integers(0, n_trades, size=(paths, n_trades))
+
+        # Circular block bootstrap: random block starts, consecutive offsets
+        n_blocks = -(-n_trades // self.block_size)
+        starts = rng.integers(0, n_trades, size=(paths, n_blocks, 1))
+        offsets = np.arange(self.block_size)
+        indices = (starts + offsets) % n_trades
+        return indices.reshape(paths, -1)[:, :n_trades]
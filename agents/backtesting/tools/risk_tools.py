@@ -7,6 +7,7 @@ Calculates comprehensive risk metrics beyond basic performance:
 - Value at Risk (VaR) and CVaR
 - Recovery time analysis
 - Underwater periods
+- Monte Carlo path risk (see monte_carlo.py)
 """
 
 import sys
@@ -24,6 +25,34 @@ from agents.backtesting.tools.models import BacktestResult, RiskMetrics
 logger = logging.getLogger(__name__)
 
 
+def true_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start and end (exclusive) indices of every run of True in a 1-D mask
+
+    Args:
+        mask: Boolean array
+
+    Returns:
+        (starts, ends) integer arrays
+    """
+    padded = np.concatenate([[False], np.asarray(mask, dtype=bool), [False]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2], edges[1::2]
+
+
+def longest_true_run(mask: np.ndarray) -> np.ndarray:
+    """
+    Length of the longest run of True along the last axis
+
+    Works on a single series (1-D) or many paths at once (2-D).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    count = np.cumsum(mask, axis=-1)
+    # Count at the most recent False, carried forward
+    last_reset = np.maximum.accumulate(np.where(mask, 0, count), axis=-1)
+    return (count - last_reset).max(axis=-1, initial=0)
+
+
 class RiskMetricsCalculator:
     """
     Calculate comprehensive risk metrics
@@ -138,21 +167,8 @@ class RiskMetricsCalculator:
         Returns:
             Maximum number of consecutive days in drawdown
         """
-        # Find periods where in drawdown (< -0.01%)
-        in_drawdown = drawdown_series < -0.01
-
-        # Find consecutive periods
-        max_duration = 0
-        current_duration = 0
-
-        for is_dd in in_drawdown:
-            if is_dd:
-                current_duration += 1
-                max_duration = max(max_duration, current_duration)
-            else:
-                current_duration = 0
-
-        return max_duration
+        # Longest run of days in drawdown (< -0.01%)
+        return int(longest_true_run(drawdown_series.to_numpy() < -0.01))
 
     def _calculate_volatility_metrics(
         self, equity_curve: pd.DataFrame
@@ -232,47 +248,59 @@ class RiskMetricsCalculator:
         drawdown = (equity - cummax) / cummax * 100
 
         # Find underwater periods
-        in_drawdown = drawdown < -0.01
+        starts, ends = true_runs(drawdown.to_numpy() < -0.01)
         underwater_periods = []
 
-        start_idx = None
-        for idx, is_dd in enumerate(in_drawdown):
-            if is_dd and start_idx is None:
-                # Start of underwater period
-                start_idx = idx
-            elif not is_dd and start_idx is not None:
-                # End of underwater period
-                period_data = self._analyze_single_underwater_period(
-                    equity_curve.iloc[start_idx:idx],
-                    drawdown.iloc[start_idx:idx]
-                )
-                underwater_periods.append(period_data)
-                start_idx = None
-
-        # Handle if still underwater at end
-        if start_idx is not None:
-            period_data = self._analyze_single_underwater_period(
-                equity_curve.iloc[start_idx:],
-                drawdown.iloc[start_idx:]
-            )
-            underwater_periods.append(period_data)
+        if len(starts):
+            values = drawdown.to_numpy()
+            index = equity_curve.index
+            lengths = ends - starts
+            # [start, next start) also spans the recovered days, which sit
+            # above -0.01% and cannot change the minimum; means need the
+            # exact run, so they come from cumulative sums
+            max_dd = np.minimum.reduceat(values, starts)
+            cumulative = np.concatenate([[0.0], np.cumsum(values)])
+            avg_dd = (cumulative[ends] - cumulative[starts]) / lengths
+
+            underwater_periods = [
+                {
+                    'start_date': index[start],
+                    'end_date': index[end - 1],
+                    'duration_days': int(length),
+                    'max_drawdown_pct': low,
+                    'avg_drawdown_pct': mean
+                }
+                for start, end, length, low, mean in zip(starts, ends, lengths, max_dd, avg_dd)
+            ]
 
         logger.info(f"Found {len(underwater_periods)} underwater periods")
         return underwater_periods
 
-    def _analyze_single_underwater_period(
+    def simulate_paths(
         self,
-        period_equity: pd.DataFrame,
-        period_drawdown: pd.Series
-    ) -> Dict:
-        """Analyze a single underwater period"""
-        return {
-            'start_date': period_equity.index[0],
-            'end_date': period_equity.index[-1],
-            'duration_days': len(period_equity),
-            'max_drawdown_pct': period_drawdown.min(),
-            'avg_drawdown_pct': period_drawdown.mean()
-        }
+        backtest_result: BacktestResult,
+        n_paths: int = 10000,
+        method: str = 'bootstrap',
+        block_size: int = 5,
+        seed: int = None
+    ):
+        """
+        Resample trades into equity paths (see MonteCarloEngine)
+
+        Args:
+            backtest_result: Backtest with trades
+            n_paths: Number of simulated paths
+            method: 'bootstrap' or 'block'
+            block_size: Consecutive trades per block (block method only)
+            seed: Random seed
+
+        Returns:
+            MonteCarloAnalysis with drawdown, underwater, ruin and CAGR distributions
+        """
+        from agents.backtesting.tools.monte_carlo import MonteCarloEngine
+
+        engine = MonteCarloEngine(n_paths=n_paths, method=method, block_size=block_size, seed=seed)
+        return engine.simulate(backtest_result)
 
     def calculate_recovery_stats(
         self, equity_curve: pd.DataFrame
@@ -286,25 +314,12 @@ class RiskMetricsCalculator:
         equity = equity_curve['equity']
         cummax = equity.cummax()
 
-        # Time to recover from drawdowns
-        recovery_times = []
-
-        # Find peaks and recoveries
-        at_peak = equity >= cummax * 0.999  # Within 0.1% of peak
-
-        in_recovery = False
-        recovery_start_idx = None
-
-        for idx, at_peak_now in enumerate(at_peak):
-            if not at_peak_now and not in_recovery:
-                # Entered drawdown
-                in_recovery = True
-                recovery_start_idx = idx
-            elif at_peak_now and in_recovery:
-                # Recovered to new peak
-                recovery_time = idx - recovery_start_idx
-                recovery_times.append(recovery_time)
-                in_recovery = False
+        # Time to recover from drawdowns: each run below the peak band that
+        # ends before the last bar is one completed recovery
+        at_peak = (equity >= cummax * 0.999).to_numpy()  # Within 0.1% of peak
+        starts, ends = true_runs(~at_peak)
+        completed = ends < len(at_peak)
+        recovery_times = (ends - starts)[completed].tolist()
 
         stats = {
             'num_recoveries': len(recovery_times),
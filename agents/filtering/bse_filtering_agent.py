@@ -220,6 +220,11 @@ class BSEFilteringAgent:
         """
         Warm the earnings calendar cache
 
+        Only days that are missing or stale are fetched (see
+        BSEEarningsCalendarTool._stale_days): a daily warm-up fetches the day
+        newly entering the window, today, and the few future days whose lead
+        time has halved since their last fetch.
+
         Args:
             days_ahead: Number of days to pre-fetch
         """
@@ -230,11 +235,10 @@ class BSEFilteringAgent:
 
         announcements = self.earnings_tool.fetch_bse_announcements(
             from_date=from_date,
-            to_date=to_date,
-            force_refresh=True
+            to_date=to_date
         )
 
-        logger.info(f"Cache warmed: {len(announcements)} announcements fetched")
+        logger.info(f"Cache warmed: {len(announcements)} announcements cached")
 
     def cleanup_old_data(self, days_to_keep: int = 90):
         """
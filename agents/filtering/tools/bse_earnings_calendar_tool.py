@@ -6,10 +6,16 @@ Scrapes BSE website for upcoming earnings announcements to enable pre-filtering
 of stocks before expensive API calls.
 
 Goal: Reduce stock universe by 70% by only analyzing stocks with earnings in next 7-14 days
+
+Cache coverage is tracked per calendar day (earnings_fetch_log), so a date range
+only refetches the days that were never fetched or have gone stale. The stale
+days are fetched as one date-range request per BSE endpoint, so a daily warm-up
+costs two requests; per-day requests are the fallback when the range fetch fails.
 """
 
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import sqlite3
@@ -17,6 +23,8 @@ from pathlib import Path
 import logging
 import json
 
+from src.utils.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,7 +35,10 @@ class BSEEarningsCalendarTool:
     Features:
     - Scrapes BSE corporate announcements API
     - Filters for earnings-related announcements
-    - Caches results in SQLite (24h TTL)
+    - Caches results in SQLite with per-day coverage (24h TTL; past days
+      fetched after they ended never go stale)
+    - Fetches only missing/stale days: one date-range request per endpoint,
+      falling back to concurrent per-day requests under a shared rate limit
     - Provides 7-day and 14-day lookforward windows
     """
 
@@ -35,20 +46,40 @@ class BSEEarningsCalendarTool:
     BSE_ANNOUNCEMENT_URL = "https://api.bseindia.com/BseIndiaAPI/api/AnnGetData/w"
     BSE_RESULT_URL = "https://api.bseindia.com/BseIndiaAPI/api/Result/w"
 
+    # Item fields carrying the announcement date in range responses
+    ITEM_DATE_FIELDS = ['NEWS_DT', 'DT_TM', 'MEETING_DATE', 'DissemDT']
+
     # Earnings-related keywords
     EARNINGS_KEYWORDS = [
         'result', 'earnings', 'financial', 'quarterly', 'q1', 'q2', 'q3', 'q4',
         'fy', 'profit', 'loss', 'statement', 'board meeting', 'financials'
     ]
 
-    def __init__(self, db_path: str = "data/earnings_calendar.db"):
+    def __init__(
+        self,
+        db_path: str = "data/earnings_calendar.db",
+        cache_ttl_hours: float = 24.0,
+        max_workers: int = 4,
+        requests_per_second: float = 4.0,
+        future_refresh_ratio: float = 0.5
+    ):
         """
         Initialize BSE earnings calendar tool
 
         Args:
             db_path: Path to SQLite database for caching
+            cache_ttl_hours: Age after which today's fetch is refetched
+            max_workers: Days fetched concurrently
+            requests_per_second: Shared BSE API rate limit across workers
+            future_refresh_ratio: A future day is refetched once its lead time
+                                  shrinks to this fraction of the lead at the
+                                  last fetch (see _stale_days)
         """
         self.db_path = Path(db_path)
+        self.cache_ttl_hours = cache_ttl_hours
+        self.max_workers = max_workers
+        self.future_refresh_ratio = future_refresh_ratio
+        self.rate_limiter = RateLimiter(requests_per_second=requests_per_second)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
 
@@ -89,6 +120,15 @@ class BSEEarningsCalendarTool:
             ON earnings_calendar(bse_code)
         """)
 
+        # Per-day fetch coverage (a day with no earnings still counts as fetched)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS earnings_fetch_log (
+                fetch_date DATE PRIMARY KEY,
+                fetched_at TIMESTAMP NOT NULL,
+                announcement_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
         conn.commit()
         conn.close()
 
@@ -111,135 +151,249 @@ class BSEEarningsCalendarTool:
         Returns:
             List of announcement dictionaries
         """
-        # Check cache first
-        if not force_refresh:
-            cached = self._get_cached_announcements(from_date, to_date)
-            if cached:
-                logger.info(f"Cache hit: {len(cached)} announcements from {from_date.date()} to {to_date.date()}")
-                return cached
-
-        logger.info(f"Fetching BSE announcements from {from_date.date()} to {to_date.date()}")
+        all_days = self._days_in_range(from_date, to_date)
+        days = all_days if force_refresh else self._stale_days(from_date, to_date)
+
+        if not days:
+            cached = self._read_announcements(from_date, to_date)
+            logger.info(f"Cache hit: {len(cached)} announcements from {from_date.date()} to {to_date.date()}")
+            return cached
+
+        logger.info(
+            f"Fetching BSE announcements for {len(days)}/{len(all_days)} days "
+            f"from {from_date.date()} to {to_date.date()}"
+        )
+
+        # One request per endpoint covers every stale day (and refreshes the
+        # fresh days between them at no extra cost)
+        if len(days) > 1:
+            errors: List[str] = []
+            announcements = self._fetch_announcements(days[0], days[-1], errors=errors)
+            if not errors:
+                self._cache_announcements(announcements, fetched_days=self._days_in_range(days[0], days[-1]))
+                return self._read_announcements(from_date, to_date)
+            logger.warning(f"Range fetch failed ({'; '.join(errors)}), falling back to per-day requests")
 
         announcements = []
+        fetched_days = []
 
-        # Fetch from BSE API (iterate day by day to handle pagination)
-        current_date = from_date
-        while current_date <= to_date:
-            try:
-                daily_announcements = self._fetch_daily_announcements(current_date)
+        def fetch_day(day: datetime):
+            errors: List[str] = []
+            return self._fetch_daily_announcements(day, errors=errors), errors
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(days)))) as executor:
+            for day, (daily_announcements, errors) in zip(days, executor.map(fetch_day, days)):
                 announcements.extend(daily_announcements)
-                logger.info(f"  {current_date.date()}: {len(daily_announcements)} announcements")
+                if errors:
+                    logger.error(f"Error fetching {day.date()}: {'; '.join(errors)}")
+                else:
+                    fetched_days.append(day)
+                logger.info(f"  {day.date()}: {len(daily_announcements)} announcements")
 
-                # Rate limiting
-                import time
-                time.sleep(0.5)
+        self._cache_announcements(announcements, fetched_days=fetched_days)
 
-            except Exception as e:
-                logger.error(f"Error fetching {current_date.date()}: {e}")
+        return self._read_announcements(from_date, to_date)
 
-            current_date += timedelta(days=1)
+    @staticmethod
+    def _days_in_range(from_date: datetime, to_date: datetime) -> List[datetime]:
+        """Calendar days from from_date to to_date inclusive (midnight datetimes)"""
+        first = datetime.combine(from_date.date(), datetime.min.time())
+        return [first + timedelta(days=i) for i in range((to_date.date() - from_date.date()).days + 1)]
 
-        # Cache results
-        if announcements:
-            self._cache_announcements(announcements)
+    def _stale_days(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        now: Optional[datetime] = None
+    ) -> List[datetime]:
+        """
+        Days in range that need fetching
+
+        Refresh policy per day (never-fetched days are always stale):
+        - Past days: final once fetched after the day ended
+        - Today: refetched when the last fetch is older than cache_ttl_hours
+        - Future days: refetched at most once per calendar day, and only once
+          the lead time has halved since the last fetch (future_refresh_ratio)
+
+        Future-dated intimations trickle in as a day approaches, so a day that
+        enters a 14-day window is refreshed at about 7, 3 and 1 days out and
+        again as today. In steady state a daily warm-up has 5 of the 15 days
+        stale (the new day, today and three approaching days), fetched together
+        as one range request per endpoint. Refetching every future day once the
+        TTL lapsed would cost 15 days at two API calls each on the per-day path.
+        """
+        now = now or datetime.now()
+        cache_age_limit = now - timedelta(hours=self.cache_ttl_hours)
+        today = datetime.combine(now.date(), datetime.min.time())
+
+        conn = sqlite3.connect(str(self.db_path))
+        rows = conn.execute("""
+            SELECT fetch_date, fetched_at FROM earnings_fetch_log
+            WHERE fetch_date BETWEEN ? AND ?
+        """, (from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d'))).fetchall()
+        conn.close()
 
+        fetched = {day: datetime.fromisoformat(fetched_at) for day, fetched_at in rows}
+        stale = []
+        for day in self._days_in_range(from_date, to_date):
+            fetched_at = fetched.get(day.strftime('%Y-%m-%d'))
+            if fetched_at is None:
+                stale.append(day)
+            elif day < today:
+                if fetched_at < day + timedelta(days=1):
+                    stale.append(day)
+            elif day == today:
+                if fetched_at <= cache_age_limit:
+                    stale.append(day)
+            elif fetched_at < today and (day - now) <= (day - fetched_at) * self.future_refresh_ratio:
+                stale.append(day)
+        return stale
+
+    def _read_announcements(self, from_date: datetime, to_date: datetime) -> List[Dict]:
+        """All cached announcements dated within [from_date, to_date]"""
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT bse_code, company_name, announcement_type, announcement_date, details
+            FROM earnings_calendar
+            WHERE announcement_date BETWEEN ? AND ?
+            ORDER BY announcement_date ASC
+        """, (from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')))
+
+        announcements = [
+            {
+                'bse_code': row[0],
+                'company_name': row[1],
+                'announcement_type': row[2],
+                'announcement_date': row[3],
+                'details': row[4]
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
         return announcements
 
-    def _fetch_daily_announcements(self, date: datetime) -> List[Dict]:
+    def _fetch_daily_announcements(self, date: datetime, errors: Optional[List[str]] = None) -> List[Dict]:
         """
         Fetch announcements for a single day
 
         Args:
             date: Date to fetch
+            errors: If given, a message is appended for each API call that failed
+                    (so callers can tell "no announcements" from "fetch failed")
 
         Returns:
             List of announcement dictionaries
         """
-        # Try Result API first (board meetings for earnings)
-        params = {
-            'strCat': '-1',
-            'strPrevDate': date.strftime('%Y%m%d'),
-            'strScrip': '',
-            'strSearch': 'S',
-            'strToDate': date.strftime('%Y%m%d'),
-            'strType': 'C'
-        }
+        return self._fetch_announcements(date, date, errors=errors)
+
+    def _item_date(self, item: Dict) -> Optional[str]:
+        """Announcement date (YYYY-MM-DD) of a BSE response item, if it carries one"""
+        for field in self.ITEM_DATE_FIELDS:
+            value = str(item.get(field) or '').strip()
+            if not value:
+                continue
+            for parse in (lambda v: datetime.fromisoformat(v[:10]), lambda v: datetime.strptime(v[:11], '%d %b %Y')):
+                try:
+                    return parse(value).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+        return None
+
+    def _fetch_announcements(
+        self,
+        first_day: datetime,
+        last_day: datetime,
+        errors: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Fetch announcements for a date range with one request per endpoint
 
-        announcements = []
+        Items are dated by the day requested when the range is a single day,
+        otherwise by their own date field (ITEM_DATE_FIELDS). Items outside
+        the range are dropped; an earnings item without a usable date is
+        reported as an error so the caller can fall back to per-day requests.
 
-        try:
-            response = self.session.get(self.BSE_RESULT_URL, params=params, timeout=10)
-            response.raise_for_status()
+        Args:
+            first_day: First day, inclusive
+            last_day: Last day, inclusive
+            errors: If given, a message is appended for each API call that failed
 
-            # Handle potential JSON parsing errors
-            try:
-                data = response.json()
-            except json.JSONDecodeError as je:
-                logger.error(f"Malformed JSON from BSE Result API for date {date}: {je}")
-                logger.debug(f"Response text (first 200 chars): {response.text[:200]}")
-                data = {}
-
-            if 'Table' in data and isinstance(data['Table'], list):
-                for item in data['Table']:
-                    # Filter for earnings-related announcements
-                    announcement_text = f"{item.get('SLONGNAME', '')} {item.get('PURPOSE', '')}".lower()
-
-                    if any(keyword in announcement_text for keyword in self.EARNINGS_KEYWORDS):
-                        announcements.append({
-                            'bse_code': item.get('SCRIP_CD', ''),
-                            'company_name': item.get('SLONGNAME', ''),
-                            'announcement_type': 'BOARD_MEETING',
-                            'announcement_date': date.strftime('%Y-%m-%d'),
-                            'details': item.get('PURPOSE', '')
-                        })
+        Returns:
+            List of announcement dictionaries
+        """
+        if errors is None:
+            errors = []
 
-        except requests.Timeout:
-            logger.warning(f"BSE Result API timeout for date {date}")
-        except requests.RequestException as e:
-            logger.warning(f"Network error fetching from Result API for date {date}: {e}")
-        except Exception as e:
-            logger.warning(f"Unexpected error fetching from Result API for date {date}: {e}")
+        first_key, last_key = first_day.strftime('%Y-%m-%d'), last_day.strftime('%Y-%m-%d')
+        span = f"{first_key}..{last_key}" if first_key != last_key else first_key
+        endpoints = [
+            # Result API first (board meetings for earnings)
+            ('Result API', self.BSE_RESULT_URL, {'strType': 'C'}, 'BOARD_MEETING', ('PURPOSE',), 'PURPOSE'),
+            ('Announcement API', self.BSE_ANNOUNCEMENT_URL, {}, 'ANNOUNCEMENT', ('HEADLINE', 'NSSUBJECT'), 'HEADLINE'),
+        ]
 
-        # Also try Announcement API
-        try:
-            ann_params = {
+        announcements = []
+        for name, url, extra_params, announcement_type, text_fields, details_field in endpoints:
+            params = {
                 'strCat': '-1',
-                'strPrevDate': date.strftime('%Y%m%d'),
+                'strPrevDate': first_day.strftime('%Y%m%d'),
                 'strScrip': '',
                 'strSearch': 'S',
-                'strToDate': date.strftime('%Y%m%d')
+                'strToDate': last_day.strftime('%Y%m%d'),
+                **extra_params
             }
 
-            response = self.session.get(self.BSE_ANNOUNCEMENT_URL, params=ann_params, timeout=10)
-            response.raise_for_status()
-
-            # Handle potential JSON parsing errors
             try:
-                data = response.json()
-            except json.JSONDecodeError as je:
-                logger.error(f"Malformed JSON from BSE Announcement API for date {date}: {je}")
-                logger.debug(f"Response text (first 200 chars): {response.text[:200]}")
-                data = {}
+                self.rate_limiter.acquire()
+                response = self.session.get(url, params=params, timeout=10)
+                response.raise_for_status()
+
+                # Handle potential JSON parsing errors
+                try:
+                    data = response.json()
+                except json.JSONDecodeError as je:
+                    logger.error(f"Malformed JSON from BSE {name} for {span}: {je}")
+                    errors.append(f"{name}: malformed JSON")
+                    logger.debug(f"Response text (first 200 chars): {response.text[:200]}")
+                    data = {}
+
+                undated = 0
+                if 'Table' in data and isinstance(data['Table'], list):
+                    for item in data['Table']:
+                        # Filter for earnings-related announcements
+                        announcement_text = " ".join(
+                            [item.get('SLONGNAME', '')] + [item.get(f, '') for f in text_fields]
+                        ).lower()
+                        if not any(keyword in announcement_text for keyword in self.EARNINGS_KEYWORDS):
+                            continue
+
+                        date_key = first_key if first_key == last_key else self._item_date(item)
+                        if date_key is None:
+                            undated += 1
+                            continue
+                        if not first_key <= date_key <= last_key:
+                            continue
 
-            if 'Table' in data and isinstance(data['Table'], list):
-                for item in data['Table']:
-                    announcement_text = f"{item.get('SLONGNAME', '')} {item.get('HEADLINE', '')} {item.get('NSSUBJECT', '')}".lower()
-
-                    if any(keyword in announcement_text for keyword in self.EARNINGS_KEYWORDS):
                         announcements.append({
                             'bse_code': item.get('SCRIP_CD', ''),
                             'company_name': item.get('SLONGNAME', ''),
-                            'announcement_type': 'ANNOUNCEMENT',
-                            'announcement_date': date.strftime('%Y-%m-%d'),
-                            'details': item.get('HEADLINE', '')
+                            'announcement_type': announcement_type,
+                            'announcement_date': date_key,
+                            'details': item.get(details_field, '')
                         })
-
-        except requests.Timeout:
-            logger.warning(f"BSE Announcement API timeout for date {date}")
-        except requests.RequestException as e:
-            logger.warning(f"Network error fetching from Announcement API for date {date}: {e}")
-        except Exception as e:
-            logger.warning(f"Unexpected error fetching from Announcement API for date {date}: {e}")
+                if undated:
+                    errors.append(f"{name}: {undated} items without a date")
+
+            except requests.Timeout:
+                logger.warning(f"BSE {name} timeout for {span}")
+                errors.append(f"{name}: timeout")
+            except requests.RequestException as e:
+                logger.warning(f"Network error fetching from {name} for {span}: {e}")
+                errors.append(f"{name}: {e}")
+            except Exception as e:
+                logger.warning(f"Unexpected error fetching from {name} for {span}: {e}")
+                errors.append(f"{name}: {e}")
 
         return announcements
 
@@ -256,91 +410,72 @@ class BSEEarningsCalendarTool:
             to_date: End date
 
         Returns:
-            List of cached announcements or None if cache miss
+            List of cached announcements or None if any day is missing/stale
         """
-        # Check if cache is fresh (< 24 hours old)
-        cache_age_limit = datetime.now() - timedelta(hours=24)
-
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        # Check if we have fresh data for the date range
-        cursor.execute("""
-            SELECT COUNT(DISTINCT announcement_date)
-            FROM earnings_calendar
-            WHERE announcement_date BETWEEN ? AND ?
-            AND scraped_at > ?
-        """, (
-            from_date.strftime('%Y-%m-%d'),
-            to_date.strftime('%Y-%m-%d'),
-            cache_age_limit.isoformat()
-        ))
-
-        cached_days = cursor.fetchone()[0]
-        expected_days = (to_date - from_date).days + 1
-
-        # Only use cache if we have all days
-        if cached_days < expected_days:
-            conn.close()
+        if self._stale_days(from_date, to_date):
             return None
 
-        # Fetch cached data
-        cursor.execute("""
-            SELECT bse_code, company_name, announcement_type, announcement_date, details
-            FROM earnings_calendar
-            WHERE announcement_date BETWEEN ? AND ?
-            AND scraped_at > ?
-            ORDER BY announcement_date ASC
-        """, (
-            from_date.strftime('%Y-%m-%d'),
-            to_date.strftime('%Y-%m-%d'),
-            cache_age_limit.isoformat()
-        ))
-
-        announcements = []
-        for row in cursor.fetchall():
-            announcements.append({
-                'bse_code': row[0],
-                'company_name': row[1],
-                'announcement_type': row[2],
-                'announcement_date': row[3],
-                'details': row[4]
-            })
-
-        conn.close()
-        return announcements
+        return self._read_announcements(from_date, to_date)
 
-    def _cache_announcements(self, announcements: List[Dict]):
+    def _cache_announcements(
+        self,
+        announcements: List[Dict],
+        fetched_days: Optional[List[datetime]] = None
+    ):
         """
-        Cache announcements in database
+        Cache announcements in database (single transaction)
 
         Args:
             announcements: List of announcement dictionaries
+            fetched_days: Days whose fetch completed; their previous rows are
+                          replaced and they are marked fresh in the fetch log.
+                          Defaults to the days the announcements are dated.
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
+        now = datetime.now().isoformat()
+        if fetched_days is None:
+            day_keys = sorted({ann['announcement_date'] for ann in announcements})
+        else:
+            day_keys = [day.strftime('%Y-%m-%d') for day in fetched_days]
+
+        counts = dict.fromkeys(day_keys, 0)
+        rows = []
         for ann in announcements:
             try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO earnings_calendar
-                    (bse_code, company_name, announcement_type, announcement_date, details, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+                rows.append((
                     ann['bse_code'],
                     ann['company_name'],
                     ann['announcement_type'],
                     ann['announcement_date'],
                     ann['details'],
-                    datetime.now().isoformat()
+                    now
                 ))
-            except Exception as e:
-                logger.warning(f"Error caching announcement: {e}")
+            except KeyError as e:
+                logger.warning(f"Error caching announcement: missing {e}")
+                continue
+            if ann['announcement_date'] in counts:
+                counts[ann['announcement_date']] += 1
 
-        conn.commit()
-        conn.close()
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            with conn:
+                if fetched_days is not None:
+                    conn.executemany(
+                        "DELETE FROM earnings_calendar WHERE announcement_date = ?",
+                        [(day,) for day in day_keys]
+                    )
+                conn.executemany("""
+                    INSERT OR REPLACE INTO earnings_calendar
+                    (bse_code, company_name, announcement_type, announcement_date, details, scraped_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.executemany("""
+                    INSERT OR REPLACE INTO earnings_fetch_log (fetch_date, fetched_at, announcement_count)
+                    VALUES (?, ?, ?)
+                """, [(day, now, count) for day, count in counts.items()])
+        finally:
+            conn.close()
 
-        logger.info(f"Cached {len(announcements)} announcements")
+        logger.info(f"Cached {len(rows)} announcements ({len(day_keys)} days marked fetched)")
 
     def get_stocks_with_upcoming_earnings(
         self,
@@ -386,6 +521,11 @@ class BSEEarningsCalendarTool:
         """, (cutoff_date.isoformat(),))
 
         deleted_count = cursor.rowcount
+
+        cursor.execute("""
+            DELETE FROM earnings_fetch_log
+            WHERE fetched_at < ?
+        """, (cutoff_date.isoformat(),))
         conn.commit()
 
         # VACUUM to reclaim space
@@ -3,6 +3,8 @@
 Stock Filter By Earnings Tool
 
 Maps BSE codes to NSE symbols and filters stock universe for backtesting.
+Lookups go through the process-wide symbol master (src/utils/symbol_master.py)
+loaded from the mapping database, not one query per code.
 
 Goal: 70% universe reduction by only including stocks with upcoming earnings
 """
@@ -12,6 +14,8 @@ from pathlib import Path
 from typing import List, Dict, Optional, Set
 import logging
 
+from src.utils.symbol_master import SymbolMaster, get_symbol_master
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +52,11 @@ class StockFilterByEarningsTool:
             'filter_efficiency': 0.0
         }
 
+    @property
+    def symbol_master(self) -> SymbolMaster:
+        """Shared in-memory index over the mapping database"""
+        return get_symbol_master(str(self.mapping_db_path))
+
     def _init_mapping_database(self):
         """Initialize BSE-NSE mapping database"""
         conn = sqlite3.connect(str(self.mapping_db_path))
@@ -103,6 +112,8 @@ class StockFilterByEarningsTool:
         conn.commit()
         conn.close()
 
+        self.symbol_master.reload()
+
     def add_mappings_bulk(self, mappings: List[Dict]):
         """
         Add multiple mappings in bulk
@@ -129,6 +140,7 @@ class StockFilterByEarningsTool:
         conn.commit()
         conn.close()
 
+        self.symbol_master.reload()
         logger.info(f"Added {len(mappings)} BSE-NSE mappings")
 
     def get_nse_symbol(self, bse_code: str) -> Optional[str]:
@@ -141,18 +153,7 @@ class StockFilterByEarningsTool:
         Returns:
             NSE symbol or None if not found
         """
-        conn = sqlite3.connect(str(self.mapping_db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT nse_symbol FROM bse_nse_mapping
-            WHERE bse_code = ?
-        """, (bse_code,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        return result[0] if result else None
+        return self.symbol_master.get_nse_symbol(bse_code)
 
     def get_bse_code(self, nse_symbol: str) -> Optional[str]:
         """
@@ -164,18 +165,7 @@ class StockFilterByEarningsTool:
         Returns:
             BSE code or None if not found
         """
-        conn = sqlite3.connect(str(self.mapping_db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT bse_code FROM bse_nse_mapping
-            WHERE nse_symbol = ?
-        """, (nse_symbol,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        return result[0] if result else None
+        return self.symbol_master.get_bse_code(nse_symbol)
 
     def map_bse_to_nse(self, bse_codes: List[str]) -> Dict[str, str]:
         """
@@ -187,22 +177,12 @@ class StockFilterByEarningsTool:
         Returns:
             Dictionary mapping BSE code to NSE symbol (only successful mappings)
         """
-        mappings = {}
-
-        conn = sqlite3.connect(str(self.mapping_db_path))
-        cursor = conn.cursor()
-
-        for bse_code in bse_codes:
-            cursor.execute("""
-                SELECT nse_symbol FROM bse_nse_mapping
-                WHERE bse_code = ?
-            """, (bse_code,))
-
-            result = cursor.fetchone()
-            if result:
-                mappings[bse_code] = result[0]
-
-        conn.close()
+        nse_symbols = self.symbol_master.map_many(bse_codes)
+        mappings = {
+            bse_code: nse_symbol
+            for bse_code, nse_symbol in zip(bse_codes, nse_symbols)
+            if nse_symbol is not None
+        }
 
         # Update statistics
         self.stats['total_bse_codes'] = len(bse_codes)
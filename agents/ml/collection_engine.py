@@ -0,0 +1,656 @@
+"""
+Resumable Collection Engine for Quarterly Financials
+
+One engine for "collect everything" refreshes, replacing the ad-hoc loops in
+collect_all_stocks_data.py, ultimate_data_collector.py,
+agents/ml/unstoppable_data_collector.py and run_universal_blockbuster_scan.py.
+
+Design:
+- Durable task ledger: one row per (bse_code, source) in `collection_ledger`,
+  stored next to `historical_financials` so a batch of rows and the ledger
+  updates for the tasks that produced them commit in one transaction
+- Per-source async limits: each source has its own concurrency cap and
+  request rate (blocking clients run in worker threads)
+- Conditional re-fetch: a completed task is only due again when its last
+  seen quarter is older than the latest quarter that should have been
+  reported by now (and at most once per `refetch_after_hours`); tasks that
+  ran out of attempts get a fresh set once a newer quarter is expected
+- Batched writes: rows are buffered and written `write_batch_size` at a time
+- Crash recovery: tasks left 'running' by a dead process are reset to
+  'pending' on the next run; writes are idempotent upserts on
+  (bse_code, quarter, year)
+
+Tasks are keyed by 6-digit BSE code, the key FinancialFeatureExtractor reads
+historical_financials by; sources map the code to their own ticker.
+
+Writes never delete rows or null out columns. By default a source only fills
+quarters and columns that are still missing, so curated rows (e.g. PDF
+extractions with extraction_confidence/pdf_url) survive a refresh. With
+`overwrite=True` the first source replaces existing values with the non-null
+values it provides.
+
+Usage:
+    engine = CollectionEngine("data/historical_financials.db", [YahooQuarterlySource()])
+    report = engine.run_sync(bse_codes)
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.rate_limiter import AsyncRateLimiter
+from src.utils.symbol_master import SymbolMaster, get_symbol_master
+from tools.db_utils import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+CRORE = 10_000_000
+
+BSE_CODE_PATTERN = re.compile(r"^\d{6}$")
+
+# historical_financials value columns a source may provide
+VALUE_COLUMNS = ('revenue_cr', 'pat_cr', 'eps', 'opm', 'npm', 'extraction_confidence', 'pdf_url')
+
+
+# ============================================================================
+# Records and quarters
+# ============================================================================
+
+@dataclass
+class QuarterlyFinancials:
+    """One quarter of results for one company (Indian fiscal quarters)"""
+    bse_code: str
+    quarter: str  # Q1 (Apr-Jun) .. Q4 (Jan-Mar)
+    year: int     # Fiscal year (FY ends in March of this year)
+    revenue_cr: Optional[float] = None
+    pat_cr: Optional[float] = None
+    eps: Optional[float] = None
+    opm: Optional[float] = None
+    npm: Optional[float] = None
+    extraction_confidence: Optional[float] = None
+    pdf_url: Optional[str] = None
+
+
+def fiscal_quarter(d: date) -> Tuple[str, int]:
+    """Indian fiscal (quarter, year) containing a calendar date"""
+    quarter = {4: 'Q1', 5: 'Q1', 6: 'Q1', 7: 'Q2', 8: 'Q2', 9: 'Q2',
+               10: 'Q3', 11: 'Q3', 12: 'Q3', 1: 'Q4', 2: 'Q4', 3: 'Q4'}[d.month]
+    year = d.year + 1 if d.month >= 4 else d.year
+    return quarter, year
+
+
+def quarter_key(quarter: str, year: int) -> str:
+    """Sortable quarter key, e.g. ('Q2', 2025) -> '2025Q2'"""
+    return f"{year}{quarter}"
+
+
+def latest_reported_quarter(today: date, reporting_lag_days: int = 45) -> str:
+    """
+    Latest quarter whose results should be out by `today`.
+
+    Companies have `reporting_lag_days` after quarter end to publish, so the
+    latest reported quarter is the one before the quarter containing
+    today - lag.
+    """
+    quarter, year = fiscal_quarter(today - timedelta(days=reporting_lag_days))
+    index = int(quarter[1]) - 1
+    if index == 0:
+        return quarter_key('Q4', year - 1)
+    return quarter_key(f"Q{index}", year)
+
+
+# ============================================================================
+# Sources
+# ============================================================================
+
+class CollectionSource:
+    """
+    A source of quarterly financials.
+
+    Subclasses implement `fetch`; an empty result counts as a failed attempt.
+
+    Attributes:
+        name: Ledger key for this source
+        max_concurrency: Maximum in-flight fetches for this source
+        requests_per_second: Fetch start rate (None: unthrottled)
+    """
+
+    name: str = "source"
+    max_concurrency: int = 4
+    requests_per_second: Optional[float] = None
+
+    async def fetch(self, bse_code: str) -> List[QuarterlyFinancials]:
+        raise NotImplementedError
+
+
+class ThreadedSource(CollectionSource):
+    """Adapter for blocking fetch functions (requests, yfinance, local DBs)"""
+
+    def __init__(
+        self,
+        name: str,
+        fetch_fn: Callable[[str], List[QuarterlyFinancials]],
+        max_concurrency: int = 4,
+        requests_per_second: Optional[float] = None
+    ):
+        self.name = name
+        self.fetch_fn = fetch_fn
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+
+    async def fetch(self, bse_code: str) -> List[QuarterlyFinancials]:
+        return await asyncio.to_thread(self.fetch_fn, bse_code)
+
+
+class YahooQuarterlySource(ThreadedSource):
+    """Yahoo Finance quarterly income statements (NSE, then BSE listing)"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_second: Optional[float] = 4.0,
+        mapping_db_path: str = "data/bse_nse_mapping.db",
+        symbol_master: Optional[SymbolMaster] = None
+    ):
+        """
+        Args:
+            max_concurrency: Maximum in-flight Yahoo fetches
+            requests_per_second: Yahoo request rate
+            mapping_db_path: BSE-NSE mapping DB for NSE ticker resolution
+            symbol_master: Optional pre-built SymbolMaster (default: shared
+                           master for mapping_db_path)
+        """
+        super().__init__("yahoo", self._fetch_blocking, max_concurrency, requests_per_second)
+        self.mapping_db_path = mapping_db_path
+        self._symbol_master = symbol_master
+
+    @property
+    def symbol_master(self) -> SymbolMaster:
+        if self._symbol_master is None:
+            self._symbol_master = get_symbol_master(self.mapping_db_path)
+        return self._symbol_master
+
+    def tickers(self, bse_code: str) -> List[str]:
+        """Yahoo tickers to try for a BSE code: NSE listing (if mapped), then BSE"""
+        nse_symbol = self.symbol_master.get_nse_symbol(bse_code)
+        return ([f"{nse_symbol}.NS"] if nse_symbol else []) + [f"{bse_code}.BO"]
+
+    def _fetch_blocking(self, bse_code: str) -> List[QuarterlyFinancials]:
+        import yfinance as yf
+
+        for ticker in self.tickers(bse_code):
+            income = yf.Ticker(ticker).quarterly_income_stmt
+            if income is not None and not income.empty:
+                return self._parse_income_statement(bse_code, income)
+        return []
+
+    @staticmethod
+    def _parse_income_statement(bse_code: str, income) -> List[QuarterlyFinancials]:
+        def value(row: str, column) -> Optional[float]:
+            if row not in income.index:
+                return None
+            v = income.loc[row, column]
+            return None if v != v else float(v)  # NaN -> None
+
+        records = []
+        for column in income.columns:
+            revenue = value('Total Revenue', column)
+            pat = value('Net Income', column)
+            if revenue is None and pat is None:
+                continue
+
+            quarter, year = fiscal_quarter(column.date() if hasattr(column, 'date') else column)
+            ebitda = value('EBITDA', column)
+            records.append(QuarterlyFinancials(
+                bse_code=bse_code,
+                quarter=quarter,
+                year=year,
+                revenue_cr=revenue / CRORE if revenue is not None else None,
+                pat_cr=pat / CRORE if pat is not None else None,
+                eps=value('Basic EPS', column),
+                opm=ebitda / revenue * 100 if ebitda is not None and revenue else None,
+                npm=pat / revenue * 100 if pat is not None and revenue else None
+            ))
+        return records
+
+
+# ============================================================================
+# Ledger
+# ============================================================================
+
+class TaskLedger:
+    """
+    Durable (symbol, source) task ledger; symbols are BSE codes.
+
+    Status: pending -> running -> done | failed. Ledger updates for finished
+    tasks are applied by CollectionEngine inside its write transaction, which
+    also records the quarter that was expected at the attempt.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS collection_ledger (
+                    symbol TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_quarter TEXT,
+                    rows_written INTEGER DEFAULT 0,
+                    last_attempt TIMESTAMP,
+                    error_message TEXT,
+                    expected_quarter TEXT,
+                    PRIMARY KEY (symbol, source)
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(collection_ledger)")}
+            if 'expected_quarter' not in columns:
+                conn.execute("ALTER TABLE collection_ledger ADD COLUMN expected_quarter TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_source_status ON collection_ledger(source, status)")
+
+    def connect(self):
+        """Pooled WAL connection context (commits on clean exit, rolls back on error)"""
+        return pooled_connection(self.db_path)
+
+    def enqueue(self, symbols: Sequence[str], sources: Sequence[str]) -> int:
+        """Add missing (symbol, source) tasks as pending; returns rows added"""
+        with self.connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO collection_ledger (symbol, source) VALUES (?, ?)",
+                [(symbol, source) for source in sources for symbol in symbols]
+            )
+            added = conn.total_changes - before
+        return added
+
+    def recover(self) -> int:
+        """Reset tasks left 'running' by an interrupted run; returns count"""
+        with self.connect() as conn:
+            cursor = conn.execute("UPDATE collection_ledger SET status = 'pending' WHERE status = 'running'")
+        if cursor.rowcount:
+            logger.info(f"Recovered {cursor.rowcount} interrupted tasks")
+        return cursor.rowcount
+
+    def renew_exhausted(self, expected_quarter: str) -> int:
+        """
+        Give failed tasks a fresh set of attempts once a newer quarter is expected.
+
+        Without this a task that failed max_attempts times would never be due
+        again, leaving a permanent gap for every later quarter.
+
+        Returns:
+            Number of tasks reset to pending
+        """
+        with self.connect() as conn:
+            cursor = conn.execute("""
+                UPDATE collection_ledger SET status = 'pending', attempts = 0
+                WHERE status = 'failed' AND (expected_quarter IS NULL OR expected_quarter < ?)
+            """, (expected_quarter,))
+        if cursor.rowcount:
+            logger.info(f"Renewed {cursor.rowcount} failed tasks for quarter {expected_quarter}")
+        return cursor.rowcount
+
+    def due(
+        self,
+        source: str,
+        symbols: Sequence[str],
+        expected_quarter: str,
+        max_attempts: int,
+        refetch_before: datetime
+    ) -> List[str]:
+        """
+        Symbols whose task for `source` should run now.
+
+        Due: pending; failed with attempts left; done but missing
+        `expected_quarter` and not attempted since `refetch_before`.
+        """
+        with self.connect() as conn:
+            rows = conn.execute("""
+                SELECT symbol FROM collection_ledger
+                WHERE source = ?
+                  AND (
+                    status = 'pending'
+                    OR (status = 'failed' AND attempts < ?)
+                    OR (status = 'done'
+                        AND (last_quarter IS NULL OR last_quarter < ?)
+                        AND last_attempt < ?)
+                  )
+            """, (source, max_attempts, expected_quarter, refetch_before.isoformat())).fetchall()
+
+        wanted = set(symbols)
+        return sorted(row[0] for row in rows if row[0] in wanted)
+
+    def mark_running(self, source: str, symbols: Sequence[str]):
+        with self.connect() as conn:
+            conn.executemany(
+                "UPDATE collection_ledger SET status = 'running' WHERE symbol = ? AND source = ?",
+                [(symbol, source) for symbol in symbols]
+            )
+
+    def status_counts(self) -> Dict[str, int]:
+        """Task count per status"""
+        with self.connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM collection_ledger GROUP BY status").fetchall()
+        return dict(rows)
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+@dataclass
+class CollectionReport:
+    """Summary of one engine run"""
+    expected_quarter: str
+    tasks_due: int = 0
+    tasks_done: int = 0
+    tasks_failed: int = 0
+    tasks_not_started: int = 0
+    rows_written: int = 0
+    rows_rejected: int = 0
+    recovered: int = 0
+    duration_seconds: float = 0.0
+    per_source: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass
+class _Outcome:
+    symbol: str
+    source: str
+    records: List[QuarterlyFinancials]
+    error: Optional[str] = None
+    is_primary: bool = True
+
+
+class CollectionEngine:
+    """
+    Bounded, restartable collection of quarterly financials into
+    historical_financials.db, keyed by BSE code.
+    """
+
+    def __init__(
+        self,
+        output_db_path: str,
+        sources: Sequence[CollectionSource],
+        write_batch_size: int = 200,
+        max_attempts: int = 3,
+        reporting_lag_days: int = 45,
+        refetch_after_hours: float = 24.0,
+        overwrite: bool = False
+    ):
+        """
+        Args:
+            output_db_path: historical_financials.db (also holds the ledger)
+            sources: Sources in priority order (only the first may overwrite)
+            write_batch_size: Rows buffered per write transaction
+            max_attempts: Failed attempts before a task is given up
+            reporting_lag_days: Days after quarter end before results are expected
+            refetch_after_hours: Minimum gap between re-fetches of a completed
+                                 task still missing the expected quarter
+            overwrite: Let the first source replace existing non-null values
+                       (default: every source only fills missing values)
+        """
+        if not sources:
+            raise ValueError("At least one source is required")
+        if len({s.name for s in sources}) != len(sources):
+            raise ValueError("Source names must be unique")
+
+        self.output_db_path = output_db_path
+        self.sources = list(sources)
+        self.write_batch_size = write_batch_size
+        self.max_attempts = max_attempts
+        self.reporting_lag_days = reporting_lag_days
+        self.refetch_after_hours = refetch_after_hours
+        self.overwrite = overwrite
+
+        self._init_output_db()
+        self.ledger = TaskLedger(output_db_path)
+
+        self._stop_requested = False
+        self._buffer: List[_Outcome] = []
+        self._buffer_rows = 0
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._report: Optional[CollectionReport] = None
+        self._expected_quarter: Optional[str] = None
+
+    def _init_output_db(self):
+        with pooled_connection(self.output_db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS historical_financials (
+                    financial_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    quarter TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    revenue_cr REAL,
+                    pat_cr REAL,
+                    eps REAL,
+                    opm REAL,
+                    npm REAL,
+                    extraction_date DATE DEFAULT (date('now')),
+                    extraction_confidence REAL,
+                    pdf_url TEXT,
+                    UNIQUE(bse_code, quarter, year)
+                )
+            """)
+
+    def stop(self):
+        """Finish in-flight fetches, flush, and leave the rest pending"""
+        self._stop_requested = True
+
+    def run_sync(self, bse_codes: Sequence[str], today: Optional[date] = None) -> CollectionReport:
+        """Blocking wrapper around run()"""
+        return asyncio.run(self.run(bse_codes, today))
+
+    async def run(self, bse_codes: Sequence[str], today: Optional[date] = None) -> CollectionReport:
+        """
+        Collect every due (bse_code, source) task.
+
+        Args:
+            bse_codes: Universe to keep collected, as 6-digit BSE codes
+                       (new codes are enqueued)
+            today: Reference date for the expected quarter (default: today)
+
+        Returns:
+            CollectionReport
+
+        Raises:
+            ValueError: If any entry is not a 6-digit BSE code
+        """
+        invalid = [code for code in bse_codes if not BSE_CODE_PATTERN.match(str(code))]
+        if invalid:
+            raise ValueError(f"Expected 6-digit BSE codes, got {len(invalid)} others (e.g. {invalid[:3]})")
+        symbols = [str(code) for code in bse_codes]
+
+        start = time.perf_counter()
+        today = today or date.today()
+        expected = latest_reported_quarter(today, self.reporting_lag_days)
+        refetch_before = datetime.now() - timedelta(hours=self.refetch_after_hours)
+
+        report = CollectionReport(expected_quarter=expected)
+        report.recovered = self.ledger.recover()
+        self.ledger.renew_exhausted(expected)
+        self.ledger.enqueue(symbols, [s.name for s in self.sources])
+
+        self._expected_quarter = expected
+        self._stop_requested = False
+        self._write_lock = asyncio.Lock()
+        self._report = report
+
+        work = []
+        for priority, source in enumerate(self.sources):
+            due = self.ledger.due(source.name, symbols, expected, self.max_attempts, refetch_before)
+            report.per_source[source.name] = {'due': len(due), 'done': 0, 'failed': 0}
+            report.tasks_due += len(due)
+            if due:
+                work.append(self._run_source(source, priority == 0, due))
+
+        logger.info(f"Collection run: {report.tasks_due} tasks due (expected quarter {expected})")
+
+        try:
+            await asyncio.gather(*work)
+        finally:
+            await self._flush()
+
+        report.tasks_not_started = report.tasks_due - report.tasks_done - report.tasks_failed
+        report.duration_seconds = round(time.perf_counter() - start, 3)
+        logger.info(
+            f"Collection run complete: {report.tasks_done} done, {report.tasks_failed} failed, "
+            f"{report.tasks_not_started} not started, {report.rows_written} rows in {report.duration_seconds}s"
+        )
+        return report
+
+    async def _run_source(self, source: CollectionSource, is_primary: bool, symbols: List[str]):
+        semaphore = asyncio.Semaphore(source.max_concurrency)
+        limiter = AsyncRateLimiter(source.requests_per_second) if source.requests_per_second else None
+
+        async def collect(symbol: str):
+            async with semaphore:
+                if self._stop_requested:
+                    return
+                if limiter is not None:
+                    await limiter.acquire()
+
+                await asyncio.to_thread(self.ledger.mark_running, source.name, [symbol])
+                try:
+                    records = list(await source.fetch(symbol) or [])
+                    error = None if records else "no data"
+                except Exception as e:
+                    records, error = [], f"{type(e).__name__}: {e}"
+
+                await self._record(_Outcome(symbol, source.name, records, error, is_primary))
+
+        await asyncio.gather(*(collect(symbol) for symbol in symbols))
+
+    async def _record(self, outcome: _Outcome):
+        """Buffer an outcome; flush once the buffer holds a full batch"""
+        self._buffer.append(outcome)
+        self._buffer_rows += max(1, len(outcome.records))
+        if self._buffer_rows >= self.write_batch_size:
+            await self._flush()
+
+    async def _flush(self):
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer, self._buffer_rows = self._buffer, [], 0
+            written, rejected = await asyncio.to_thread(self._write_batch, batch)
+
+        report = self._report
+        report.rows_written += written
+        report.rows_rejected += rejected
+        for outcome in batch:
+            counts = report.per_source[outcome.source]
+            if outcome.error is None:
+                report.tasks_done += 1
+                counts['done'] += 1
+            else:
+                report.tasks_failed += 1
+                counts['failed'] += 1
+
+    @staticmethod
+    def _upsert_sql(overwrite: bool) -> str:
+        """
+        Upsert on (bse_code, quarter, year) that never deletes rows or nulls columns.
+
+        Fill mode sets only columns that are NULL in the stored row; overwrite
+        mode replaces stored values with the source's non-null values. Rows are
+        only touched when a value actually changes, so rowcount counts real writes.
+        """
+        existing = "historical_financials"
+        if overwrite:
+            assignments = [f"{c} = COALESCE(excluded.{c}, {existing}.{c})" for c in VALUE_COLUMNS]
+            changes = [f"(excluded.{c} IS NOT NULL AND excluded.{c} IS NOT {existing}.{c})" for c in VALUE_COLUMNS]
+        else:
+            assignments = [f"{c} = COALESCE({existing}.{c}, excluded.{c})" for c in VALUE_COLUMNS]
+            changes = [f"({existing}.{c} IS NULL AND excluded.{c} IS NOT NULL)" for c in VALUE_COLUMNS]
+
+        return f"""
+            INSERT INTO historical_financials (bse_code, quarter, year, {', '.join(VALUE_COLUMNS)})
+            VALUES (?, ?, ?, {', '.join('?' for _ in VALUE_COLUMNS)})
+            ON CONFLICT(bse_code, quarter, year) DO UPDATE SET
+                {', '.join(assignments)}
+            WHERE {' OR '.join(changes)}
+        """
+
+    def _write_batch(self, batch: List[_Outcome]) -> Tuple[int, int]:
+        """Write rows and ledger updates for a batch in one transaction"""
+        written = rejected = 0
+        now = datetime.now().isoformat()
+        fill_sql = self._upsert_sql(overwrite=False)
+        overwrite_sql = self._upsert_sql(overwrite=True)
+
+        with self.ledger.connect() as conn:
+            for outcome in batch:
+                sql = overwrite_sql if outcome.is_primary and self.overwrite else fill_sql
+                for r in outcome.records:
+                    try:
+                        cursor = conn.execute(sql, (
+                            r.bse_code, r.quarter, r.year,
+                            *(getattr(r, column) for column in VALUE_COLUMNS)
+                        ))
+                        written += cursor.rowcount
+                    except sqlite3.IntegrityError as e:
+                        # Existing schemas may carry CHECK constraints; drop the row, keep the batch
+                        rejected += 1
+                        logger.warning(f"Rejected {r.bse_code} {r.quarter} {r.year}: {e}")
+
+                if outcome.error is None:
+                    last_quarter = max(quarter_key(r.quarter, r.year) for r in outcome.records)
+                    conn.execute("""
+                        UPDATE collection_ledger
+                        SET status = 'done', attempts = 0, last_quarter = ?, rows_written = ?,
+                            last_attempt = ?, error_message = NULL, expected_quarter = ?
+                        WHERE symbol = ? AND source = ?
+                    """, (last_quarter, len(outcome.records), now, self._expected_quarter,
+                          outcome.symbol, outcome.source))
+                else:
+                    conn.execute("""
+                        UPDATE collection_ledger
+                        SET status = 'failed', attempts = attempts + 1, last_attempt = ?, error_message = ?,
+                            expected_quarter = ?
+                        WHERE symbol = ? AND source = ?
+                    """, (now, outcome.error, self._expected_quarter, outcome.symbol, outcome.source))
+
+        return written, rejected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: refresh historical_financials.db for a list of BSE codes"""
+    parser = argparse.ArgumentParser(description="Resumable quarterly financials collection")
+    parser.add_argument("codes_file", help="Text file with one 6-digit BSE code per line")
+    parser.add_argument("--db", default="data/historical_financials.db", help="Output database")
+    parser.add_argument("--mapping-db", default="data/bse_nse_mapping.db", help="BSE-NSE mapping database")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max in-flight Yahoo fetches")
+    parser.add_argument("--rate", type=float, default=4.0, help="Yahoo requests per second")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace existing values with Yahoo's (default: only fill missing values)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    with open(args.codes_file) as f:
+        bse_codes = [line.strip() for line in f if line.strip()]
+
+    source = YahooQuarterlySource(args.concurrency, args.rate, mapping_db_path=args.mapping_db)
+    engine = CollectionEngine(args.db, [source], overwrite=args.overwrite)
+    report = engine.run_sync(bse_codes)
+
+    print(f"Expected quarter: {report.expected_quarter}")
+    print(f"Tasks: {report.tasks_done} done, {report.tasks_failed} failed, {report.tasks_not_started} not started")
+    print(f"Rows written: {report.rows_written} ({report.rows_rejected} rejected)")
+    print(f"Ledger: {engine.ledger.status_counts()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
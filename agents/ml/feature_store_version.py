@@ -0,0 +1,54 @@
+"""
+Feature Store Version Stamps
+
+A feature store directory carries a small stamp file that feature extractors
+rewrite whenever they store new rows. Readers (e.g. FeatureVectorCache) key
+cached features on the stamp, so a write invalidates them without any
+coordination beyond the filesystem.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+VERSION_FILENAME = "feature_store.version"
+
+
+def bump_feature_store_version(store_dir: str) -> str:
+    """
+    Record that new feature rows were written to a feature store directory.
+
+    Args:
+        store_dir: Directory holding the feature databases
+
+    Returns:
+        New version stamp
+    """
+    path = Path(store_dir) / VERSION_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    version = str(time.time_ns())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(version)
+    tmp_path.replace(path)
+
+    logger.debug(f"Feature store version bumped: {store_dir} -> {version}")
+    return version
+
+
+def read_feature_store_version(store_dir: str) -> str:
+    """
+    Read the current version stamp of a feature store directory.
+
+    Args:
+        store_dir: Directory holding the feature databases
+
+    Returns:
+        Version stamp ("0" if features were never written)
+    """
+    try:
+        return (Path(store_dir) / VERSION_FILENAME).read_text().strip() or "0"
+    except FileNotFoundError:
+        return "0"
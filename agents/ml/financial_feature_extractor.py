@@ -9,12 +9,16 @@ Created: 2025-11-13
 """
 
 import logging
-import sqlite3
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import List, Dict, Optional
 import numpy as np
 import pandas as pd
+from pathlib import Path
+
+from agents.ml.feature_store_version import bump_feature_store_version
+from monitoring.instrumentation import STAGE_INDICATOR_COMPUTE, instrument_stage, track_stage
+from tools.db_utils import pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -85,51 +89,48 @@ class FinancialFeatureExtractor:
 
     def _initialize_database(self):
         """AC2.2.1: Create financial_features table with indexes"""
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS financial_features (
-                feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bse_code TEXT NOT NULL,
-                date DATE NOT NULL,
-
-                -- Revenue growth features
-                revenue_growth_qoq REAL,
-                revenue_growth_yoy REAL,
-                revenue_growth_avg_4q REAL,
-
-                -- Profit growth features
-                pat_growth_qoq REAL,
-                pat_growth_yoy REAL,
-                pat_growth_avg_4q REAL,
-
-                -- Margin features
-                operating_margin REAL,
-                net_profit_margin REAL,
-                margin_expansion_qoq REAL,
-                avg_margin_4q REAL,
-
-                -- EPS features
-                eps_growth_qoq REAL,
-                eps_growth_yoy REAL,
-                eps_consistency REAL,
-
-                -- Earnings quality features
-                consecutive_growth_quarters INTEGER,
-                earnings_surprise INTEGER,
-
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(bse_code, date) ON CONFLICT REPLACE
-            )
-        """)
-
-        # Create indexes for query performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_financial_sample_id ON financial_features(feature_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_financial_bse_date ON financial_features(bse_code, date)")
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS financial_features (
+                    feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    date DATE NOT NULL,
+
+                    -- Revenue growth features
+                    revenue_growth_qoq REAL,
+                    revenue_growth_yoy REAL,
+                    revenue_growth_avg_4q REAL,
+
+                    -- Profit growth features
+                    pat_growth_qoq REAL,
+                    pat_growth_yoy REAL,
+                    pat_growth_avg_4q REAL,
+
+                    -- Margin features
+                    operating_margin REAL,
+                    net_profit_margin REAL,
+                    margin_expansion_qoq REAL,
+                    avg_margin_4q REAL,
+
+                    -- EPS features
+                    eps_growth_qoq REAL,
+                    eps_growth_yoy REAL,
+                    eps_consistency REAL,
+
+                    -- Earnings quality features
+                    consecutive_growth_quarters INTEGER,
+                    earnings_surprise INTEGER,
+
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(bse_code, date) ON CONFLICT REPLACE
+                )
+            """)
+
+            # Create indexes for query performance
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_financial_sample_id ON financial_features(feature_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_financial_bse_date ON financial_features(bse_code, date)")
         logger.info("Database schema initialized with indexes")
 
     def _sort_financials(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -444,6 +445,7 @@ class FinancialFeatureExtractor:
 
         return result
 
+    @instrument_stage("feature_load.financial")
     def _load_financial_data(self, bse_code: str) -> Optional[pd.DataFrame]:
         """
         Load historical financial data for a company (AC2.2.7)
@@ -455,8 +457,6 @@ class FinancialFeatureExtractor:
             DataFrame with columns ['quarter', 'year', 'revenue', 'pat', 'operating_profit', 'eps']
             or None if no data found
         """
-        conn = sqlite3.connect(self.financials_db_path)
-
         query = """
             SELECT quarter, year, revenue, pat, operating_profit, eps
             FROM historical_financials
@@ -466,8 +466,8 @@ class FinancialFeatureExtractor:
         """
 
         try:
-            df = pd.read_sql_query(query, conn, params=(bse_code,))
-            conn.close()
+            with pooled_connection(self.financials_db_path, read_only=True) as conn:
+                df = pd.read_sql_query(query, conn, params=(bse_code,))
 
             if df.empty:
                 logger.warning(f"No financial data found for {bse_code}")
@@ -477,7 +477,6 @@ class FinancialFeatureExtractor:
 
         except Exception as e:
             logger.error(f"Error loading financial data for {bse_code}: {e}")
-            conn.close()
             return None
 
     def extract_features_for_sample(self, bse_code: str, date: str) -> FinancialFeatures:
@@ -499,11 +498,12 @@ class FinancialFeatureExtractor:
             return FinancialFeatures(bse_code=bse_code, date=date)
 
         # Calculate all feature groups
-        revenue_growth = self.calculate_revenue_growth(financials)
-        profit_growth = self.calculate_profit_growth(financials)
-        margins = self.calculate_margins(financials)
-        eps_features = self.calculate_eps_features(financials)
-        quality = self.calculate_earnings_quality(financials)
+        with track_stage(f"{STAGE_INDICATOR_COMPUTE}.financial"):
+            revenue_growth = self.calculate_revenue_growth(financials)
+            profit_growth = self.calculate_profit_growth(financials)
+            margins = self.calculate_margins(financials)
+            eps_features = self.calculate_eps_features(financials)
+            quality = self.calculate_earnings_quality(financials)
 
         return FinancialFeatures(
             bse_code=bse_code,
@@ -557,33 +557,33 @@ class FinancialFeatureExtractor:
         df = pd.DataFrame(features_list)
 
         # Bulk insert into database
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        for features_dict in features_list:
-            cursor.execute("""
-                INSERT OR REPLACE INTO financial_features (
-                    bse_code, date,
-                    revenue_growth_qoq, revenue_growth_yoy, revenue_growth_avg_4q,
-                    pat_growth_qoq, pat_growth_yoy, pat_growth_avg_4q,
-                    operating_margin, net_profit_margin, margin_expansion_qoq, avg_margin_4q,
-                    eps_growth_qoq, eps_growth_yoy, eps_consistency,
-                    consecutive_growth_quarters, earnings_surprise,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                features_dict['bse_code'], features_dict['date'],
-                features_dict['revenue_growth_qoq'], features_dict['revenue_growth_yoy'], features_dict['revenue_growth_avg_4q'],
-                features_dict['pat_growth_qoq'], features_dict['pat_growth_yoy'], features_dict['pat_growth_avg_4q'],
-                features_dict['operating_margin'], features_dict['net_profit_margin'],
-                features_dict['margin_expansion_qoq'], features_dict['avg_margin_4q'],
-                features_dict['eps_growth_qoq'], features_dict['eps_growth_yoy'], features_dict['eps_consistency'],
-                features_dict['consecutive_growth_quarters'], features_dict['earnings_surprise'],
-                features_dict['created_at']
-            ))
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
+
+            for features_dict in features_list:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO financial_features (
+                        bse_code, date,
+                        revenue_growth_qoq, revenue_growth_yoy, revenue_growth_avg_4q,
+                        pat_growth_qoq, pat_growth_yoy, pat_growth_avg_4q,
+                        operating_margin, net_profit_margin, margin_expansion_qoq, avg_margin_4q,
+                        eps_growth_qoq, eps_growth_yoy, eps_consistency,
+                        consecutive_growth_quarters, earnings_surprise,
+                        created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    features_dict['bse_code'], features_dict['date'],
+                    features_dict['revenue_growth_qoq'], features_dict['revenue_growth_yoy'], features_dict['revenue_growth_avg_4q'],
+                    features_dict['pat_growth_qoq'], features_dict['pat_growth_yoy'], features_dict['pat_growth_avg_4q'],
+                    features_dict['operating_margin'], features_dict['net_profit_margin'],
+                    features_dict['margin_expansion_qoq'], features_dict['avg_margin_4q'],
+                    features_dict['eps_growth_qoq'], features_dict['eps_growth_yoy'], features_dict['eps_consistency'],
+                    features_dict['consecutive_growth_quarters'], features_dict['earnings_surprise'],
+                    features_dict['created_at']
+                ))
+
+        # Invalidate cached feature vectors for this store
+        bump_feature_store_version(str(Path(self.output_db_path).parent))
 
         logger.info(f"Batch financial feature extraction complete: {len(features_list)} samples processed")
         return df
@@ -26,10 +26,14 @@ from datetime import datetime, timedelta, date
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
 # Import tools and skills
-from tools.db_utils import get_db_connection, execute_query, create_table_if_not_exists
+from tools.db_utils import get_db_connection, execute_query, create_table_if_not_exists, pooled_connection
+from tools.bhav_copy_archive import BhavCopyArchive, bhav_copy_date, read_bhav_csv
+from tools.price_completeness import PresenceBitmap, coalesce_ranges
+from src.utils.trading_calendar import get_trading_calendar, to_day
 from tools.validation_utils import validate_date_range
 from skills.circuit_detector import find_circuit_hits_in_dataset
 
@@ -688,6 +692,7 @@ class UpperCircuitLabeler:
         self.db_path = db_path
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.calendar = get_trading_calendar()
 
         # AC1.2.4: Create database table
         self._initialize_database()
@@ -828,22 +833,16 @@ class UpperCircuitLabeler:
         Returns:
             Next trading day in YYYY-MM-DD format, or None if not found
         """
-        current_date = datetime.strptime(date_str, "%Y-%m-%d")
-
-        for i in range(1, max_days + 1):
-            next_date = current_date + timedelta(days=i)
-
-            # Skip weekends (Saturday=5, Sunday=6)
-            if next_date.weekday() >= 5:
-                continue
-
-            # TODO: Check market holiday calendar
-            # For now, assume it's a trading day if not weekend
+        try:
+            next_day = self.calendar.next_trading_day(date_str)
+        except ValueError:
+            next_day = None
 
-            return next_date.strftime("%Y-%m-%d")
+        if next_day is None or (to_day(next_day) - to_day(date_str)).astype(int) > max_days:
+            logger.warning(f"No trading day found within {max_days} days of {date_str}")
+            return None
 
-        logger.warning(f"No trading day found within {max_days} days of {date_str}")
-        return None
+        return next_day
 
     def download_bhav_copy(self, date_str: str) -> Optional[str]:
         """
@@ -1145,6 +1144,41 @@ class MappingReport:
     unmapped_count: int = 0
 
 
+FUZZY_PARALLEL_MIN_NAMES = 2000  # Below this, process start-up outweighs the scoring work
+FUZZY_MIN_RATIO = 80
+
+
+def _best_fuzzy_matches(bse_items, nse_clean, index) -> List[Tuple[str, Optional[int], int]]:
+    """
+    Best token_sort_ratio NSE match per cleaned BSE name (module-level for worker processes).
+
+    Args:
+        bse_items: [(bse_code, cleaned_name)]
+        nse_clean: Cleaned NSE names, in candidate order
+        index: CharBagIndex over token_sort_key(nse_clean)
+
+    Returns:
+        [(bse_code, best NSE position or None, best ratio)]; first best wins on ties
+    """
+    from fuzzywuzzy import fuzz
+    from tools.fuzzy_name_matcher import token_sort_key
+
+    # fuzz returns round(100 * ratio), so 79.5 already rounds up to 80
+    min_bound = (FUZZY_MIN_RATIO - 0.5) / 100.0
+
+    results = []
+    for bse_code, bse_clean in bse_items:
+        best_idx = None
+        best_ratio = 0
+        for i in index.candidates(token_sort_key(bse_clean), min_bound):
+            ratio = fuzz.token_sort_ratio(bse_clean, nse_clean[i])
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_idx = int(i)
+        results.append((bse_code, best_idx, best_ratio))
+    return results
+
+
 class BSENSEMapper:
     """
     BSE-NSE symbol mapper (Story 1.3).
@@ -1265,24 +1299,17 @@ class BSENSEMapper:
         Returns:
             Dict mapping bse_code → {company_name, isin}
         """
-        import csv
-
         bse_data = {}
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            frame = read_bhav_csv(csv_path, "BSE")
+            frame = frame[frame['code'] != '']
 
-                for row in reader:
-                    bse_code = row.get('SC_CODE', '').strip()
-                    company_name = row.get('SC_NAME', '').strip()
-                    isin = row.get('ISIN_CODE', '').strip() or row.get('SC_ISIN', '').strip()
-
-                    if bse_code:
-                        bse_data[bse_code] = {
-                            "company_name": company_name,
-                            "isin": isin if isin else None
-                        }
+            for bse_code, company_name, isin in zip(frame['code'], frame['name'], frame['isin']):
+                bse_data[bse_code] = {
+                    "company_name": company_name,
+                    "isin": isin if isin else None
+                }
 
             logger.info(f"Parsed {len(bse_data)} BSE companies from {csv_path}")
             self._total_bse_companies = len(bse_data)
@@ -1303,33 +1330,23 @@ class BSENSEMapper:
         Returns:
             Dict mapping nse_symbol → {isin, volume, series, company_name}
         """
-        import csv
-
         nse_data = {}
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    series = row.get('SERIES', '').strip()
+            frame = read_bhav_csv(csv_path, "NSE")
 
-                    # Only include EQ (equity) series
-                    if series != 'EQ':
-                        continue
+            # Only include EQ (equity) series
+            frame = frame[(frame['series'] == 'EQ') & (frame['code'] != '') & (frame['isin'] != '')]
 
-                    symbol = row.get('SYMBOL', '').strip()
-                    isin = row.get('ISIN', '').strip()
-                    volume = int(row.get('TOTTRDQTY', 0) or 0)
-                    company_name = row.get('NAME', '').strip() if 'NAME' in row else None
-
-                    if symbol and isin:
-                        nse_data[symbol] = {
-                            "isin": isin,
-                            "volume": volume,
-                            "series": series,
-                            "company_name": company_name
-                        }
+            for symbol, isin, volume, series, company_name in zip(
+                frame['code'], frame['isin'], frame['volume'].tolist(), frame['series'], frame['name']
+            ):
+                nse_data[symbol] = {
+                    "isin": isin,
+                    "volume": volume,
+                    "series": series,
+                    "company_name": company_name or None
+                }
 
             logger.info(f"Parsed {len(nse_data)} NSE EQ symbols from {csv_path}")
             return nse_data
@@ -1471,6 +1488,11 @@ class BSENSEMapper:
         - Ratio 80-89: Medium confidence, requires manual review
         - Ratio <80: Reject
 
+        Each BSE name is only scored against NSE names whose character-bag
+        bound can reach 80 (see tools.fuzzy_name_matcher.CharBagIndex), which
+        yields the same matches as scoring every pair. Large batches are
+        split across processes.
+
         Args:
             unmapped_bse: BSE codes without ISIN match
             nse_symbols: All NSE symbols with company names
@@ -1479,37 +1501,50 @@ class BSENSEMapper:
             Dict mapping bse_code → mapping candidate
         """
         try:
-            from fuzzywuzzy import fuzz
+            from fuzzywuzzy import fuzz  # noqa: F401 (availability check)
         except ImportError:
             logger.warning("fuzzywuzzy not installed, skipping fuzzy matching")
             return {}
 
-        fuzzy_mappings = {}
-
-        for bse_code, bse_info in unmapped_bse.items():
-            bse_name = bse_info.get('company_name', '')
-
-            if not bse_name:
-                continue
-
-            bse_clean = self.clean_company_name(bse_name)
+        from tools.fuzzy_name_matcher import CharBagIndex, token_sort_key
 
-            best_match = None
-            best_ratio = 0
+        # Clean every NSE name once and index them for candidate blocking
+        nse_entries = [
+            (nse_symbol, nse_info, self.clean_company_name(nse_info.get('company_name', '')))
+            for nse_symbol, nse_info in nse_symbols.items()
+            if nse_info.get('company_name', '')
+        ]
+        nse_clean = [clean for _, _, clean in nse_entries]
+        index = CharBagIndex([token_sort_key(clean) for clean in nse_clean])
 
-            # Try all NSE symbols
-            for nse_symbol, nse_info in nse_symbols.items():
-                nse_name = nse_info.get('company_name', '')
+        bse_items = [
+            (bse_code, self.clean_company_name(bse_info['company_name']))
+            for bse_code, bse_info in unmapped_bse.items()
+            if bse_info.get('company_name', '')
+        ]
 
-                if not nse_name:
-                    continue
+        if len(bse_items) >= FUZZY_PARALLEL_MIN_NAMES:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = os.cpu_count() or 1
+            chunk = -(-len(bse_items) // workers)
+            chunks = [bse_items[i:i + chunk] for i in range(0, len(bse_items), chunk)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = [
+                    match
+                    for part in executor.map(
+                        _best_fuzzy_matches, chunks, [nse_clean] * len(chunks), [index] * len(chunks)
+                    )
+                    for match in part
+                ]
+        else:
+            results = _best_fuzzy_matches(bse_items, nse_clean, index)
 
-                nse_clean = self.clean_company_name(nse_name)
-                ratio = fuzz.token_sort_ratio(bse_clean, nse_clean)
+        fuzzy_mappings = {}
 
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = (nse_symbol, nse_info)
+        for bse_code, best_idx, best_ratio in results:
+            bse_info = unmapped_bse[bse_code]
+            best_match = nse_entries[best_idx][:2] if best_idx is not None else None
 
             # Accept if ratio ≥80
             if best_ratio >= 80 and best_match:
@@ -1934,6 +1969,9 @@ from agents.ml.financial_extractor_story_1_4 import (
 # Story 1.5: PriceCollector - Historical Price & Volume Data Collection
 # ============================================================================
 
+GAP_FETCH_MAX_GAP_DAYS = 5  # Missing runs this many trading days apart or closer share one yfinance download
+
+
 @dataclass
 class PriceCollectionReport:
     """Summary report for price data collection (AC1.5.5)"""
@@ -1961,7 +1999,8 @@ class PriceCollector:
 
     Workflow:
     1. Download BSE/NSE BhavCopy CSV files for date range (AC1.5.1, AC1.5.2)
-    2. Parse CSV files and store in price_movements.db (AC1.5.3)
+    2. Parse each CSV once into the columnar BhavCopy archive and upsert
+       price_movements.db in one bulk transaction (AC1.5.3)
     3. Fill gaps using yfinance fallback (AC1.5.4)
     4. Calculate data completeness per company (AC1.5.5)
     5. Validate OHLC data quality (AC1.5.6)
@@ -1978,6 +2017,10 @@ class PriceCollector:
         (self.cache_dir / "bse").mkdir(exist_ok=True)
         (self.cache_dir / "nse").mkdir(exist_ok=True)
 
+        # Parse-once columnar store of every ingested BhavCopy day
+        self.archive = BhavCopyArchive(self.cache_dir / "archive")
+        self.calendar = get_trading_calendar()
+
         self.incomplete_data_log = "/Users/srijan/Desktop/aksh/data/incomplete_price_data.csv"
         self.anomaly_log = "/Users/srijan/Desktop/aksh/data/price_data_anomalies.csv"
 
@@ -2038,17 +2081,11 @@ class PriceCollector:
 
     def download_bse_bhav_copies(self, start_date: str, end_date: str) -> List[str]:
         """AC1.5.1: Download BSE BhavCopy CSV files for all trading days"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
-
         downloaded_files = []
-        current_date = start
 
-        while current_date <= end:
-            # Skip weekends
-            if current_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                current_date += timedelta(days=1)
-                continue
+        # Weekends and exchange holidays have no BhavCopy
+        for trading_day in self.calendar.trading_days(start_date, end_date):
+            current_date = datetime.strptime(trading_day, "%Y-%m-%d")
 
             # Format: EQ131124.csv for 13/11/2024
             date_str = current_date.strftime("%d%m%y")
@@ -2058,7 +2095,6 @@ class PriceCollector:
             # AC1.5.1: Skip if file already cached
             if cached_file.exists() and cached_file.stat().st_size > 0:
                 downloaded_files.append(str(cached_file))
-                current_date += timedelta(days=1)
                 continue
 
             # Download
@@ -2091,17 +2127,11 @@ class PriceCollector:
                     else:
                         time.sleep(1)
 
-            current_date += timedelta(days=1)
-
         return downloaded_files
 
     def download_nse_bhav_copies(self, start_date: str, end_date: str) -> List[str]:
         """AC1.5.2: Download NSE BhavCopy CSV files for all trading days"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
-
         downloaded_files = []
-        current_date = start
 
         # AC1.5.2: NSE requires specific headers
         headers = {
@@ -2109,11 +2139,9 @@ class PriceCollector:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
         }
 
-        while current_date <= end:
-            # Skip weekends
-            if current_date.weekday() >= 5:
-                current_date += timedelta(days=1)
-                continue
+        # Weekends and exchange holidays have no BhavCopy
+        for trading_day in self.calendar.trading_days(start_date, end_date):
+            current_date = datetime.strptime(trading_day, "%Y-%m-%d")
 
             # Format: cm13NOV2024bhav.csv
             date_str = current_date.strftime("%d%b%Y").upper()
@@ -2123,7 +2151,6 @@ class PriceCollector:
             # Skip if cached
             if cached_file.exists() and cached_file.stat().st_size > 0:
                 downloaded_files.append(str(cached_file))
-                current_date += timedelta(days=1)
                 continue
 
             # URL format: https://archives.nseindia.com/content/historical/EQUITIES/2024/NOV/cm13NOV2024bhav.csv.zip
@@ -2155,165 +2182,109 @@ class PriceCollector:
                 else:
                     logger.error(f"Failed to download NSE BhavCopy: {e}")
 
-            current_date += timedelta(days=1)
-
         return downloaded_files
 
     def parse_bhav_copy(self, csv_path: str, source: str, date: str) -> pd.DataFrame:
-        """AC1.5.3: Parse CSV files and return DataFrame"""
-        try:
-            import pandas as pd
+        """
+        AC1.5.3: Parse CSV files and return DataFrame
 
+        The file goes through the BhavCopy archive, so each day is parsed
+        once; re-runs over the same file read the archived partition.
+        """
+        try:
             if source == 'bse_bhav_copy':
-                # BSE columns: SC_CODE, SC_NAME, OPEN, HIGH, LOW, CLOSE, NO_OF_SHRS, NET_TURNOV, TDCLOINDI
-                df = pd.read_csv(csv_path)
-
-                # Rename columns
-                df = df.rename(columns={
-                    'SC_CODE': 'bse_code',
-                    'OPEN': 'open',
-                    'HIGH': 'high',
-                    'LOW': 'low',
-                    'CLOSE': 'close',
-                    'NO_OF_SHRS': 'volume',
-                    'TDCLOINDI': 'circuit_indicator'
-                })
-
-                # Add metadata
-                df['bse_code'] = df['bse_code'].astype(str)
-                df['date'] = date
-                df['source'] = source
-                df['hit_upper_circuit'] = df['circuit_indicator'] == 'C'
-                df['nse_symbol'] = None
+                frame = self.archive.ingest_file(csv_path, 'BSE', date)
 
-                # Select relevant columns
-                df = df[['bse_code', 'nse_symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 'hit_upper_circuit', 'source']]
+                df = pd.DataFrame({
+                    'bse_code': frame['code'],
+                    'nse_symbol': None,
+                    'date': date,
+                    'open': frame['open'],
+                    'high': frame['high'],
+                    'low': frame['low'],
+                    'close': frame['close'],
+                    'volume': frame['volume'],
+                    'prev_close': frame['prev_close'],
+                    'hit_upper_circuit': frame['is_circuit'],
+                    'source': source
+                })
 
             elif source == 'nse_bhav_copy':
-                # NSE columns: SYMBOL, SERIES, OPEN, HIGH, LOW, CLOSE, TOTTRDQTY, TOTTRDVAL, PREV_CLOSE
-                df = pd.read_csv(csv_path)
+                frame = self.archive.ingest_file(csv_path, 'NSE', date)
 
                 # Filter to EQ series only
-                df = df[df['SERIES'] == 'EQ']
-
-                # Rename columns
-                df = df.rename(columns={
-                    'SYMBOL': 'nse_symbol',
-                    'OPEN': 'open',
-                    'HIGH': 'high',
-                    'LOW': 'low',
-                    'CLOSE': 'close',
-                    'TOTTRDQTY': 'volume',
-                    'PREV_CLOSE': 'prev_close'
-                })
+                frame = frame[frame['series'] == 'EQ']
 
-                # Add metadata
-                df['date'] = date
-                df['source'] = source
-                df['bse_code'] = None
-
-                # Select relevant columns
-                df = df[['bse_code', 'nse_symbol', 'date', 'open', 'high', 'low', 'close', 'volume', 'prev_close', 'source']]
+                df = pd.DataFrame({
+                    'bse_code': None,
+                    'nse_symbol': frame['code'],
+                    'date': date,
+                    'open': frame['open'],
+                    'high': frame['high'],
+                    'low': frame['low'],
+                    'close': frame['close'],
+                    'volume': frame['volume'],
+                    'prev_close': frame['prev_close'],
+                    'source': source
+                })
 
             else:
                 raise ValueError(f"Unknown source: {source}")
 
-            return df
+            return df.reset_index(drop=True)
 
         except Exception as e:
             logger.error(f"Error parsing {csv_path}: {e}")
             return pd.DataFrame()
 
     def store_price_data(self, df: pd.DataFrame) -> int:
-        """AC1.5.3: Store parsed data in price_movements.db"""
+        """
+        AC1.5.3: Store parsed data in price_movements.db
+
+        Rows are upserted with one executemany; UNIQUE(bse_code, date)
+        ON CONFLICT REPLACE keeps the latest values. Inside an enclosing
+        pooled_connection block the write joins that transaction.
+        """
         if df.empty:
             return 0
 
-        conn = sqlite3.connect(self.db_path)
-
-        # Use pandas to_sql with if_exists='append'
-        # But we have UNIQUE constraint, so it will replace on conflict
-        rows_inserted = 0
+        columns = ['bse_code', 'nse_symbol', 'date', 'open', 'high', 'low', 'close',
+                   'volume', 'prev_close', 'hit_upper_circuit', 'source']
+        frame = df.reindex(columns=columns)
 
-        for _, row in df.iterrows():
-            try:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO price_movements
-                    (bse_code, nse_symbol, date, open, high, low, close, volume, prev_close, hit_upper_circuit, source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row.get('bse_code'),
-                    row.get('nse_symbol'),
-                    row['date'],
-                    row['open'],
-                    row['high'],
-                    row['low'],
-                    row['close'],
-                    row['volume'],
-                    row.get('prev_close'),
-                    row.get('hit_upper_circuit'),
-                    row['source']
-                ))
-                rows_inserted += 1
-            except Exception as e:
-                logger.error(f"Error inserting row: {e}")
+        # Object columns hold Python scalars (sqlite3 rejects numpy types); NaN -> NULL
+        values = [
+            frame[col].astype(object).where(frame[col].notna(), None).tolist()
+            for col in columns
+        ]
 
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.db_path) as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO price_movements
+                (bse_code, nse_symbol, date, open, high, low, close, volume, prev_close, hit_upper_circuit, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, zip(*values))
 
-        return rows_inserted
+        return len(frame)
 
     def identify_gaps(self, bse_codes: List[str], start_date: str, end_date: str, expected_days: int = None) -> Dict[str, List[str]]:
-        """AC1.5.4: Identify companies with <95% date coverage"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
-
-        # Calculate expected trading days (~250 per year)
+        """AC1.5.4: Identify companies with <95% date coverage and their missing trading days"""
+        trading_days = self.calendar.trading_days(start_date, end_date)
         if expected_days is None:
-            total_days = (end - start).days
-            expected_days = int(total_days * 250 / 365)  # Rough estimate
-
-        gaps = {}
+            expected_days = len(trading_days)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for bse_code in bse_codes:
-            cursor.execute("""
-                SELECT COUNT(*) FROM price_movements
-                WHERE bse_code=? AND date BETWEEN ? AND ?
-            """, (bse_code, start_date, end_date))
-
-            actual_days = cursor.fetchone()[0]
-            completeness = (actual_days / expected_days * 100) if expected_days > 0 else 0
-
-            if completeness < 95.0:
-                # Identify missing dates
-                cursor.execute("""
-                    SELECT date FROM price_movements
-                    WHERE bse_code=? AND date BETWEEN ? AND ?
-                    ORDER BY date
-                """, (bse_code, start_date, end_date))
-
-                existing_dates = set(row[0] for row in cursor.fetchall())
-
-                # Generate all expected dates
-                all_dates = []
-                current = start
-                while current <= end:
-                    if current.weekday() < 5:  # Exclude weekends
-                        all_dates.append(current.strftime("%Y-%m-%d"))
-                    current += timedelta(days=1)
-
-                missing_dates = [d for d in all_dates if d not in existing_dates]
-                gaps[bse_code] = missing_dates
+        presence = PresenceBitmap.from_db(
+            self.db_path, codes=bse_codes, start_date=start_date, end_date=end_date, calendar=trading_days
+        )
+        return presence.missing_dates(threshold=95.0, expected_days=expected_days)
 
-        conn.close()
-        return gaps
+    def fill_gaps_with_yfinance(self, bse_code: str, missing_dates: List[str], max_gap_days: int = GAP_FETCH_MAX_GAP_DAYS) -> int:
+        """
+        AC1.5.4: Fill missing dates using yfinance
 
-    def fill_gaps_with_yfinance(self, bse_code: str, missing_dates: List[str]) -> int:
-        """AC1.5.4: Fill missing dates using yfinance"""
+        Missing dates are coalesced into as few range downloads as possible:
+        runs separated by at most max_gap_days trading days share one request.
+        """
         if not missing_dates:
             return 0
 
@@ -2326,47 +2297,43 @@ class PriceCollector:
         try:
             import yfinance as yf
 
-            # Download data for missing dates
-            start_date = min(missing_dates)
-            end_date = max(missing_dates)
-
+            missing = np.unique(np.asarray(missing_dates, dtype='datetime64[D]'))
+            positions = self.calendar.ordinals(missing)
             ticker = f"{nse_symbol}.NS"
-            df = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            gaps_filled = 0
 
-            if df.empty:
-                return 0
+            for first, last in coalesce_ranges(positions, max_gap=max_gap_days):
+                start = pd.Timestamp(missing[positions == first][0])
+                end = pd.Timestamp(missing[positions == last][-1]) + timedelta(days=1)  # end is exclusive
+                df = yf.download(ticker, start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"), progress=False)
 
-            # Convert to price_movements format
-            gaps_filled = 0
+                # AC1.5.4: Rate limit - 1 second between yfinance calls
+                time.sleep(1)
 
-            for date_idx, row in df.iterrows():
-                date_str = date_idx.strftime("%Y-%m-%d")
+                if df.empty:
+                    continue
 
-                if date_str in missing_dates:
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
+                dates = df.index.strftime("%Y-%m-%d")
+                rows = df[dates.isin(missing_dates)]
+                if rows.empty:
+                    continue
 
-                    cursor.execute("""
+                with pooled_connection(self.db_path) as conn:
+                    conn.executemany("""
                         INSERT OR REPLACE INTO price_movements
                         (bse_code, nse_symbol, date, open, high, low, close, volume, source)
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'yfinance_fallback')
-                    """, (
-                        bse_code,
-                        nse_symbol,
-                        date_str,
-                        row['Open'],
-                        row['High'],
-                        row['Low'],
-                        row['Close'],
-                        int(row['Volume'])
+                    """, zip(
+                        [bse_code] * len(rows),
+                        [nse_symbol] * len(rows),
+                        rows.index.strftime("%Y-%m-%d"),
+                        rows['Open'].astype(float).tolist(),
+                        rows['High'].astype(float).tolist(),
+                        rows['Low'].astype(float).tolist(),
+                        rows['Close'].astype(float).tolist(),
+                        rows['Volume'].astype(np.int64).tolist()
                     ))
-
-                    conn.commit()
-                    conn.close()
-                    gaps_filled += 1
-
-            # AC1.5.4: Rate limit - 1 second between yfinance calls
-            time.sleep(1)
+                gaps_filled += len(rows)
 
             return gaps_filled
 
@@ -2376,20 +2343,7 @@ class PriceCollector:
 
     def calculate_completeness(self, bse_codes: List[str], expected_days: int = 975) -> Dict[str, float]:
         """AC1.5.5: Calculate completeness per company"""
-        completeness = {}
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for bse_code in bse_codes:
-            cursor.execute("SELECT COUNT(*) FROM price_movements WHERE bse_code=?", (bse_code,))
-            actual_days = cursor.fetchone()[0]
-
-            completeness_pct = (actual_days / expected_days * 100) if expected_days > 0 else 0
-            completeness[bse_code] = completeness_pct
-
-        conn.close()
-        return completeness
+        return PresenceBitmap.from_db(self.db_path, codes=bse_codes).completeness(expected_days)
 
     def log_incomplete_companies(self, completeness: Dict[str, float], threshold: float = 95.0):
         """AC1.5.5: Log companies with <95% completeness to CSV"""
@@ -2489,6 +2443,25 @@ class PriceCollector:
                     'error_type': error_type
                 })
 
+    def _store_bhav_files(self, bse_files: List[str], nse_files: List[str]) -> int:
+        """Parse (via the archive) and store every BSE and NSE BhavCopy file"""
+        total_records = 0
+
+        for csv_paths, exchange, source in (
+            (bse_files, 'BSE', 'bse_bhav_copy'),
+            (nse_files, 'NSE', 'nse_bhav_copy')
+        ):
+            for csv_path in csv_paths:
+                try:
+                    date_formatted = bhav_copy_date(csv_path, exchange)
+                except ValueError:
+                    continue
+
+                df = self.parse_bhav_copy(csv_path, source=source, date=date_formatted)
+                total_records += self.store_price_data(df)
+
+        return total_records
+
     def collect_all_price_data(self, bse_codes: List[str], start_date: str, end_date: str) -> PriceCollectionReport:
         """AC1.5.1-AC1.5.7: Collect all price data for specified companies and date range"""
         start_time = time.time()
@@ -2502,35 +2475,10 @@ class PriceCollector:
         total_files = len(bse_files) + len(nse_files)
         logger.info(f"Downloaded {total_files} BhavCopy files")
 
-        # Step 2: Parse and store BSE data
-        total_records = 0
-        for csv_path in bse_files:
-            date_str = Path(csv_path).stem.replace("EQ", "")
-            # Convert DDMMYY to YYYY-MM-DD
-            try:
-                date_obj = datetime.strptime(date_str, "%d%m%y")
-                date_formatted = date_obj.strftime("%Y-%m-%d")
-            except:
-                continue
-
-            df = self.parse_bhav_copy(csv_path, source='bse_bhav_copy', date=date_formatted)
-            records = self.store_price_data(df)
-            total_records += records
-
-        # Step 3: Parse and store NSE data
-        for csv_path in nse_files:
-            # Extract date from filename like cm13NOV2024bhav.csv
-            filename = Path(csv_path).stem
-            try:
-                date_part = filename.replace("cm", "").replace("bhav", "")
-                date_obj = datetime.strptime(date_part, "%d%b%Y")
-                date_formatted = date_obj.strftime("%Y-%m-%d")
-            except:
-                continue
-
-            df = self.parse_bhav_copy(csv_path, source='nse_bhav_copy', date=date_formatted)
-            records = self.store_price_data(df)
-            total_records += records
+        # Steps 2-3: Parse each file once (archive) and upsert all days in
+        # one bulk transaction
+        with pooled_connection(self.db_path):
+            total_records = self._store_bhav_files(bse_files, nse_files)
 
         # Step 4: Fill gaps with yfinance
         gaps = self.identify_gaps(bse_codes, start_date, end_date)
@@ -2765,22 +2713,11 @@ class DataQualityValidator:
         expected_days = 975
 
         try:
-            conn = sqlite3.connect(self.db_paths['price_movements'])
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT AVG(completeness) AS avg_completeness FROM (
-                    SELECT bse_code, (COUNT(DISTINCT date) * 100.0 / ?) AS completeness
-                    FROM price_movements
-                    WHERE date BETWEEN '2022-01-01' AND '2025-11-13'
-                    GROUP BY bse_code
-                )
-            """, (expected_days,))
-
-            result = cursor.fetchone()
-            avg_completeness = result[0] if result and result[0] else 0.0
-
-            conn.close()
+            presence = PresenceBitmap.from_db(
+                self.db_paths['price_movements'], start_date='2022-01-01', end_date='2025-11-13'
+            )
+            completeness = presence.completeness(expected_days)
+            avg_completeness = float(np.mean(list(completeness.values()))) if completeness else 0.0
 
             passed = avg_completeness >= threshold
             status = "PASS" if passed else "FAIL"
@@ -7,6 +7,10 @@ This agent coordinates the extraction of features from various domains:
 - Sentiment (Momentum, Reaction, Volatility)
 - Seasonality (Quarterly patterns)
 
+Extraction runs as a small DAG (agents/ml/feature_dag.py): a shared price
+panel is loaded once for the technical and sentiment stages, and the
+independent extractor stages run concurrently in worker processes.
+
 Author: VCP Financial Research Team
 Created: 2025-11-19
 """
@@ -22,6 +26,8 @@ from .financial_feature_extractor import FinancialFeatureExtractor
 from .technical_feature_extractor import TechnicalFeatureExtractor
 from .sentiment_feature_extractor import SentimentFeatureExtractor
 from .seasonality_feature_extractor import SeasonalityFeatureExtractor
+from .feature_dag import FeatureStage, run_feature_dag
+from .price_panel import PricePanel
 from agents.ml.fundamental_analysis_agent import FundamentalAnalysisAgent
 from agents.ml.blockbuster_feature_extractor import MLBlockbusterFeatureExtractor
 
@@ -38,6 +44,42 @@ class FeatureEngineerConfig:
     """Configuration for feature engineering"""
     db_base_path: str
     batch_size: int = 100
+    max_workers: Optional[int] = None  # Stage worker processes (None: one per stage, 1: sequential)
+
+
+# Stage functions are module-level so worker processes can unpickle them
+
+def _extract_batch(extractor, samples: List[Dict[str, str]], price_panel: Optional[PricePanel] = None) -> int:
+    """Run one extractor's batch extraction and return the row count"""
+    if price_panel is None:
+        return len(extractor.extract_features_batch(samples))
+
+    extractor.price_panel = price_panel
+    try:
+        return len(extractor.extract_features_batch(samples))
+    finally:
+        extractor.price_panel = None
+
+
+def _analyze_fundamentals(fundamental_agent, samples: List[Dict[str, str]]) -> int:
+    """Analyze announcements for every BSE code in the batch"""
+    # Group by bse_code to minimize DB opens
+    bse_codes = set(s['bse_code'] for s in samples)
+    # Use a fixed date range for simulation/fetching
+    start_date = min(s['date'] for s in samples)
+    end_date = max(s['date'] for s in samples)
+
+    for code in bse_codes:
+        fundamental_agent.analyze_company(code, start_date, end_date)
+    return len(samples)  # Assuming success
+
+
+def _extract_blockbuster(blockbuster_extractor) -> int:
+    """Extract and save blockbuster features"""
+    blockbuster_df = blockbuster_extractor.extract_all_features()
+    blockbuster_extractor.save_features(blockbuster_df)
+    return len(blockbuster_df)
+
 
 class MLFeatureEngineerAgent:
     """
@@ -49,14 +91,19 @@ class MLFeatureEngineerAgent:
     3. Ensure data consistency across feature sets
     """
 
-    def __init__(self, db_base_path: str):
+    def __init__(self, db_base_path: str, max_workers: Optional[int] = None):
         """
         Initialize MLFeatureEngineerAgent
         
         Args:
             db_base_path: Base directory for databases
+            max_workers: Worker processes for extractor stages (None: one per
+                         stage, 1: run stages sequentially in-process)
         """
-        self.config = FeatureEngineerConfig(db_base_path=db_base_path)
+        self.config = FeatureEngineerConfig(db_base_path=db_base_path, max_workers=max_workers)
+
+        # Wall-clock seconds per stage of the last engineer_batch_features run
+        self.last_stage_timings: Dict[str, float] = {}
         
         # Define database paths
         self.paths = {
@@ -141,52 +188,52 @@ class MLFeatureEngineerAgent:
         }
         
         try:
-            # 1. Financial Features
-            logger.info("Extracting financial features...")
-            fin_df = self.financial_extractor.extract_features_batch(samples)
-            results['financial'] = len(fin_df)
-            
-            # 2. Technical Features
-            logger.info("Extracting technical features...")
-            tech_df = self.technical_extractor.extract_features_batch(samples)
-            results['technical'] = len(tech_df)
-            
-            # 3. Sentiment Features
-            logger.info("Extracting sentiment features...")
-            sent_df = self.sentiment_extractor.extract_features_batch(samples)
-            results['sentiment'] = len(sent_df)
-            
-            # 4. Seasonality Features
-            logger.info("Extracting seasonality features...")
-            seas_df = self.seasonality_extractor.extract_features_batch(samples)
-            results['seasonality'] = len(seas_df)
-            
-            # 5. Fundamental Features (Simulated extraction for samples)
-            logger.info("Extracting fundamental features...")
-            # Group by bse_code to minimize DB opens
-            bse_codes = set(s['bse_code'] for s in samples)
-            # Use a fixed date range for simulation/fetching
-            start_date = min(s['date'] for s in samples)
-            end_date = max(s['date'] for s in samples)
-
-            for code in bse_codes:
-                self.fundamental_agent.analyze_company(code, start_date, end_date)
-            results['fundamental'] = len(samples) # Assuming success
-
-            # 6. Blockbuster Features
-            logger.info("Extracting blockbuster features...")
-            # Run the blockbuster feature extraction
-            blockbuster_df = self.blockbuster_extractor.extract_all_features()
-            self.blockbuster_extractor.save_features(blockbuster_df)
-            results['blockbuster'] = len(blockbuster_df)
-
-            logger.info(f"Batch engineering complete. Results: {results}")
+            result = run_feature_dag(self._build_stages(samples), max_workers=self.config.max_workers)
+            self.last_stage_timings = dict(result.stage_timings, total=result.total_seconds)
+
+            for category in results:
+                results[category] = result.outputs[category]
+
+            logger.info(f"Batch engineering complete. Results: {results}, timings: {self.last_stage_timings}")
             return results
             
         except Exception as e:
             logger.error(f"Error during batch feature engineering: {e}")
             raise
 
+    def _build_stages(self, samples: List[Dict[str, str]]) -> List[FeatureStage]:
+        """
+        Feature build DAG.
+
+        The price panel is loaded once in-process and shared by the technical
+        and sentiment stages (both previously queried price_movements per
+        sample). All extractor stages are independent of each other.
+        """
+        return [
+            FeatureStage(
+                name='price_panel',
+                func=PricePanel.load,
+                args=(self.paths['price_db'], samples),
+                in_process=True
+            ),
+            FeatureStage(name='financial', func=_extract_batch, args=(self.financial_extractor, samples)),
+            FeatureStage(
+                name='technical',
+                func=_extract_batch,
+                args=(self.technical_extractor, samples),
+                depends_on=('price_panel',)
+            ),
+            FeatureStage(
+                name='sentiment',
+                func=_extract_batch,
+                args=(self.sentiment_extractor, samples),
+                depends_on=('price_panel',)
+            ),
+            FeatureStage(name='seasonality', func=_extract_batch, args=(self.seasonality_extractor, samples)),
+            FeatureStage(name='fundamental', func=_analyze_fundamentals, args=(self.fundamental_agent, samples)),
+            FeatureStage(name='blockbuster', func=_extract_blockbuster, args=(self.blockbuster_extractor,))
+        ]
+
     def get_feature_stats(self) -> Dict[str, int]:
         """Get statistics about extracted features"""
         # This would query the DBs to get counts
@@ -21,7 +21,8 @@ from dataclasses import dataclass
 # Import circuit identifier tool
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tools.circuit_identifier import identify_circuits, get_circuit_statistics
+from tools.circuit_identifier import identify_circuits, get_circuit_statistics, load_price_changes
+from tools.db_utils import pooled_connection
 
 # Configure logging
 logging.basicConfig(
@@ -76,80 +77,39 @@ class MLLabelQualityAgent:
         if self.config.backup_labels:
             self._backup_labels()
         
-        # Identify real circuits
-        circuits = identify_circuits(
-            self.price_db,
-            threshold=self.config.circuit_threshold
-        )
-        
-        logger.info(f"Identified {len(circuits)} circuit events")
-        
-        # Get ALL price movements to create negative labels
-        conn = sqlite3.connect(self.price_db)
-        cursor_price = conn.cursor()
-        cursor_price.execute("""
-            SELECT p1.bse_code, p2.date, 
-                   ((p2.close - p1.close) / p1.close * 100) as pct_change
-            FROM price_movements p1
-            JOIN price_movements p2 
-                ON p1.bse_code = p2.bse_code 
-                AND date(p2.date) = date(p1.date, '+1 day')
-            WHERE p1.close > 0
-        """)
-        all_movements = cursor_price.fetchall()
-        conn.close()
-        
-        logger.info(f"Found {len(all_movements)} total price movements")
-        
-        # Create set of circuit dates for quick lookup
-        circuit_set = {(c['bse_code'], c['circuit_date']) for c in circuits}
-        
-        # Clear existing labels
-        conn = sqlite3.connect(self.labels_db)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM upper_circuit_labels")
-        conn.commit()
-        
-        # Insert all labels (positive and negative)
-        positive_count = 0
-        negative_count = 0
-        
-        for bse_code, date, pct_change in all_movements:
-            try:
-                is_circuit = (bse_code, date) in circuit_set
-                label = 1 if is_circuit else 0
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO upper_circuit_labels
-                    (bse_code, earnings_date, next_day_date, price_change_pct, hit_circuit, label)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    bse_code,
-                    date,
-                    date,
-                    pct_change,
-                    1 if is_circuit else 0,
-                    label
-                ))
-                
-                if label == 1:
-                    positive_count += 1
-                else:
-                    negative_count += 1
-                    
-            except Exception as e:
-                logger.error(f"Error inserting label: {e}")
-        
-        conn.commit()
-        conn.close()
-        
+        # One pass over price_movements: every day-over-day move, aligned to
+        # the previous trading row of the same company
+        moves = load_price_changes(self.price_db)
+        is_circuit = (moves['pct_change'] >= self.config.circuit_threshold).to_numpy()
+        positive_count = int(is_circuit.sum())
+        negative_count = len(moves) - positive_count
+
+        logger.info(f"Identified {positive_count} circuit events in {len(moves)} price movements")
+
+        # Replace all labels (positive and negative) in one transaction
+        flags = is_circuit.astype(int).tolist()
+        with pooled_connection(self.labels_db) as conn:
+            conn.execute("DELETE FROM upper_circuit_labels")
+            conn.executemany("""
+                INSERT OR REPLACE INTO upper_circuit_labels
+                (bse_code, earnings_date, next_day_date, price_change_pct, hit_circuit, label)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, zip(
+                moves['bse_code'].tolist(),
+                moves['date'].tolist(),
+                moves['date'].tolist(),
+                moves['pct_change'].tolist(),
+                flags,
+                flags
+            ))
+
         # Get label statistics
         stats = self.get_label_stats()
         
         logger.info(f"Re-labeling complete: {positive_count} positive, {negative_count} negative labels")
         
         return {
-            "circuits_identified": len(circuits),
+            "circuits_identified": positive_count,
             "labels_created": positive_count + negative_count,
             "positive_labels": positive_count,
             "negative_labels": negative_count,
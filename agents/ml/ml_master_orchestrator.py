@@ -55,6 +55,7 @@ class TaskResult:
     duration_seconds: float
     output: any
     error_message: Optional[str] = None
+    stage_timings: Optional[Dict[str, float]] = None  # Seconds per sub-stage, when the agent reports them
 
 
 @dataclass
@@ -192,7 +193,8 @@ class MLMasterOrchestrator:
         if self._feature_engineer is None:
             from .ml_feature_engineer import MLFeatureEngineerAgent
             self._feature_engineer = MLFeatureEngineerAgent(
-                db_base_path=self.config.db_base_path
+                db_base_path=self.config.db_base_path,
+                max_workers=self.config.max_concurrent_tasks if self.config.enable_parallel_execution else 1
             )
         return self._feature_engineer
 
@@ -367,7 +369,8 @@ class MLMasterOrchestrator:
         Orchestrate model training pipeline (Epic 3).
 
         Tasks delegated in sequence:
-        1. Engineer features for all labeled samples (MLFeatureEngineerAgent)
+        1. Engineer features for all labeled samples (MLFeatureEngineerAgent;
+           per-stage timings in TaskResult.stage_timings)
         2. Split data into train/val/test (70%/15%/15%)
         3. Train models with hyperparameter tuning (MLTrainingAgent)
         4. Select champion model based on F1 score
@@ -430,7 +433,8 @@ class MLMasterOrchestrator:
                 agent_name="MLFeatureEngineerAgent",
                 status="SUCCESS",
                 duration_seconds=task_duration,
-                output=feature_stats
+                output=feature_stats,
+                stage_timings=self.feature_engineer.last_stage_timings
             ))
             
             # Task 2: Baseline Training
@@ -16,13 +16,14 @@ Created: 2025-11-14
 """
 
 import logging
-import sqlite3
 import json
 import joblib
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from tools.db_utils import pooled_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,25 +86,22 @@ class ModelRegistry:
         - created_at: TEXT NOT NULL
         - description: TEXT
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS models (
-                model_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                model_name TEXT NOT NULL,
-                model_type TEXT NOT NULL,
-                version TEXT NOT NULL,
-                metrics TEXT NOT NULL,
-                hyperparameters TEXT,
-                file_path TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                description TEXT
-            )
-        """)
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS models (
+                    model_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model_name TEXT NOT NULL,
+                    model_type TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    metrics TEXT NOT NULL,
+                    hyperparameters TEXT,
+                    file_path TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    description TEXT
+                )
+            """)
 
         logger.debug(f"Database created/verified: {self.db_path}")
 
@@ -122,18 +120,17 @@ class ModelRegistry:
             return version
 
         # Get latest version for this model type
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with pooled_connection(self.db_path, read_only=True) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT version FROM models
-            WHERE model_type = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, (model_type,))
+            cursor.execute("""
+                SELECT version FROM models
+                WHERE model_type = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+            """, (model_type,))
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         if row is None:
             # First model of this type
@@ -187,28 +184,26 @@ class ModelRegistry:
         # Save metadata to database
         created_at = datetime.now().isoformat()
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO models (
-                model_name, model_type, version, metrics, hyperparameters,
-                file_path, created_at, description
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            model_name,
-            model_type,
-            model_version,
-            json.dumps(metrics),
-            json.dumps(hyperparameters) if hyperparameters else None,
-            model_filepath,
-            created_at,
-            description
-        ))
-
-        model_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO models (
+                    model_name, model_type, version, metrics, hyperparameters,
+                    file_path, created_at, description
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                model_name,
+                model_type,
+                model_version,
+                json.dumps(metrics),
+                json.dumps(hyperparameters) if hyperparameters else None,
+                model_filepath,
+                created_at,
+                description
+            ))
+
+            model_id = cursor.lastrowid
 
         logger.info(f"Model metadata saved: id={model_id}, version={model_version}")
 
@@ -236,16 +231,15 @@ class ModelRegistry:
             raise ValueError("Must specify either model_id or version")
 
         # Query database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with pooled_connection(self.db_path, read_only=True) as conn:
+            cursor = conn.cursor()
 
-        if model_id is not None:
-            cursor.execute("SELECT file_path FROM models WHERE model_id=?", (model_id,))
-        else:
-            cursor.execute("SELECT file_path FROM models WHERE version=?", (version,))
+            if model_id is not None:
+                cursor.execute("SELECT file_path FROM models WHERE model_id=?", (model_id,))
+            else:
+                cursor.execute("SELECT file_path FROM models WHERE version=?", (version,))
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         if row is None:
             logger.warning(f"Model not found: id={model_id}, version={version}")
@@ -277,22 +271,21 @@ class ModelRegistry:
         Returns:
             List of model metadata dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with pooled_connection(self.db_path, read_only=True) as conn:
+            cursor = conn.cursor()
 
-        # Build query
-        query = "SELECT * FROM models"
-        params = []
+            # Build query
+            query = "SELECT * FROM models"
+            params = []
 
-        if model_type is not None:
-            query += " WHERE model_type=?"
-            params.append(model_type)
+            if model_type is not None:
+                query += " WHERE model_type=?"
+                params.append(model_type)
 
-        query += " ORDER BY created_at DESC"
+            query += " ORDER BY created_at DESC"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
 
         # Parse results
         models = []
@@ -358,23 +351,20 @@ class ModelRegistry:
             True if deleted successfully, False otherwise
         """
         # Get file path
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT file_path FROM models WHERE model_id=?", (model_id,))
-        row = cursor.fetchone()
+            cursor.execute("SELECT file_path FROM models WHERE model_id=?", (model_id,))
+            row = cursor.fetchone()
 
-        if row is None:
-            conn.close()
-            logger.warning(f"Model not found: id={model_id}")
-            return False
+            if row is None:
+                logger.warning(f"Model not found: id={model_id}")
+                return False
 
-        file_path = row[0]
+            file_path = row[0]
 
-        # Delete from database
-        cursor.execute("DELETE FROM models WHERE model_id=?", (model_id,))
-        conn.commit()
-        conn.close()
+            # Delete from database
+            cursor.execute("DELETE FROM models WHERE model_id=?", (model_id,))
 
         # Delete file
         try:
@@ -0,0 +1,443 @@
+"""
+In-Process API Benchmark (Story 7.5 follow-up)
+
+Repeatable latency/throughput benchmark for the prediction API that needs no
+running server. The FastAPI app (`api.main:app`) is driven in-process through
+an ASGI transport, backed by a synthetic model registry, so every run measures
+the same code path with the same model and the same payloads.
+
+Scenarios:
+- predict_single: POST /api/v1/predict at configurable concurrency
+- batch_predict: POST /api/v1/batch_predict with N stocks per request
+
+Each run records p50/p95/p99 latency, throughput and error rate per scenario
+(using `LoadTester.collect_metrics` so numbers match the Locust reports) and is
+compared against a JSON baseline. A run fails when any scenario regresses past
+the configured threshold.
+
+Feature-cache modes:
+- cold (default): every stock in every request is a distinct (bse_code, date),
+  so each prediction pays for feature assembly
+- warm: requests cycle through SAMPLE_STOCKS on one date, so after the first
+  few requests features come from the FeatureVectorCache
+The mode is recorded in the report config; runs are only compared against a
+baseline recorded in the same mode.
+
+Usage:
+    python -m agents.ml.optimization.api_benchmark --update-baseline
+    python -m agents.ml.optimization.api_benchmark --concurrency 100 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import httpx
+
+from agents.ml.model_registry import ModelRegistry
+from agents.ml.optimization.load_tester import LoadTester
+
+logger = logging.getLogger(__name__)
+
+# Must match the feature count produced by PredictionService.extract_features
+N_FEATURES = 25
+
+SAMPLE_STOCKS = ["500325", "532977", "500180", "500209", "532174"]
+
+PREDICTION_DATE = datetime(2025, 11, 14)
+
+FEATURE_CACHE_MODES = ('cold', 'warm')
+
+# Synthetic BSE codes for cold mode: 6 digits, one per (scenario, request, stock)
+COLD_CODE_START = 100000
+COLD_CODES_PER_DATE = 900000
+
+DEFAULT_BASELINE_PATH = "data/benchmarks/api_baseline.json"
+
+# Metrics where larger is worse, compared relative to the baseline
+LATENCY_METRICS = ['latency_p50', 'latency_p95', 'latency_p99']
+
+
+def build_synthetic_registry(registry_path: str, seed: int = 42) -> Dict[str, Any]:
+    """
+    Train a small tree model on synthetic data and register it.
+
+    The model has the same input width as the production feature vector, so
+    inference cost is representative of an XGBoost/GBM model in the registry.
+
+    Args:
+        registry_path: Directory for the model registry
+        seed: Random seed (fixed so benchmark runs are comparable)
+
+    Returns:
+        Metadata of the registered model (as returned by get_best_model)
+    """
+    from sklearn.ensemble import GradientBoostingClassifier
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(2000, N_FEATURES))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=2000) > 0).astype(int)
+
+    model = GradientBoostingClassifier(n_estimators=100, max_depth=3, random_state=seed)
+    model.fit(X, y)
+
+    registry = ModelRegistry(registry_path)
+    registry.save_model(
+        model=model,
+        model_name="Synthetic Benchmark Model",
+        model_type="GradientBoostingClassifier",
+        metrics={'f1': 0.75, 'roc_auc': 0.80},
+        hyperparameters={'n_estimators': 100, 'max_depth': 3},
+        version="1.0.0",
+        description="Synthetic model for API benchmarking"
+    )
+
+    return registry.get_best_model(metric='f1')
+
+
+class APIBenchmark:
+    """
+    In-process benchmark of the prediction API.
+
+    Features:
+    - Synthetic model registry fixture (no data/ directory required)
+    - Async HTTP client over ASGI transport with bounded concurrency
+    - Per-scenario latency percentiles, throughput and error rate
+    - JSON baseline with regression threshold
+    """
+
+    def __init__(
+        self,
+        work_dir: Optional[str] = None,
+        concurrency: int = 50,
+        requests_per_scenario: int = 500,
+        batch_size: int = 10,
+        baseline_path: str = DEFAULT_BASELINE_PATH,
+        regression_threshold: float = 0.20,
+        error_rate_tolerance: float = 0.01,
+        feature_cache: str = 'cold'
+    ):
+        """
+        Initialize benchmark.
+
+        Args:
+            work_dir: Directory for the synthetic registry and feature DBs
+                      (default: temporary directory removed by cleanup())
+            concurrency: Maximum in-flight requests
+            requests_per_scenario: Requests issued per scenario
+            batch_size: Stocks per batch prediction request
+            baseline_path: JSON file holding the reference results
+            regression_threshold: Allowed relative slowdown (0.20 = 20%)
+            error_rate_tolerance: Allowed absolute increase in error rate
+            feature_cache: 'cold' (every prediction assembles features) or
+                           'warm' (repeated stocks served from the feature cache)
+        """
+        if feature_cache not in FEATURE_CACHE_MODES:
+            raise ValueError(f"feature_cache must be one of {FEATURE_CACHE_MODES}, got {feature_cache!r}")
+
+        self._owns_work_dir = work_dir is None
+        if work_dir is None:
+            work_dir = tempfile.mkdtemp(prefix="api_benchmark_")
+
+        self.work_dir = Path(work_dir)
+        self.concurrency = concurrency
+        self.requests_per_scenario = requests_per_scenario
+        self.batch_size = batch_size
+        self.baseline_path = Path(baseline_path)
+        self.regression_threshold = regression_threshold
+        self.error_rate_tolerance = error_rate_tolerance
+        self.feature_cache = feature_cache
+
+        self.load_tester = LoadTester(base_url="asgi://api.main")
+
+    def setup_service(self):
+        """
+        Build the synthetic registry and install a PredictionService into api.main.
+
+        Returns:
+            The installed PredictionService
+        """
+        import api.main as api_main
+        from api.prediction_endpoint import PredictionService
+
+        registry_path = self.work_dir / "registry"
+        features_path = self.work_dir / "features"
+        features_path.mkdir(parents=True, exist_ok=True)
+
+        if ModelRegistry(str(registry_path)).get_best_model(metric='f1') is None:
+            build_synthetic_registry(str(registry_path))
+
+        service = PredictionService(
+            model_registry_path=str(registry_path),
+            feature_dbs={
+                'price': str(features_path / 'price_movements.db'),
+                'technical': str(features_path / 'technical_features.db'),
+                'financial': str(features_path / 'financial_data.db'),
+                'financial_features': str(features_path / 'financial_features.db'),
+                'news': str(features_path / 'news_sentiment.db'),
+                'sentiment': str(features_path / 'sentiment_features.db'),
+                'labels': str(features_path / 'upper_circuit_labels.db'),
+                'seasonality': str(features_path / 'seasonality_features.db')
+            }
+        )
+        api_main.prediction_service = service
+        return service
+
+    def cleanup(self):
+        """Remove the work directory if the benchmark created it"""
+        if self._owns_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _stock(self, n: int) -> Dict[str, str]:
+        """
+        Stock/date for the n-th prediction of a run.
+
+        In cold mode n maps to a distinct (bse_code, date) so no prediction
+        hits the feature cache; in warm mode stocks repeat on one date.
+        """
+        if self.feature_cache == 'warm':
+            return {
+                'bse_code': SAMPLE_STOCKS[n % len(SAMPLE_STOCKS)],
+                'prediction_date': PREDICTION_DATE.strftime('%Y-%m-%d')
+            }
+
+        day, offset = divmod(n, COLD_CODES_PER_DATE)
+        return {
+            'bse_code': f"{COLD_CODE_START + offset:06d}",
+            'prediction_date': (PREDICTION_DATE - timedelta(days=day)).strftime('%Y-%m-%d')
+        }
+
+    def _payload(self, scenario: str, i: int) -> Dict[str, Any]:
+        """Build a deterministic request payload for request number i"""
+        # Scenarios (and the warm-up request, i = -1) draw from disjoint ranges
+        if scenario == 'predict_single':
+            return self._stock(i + 1)
+
+        first = 1 + self.requests_per_scenario + i * self.batch_size
+        return {'predictions': [self._stock(first + j) for j in range(self.batch_size)]}
+
+    async def _run_scenario(
+        self,
+        client: httpx.AsyncClient,
+        scenario: str,
+        endpoint: str
+    ) -> Dict[str, Any]:
+        """
+        Issue requests_per_scenario requests with at most `concurrency` in flight.
+
+        Returns:
+            Results dict in LoadTester format: {'requests': [...], 'duration': s}
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        requests: List[Dict[str, Any]] = []
+
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(endpoint, json=self._payload(scenario, i))
+                    success = response.status_code == 200
+                except Exception as e:
+                    logger.debug(f"{scenario} request {i} failed: {e}")
+                    success = False
+                requests.append({
+                    'response_time': (time.perf_counter() - start) * 1000,
+                    'success': success
+                })
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(self.requests_per_scenario)))
+        duration = time.perf_counter() - started
+
+        return {'requests': requests, 'duration': duration}
+
+    async def run_async(self) -> Dict[str, Any]:
+        """Run all scenarios and return the benchmark report"""
+        import api.main as api_main
+
+        self.setup_service()
+
+        scenarios = {
+            'predict_single': '/api/v1/predict',
+            'batch_predict': '/api/v1/batch_predict'
+        }
+
+        # Per-request INFO logging in the service would dominate the measurement
+        service_logger = logging.getLogger('api.prediction_endpoint')
+        previous_level = service_logger.level
+        service_logger.setLevel(logging.WARNING)
+
+        results: Dict[str, Dict[str, float]] = {}
+        try:
+            transport = httpx.ASGITransport(app=api_main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                # Warm-up so lazy imports and first-call costs don't skew p99
+                await client.post(scenarios['predict_single'], json=self._payload('predict_single', -1))
+
+                for scenario, endpoint in scenarios.items():
+                    raw = await self._run_scenario(client, scenario, endpoint)
+                    metrics = self.load_tester.collect_metrics(raw)
+                    results[scenario] = {
+                        key: metrics[key]
+                        for key in ['latency_p50', 'latency_p95', 'latency_p99',
+                                    'latency_mean', 'throughput', 'error_rate',
+                                    'total_requests', 'failed_requests']
+                    }
+                    logger.info(
+                        f"{scenario}: p50={metrics['latency_p50']:.1f}ms "
+                        f"p95={metrics['latency_p95']:.1f}ms p99={metrics['latency_p99']:.1f}ms "
+                        f"throughput={metrics['throughput']:.1f} req/s "
+                        f"errors={metrics['error_rate']:.2%}"
+                    )
+        finally:
+            service_logger.setLevel(previous_level)
+            api_main.reset_service()
+
+        return {
+            'created_at': datetime.now().isoformat(),
+            'config': {
+                'concurrency': self.concurrency,
+                'requests_per_scenario': self.requests_per_scenario,
+                'batch_size': self.batch_size,
+                'feature_cache': self.feature_cache
+            },
+            'scenarios': results
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Synchronous wrapper around run_async"""
+        return asyncio.run(self.run_async())
+
+    def load_baseline(self) -> Optional[Dict[str, Any]]:
+        """Load baseline report, or None if no baseline has been recorded"""
+        if not self.baseline_path.exists():
+            return None
+
+        with open(self.baseline_path) as f:
+            return json.load(f)
+
+    def save_baseline(self, report: Dict[str, Any]):
+        """Write report as the new baseline"""
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.baseline_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        logger.info(f"Baseline saved: {self.baseline_path}")
+
+    def compare_to_baseline(
+        self,
+        report: Dict[str, Any],
+        baseline: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Compare a report against the baseline.
+
+        Args:
+            report: Current benchmark report
+            baseline: Baseline benchmark report
+
+        Returns:
+            List of regression descriptions (empty if the run passes)
+        """
+        regressions = []
+
+        base_mode = baseline.get('config', {}).get('feature_cache')
+        current_mode = report.get('config', {}).get('feature_cache')
+        if base_mode and current_mode and base_mode != current_mode:
+            return [
+                f"feature_cache mode {current_mode!r} does not match baseline mode {base_mode!r}; "
+                f"re-record the baseline with --update-baseline"
+            ]
+
+        for scenario, base in baseline.get('scenarios', {}).items():
+            current = report.get('scenarios', {}).get(scenario)
+            if current is None:
+                regressions.append(f"{scenario}: missing from current run")
+                continue
+
+            for metric in LATENCY_METRICS:
+                limit = base[metric] * (1 + self.regression_threshold)
+                if current[metric] > limit:
+                    regressions.append(
+                        f"{scenario}: {metric} {current[metric]:.1f}ms > "
+                        f"{limit:.1f}ms (baseline {base[metric]:.1f}ms)"
+                    )
+
+            min_throughput = base['throughput'] * (1 - self.regression_threshold)
+            if current['throughput'] < min_throughput:
+                regressions.append(
+                    f"{scenario}: throughput {current['throughput']:.1f} req/s < "
+                    f"{min_throughput:.1f} req/s (baseline {base['throughput']:.1f} req/s)"
+                )
+
+            max_error_rate = base['error_rate'] + self.error_rate_tolerance
+            if current['error_rate'] > max_error_rate:
+                regressions.append(
+                    f"{scenario}: error_rate {current['error_rate']:.2%} > "
+                    f"{max_error_rate:.2%} (baseline {base['error_rate']:.2%})"
+                )
+
+        return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point.
+
+    Returns:
+        0 if the run passes (or a baseline was written), 1 on regression
+    """
+    parser = argparse.ArgumentParser(description="In-process prediction API benchmark")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500, help="Requests per scenario")
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help="Allowed relative regression (0.20 = 20%%)")
+    parser.add_argument('--feature-cache', choices=FEATURE_CACHE_MODES, default='cold',
+                        help="cold: distinct stock/date per prediction; warm: repeated stocks hit the feature cache")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Record this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    benchmark = APIBenchmark(
+        concurrency=args.concurrency,
+        requests_per_scenario=args.requests,
+        batch_size=args.batch_size,
+        baseline_path=args.baseline,
+        regression_threshold=args.threshold,
+        feature_cache=args.feature_cache
+    )
+    try:
+        report = benchmark.run()
+    finally:
+        benchmark.cleanup()
+
+    baseline = benchmark.load_baseline()
+    if args.update_baseline or baseline is None:
+        benchmark.save_baseline(report)
+        return 0
+
+    regressions = benchmark.compare_to_baseline(report, baseline)
+    if regressions:
+        for regression in regressions:
+            logger.error(f"REGRESSION {regression}")
+        return 1
+
+    logger.info("Benchmark within baseline thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,10 +18,12 @@ import pickle
 import hashlib
 import logging
 import time
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 from collections import OrderedDict
 from threading import Lock
 
+from monitoring.instrumentation import STAGE_CACHE_GET, STAGE_CACHE_SET, instrument_stage
+
 try:
     import redis
     REDIS_AVAILABLE = True
@@ -150,6 +152,7 @@ class CacheManager:
         self.misses = 0
         self.stats_lock = Lock()
 
+    @instrument_stage(STAGE_CACHE_GET)
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache (L2 → L1 → None).
@@ -189,6 +192,7 @@ class CacheManager:
         logger.debug(f"Cache miss: {key}")
         return None
 
+    @instrument_stage(STAGE_CACHE_SET)
     def set(self, key: str, value: Any, ttl: int = 3600):
         """
         Set value in both cache layers.
@@ -212,6 +216,63 @@ class CacheManager:
         else:
             logger.debug(f"Cached in L2 only: {key}")
 
+    @instrument_stage(f"{STAGE_CACHE_GET}.many")
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get multiple values (L2 → L1) with a single Redis round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of found keys to values (missing keys omitted)
+        """
+        found = {}
+        remaining = []
+        for key in keys:
+            value = self.lru_cache.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                remaining.append(key)
+
+        if remaining and self.redis_client:
+            try:
+                for key, cached in zip(remaining, self.redis_client.mget(remaining)):
+                    if cached:
+                        value = self._deserialize(cached)
+                        self.lru_cache.set(key, value)
+                        found[key] = value
+            except Exception as e:
+                logger.warning(f"Redis mget failed for {len(remaining)} keys: {e}")
+
+        with self.stats_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    @instrument_stage(f"{STAGE_CACHE_SET}.many")
+    def set_many(self, items: Dict[str, Any], ttl: int = 3600):
+        """
+        Set multiple values in both cache layers (one Redis pipeline).
+
+        Args:
+            items: Dictionary of cache keys to values
+            ttl: Time to live in seconds (default: 3600 = 1 hour)
+        """
+        for key, value in items.items():
+            self.lru_cache.set(key, value)
+
+        if items and self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in items.items():
+                    pipe.setex(key, ttl, self._serialize(value))
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis pipeline set failed for {len(items)} keys: {e}")
+
     def invalidate(self, pattern: str):
         """
         Invalidate cache entries matching pattern.
@@ -19,6 +19,9 @@ from typing import List, Dict, Optional, Tuple, Any
 from queue import Queue, Empty
 from threading import Lock
 
+from monitoring.instrumentation import STAGE_SQLITE_QUERY, track_stage
+from tools.db_utils import configure_connection
+
 try:
     import redis
     REDIS_AVAILABLE = True
@@ -63,7 +66,7 @@ class DatabaseOptimizer:
         # Initialize connection pool
         self.available_connections = pool_size  # Track available connections
         for _ in range(pool_size):
-            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn = configure_connection(sqlite3.connect(db_path, check_same_thread=False))
             conn.row_factory = sqlite3.Row  # Return rows as dicts
             self.connection_pool.put(conn)
 
@@ -104,7 +107,7 @@ class DatabaseOptimizer:
         except Empty:
             # Fallback: create new connection if pool exhausted
             logger.warning("Connection pool exhausted, creating new connection")
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn = configure_connection(sqlite3.connect(self.db_path, check_same_thread=False))
             conn.row_factory = sqlite3.Row
             return conn
 
@@ -132,6 +135,9 @@ class DatabaseOptimizer:
         - date (time-based queries)
         - upper_circuit_label (filtering)
 
+        For indexes derived from the queries a job actually issues, use
+        agents.ml.optimization.index_advisor.
+
         Returns:
             List of created index names
         """
@@ -180,9 +186,10 @@ class DatabaseOptimizer:
         cursor = conn.cursor()
 
         try:
-            cursor.execute(query, params)
-            # Convert Row objects to dicts
-            results = [dict(row) for row in cursor.fetchall()]
+            with track_stage(STAGE_SQLITE_QUERY):
+                cursor.execute(query, params)
+                # Convert Row objects to dicts
+                results = [dict(row) for row in cursor.fetchall()]
             return results
         finally:
             self.release_connection(conn)
@@ -0,0 +1,232 @@
+"""
+Feature-Vector Cache (Story 7.4 follow-up)
+
+Caches assembled model-input vectors keyed by (bse_code, date, feature-store
+version). Features for a stock/date are deterministic once the day's data has
+been written, so repeated dashboard refreshes, batch re-scoring and re-scoring
+after a model swap can reuse them without touching the feature databases.
+
+Invalidation:
+- Feature extractors call `bump_feature_store_version()` (agents.ml.feature_store_version)
+  after writing rows, which rewrites a small stamp file next to their output DB
+- The cache folds the stamp into every key, so new writes simply stop
+  matching old entries (stale entries age out of the LRU)
+- The stamp file is re-read at most every `version_check_interval` seconds
+
+Layers:
+1. Process-local LRU of float32 vectors (no serialization, no locks beyond LRU)
+2. Optional shared CacheManager (Redis-backed, shared across instances);
+   skipped when none is configured, since its in-process LRU would only
+   duplicate layer 1
+
+Callers should score the float32 vector form on both the miss and the hit
+path (`to_dict(to_vector(features))`), so a stock/date gets identical model
+inputs whether or not it was cached.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.ml.feature_store_version import read_feature_store_version
+from agents.ml.optimization.cache_manager import CacheManager, LRUCache
+from monitoring.instrumentation import STAGE_CACHE_GET, STAGE_CACHE_SET, instrument_stage
+
+logger = logging.getLogger(__name__)
+
+FeatureKey = Tuple[str, str]
+
+
+class FeatureVectorCache:
+    """
+    Local (+ optional shared) cache of float32 feature vectors.
+
+    Features:
+    - Keys: (bse_code, date) + feature-store version stamp
+    - Bulk get/set for batch scoring (one Redis round trip per call)
+    - Dict <-> vector conversion with a fixed feature order
+    """
+
+    def __init__(
+        self,
+        store_dirs: Sequence[str],
+        cache_manager: Optional[CacheManager] = None,
+        feature_names: Optional[Sequence[str]] = None,
+        ttl: int = 86400,
+        max_local_entries: int = 50000,
+        version_check_interval: float = 1.0
+    ):
+        """
+        Initialize feature-vector cache.
+
+        Args:
+            store_dirs: Feature store directories whose version stamps key the cache
+            cache_manager: Shared CacheManager, normally Redis-backed (default: none,
+                           local LRU only)
+            feature_names: Feature order for vectors (default: learned from the
+                           first dict passed to to_vector)
+            ttl: TTL for the shared layer in seconds (default: 1 day)
+            max_local_entries: Size of the process-local LRU
+            version_check_interval: Seconds between version stamp reads
+        """
+        self.store_dirs = list(dict.fromkeys(str(d) for d in store_dirs))
+        self.cache_manager = cache_manager
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+
+        self.local = LRUCache(maxsize=max_local_entries)
+
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+        # Statistics
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> str:
+        """Combined version stamp of all store directories"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self.version_check_interval:
+            self._version = ".".join(read_feature_store_version(d) for d in self.store_dirs)
+            self._version_checked_at = now
+        return self._version
+
+    def _key(self, version: str, bse_code: str, date: str) -> str:
+        return f"features:v{version}:{bse_code}:{date}"
+
+    def to_vector(self, features: Dict[str, float]) -> np.ndarray:
+        """
+        Convert a feature dict to a float32 vector in cache feature order.
+
+        Args:
+            features: Feature name -> value
+
+        Returns:
+            1-D float32 array
+        """
+        if self.feature_names is None:
+            self.feature_names = list(features.keys())
+        return np.fromiter(
+            (features[name] for name in self.feature_names),
+            dtype=np.float32,
+            count=len(self.feature_names)
+        )
+
+    def to_dict(self, vector: np.ndarray) -> Dict[str, float]:
+        """
+        Convert a cached vector back to a feature dict.
+
+        Values are the exact float32 values widened to Python floats, so
+        `to_dict(to_vector(d))` is a fixed point of the round trip.
+        """
+        if self.feature_names is None:
+            raise ValueError("feature_names unknown: no vector has been encoded yet")
+        return dict(zip(self.feature_names, np.asarray(vector, dtype=np.float32).tolist()))
+
+    @instrument_stage(f"{STAGE_CACHE_GET}.features")
+    def get(self, bse_code: str, date: str) -> Optional[np.ndarray]:
+        """
+        Get cached vector for one stock/date.
+
+        Returns:
+            float32 vector, or None on miss
+        """
+        key = self._key(self.version, bse_code, date)
+
+        vector = self.local.get(key)
+        if vector is not None:
+            self.local_hits += 1
+            return vector
+
+        if self.cache_manager is not None:
+            vector = self.cache_manager.get(key)
+            if vector is not None:
+                self.shared_hits += 1
+                self.local.set(key, vector)
+                return vector
+
+        self.misses += 1
+        return None
+
+    @instrument_stage(f"{STAGE_CACHE_SET}.features")
+    def set(self, bse_code: str, date: str, vector: np.ndarray):
+        """Cache vector for one stock/date"""
+        vector = np.asarray(vector, dtype=np.float32)
+        key = self._key(self.version, bse_code, date)
+        self.local.set(key, vector)
+        if self.cache_manager is not None:
+            self.cache_manager.set(key, vector, ttl=self.ttl)
+
+    def get_many(self, items: Iterable[FeatureKey]) -> Dict[FeatureKey, np.ndarray]:
+        """
+        Bulk lookup for batch scoring.
+
+        Args:
+            items: (bse_code, date) pairs
+
+        Returns:
+            Dictionary of found pairs to vectors (misses omitted)
+        """
+        version = self.version
+        found: Dict[FeatureKey, np.ndarray] = {}
+        remaining: Dict[str, FeatureKey] = {}
+
+        for item in items:
+            key = self._key(version, *item)
+            vector = self.local.get(key)
+            if vector is not None:
+                found[item] = vector
+                self.local_hits += 1
+            else:
+                remaining[key] = item
+
+        if remaining and self.cache_manager is None:
+            self.misses += len(remaining)
+        elif remaining:
+            shared = self.cache_manager.get_many(list(remaining))
+            for key, vector in shared.items():
+                self.local.set(key, vector)
+                found[remaining[key]] = vector
+            self.shared_hits += len(shared)
+            self.misses += len(remaining) - len(shared)
+
+        return found
+
+    def set_many(self, vectors: Dict[FeatureKey, np.ndarray]):
+        """
+        Bulk store for batch scoring.
+
+        Args:
+            vectors: (bse_code, date) -> vector
+        """
+        version = self.version
+        items = {
+            self._key(version, *item): np.asarray(vector, dtype=np.float32)
+            for item, vector in vectors.items()
+        }
+        for key, vector in items.items():
+            self.local.set(key, vector)
+        if self.cache_manager is not None:
+            self.cache_manager.set_many(items, ttl=self.ttl)
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with local/shared hits, misses and hit rate
+        """
+        total = self.local_hits + self.shared_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': (self.local_hits + self.shared_hits) / total if total > 0 else 0.0,
+            'local_size': len(self.local),
+            'version': self.version
+        }
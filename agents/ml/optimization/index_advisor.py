@@ -0,0 +1,564 @@
+"""
+Query-Plan Index Advisor (Story 7.3 follow-up)
+
+Recommends and applies indexes from the SQL the pipeline actually issues,
+instead of DatabaseOptimizer.create_indexes' fixed list.
+
+Workflow:
+1. Capture: run a job with tracing on (`VCP_SQL_TRACE_FILE=logs/sql_trace.json`
+   or `with QueryTrace() as trace:`). Every statement on a pooled connection
+   (tools/db_utils) is recorded per database with a call count.
+2. Analyze: `EXPLAIN QUERY PLAN` on each traced SELECT. Full table scans,
+   partially used indexes and temp B-trees for ORDER BY get a composite index
+   (equality columns, then the range column, then ORDER BY columns). Hot
+   queries selecting a few columns get a covering index.
+3. Apply: CREATE INDEX IF NOT EXISTS + ANALYZE, optionally rebuilding tables
+   as WITHOUT ROWID keyed on (bse_code, date).
+4. Report: before/after plan and median latency per query.
+
+Usage:
+    VCP_SQL_TRACE_FILE=logs/sql_trace.json python run_ml_training.py
+    python -m agents.ml.optimization.index_advisor logs/sql_trace.json --apply \
+        --without-rowid price_movements --report reports/index_advisor.md
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import argparse
+import logging
+import re
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from tools.db_utils import QueryTrace, pooled_connection
+
+logger = logging.getLogger(__name__)
+
+# Calls before a query that already uses an index is worth a covering index
+HOT_QUERY_CALLS = 100
+
+# Extra selected columns a covering index may carry
+MAX_COVERING_EXTRA = 4
+
+_FROM = re.compile(r'\bFROM\s+(\w+)', re.I)
+_WHERE = re.compile(r'\bWHERE\b(.*?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|$)', re.I | re.S)
+_ORDER_BY = re.compile(r'\bORDER\s+BY\b(.*?)(?:\bLIMIT\b|$)', re.I | re.S)
+_SELECT_LIST = re.compile(r'^\s*SELECT\s+(?:DISTINCT\s+)?(.*?)\bFROM\b', re.I | re.S)
+_PREDICATE = re.compile(
+    r'(?:\b\w+\.)?\b(\w+)\s*(<=|>=|<>|!=|==|=|<|>|\bBETWEEN\b|\bIN\b|\bLIKE\b)', re.I
+)
+_EQUALITY_OPS = {'=', '==', 'IN'}
+_RANGE_OPS = {'<', '>', '<=', '>=', 'BETWEEN', 'LIKE'}
+
+
+@dataclass
+class IndexRecommendation:
+    """One index to create"""
+    table: str
+    columns: List[str]
+    reason: str
+    covering: bool = False
+    queries: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"[:120]
+
+    @property
+    def sql(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+
+@dataclass
+class QueryTiming:
+    """Plan and latency of one traced query before/after the migration"""
+    query: str
+    calls: int
+    plan_before: List[str]
+    ms_before: float
+    plan_after: Optional[List[str]] = None
+    ms_after: Optional[float] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.ms_after is None or self.ms_after <= 0:
+            return None
+        return self.ms_before / self.ms_after
+
+
+@dataclass
+class IndexReport:
+    """Advisor result for one database"""
+    db_path: str
+    recommendations: List[IndexRecommendation]
+    timings: List[QueryTiming]
+    applied: List[str] = field(default_factory=list)
+    rebuilt_without_rowid: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'db_path': self.db_path,
+            'recommendations': [
+                {'name': r.name, 'sql': r.sql, 'reason': r.reason, 'queries': r.queries}
+                for r in self.recommendations
+            ],
+            'applied': self.applied,
+            'rebuilt_without_rowid': self.rebuilt_without_rowid,
+            'timings': [
+                {
+                    'query': t.query, 'calls': t.calls,
+                    'plan_before': t.plan_before, 'ms_before': t.ms_before,
+                    'plan_after': t.plan_after, 'ms_after': t.ms_after, 'speedup': t.speedup
+                }
+                for t in self.timings
+            ]
+        }
+
+    def to_markdown(self) -> str:
+        lines = [f"## {self.db_path}", ""]
+
+        if self.recommendations:
+            lines.append("### Recommended indexes")
+            lines.append("")
+            for r in self.recommendations:
+                status = "applied" if r.name in self.applied else "not applied"
+                lines.append(f"- `{r.sql}` ({r.reason}; {status})")
+            lines.append("")
+
+        for table, rows in self.rebuilt_without_rowid.items():
+            lines.append(f"- Rebuilt `{table}` as WITHOUT ROWID ({rows} rows)")
+        if self.rebuilt_without_rowid:
+            lines.append("")
+
+        lines.append("### Query timings")
+        lines.append("")
+        lines.append("| Query | Calls | Plan before | ms before | Plan after | ms after | Speedup |")
+        lines.append("|---|---|---|---|---|---|---|")
+        for t in self.timings:
+            after_plan = '; '.join(t.plan_after) if t.plan_after is not None else '-'
+            after_ms = f"{t.ms_after:.3f}" if t.ms_after is not None else '-'
+            speedup = f"{t.speedup:.1f}x" if t.speedup is not None else '-'
+            query = t.query if len(t.query) <= 80 else t.query[:77] + '...'
+            lines.append(
+                f"| `{query}` | {t.calls} | {'; '.join(t.plan_before)} | {t.ms_before:.3f} "
+                f"| {after_plan} | {after_ms} | {speedup} |"
+            )
+
+        return '\n'.join(lines) + '\n'
+
+
+def is_full_scan(plan: List[str]) -> bool:
+    """Whether a plan scans a whole table (or a whole index) instead of searching it"""
+    return any(step.startswith('SCAN ') and 'CONSTANT ROW' not in step for step in plan)
+
+
+class IndexAdvisor:
+    """
+    EXPLAIN-driven index advisor for one SQLite database.
+
+    Features:
+    - Composite and covering index recommendations per traced query
+    - Skips indexes an existing index already provides (prefix match)
+    - Before/after plan and latency report
+    - Optional WITHOUT ROWID rebuild keyed on (bse_code, date)
+    """
+
+    def __init__(self, db_path: str, repeats: int = 5, hot_query_calls: int = HOT_QUERY_CALLS):
+        """
+        Initialize advisor.
+
+        Args:
+            db_path: SQLite database to analyze
+            repeats: Executions per query when timing (median is reported)
+            hot_query_calls: Calls before an indexed query gets a covering index
+        """
+        self.db_path = db_path
+        self.repeats = repeats
+        self.hot_query_calls = hot_query_calls
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def explain(self, sql: str) -> List[str]:
+        """EXPLAIN QUERY PLAN detail lines for a statement"""
+        with pooled_connection(self.db_path) as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+    def time_query(self, sql: str) -> float:
+        """Median wall time of a statement in milliseconds"""
+        durations = []
+        with pooled_connection(self.db_path) as conn:
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                conn.execute(sql).fetchall()
+                durations.append((time.perf_counter() - start) * 1000)
+        return statistics.median(durations)
+
+    def _table_columns(self, table: str) -> List[str]:
+        with pooled_connection(self.db_path) as conn:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def _existing_indexes(self, table: str) -> List[List[str]]:
+        with pooled_connection(self.db_path) as conn:
+            indexes = []
+            for row in conn.execute(f"PRAGMA index_list({table})").fetchall():
+                columns = [info[2] for info in conn.execute(f"PRAGMA index_info({row[1]})")]
+                indexes.append(columns)
+            pk = [r[1] for r in sorted(conn.execute(f"PRAGMA table_info({table})"), key=lambda r: r[5]) if r[5]]
+            if pk:
+                indexes.append(pk)
+        return indexes
+
+    # ------------------------------------------------------------------
+    # Recommendation
+    # ------------------------------------------------------------------
+
+    def recommend_for_query(self, sql: str, plan: List[str], calls: int = 1) -> Optional[IndexRecommendation]:
+        """
+        Index that would serve one single-table SELECT, or None if not needed.
+
+        Args:
+            sql: Statement (literals inlined or ?-normalized)
+            plan: Its EXPLAIN QUERY PLAN details
+            calls: Traced call count
+        """
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')) or re.search(r'\bJOIN\b', sql, re.I):
+            return None
+
+        from_match = _FROM.search(sql)
+        where_match = _WHERE.search(sql)
+        if not from_match or not where_match:
+            return None
+
+        table = from_match.group(1)
+        table_columns = set(self._table_columns(table))
+        where = where_match.group(1)
+        if not table_columns or re.search(r'\bOR\b', where, re.I):
+            return None
+
+        equality: List[str] = []
+        ranges: List[str] = []
+        for column, op in _PREDICATE.findall(where):
+            if column not in table_columns:
+                continue
+            op = op.upper()
+            if op in _EQUALITY_OPS and column not in equality:
+                equality.append(column)
+            elif op in _RANGE_OPS and column not in ranges:
+                ranges.append(column)
+        ranges = [c for c in ranges if c not in equality]
+
+        order_by: List[str] = []
+        order_match = _ORDER_BY.search(sql)
+        if order_match:
+            for term in order_match.group(1).split(','):
+                tokens = term.split()
+                column = tokens[0].split('.')[-1] if tokens else ''
+                if column in table_columns:
+                    order_by.append(column)
+
+        columns = list(equality)
+        if ranges:
+            columns.append(ranges[0])
+        else:
+            columns.extend(c for c in order_by if c not in columns)
+        if not columns:
+            return None
+
+        full_scan = is_full_scan(plan)
+        temp_sort = any('TEMP B-TREE' in step for step in plan)
+        searched = [step for step in plan if step.startswith('SEARCH ') and f' {table} ' in f' {step} ']
+        used = max((step.count('=') + step.count('>') + step.count('<') for step in searched), default=0)
+        # A range column contributes two constraints (date>? AND date<?)
+        wanted = len(equality) + (2 if ranges and 'BETWEEN' in where.upper() else len(ranges[:1]))
+        partial = bool(searched) and used < wanted
+        # WITHOUT ROWID primary-key searches read the row from the key b-tree itself
+        covered = any('COVERING INDEX' in step or 'PRIMARY KEY' in step for step in searched)
+
+        selected = self._selected_columns(sql, table_columns)
+        extra = [c for c in (selected or []) if c not in columns]
+        covering = (
+            selected is not None
+            and len(extra) <= MAX_COVERING_EXTRA
+            and not covered
+            and (full_scan or partial or temp_sort or calls >= self.hot_query_calls)
+        )
+
+        if full_scan:
+            reason = f"full scan of {table}"
+        elif partial:
+            reason = f"index on {table} uses {used} of {wanted} constraints"
+        elif temp_sort:
+            reason = "temp B-tree for ORDER BY"
+        elif covering:
+            reason = f"hot query ({calls} calls) reads the table after the index"
+        else:
+            return None
+
+        if covering:
+            columns = columns + extra
+
+        for existing in self._existing_indexes(table):
+            if existing[:len(columns)] == columns:
+                return None
+
+        return IndexRecommendation(table=table, columns=columns, reason=reason, covering=covering)
+
+    @staticmethod
+    def _selected_columns(sql: str, table_columns: set) -> Optional[List[str]]:
+        match = _SELECT_LIST.search(sql)
+        if not match or '*' in match.group(1):
+            return None
+        selected = []
+        for item in match.group(1).split(','):
+            expression = re.split(r'\bAS\b', item, flags=re.I)[0]
+            for token in re.findall(r'\w+', expression):
+                if token in table_columns and token not in selected:
+                    selected.append(token)
+        return selected
+
+    def recommend(self, queries: Dict[str, Dict[str, Any]]) -> Tuple[List[IndexRecommendation], Dict[str, List[str]]]:
+        """
+        Recommendations for a traced workload.
+
+        Args:
+            queries: normalized sql -> {'count', 'example'} (QueryTrace format)
+
+        Returns:
+            (merged recommendations, plans by normalized sql)
+        """
+        plans: Dict[str, List[str]] = {}
+        by_key: Dict[Tuple[str, Tuple[str, ...]], IndexRecommendation] = {}
+
+        for normalized, info in queries.items():
+            try:
+                plan = self.explain(info['example'])
+            except Exception as e:
+                logger.debug(f"Cannot explain {normalized[:80]}: {e}")
+                continue
+            plans[normalized] = plan
+
+            recommendation = self.recommend_for_query(info['example'], plan, info.get('count', 1))
+            if recommendation is None:
+                continue
+            key = (recommendation.table, tuple(recommendation.columns))
+            merged = by_key.setdefault(key, recommendation)
+            merged.queries.append(normalized)
+
+        # Drop indexes that are a prefix of another recommendation on the same table
+        recommendations = list(by_key.values())
+        kept = []
+        for r in recommendations:
+            wider = [
+                o for o in recommendations
+                if o is not r and o.table == r.table
+                and len(o.columns) > len(r.columns) and o.columns[:len(r.columns)] == r.columns
+            ]
+            if wider:
+                wider[0].queries.extend(r.queries)
+            else:
+                kept.append(r)
+
+        return kept, plans
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def apply(self, recommendations: Sequence[IndexRecommendation]) -> List[str]:
+        """Create recommended indexes and refresh planner statistics"""
+        created = []
+        with pooled_connection(self.db_path) as conn:
+            for r in recommendations:
+                conn.execute(r.sql)
+                created.append(r.name)
+                logger.info(f"Created index: {r.sql}")
+            conn.execute("ANALYZE")
+        return created
+
+    def migrate_without_rowid(self, table: str, key: Sequence[str] = ('bse_code', 'date')) -> int:
+        """
+        Rebuild a table as WITHOUT ROWID with PRIMARY KEY(key) ON CONFLICT REPLACE.
+
+        Rows are clustered on the key, so (bse_code, date) range reads touch
+        contiguous pages and need no separate index lookup. Rows with a NULL
+        key column are dropped; for duplicate keys the last row wins, matching
+        an existing UNIQUE(...) ON CONFLICT REPLACE. A rowid-alias column
+        (e.g. price_id) is kept as a plain INTEGER column. Column CHECK
+        constraints are not carried over.
+
+        Returns:
+            Rows in the rebuilt table (0 if it already was WITHOUT ROWID)
+
+        Raises:
+            ValueError: If a key column is missing from the table
+        """
+        with pooled_connection(self.db_path) as conn:
+            create_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+            ).fetchone()
+            if create_sql is None:
+                raise ValueError(f"No table {table}")
+            if 'WITHOUT ROWID' in create_sql[0].upper():
+                return 0
+
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            names = [row[1] for row in info]
+            missing = [c for c in key if c not in names]
+            if missing:
+                raise ValueError(f"{table} has no column(s) {missing}")
+
+            definitions = []
+            for _, name, col_type, notnull, default, _ in info:
+                definition = f"{name} {col_type}".strip()
+                if notnull or name in key:
+                    definition += " NOT NULL"
+                if default is not None:
+                    definition += f" DEFAULT {default}"
+                definitions.append(definition)
+
+            index_sql = [
+                row[0] for row in conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                    (table,)
+                )
+            ]
+
+            staging = f"{table}__without_rowid"
+            column_list = ', '.join(names)
+            conn.execute("BEGIN")
+            conn.execute(f"DROP TABLE IF EXISTS {staging}")
+            conn.execute(f"""
+                CREATE TABLE {staging} (
+                    {', '.join(definitions)},
+                    PRIMARY KEY ({', '.join(key)}) ON CONFLICT REPLACE
+                ) WITHOUT ROWID
+            """)
+            conn.execute(f"""
+                INSERT INTO {staging} ({column_list})
+                SELECT {column_list} FROM {table}
+                WHERE {' AND '.join(f'{c} IS NOT NULL' for c in key)}
+                ORDER BY rowid
+            """)
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+            for sql in index_sql:
+                conn.execute(sql)
+            rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        logger.info(f"Rebuilt {table} as WITHOUT ROWID on ({', '.join(key)}): {rows} rows")
+        return rows
+
+    # ------------------------------------------------------------------
+    # End to end
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        queries: Dict[str, Dict[str, Any]],
+        apply: bool = False,
+        without_rowid: Sequence[str] = ()
+    ) -> IndexReport:
+        """
+        Analyze a traced workload, optionally migrate, and time before/after.
+
+        Args:
+            queries: normalized sql -> {'count', 'example'} for this database
+            apply: Create the recommended indexes
+            without_rowid: Tables to rebuild as WITHOUT ROWID on (bse_code, date)
+        """
+        recommendations, plans = self.recommend(queries)
+
+        timings = []
+        for normalized, plan in plans.items():
+            example = queries[normalized]['example']
+            timings.append(QueryTiming(
+                query=normalized,
+                calls=queries[normalized].get('count', 1),
+                plan_before=plan,
+                ms_before=self.time_query(example)
+            ))
+
+        report = IndexReport(self.db_path, recommendations, timings)
+        if not apply and not without_rowid:
+            return report
+
+        for table in without_rowid:
+            report.rebuilt_without_rowid[table] = self.migrate_without_rowid(table)
+        if without_rowid:
+            # Clustered tables change which indexes are still worth having
+            report.recommendations, _ = self.recommend(queries)
+        if apply:
+            report.applied = self.apply(report.recommendations)
+        else:
+            with pooled_connection(self.db_path) as conn:
+                conn.execute("ANALYZE")
+
+        for timing in timings:
+            example = queries[timing.query]['example']
+            timing.plan_after = self.explain(example)
+            timing.ms_after = self.time_query(example)
+
+        return report
+
+
+def advise(
+    trace: QueryTrace,
+    apply: bool = False,
+    without_rowid: Sequence[str] = (),
+    db_paths: Optional[Sequence[str]] = None,
+    repeats: int = 5
+) -> List[IndexReport]:
+    """Run the advisor for every (or the selected) database in a trace"""
+    reports = []
+    for db_path, queries in trace.queries.items():
+        if db_paths and db_path not in db_paths:
+            continue
+        if not Path(db_path).exists():
+            logger.warning(f"Skipping {db_path}: database not found")
+            continue
+        advisor = IndexAdvisor(db_path, repeats=repeats)
+        tables = [t for t in without_rowid if advisor._table_columns(t)]
+        reports.append(advisor.run(queries, apply=apply, without_rowid=tables))
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: recommend/apply indexes from a SQL trace and write a timing report"""
+    parser = argparse.ArgumentParser(description="Query-plan index advisor")
+    parser.add_argument("trace_file", help="JSON trace written by QueryTrace / VCP_SQL_TRACE_FILE")
+    parser.add_argument("--db", action="append", help="Only analyze this database (repeatable)")
+    parser.add_argument("--apply", action="store_true", help="Create the recommended indexes")
+    parser.add_argument("--without-rowid", action="append", default=[], metavar="TABLE",
+                        help="Rebuild TABLE as WITHOUT ROWID keyed on (bse_code, date)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing runs per query")
+    parser.add_argument("--report", help="Write the markdown report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    reports = advise(
+        QueryTrace.load(args.trace_file),
+        apply=args.apply,
+        without_rowid=args.without_rowid,
+        db_paths=args.db,
+        repeats=args.repeats
+    )
+    text = '\n'.join(r.to_markdown() for r in reports) or "No traced databases found\n"
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(text)
+        print(f"Report written: {args.report}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -293,7 +293,7 @@ class InferenceOptimizer:
         self,
         model_path: str,
         use_gpu: bool = False
-    ) -> ort.InferenceSession:
+    ) -> "ort.InferenceSession":
         """
         Load ONNX model for inference.
 
@@ -324,7 +324,7 @@ class InferenceOptimizer:
 
     def predict_with_onnx(
         self,
-        session: ort.InferenceSession,
+        session: "ort.InferenceSession",
         features: np.ndarray
     ) -> np.ndarray:
         """
@@ -123,6 +123,9 @@ class LoadTester:
             2. Monitor test execution
             3. Collect real-time metrics
             4. Stop test after duration
+
+            For a repeatable pre-deploy number without a live server, use
+            agents.ml.optimization.api_benchmark.APIBenchmark instead.
         """
         if not LOCUST_AVAILABLE:
             logger.warning("Locust not available. Returning mock results.")
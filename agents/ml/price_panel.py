@@ -0,0 +1,127 @@
+"""
+Shared Price Panel for Batch Feature Extraction
+
+Loads `price_movements` rows once per BSE code for a whole batch of samples,
+so the technical and sentiment extractors slice windows from memory instead
+of each issuing one query per sample.
+
+Coverage per code: [earliest sample date - lookback_days, latest sample date + lookahead_days].
+Windows outside the loaded coverage fall back to the extractor's own query.
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tools.db_utils import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class PricePanel:
+    """
+    In-memory per-code price history for a batch of samples.
+
+    Picklable (plain DataFrames), so it can be shipped to extractor stages
+    running in worker processes.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], coverage: Dict[str, Tuple[str, str]]):
+        """
+        Args:
+            frames: bse_code -> DataFrame with the available PRICE_COLUMNS sorted by date
+            coverage: bse_code -> (start_date, end_date) loaded for that code
+        """
+        self.frames = frames
+        self.coverage = coverage
+
+    @classmethod
+    def load(
+        cls,
+        price_db_path: str,
+        samples: Sequence[Dict[str, str]],
+        lookback_days: int = 60,
+        lookahead_days: int = 10
+    ) -> "PricePanel":
+        """
+        Load price history covering every sample's extraction windows.
+
+        Args:
+            price_db_path: Path to price_movements.db
+            samples: List of dicts with 'bse_code' and 'date' (YYYY-MM-DD)
+            lookback_days: Days needed before each sample date
+            lookahead_days: Days needed after each sample date
+
+        Returns:
+            PricePanel with one DataFrame per BSE code
+        """
+        date_ranges: Dict[str, List[str]] = {}
+        for sample in samples:
+            dates = date_ranges.setdefault(sample['bse_code'], [sample['date'], sample['date']])
+            dates[0] = min(dates[0], sample['date'])
+            dates[1] = max(dates[1], sample['date'])
+
+        frames: Dict[str, pd.DataFrame] = {}
+        coverage: Dict[str, Tuple[str, str]] = {}
+
+        with pooled_connection(price_db_path, read_only=True) as conn:
+            available = {row[1] for row in conn.execute("PRAGMA table_info(price_movements)")}
+            query = f"""
+                SELECT {', '.join(c for c in PRICE_COLUMNS if c in available)}
+                FROM price_movements
+                WHERE bse_code = ?
+                  AND date BETWEEN ? AND ?
+                ORDER BY date ASC
+            """
+
+            for bse_code, (first, last) in date_ranges.items():
+                start_date = (datetime.strptime(first, "%Y-%m-%d") - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+                end_date = (datetime.strptime(last, "%Y-%m-%d") + timedelta(days=lookahead_days)).strftime("%Y-%m-%d")
+
+                frames[bse_code] = pd.read_sql_query(query, conn, params=(bse_code, start_date, end_date))
+                coverage[bse_code] = (start_date, end_date)
+
+        logger.info(f"Loaded price panel: {len(frames)} codes, {sum(len(f) for f in frames.values())} rows")
+        return cls(frames, coverage)
+
+    def covers(self, bse_code: str, start_date: str, end_date: str) -> bool:
+        """Whether [start_date, end_date] for bse_code was loaded"""
+        loaded = self.coverage.get(bse_code)
+        return loaded is not None and loaded[0] <= start_date and end_date <= loaded[1]
+
+    def window(
+        self,
+        bse_code: str,
+        start_date: str,
+        end_date: str,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Rows with start_date <= date <= end_date (same as the SQL BETWEEN).
+
+        Args:
+            bse_code: BSE company code (must be covered)
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+            columns: Columns to return (default: all)
+
+        Returns:
+            DataFrame with a fresh 0..n-1 index, ordered by date
+        """
+        frame = self.frames[bse_code]
+        dates = frame['date'].to_numpy()
+        lo = np.searchsorted(dates, start_date, side='left')
+        hi = np.searchsorted(dates, end_date, side='right')
+
+        window = frame.iloc[lo:hi]
+        if columns is not None:
+            window = window[columns]
+        return window.reset_index(drop=True)
@@ -15,7 +15,6 @@ Story: 2.4
 Epic: 2 (Feature Engineering)
 """
 
-import sqlite3
 import pandas as pd
 from dataclasses import dataclass, field, asdict
 from typing import Optional, Dict, List
@@ -23,6 +22,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+from agents.ml.feature_store_version import bump_feature_store_version
+from monitoring.instrumentation import instrument_stage
+from tools.db_utils import pooled_connection
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -103,44 +106,41 @@ class SeasonalityFeatureExtractor:
 
     def _create_database_schema(self):
         """Create seasonality_features table with proper schema and indexes"""
-        conn = sqlite3.connect(self.output_db_path)
-
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS seasonality_features (
-                feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bse_code TEXT NOT NULL,
-                date DATE NOT NULL,
+        with pooled_connection(self.output_db_path) as conn:
 
-                -- Quarter indicators (one-hot)
-                is_q1 INTEGER,
-                is_q2 INTEGER,
-                is_q3 INTEGER,
-                is_q4 INTEGER,
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seasonality_features (
+                    feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    date DATE NOT NULL,
 
-                -- Month indicator
-                announcement_month INTEGER,
+                    -- Quarter indicators (one-hot)
+                    is_q1 INTEGER,
+                    is_q2 INTEGER,
+                    is_q3 INTEGER,
+                    is_q4 INTEGER,
 
-                -- Historical circuit rate
-                historical_circuit_rate_quarter REAL,
+                    -- Month indicator
+                    announcement_month INTEGER,
 
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(bse_code, date) ON CONFLICT REPLACE
-            )
-        """)
+                    -- Historical circuit rate
+                    historical_circuit_rate_quarter REAL,
 
-        # Create indexes for fast lookups
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_seasonality_sample_id
-            ON seasonality_features(feature_id)
-        """)
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(bse_code, date) ON CONFLICT REPLACE
+                )
+            """)
 
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_seasonality_bse_date
-            ON seasonality_features(bse_code, date)
-        """)
+            # Create indexes for fast lookups
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_seasonality_sample_id
+                ON seasonality_features(feature_id)
+            """)
 
-        conn.commit()
-        conn.close()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_seasonality_bse_date
+                ON seasonality_features(bse_code, date)
+            """)
 
         logger.info("Database schema created successfully")
 
@@ -201,6 +201,7 @@ class SeasonalityFeatureExtractor:
 
         return result
 
+    @instrument_stage("feature_load.seasonality")
     def calculate_historical_circuit_rate(
         self,
         bse_code: str,
@@ -231,24 +232,22 @@ class SeasonalityFeatureExtractor:
         # Load historical data for this company and quarter (last 3 years)
         start_date = current_date - timedelta(days=3*365)
 
-        conn = sqlite3.connect(self.labels_db_path)
-
-        query = """
-            SELECT earnings_date as date, label as upper_circuit
-            FROM upper_circuit_labels
-            WHERE bse_code = ?
-              AND earnings_date >= ?
-              AND earnings_date < ?
-            ORDER BY earnings_date ASC
-        """
-
-        df = pd.read_sql_query(
-            query,
-            conn,
-            params=(bse_code, start_date.strftime('%Y-%m-%d'), date)
-        )
-
-        conn.close()
+        with pooled_connection(self.labels_db_path, read_only=True) as conn:
+
+            query = """
+                SELECT earnings_date as date, label as upper_circuit
+                FROM upper_circuit_labels
+                WHERE bse_code = ?
+                  AND earnings_date >= ?
+                  AND earnings_date < ?
+                ORDER BY earnings_date ASC
+            """
+
+            df = pd.read_sql_query(
+                query,
+                conn,
+                params=(bse_code, start_date.strftime('%Y-%m-%d'), date)
+            )
 
         if df.empty:
             logger.warning(f"No historical data for {bse_code}")
@@ -362,26 +361,26 @@ class SeasonalityFeatureExtractor:
         Args:
             df: DataFrame with seasonality features
         """
-        conn = sqlite3.connect(self.output_db_path)
-
-        # Store using INSERT OR REPLACE for idempotency
-        for _, row in df.iterrows():
-            conn.execute("""
-                INSERT OR REPLACE INTO seasonality_features (
-                    bse_code, date,
-                    is_q1, is_q2, is_q3, is_q4,
-                    announcement_month,
-                    historical_circuit_rate_quarter
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['bse_code'], row['date'],
-                row['is_q1'], row['is_q2'], row['is_q3'], row['is_q4'],
-                row['announcement_month'],
-                row.get('historical_circuit_rate_quarter')
-            ))
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+
+            # Store using INSERT OR REPLACE for idempotency
+            for _, row in df.iterrows():
+                conn.execute("""
+                    INSERT OR REPLACE INTO seasonality_features (
+                        bse_code, date,
+                        is_q1, is_q2, is_q3, is_q4,
+                        announcement_month,
+                        historical_circuit_rate_quarter
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    row['bse_code'], row['date'],
+                    row['is_q1'], row['is_q2'], row['is_q3'], row['is_q4'],
+                    row['announcement_month'],
+                    row.get('historical_circuit_rate_quarter')
+                ))
+
+        # Invalidate cached feature vectors for this store
+        bump_feature_store_version(str(Path(self.output_db_path).parent))
 
         logger.info(f"Stored {len(df)} feature records in database")
 
@@ -16,7 +16,6 @@ Story: 2.3
 Epic: 2 (Feature Engineering)
 """
 
-import sqlite3
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field, asdict
@@ -25,6 +24,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+from agents.ml.feature_store_version import bump_feature_store_version
+from monitoring.instrumentation import STAGE_INDICATOR_COMPUTE, instrument_stage, track_stage
+from tools.db_utils import pooled_connection
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -86,6 +89,9 @@ class SentimentFeatureExtractor:
         self.labels_db_path = labels_db_path
         self.output_db_path = output_db_path
 
+        # Optional shared PricePanel set by MLFeatureEngineerAgent for batch runs
+        self.price_panel = None
+
         # Create output database and schema
         self._create_database_schema()
 
@@ -95,51 +101,49 @@ class SentimentFeatureExtractor:
 
     def _create_database_schema(self):
         """Create sentiment_features table with proper schema and indexes"""
-        conn = sqlite3.connect(self.output_db_path)
-
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS sentiment_features (
-                feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bse_code TEXT NOT NULL,
-                date DATE NOT NULL,
+        with pooled_connection(self.output_db_path) as conn:
 
-                -- Pre-announcement momentum
-                pre_momentum_5d REAL,
-                pre_momentum_10d REAL,
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sentiment_features (
+                    feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    date DATE NOT NULL,
 
-                -- Day 1 reaction
-                day0_reaction REAL,
-                day1_reaction REAL,
-                cumulative_reaction_2d REAL,
+                    -- Pre-announcement momentum
+                    pre_momentum_5d REAL,
+                    pre_momentum_10d REAL,
 
-                -- Volume behavior
-                volume_spike_ratio REAL,
-                pre_volume_trend REAL,
+                    -- Day 1 reaction
+                    day0_reaction REAL,
+                    day1_reaction REAL,
+                    cumulative_reaction_2d REAL,
 
-                -- Post-announcement volatility
-                post_volatility_5d REAL,
+                    -- Volume behavior
+                    volume_spike_ratio REAL,
+                    pre_volume_trend REAL,
 
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(bse_code, date) ON CONFLICT REPLACE
-            )
-        """)
+                    -- Post-announcement volatility
+                    post_volatility_5d REAL,
 
-        # Create indexes for fast lookups
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sentiment_sample_id
-            ON sentiment_features(feature_id)
-        """)
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(bse_code, date) ON CONFLICT REPLACE
+                )
+            """)
 
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sentiment_bse_date
-            ON sentiment_features(bse_code, date)
-        """)
+            # Create indexes for fast lookups
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sentiment_sample_id
+                ON sentiment_features(feature_id)
+            """)
 
-        conn.commit()
-        conn.close()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sentiment_bse_date
+                ON sentiment_features(bse_code, date)
+            """)
 
         logger.info("Database schema created successfully")
 
+    @instrument_stage("feature_load.sentiment")
     def _load_price_data(
         self,
         bse_code: str,
@@ -157,24 +161,24 @@ class SentimentFeatureExtractor:
         Returns:
             DataFrame with columns: date, open, high, low, close, volume
         """
-        conn = sqlite3.connect(self.price_db_path)
-
-        query = """
-            SELECT date, open, high, low, close, volume
-            FROM price_movements
-            WHERE bse_code = ?
-              AND date >= ?
-              AND date <= ?
-            ORDER BY date ASC
-        """
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
 
-        df = pd.read_sql_query(
-            query,
-            conn,
-            params=(bse_code, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
-        )
+        if self.price_panel is not None and self.price_panel.covers(bse_code, start_str, end_str):
+            df = self.price_panel.window(bse_code, start_str, end_str)
+        else:
+            with pooled_connection(self.price_db_path, read_only=True) as conn:
 
-        conn.close()
+                query = """
+                    SELECT date, open, high, low, close, volume
+                    FROM price_movements
+                    WHERE bse_code = ?
+                      AND date >= ?
+                      AND date <= ?
+                    ORDER BY date ASC
+                """
+
+                df = pd.read_sql_query(query, conn, params=(bse_code, start_str, end_str))
 
         if not df.empty:
             df['date'] = pd.to_datetime(df['date'])
@@ -421,10 +425,11 @@ class SentimentFeatureExtractor:
             return SentimentFeatures(bse_code=bse_code, date=date)
 
         # Calculate all feature groups
-        momentum = self.calculate_pre_momentum(prices, announcement_date)
-        reaction = self.calculate_day_reaction(prices, announcement_date)
-        volume = self.calculate_volume_features(prices, announcement_date)
-        volatility = self.calculate_post_volatility(prices, announcement_date)
+        with track_stage(f"{STAGE_INDICATOR_COMPUTE}.sentiment"):
+            momentum = self.calculate_pre_momentum(prices, announcement_date)
+            reaction = self.calculate_day_reaction(prices, announcement_date)
+            volume = self.calculate_volume_features(prices, announcement_date)
+            volatility = self.calculate_post_volatility(prices, announcement_date)
 
         # Combine into SentimentFeatures object
         features = SentimentFeatures(
@@ -486,28 +491,28 @@ class SentimentFeatureExtractor:
         Args:
             df: DataFrame with sentiment features
         """
-        conn = sqlite3.connect(self.output_db_path)
-
-        # Store using INSERT OR REPLACE for idempotency
-        for _, row in df.iterrows():
-            conn.execute("""
-                INSERT OR REPLACE INTO sentiment_features (
-                    bse_code, date,
-                    pre_momentum_5d, pre_momentum_10d,
-                    day0_reaction, day1_reaction, cumulative_reaction_2d,
-                    volume_spike_ratio, pre_volume_trend,
-                    post_volatility_5d
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['bse_code'], row['date'],
-                row.get('pre_momentum_5d'), row.get('pre_momentum_10d'),
-                row.get('day0_reaction'), row.get('day1_reaction'), row.get('cumulative_reaction_2d'),
-                row.get('volume_spike_ratio'), row.get('pre_volume_trend'),
-                row.get('post_volatility_5d')
-            ))
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+
+            # Store using INSERT OR REPLACE for idempotency
+            for _, row in df.iterrows():
+                conn.execute("""
+                    INSERT OR REPLACE INTO sentiment_features (
+                        bse_code, date,
+                        pre_momentum_5d, pre_momentum_10d,
+                        day0_reaction, day1_reaction, cumulative_reaction_2d,
+                        volume_spike_ratio, pre_volume_trend,
+                        post_volatility_5d
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    row['bse_code'], row['date'],
+                    row.get('pre_momentum_5d'), row.get('pre_momentum_10d'),
+                    row.get('day0_reaction'), row.get('day1_reaction'), row.get('cumulative_reaction_2d'),
+                    row.get('volume_spike_ratio'), row.get('pre_volume_trend'),
+                    row.get('post_volatility_5d')
+                ))
+
+        # Invalidate cached feature vectors for this store
+        bump_feature_store_version(str(Path(self.output_db_path).parent))
 
         logger.info(f"Stored {len(df)} feature records in database")
 
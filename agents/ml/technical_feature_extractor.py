@@ -9,12 +9,16 @@ Created: 2025-11-13
 """
 
 import logging
-import sqlite3
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
+from pathlib import Path
+
+from agents.ml.feature_store_version import bump_feature_store_version
+from monitoring.instrumentation import STAGE_INDICATOR_COMPUTE, instrument_stage, track_stage
+from tools.db_utils import pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -79,54 +83,53 @@ class TechnicalFeatureExtractor:
         """
         self.price_db_path = price_db_path
         self.output_db_path = output_db_path
+        # Optional shared PricePanel set by MLFeatureEngineerAgent for batch runs
+        self.price_panel = None
         self._initialize_database()
         logger.info(f"TechnicalFeatureExtractor initialized: price_db={price_db_path}, output_db={output_db_path}")
 
     def _initialize_database(self):
         """AC2.1.1: Create technical_features table with indexes"""
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS technical_features (
-                feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bse_code TEXT NOT NULL,
-                date DATE NOT NULL,
-
-                -- RSI features
-                rsi_14 REAL,
-
-                -- MACD features
-                macd_line REAL,
-                macd_signal REAL,
-                macd_histogram REAL,
-
-                -- Bollinger Bands features
-                bb_upper REAL,
-                bb_middle REAL,
-                bb_lower REAL,
-                bb_percent_b REAL,
-
-                -- Volume features
-                volume_ratio REAL,
-                volume_spike INTEGER,
-
-                -- Momentum features
-                momentum_5d REAL,
-                momentum_10d REAL,
-                momentum_30d REAL,
-
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(bse_code, date) ON CONFLICT REPLACE
-            )
-        """)
-
-        # Create indexes for query performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sample_id ON technical_features(feature_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_bse_date ON technical_features(bse_code, date)")
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS technical_features (
+                    feature_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    date DATE NOT NULL,
+
+                    -- RSI features
+                    rsi_14 REAL,
+
+                    -- MACD features
+                    macd_line REAL,
+                    macd_signal REAL,
+                    macd_histogram REAL,
+
+                    -- Bollinger Bands features
+                    bb_upper REAL,
+                    bb_middle REAL,
+                    bb_lower REAL,
+                    bb_percent_b REAL,
+
+                    -- Volume features
+                    volume_ratio REAL,
+                    volume_spike INTEGER,
+
+                    -- Momentum features
+                    momentum_5d REAL,
+                    momentum_10d REAL,
+                    momentum_30d REAL,
+
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(bse_code, date) ON CONFLICT REPLACE
+                )
+            """)
+
+            # Create indexes for query performance
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sample_id ON technical_features(feature_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bse_date ON technical_features(bse_code, date)")
         logger.info("Database schema initialized with indexes")
 
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
@@ -347,6 +350,7 @@ class TechnicalFeatureExtractor:
 
         return momentum
 
+    @instrument_stage("feature_load.technical")
     def _load_price_data(self, bse_code: str, end_date: str, lookback_days: int = 60) -> Optional[pd.DataFrame]:
         """
         Load historical price/volume data for a company (AC2.1.7)
@@ -361,17 +365,19 @@ class TechnicalFeatureExtractor:
         """
         start_date = (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
 
-        conn = sqlite3.connect(self.price_db_path)
-        query = """
-            SELECT date, close, volume
-            FROM price_movements
-            WHERE bse_code = ?
-              AND date BETWEEN ? AND ?
-            ORDER BY date ASC
-        """
+        if self.price_panel is not None and self.price_panel.covers(bse_code, start_date, end_date):
+            df = self.price_panel.window(bse_code, start_date, end_date, columns=['date', 'close', 'volume'])
+        else:
+            with pooled_connection(self.price_db_path, read_only=True) as conn:
+                query = """
+                    SELECT date, close, volume
+                    FROM price_movements
+                    WHERE bse_code = ?
+                      AND date BETWEEN ? AND ?
+                    ORDER BY date ASC
+                """
 
-        df = pd.read_sql_query(query, conn, params=(bse_code, start_date, end_date))
-        conn.close()
+                df = pd.read_sql_query(query, conn, params=(bse_code, start_date, end_date))
 
         if df.empty:
             logger.warning(f"No price data found for {bse_code} between {start_date} and {end_date}")
@@ -401,15 +407,16 @@ class TechnicalFeatureExtractor:
         volumes = df['volume']
 
         # Calculate all features (returns Series)
-        rsi = self.calculate_rsi(prices, period=14)
+        with track_stage(f"{STAGE_INDICATOR_COMPUTE}.technical"):
+            rsi = self.calculate_rsi(prices, period=14)
 
-        macd = self.calculate_macd(prices)
+            macd = self.calculate_macd(prices)
 
-        bb = self.calculate_bollinger_bands(prices)
+            bb = self.calculate_bollinger_bands(prices)
 
-        vol_indicators = self.calculate_volume_indicators(volumes)
+            vol_indicators = self.calculate_volume_indicators(volumes)
 
-        momentum = self.calculate_momentum(prices, periods=[5, 10, 30])
+            momentum = self.calculate_momentum(prices, periods=[5, 10, 30])
 
         # Extract latest values from Series
         def get_latest(series):
@@ -467,28 +474,28 @@ class TechnicalFeatureExtractor:
         df = pd.DataFrame(features_list)
 
         # Bulk insert into database
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        for features_dict in features_list:
-            cursor.execute("""
-                INSERT OR REPLACE INTO technical_features (
-                    bse_code, date, rsi_14, macd_line, macd_signal, macd_histogram,
-                    bb_upper, bb_middle, bb_lower, bb_percent_b,
-                    volume_ratio, volume_spike, momentum_5d, momentum_10d, momentum_30d,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                features_dict['bse_code'], features_dict['date'], features_dict['rsi_14'],
-                features_dict['macd_line'], features_dict['macd_signal'], features_dict['macd_histogram'],
-                features_dict['bb_upper'], features_dict['bb_middle'], features_dict['bb_lower'], features_dict['bb_percent_b'],
-                features_dict['volume_ratio'], features_dict['volume_spike'],
-                features_dict['momentum_5d'], features_dict['momentum_10d'], features_dict['momentum_30d'],
-                features_dict['created_at']
-            ))
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
+
+            for features_dict in features_list:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO technical_features (
+                        bse_code, date, rsi_14, macd_line, macd_signal, macd_histogram,
+                        bb_upper, bb_middle, bb_lower, bb_percent_b,
+                        volume_ratio, volume_spike, momentum_5d, momentum_10d, momentum_30d,
+                        created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    features_dict['bse_code'], features_dict['date'], features_dict['rsi_14'],
+                    features_dict['macd_line'], features_dict['macd_signal'], features_dict['macd_histogram'],
+                    features_dict['bb_upper'], features_dict['bb_middle'], features_dict['bb_lower'], features_dict['bb_percent_b'],
+                    features_dict['volume_ratio'], features_dict['volume_spike'],
+                    features_dict['momentum_5d'], features_dict['momentum_10d'], features_dict['momentum_30d'],
+                    features_dict['created_at']
+                ))
+
+        # Invalidate cached feature vectors for this store
+        bump_feature_store_version(str(Path(self.output_db_path).parent))
 
         logger.info(f"Batch extraction complete: {len(features_list)} samples processed")
         return df
@@ -9,6 +9,16 @@ This agent:
 3. Filters alerts based on ML confidence
 4. Sends enhanced alerts via Telegram/Gmail
 
+Concurrency:
+- One keep-alive httpx.AsyncClient pool per bridge, bounded by max_concurrency
+- Pending detections are scored with one /api/v1/batch_predict call per
+  batch_size detections (falling back to concurrent single calls)
+- Alerts are dispatched concurrently, throttled per channel by AsyncRateLimiter
+
+Prediction requests follow the API's PredictionRequest schema: detection
+symbols are resolved to 6-digit BSE codes through the symbol master and
+scored as of the detection date.
+
 Author: VCP ML System
 Version: 1.0.0
 """
@@ -16,12 +26,15 @@ Version: 1.0.0
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 import sqlite3
-import requests
+import httpx
 from dataclasses import dataclass
 from enum import Enum
 
+from src.utils.rate_limiter import AsyncRateLimiter
+from src.utils.symbol_master import SymbolMaster, get_symbol_master
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +42,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+FALLBACK_PROBABILITY = 0.15  # Used when the ML API has no prediction for a detection
+
 
 class AlertPriority(Enum):
     """Alert priority levels"""
@@ -67,6 +82,13 @@ class MLEnhancedAlert:
     confidence_level: str
 
 
+# Default per-channel send rates (messages/second)
+DEFAULT_CHANNEL_RATE_LIMITS = {
+    'telegram': 20.0,  # Below Telegram's ~30 msg/s bot limit
+    'gmail': 5.0
+}
+
+
 class MLAlertBridge:
     """
     Bridge between VCP detection system and ML prediction API
@@ -77,7 +99,14 @@ class MLAlertBridge:
         vcp_db_path: str = "/Users/srijan/vcp_clean_test/vcp/vcp_trading_local.db",
         ml_api_url: str = "http://13.200.109.29:8002",
         min_ml_threshold: float = 0.15,
-        polling_interval: int = 60
+        polling_interval: int = 60,
+        max_concurrency: int = 10,
+        batch_size: int = 100,
+        request_timeout: float = 10.0,
+        channel_rate_limits: Optional[Dict[str, float]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        mapping_db_path: str = "data/bse_nse_mapping.db",
+        symbol_master: Optional[SymbolMaster] = None
     ):
         """
         Initialize ML Alert Bridge
@@ -87,15 +116,41 @@ class MLAlertBridge:
             ml_api_url: URL of ML prediction API
             min_ml_threshold: Minimum ML probability to send alert
             polling_interval: Seconds between checks
+            max_concurrency: Maximum in-flight ML API requests (and pooled connections)
+            batch_size: Detections per batch prediction call (API maximum: 100)
+            request_timeout: Per-request timeout in seconds
+            channel_rate_limits: Messages/second per alert channel
+                                 (default: DEFAULT_CHANNEL_RATE_LIMITS)
+            client: Optional pre-configured AsyncClient (not closed by the bridge)
+            mapping_db_path: BSE-NSE mapping DB used to resolve NSE symbols to BSE codes
+            symbol_master: Optional pre-built SymbolMaster (default: shared master
+                           for mapping_db_path)
         """
         self.vcp_db_path = vcp_db_path
         self.ml_api_url = ml_api_url.rstrip('/')
         self.min_ml_threshold = min_ml_threshold
         self.polling_interval = polling_interval
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.request_timeout = request_timeout
+        self.mapping_db_path = mapping_db_path
+        self._symbol_master = symbol_master
 
         # Track processed detections to avoid duplicates
         self.processed_detections: set = set()
 
+        # HTTP client pool (created lazily inside the running loop)
+        self._client = client
+        self._owns_client = client is None
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Per-channel alert throttling
+        rates = channel_rate_limits or DEFAULT_CHANNEL_RATE_LIMITS
+        self.channel_limiters: Dict[str, AsyncRateLimiter] = {
+            channel: AsyncRateLimiter(requests_per_second=rate)
+            for channel, rate in rates.items()
+        }
+
         logger.info(f"ML Alert Bridge initialized")
         logger.info(f"VCP DB: {vcp_db_path}")
         logger.info(f"ML API: {ml_api_url}")
@@ -114,6 +169,11 @@ class MLAlertBridge:
         Returns:
             List of VCP detections
         """
+        # sqlite3 is blocking; keep it off the event loop
+        return await asyncio.to_thread(self._fetch_vcp_detections, minutes)
+
+    def _fetch_vcp_detections(self, minutes: int) -> List[VCPDetection]:
+        """Blocking part of get_recent_vcp_detections"""
         detections = []
         cutoff_time = datetime.now() - timedelta(minutes=minutes)
 
@@ -160,43 +220,171 @@ class MLAlertBridge:
 
         return detections
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Keep-alive HTTP client shared by all ML API calls"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.request_timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the HTTP client pool (if the bridge created it)"""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "MLAlertBridge":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @property
+    def symbol_master(self) -> SymbolMaster:
+        """Symbol master used to resolve detection symbols to BSE codes"""
+        if self._symbol_master is None:
+            self._symbol_master = get_symbol_master(self.mapping_db_path)
+        return self._symbol_master
+
+    def _prediction_payload(self, symbol: str, prediction_date: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        PredictionRequest body for one symbol
+
+        Args:
+            symbol: NSE symbol (or 6-digit BSE code)
+            prediction_date: Date to score as of (default: today)
+
+        Returns:
+            Request dict, or None if the symbol has no known BSE code
+        """
+        symbol = symbol.strip()
+        if len(symbol) == 6 and symbol.isdigit():
+            bse_code, nse_symbol = symbol, None
+        else:
+            bse_code, nse_symbol = self.symbol_master.get_bse_code(symbol), symbol
+
+        if bse_code is None:
+            logger.warning(f"No BSE code for {symbol}; cannot request ML prediction")
+            return None
+
+        payload = {
+            "bse_code": bse_code,
+            "prediction_date": (prediction_date or datetime.now()).strftime('%Y-%m-%d')
+        }
+        if nse_symbol:
+            payload["nse_symbol"] = nse_symbol
+        return payload
+
     async def get_ml_prediction(
         self,
         symbol: str,
-        features: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+        prediction_date: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get ML prediction from API
 
         Args:
             symbol: Stock symbol
-            features: Optional feature dict
+            prediction_date: Date to score as of (default: today)
+
+        Returns:
+            PredictionResponse dict from ML API, or None if unavailable
+        """
+        payload = self._prediction_payload(symbol, prediction_date)
+        if payload is None:
+            return None
+        return await self._post_single(payload)
+
+    async def get_ml_predictions(self, detections: List[VCPDetection]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get ML predictions for many detections using the batch endpoint
+
+        Each detection is scored as of its detection date. Detections whose
+        symbol has no BSE code are not sent. The rest go in chunks of
+        batch_size, all chunks concurrently; a chunk whose batch call fails is
+        retried as concurrent single calls. Items the batch endpoint could not
+        score come back as None, like a failed single call, so both paths get
+        the same FALLBACK_PROBABILITY default when alerts are built.
+
+        Args:
+            detections: VCP detections
 
         Returns:
-            Prediction response from ML API
+            PredictionResponse dicts (None where unavailable), same order as detections
         """
+        payloads = [self._prediction_payload(d.symbol, d.detection_time) for d in detections]
+        pending = [i for i, payload in enumerate(payloads) if payload is not None]
+
+        chunks = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        chunk_results = await asyncio.gather(
+            *(self._predict_chunk([payloads[i] for i in chunk]) for chunk in chunks)
+        )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(detections)
+        for chunk, predictions in zip(chunks, chunk_results):
+            for i, prediction in zip(chunk, predictions):
+                results[i] = prediction
+        return results
+
+    async def _predict_chunk(self, payloads: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """One batch prediction call, falling back to single calls"""
         try:
-            url = f"{self.ml_api_url}/api/v1/predict"
-            payload = {
-                "symbol": symbol,
-                "features": features or {}
-            }
+            async with self._request_semaphore:
+                response = await self.client.post(
+                    f"{self.ml_api_url}/api/v1/batch_predict",
+                    json={"predictions": payloads}
+                )
 
-            response = requests.post(
-                url,
-                json=payload,
-                timeout=10
-            )
+            if response.status_code == 200:
+                predictions = response.json()
+                if isinstance(predictions, list) and len(predictions) == len(payloads):
+                    return [None if self._is_failed_prediction(p) else p for p in predictions]
+                logger.error(f"ML batch API returned {len(predictions)} results for {len(payloads)} requests")
+            else:
+                logger.error(f"ML batch API error: {response.status_code}")
+
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"ML batch API request failed: {e}")
+
+        logger.info(f"Falling back to single predictions for {len(payloads)} requests")
+        return list(await asyncio.gather(*(self._post_single(payload) for payload in payloads)))
+
+    async def _post_single(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST one PredictionRequest to /api/v1/predict"""
+        try:
+            async with self._request_semaphore:
+                response = await self.client.post(f"{self.ml_api_url}/api/v1/predict", json=payload)
 
             if response.status_code == 200:
                 return response.json()
-            else:
-                logger.error(f"ML API error for {symbol}: {response.status_code}")
-                return None
+            logger.error(f"ML API error for {payload['bse_code']}: {response.status_code}")
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"ML API request failed for {symbol}: {e}")
-            return None
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"ML API request failed for {payload['bse_code']}: {e}")
+
+        return None
+
+    @staticmethod
+    def _is_failed_prediction(prediction: Any) -> bool:
+        """
+        True for a batch item the API could not score
+
+        The batch endpoint keeps failed items in place as probability=0.0,
+        predicted_label=0, LOW confidence placeholders.
+        """
+        if not isinstance(prediction, dict):
+            return True
+        return (
+            prediction.get('probability') == 0.0
+            and prediction.get('predicted_label') == 0
+            and prediction.get('confidence') == "LOW"
+        )
 
     def determine_priority(self, ml_probability: float) -> AlertPriority:
         """
@@ -232,18 +420,33 @@ class MLAlertBridge:
         Returns:
             Enhanced alert or None if filtered
         """
-        # Get ML prediction
-        ml_result = await self.get_ml_prediction(detection.symbol)
+        ml_result = await self.get_ml_prediction(detection.symbol, detection.detection_time)
+        return self._build_enhanced_alert(detection, ml_result)
+
+    def _build_enhanced_alert(
+        self,
+        detection: VCPDetection,
+        ml_result: Optional[Dict[str, Any]]
+    ) -> Optional[MLEnhancedAlert]:
+        """
+        Combine a detection with its ML prediction
 
+        Args:
+            detection: VCP detection
+            ml_result: PredictionResponse dict (None if unavailable)
+
+        Returns:
+            Enhanced alert or None if filtered
+        """
         if not ml_result:
             logger.warning(f"No ML prediction for {detection.symbol}, using default")
             ml_result = {
-                "probability": 0.15,
-                "prediction": 0,
+                "probability": FALLBACK_PROBABILITY,
+                "predicted_label": 0,
                 "model_version": "unknown"
             }
 
-        ml_probability = ml_result.get('probability', 0.15)
+        ml_probability = ml_result.get('probability', FALLBACK_PROBABILITY)
         priority = self.determine_priority(ml_probability)
 
         # Filter out low-confidence alerts
@@ -258,7 +461,7 @@ class MLAlertBridge:
             pattern_type=detection.pattern_type,
             vcp_score=detection.vcp_score,
             ml_probability=ml_probability,
-            ml_prediction=ml_result.get('prediction', 0),
+            ml_prediction=ml_result.get('predicted_label', 0),
             priority=priority,
             price=detection.price,
             volume=detection.volume,
@@ -345,9 +548,12 @@ class MLAlertBridge:
 
         return message
 
-    async def process_detections(self):
+    async def process_detections(self) -> List[MLEnhancedAlert]:
         """
         Main processing loop - fetch VCP detections and enhance with ML
+
+        Returns:
+            Enhanced alerts sent this cycle
         """
         logger.info("Starting detection processing...")
 
@@ -358,29 +564,72 @@ class MLAlertBridge:
 
         if not detections:
             logger.info("No new detections to process")
-            return
+            return []
 
-        # Process each detection
-        enhanced_alerts = []
+        # Score all pending detections together
+        ml_results = await self.get_ml_predictions(detections)
 
-        for detection in detections:
-            enhanced_alert = await self.enhance_detection_with_ml(detection)
+        enhanced_alerts = []
+        for detection, ml_result in zip(detections, ml_results):
+            enhanced_alert = self._build_enhanced_alert(detection, ml_result)
 
             if enhanced_alert:
                 enhanced_alerts.append(enhanced_alert)
 
         # Send alerts
         logger.info(f"Sending {len(enhanced_alerts)} enhanced alerts...")
+        sent = await self.dispatch_alerts(enhanced_alerts)
+
+        logger.info(
+            f"Processed {len(detections)} detections, sent {len(enhanced_alerts)} alerts "
+            f"(telegram: {sent['telegram']}, gmail: {sent['gmail']})"
+        )
+        return enhanced_alerts
+
+    async def dispatch_alerts(self, alerts: List[MLEnhancedAlert]) -> Dict[str, int]:
+        """
+        Send alerts on all channels concurrently
+
+        Every alert goes to Telegram; CRITICAL/HIGH alerts also go to Gmail.
+        Each channel is throttled by its own rate limiter.
 
-        for alert in enhanced_alerts:
-            # Send via configured channels
-            await self.send_telegram_alert(alert)
+        Args:
+            alerts: Enhanced alerts to send
+
+        Returns:
+            Successful sends per channel
+        """
+        sends = []
+        for alert in alerts:
+            sends.append(('telegram', self._send_on_channel('telegram', self.send_telegram_alert, alert)))
 
             # Send Gmail for high-priority alerts
             if alert.priority in [AlertPriority.CRITICAL, AlertPriority.HIGH]:
-                await self.send_gmail_alert(alert)
+                sends.append(('gmail', self._send_on_channel('gmail', self.send_gmail_alert, alert)))
+
+        results = await asyncio.gather(*(send for _, send in sends))
 
-        logger.info(f"Processed {len(detections)} detections, sent {len(enhanced_alerts)} alerts")
+        sent = {'telegram': 0, 'gmail': 0}
+        for (channel, _), ok in zip(sends, results):
+            sent[channel] += int(ok)
+        return sent
+
+    async def _send_on_channel(
+        self,
+        channel: str,
+        sender: Callable[[MLEnhancedAlert], Awaitable[bool]],
+        alert: MLEnhancedAlert
+    ) -> bool:
+        """Send one alert after acquiring the channel's rate-limit token"""
+        limiter = self.channel_limiters.get(channel)
+        if limiter is not None:
+            await limiter.acquire()
+
+        try:
+            return await sender(alert)
+        except Exception as e:
+            logger.error(f"{channel} alert failed for {alert.symbol}: {e}")
+            return False
 
     async def run(self):
         """
@@ -389,15 +638,18 @@ class MLAlertBridge:
         logger.info("ML Alert Bridge started")
         logger.info(f"Polling interval: {self.polling_interval}s")
 
-        while True:
-            try:
-                await self.process_detections()
+        try:
+            while True:
+                try:
+                    await self.process_detections()
 
-            except Exception as e:
-                logger.error(f"Error in processing loop: {e}", exc_info=True)
+                except Exception as e:
+                    logger.error(f"Error in processing loop: {e}", exc_info=True)
 
-            # Wait before next poll
-            await asyncio.sleep(self.polling_interval)
+                # Wait before next poll
+                await asyncio.sleep(self.polling_interval)
+        finally:
+            await self.aclose()
 
 
 async def main():
@@ -15,7 +15,6 @@ Created: 2025-11-18
 """
 
 import logging
-import sqlite3
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
@@ -23,6 +22,8 @@ import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from tools.db_utils import pooled_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,42 +102,39 @@ class ADXDMAScanner:
 
     def _initialize_database(self):
         """Create trading_signals table"""
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trading_signals (
-                signal_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                signal_type TEXT NOT NULL,
-                date DATE NOT NULL,
-                close_price REAL NOT NULL,
-
-                dma_50 REAL,
-                dma_100 REAL,
-                dma_200 REAL,
-
-                adx REAL,
-                plus_di REAL,
-                minus_di REAL,
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
 
-                volume REAL,
-                avg_volume_30d REAL,
-                volume_ratio REAL,
-
-                signal_strength REAL,
-
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(symbol, date, signal_type) ON CONFLICT REPLACE
-            )
-        """)
-
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_symbol_date ON trading_signals(symbol, date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_signal_type ON trading_signals(signal_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_date ON trading_signals(date)")
-
-        conn.commit()
-        conn.close()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS trading_signals (
+                    signal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    signal_type TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    close_price REAL NOT NULL,
+
+                    dma_50 REAL,
+                    dma_100 REAL,
+                    dma_200 REAL,
+
+                    adx REAL,
+                    plus_di REAL,
+                    minus_di REAL,
+
+                    volume REAL,
+                    avg_volume_30d REAL,
+                    volume_ratio REAL,
+
+                    signal_strength REAL,
+
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(symbol, date, signal_type) ON CONFLICT REPLACE
+                )
+            """)
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_symbol_date ON trading_signals(symbol, date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_signal_type ON trading_signals(signal_type)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_date ON trading_signals(date)")
         logger.info("Database schema initialized")
 
     def calculate_dma(self, prices: pd.Series, period: int) -> pd.Series:
@@ -427,29 +425,27 @@ class ADXDMAScanner:
         if not signals:
             return
 
-        conn = sqlite3.connect(self.output_db_path)
-        cursor = conn.cursor()
-
-        for signal in signals:
-            signal_dict = asdict(signal)
-            cursor.execute("""
-                INSERT OR REPLACE INTO trading_signals (
-                    symbol, signal_type, date, close_price,
-                    dma_50, dma_100, dma_200,
-                    adx, plus_di, minus_di,
-                    volume, avg_volume_30d, volume_ratio,
-                    signal_strength, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal_dict['symbol'], signal_dict['signal_type'], signal_dict['date'],
-                signal_dict['close_price'], signal_dict['dma_50'], signal_dict['dma_100'],
-                signal_dict['dma_200'], signal_dict['adx'], signal_dict['plus_di'],
-                signal_dict['minus_di'], signal_dict['volume'], signal_dict['avg_volume_30d'],
-                signal_dict['volume_ratio'], signal_dict['signal_strength'], signal_dict['created_at']
-            ))
+        with pooled_connection(self.output_db_path) as conn:
+            cursor = conn.cursor()
+
+            for signal in signals:
+                signal_dict = asdict(signal)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO trading_signals (
+                        symbol, signal_type, date, close_price,
+                        dma_50, dma_100, dma_200,
+                        adx, plus_di, minus_di,
+                        volume, avg_volume_30d, volume_ratio,
+                        signal_strength, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    signal_dict['symbol'], signal_dict['signal_type'], signal_dict['date'],
+                    signal_dict['close_price'], signal_dict['dma_50'], signal_dict['dma_100'],
+                    signal_dict['dma_200'], signal_dict['adx'], signal_dict['plus_di'],
+                    signal_dict['minus_di'], signal_dict['volume'], signal_dict['avg_volume_30d'],
+                    signal_dict['volume_ratio'], signal_dict['signal_strength'], signal_dict['created_at']
+                ))
 
-        conn.commit()
-        conn.close()
         logger.info(f"Saved {len(signals)} signals to database")
 
 
@@ -7,6 +7,10 @@ Sequential agent pipeline for comprehensive VCP stock analysis:
 3. FundamentalAnalyst - Analyzes earnings quality and growth
 4. SignalGenerator - Generates buy/sell signals with risk metrics
 
+Universe scans rank every symbol with the panel VCP detector first
+(skills.vcp_detector.scan_vcp_universe) and run the pipeline only for that shortlist
+(VCPWorkflow.run_shortlist).
+
 Source: Learned from awesome-ai-apps/advance_ai_agents/deep_researcher_agent
 """
 
@@ -16,6 +20,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
 
+import pandas as pd
+
 # Import existing VCP system components
 from src.data.yahoo_finance_fetcher import YahooFinanceFetcher
 from src.rag.earnings_query import get_earnings_query_engine
@@ -182,6 +188,38 @@ class VCPWorkflow:
                 execution_time=(datetime.now() - start_time).total_seconds()
             )
 
+    async def run_shortlist(
+        self,
+        candidates: pd.DataFrame,
+        exchange: str = "NSE",
+        limit: Optional[int] = None
+    ) -> List[WorkflowResult]:
+        """
+        Execute the workflow for the symbols of a VCP scan, best first
+
+        Args:
+            candidates: Ranked table from scan_vcp_panel / scan_vcp_universe
+            exchange: Exchange (NSE or BSE)
+            limit: Analyze only the first `limit` candidates
+
+        Returns:
+            WorkflowResult per candidate, in rank order
+
+        Example:
+            >>> from skills.vcp_detector import scan_vcp_universe
+            >>> shortlist = scan_vcp_universe("data/bhav_archive", "NSE", top_n=20)
+            >>> results = await workflow.run_shortlist(shortlist, "NSE")
+        """
+        symbols = candidates['code'].astype(str).tolist()
+        if limit is not None:
+            symbols = symbols[:limit]
+
+        logger.info(f"Running workflow for {len(symbols)} VCP scan candidates")
+        results = []
+        for symbol in symbols:
+            results.append(await self.run(symbol, exchange))
+        return results
+
     async def _stage1_data_collector(
         self,
         symbol: str,
@@ -15,7 +15,6 @@ Created: 2025-11-14
 """
 
 import logging
-import sqlite3
 import time
 import json
 from datetime import datetime
@@ -31,6 +30,8 @@ from agents.ml.technical_feature_extractor import TechnicalFeatureExtractor
 from agents.ml.financial_feature_extractor import FinancialFeatureExtractor
 from agents.ml.sentiment_feature_extractor import SentimentFeatureExtractor
 from agents.ml.seasonality_feature_extractor import SeasonalityFeatureExtractor
+from agents.ml.optimization.feature_cache import FeatureVectorCache
+from tools.db_utils import pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -159,7 +160,8 @@ class BatchPredictor:
         master_stock_db_path: str,
         predictions_db_path: str,
         output_dir: str,
-        batch_size: int = 100
+        batch_size: int = 100,
+        feature_cache: Optional[FeatureVectorCache] = None
     ):
         """
         Initialize batch predictor
@@ -171,6 +173,8 @@ class BatchPredictor:
             predictions_db_path: Path to predictions output database
             output_dir: Directory for output files (CSV, JSON, reports)
             batch_size: Number of stocks per batch (default: 100)
+            feature_cache: Feature-vector cache (default: private cache keyed on
+                           the feature DB directories)
         """
         self.model_registry_path = model_registry_path
         self.feature_dbs = feature_dbs
@@ -214,6 +218,19 @@ class BatchPredictor:
             output_db_path=feature_dbs.get('seasonality', 'data/features/seasonality_features.db')
         )
 
+        # Feature vectors keyed by (bse_code, date, feature-store version)
+        self.feature_cache = feature_cache or FeatureVectorCache(
+            store_dirs=[
+                str(Path(feature_dbs.get(name, default)).parent)
+                for name, default in [
+                    ('technical', 'data/features/technical_features.db'),
+                    ('financial_features', 'data/features/financial_features.db'),
+                    ('sentiment', 'data/features/sentiment_features.db'),
+                    ('seasonality', 'data/features/seasonality_features.db')
+                ]
+            ]
+        )
+
         # Initialize predictions database
         self._init_predictions_db()
 
@@ -224,37 +241,34 @@ class BatchPredictor:
 
     def _init_predictions_db(self):
         """Initialize predictions database with schema (AC4.2.5)"""
-        conn = sqlite3.connect(self.predictions_db_path)
-
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS daily_predictions (
-                prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bse_code TEXT NOT NULL,
-                nse_symbol TEXT,
-                company_name TEXT,
-                prediction_date DATE NOT NULL,
-                predicted_label INTEGER NOT NULL CHECK(predicted_label IN (0, 1)),
-                probability REAL NOT NULL CHECK(probability BETWEEN 0 AND 1),
-                confidence TEXT CHECK(confidence IN ('LOW', 'MEDIUM', 'HIGH')),
-                model_version TEXT,
-                model_type TEXT,
-                prediction_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(bse_code, prediction_date, model_version)
-            )
-        ''')
-
-        conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_date_prob
-            ON daily_predictions(prediction_date, probability DESC)
-        ''')
-
-        conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_bse_date
-            ON daily_predictions(bse_code, prediction_date)
-        ''')
-
-        conn.commit()
-        conn.close()
+        with pooled_connection(self.predictions_db_path) as conn:
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS daily_predictions (
+                    prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bse_code TEXT NOT NULL,
+                    nse_symbol TEXT,
+                    company_name TEXT,
+                    prediction_date DATE NOT NULL,
+                    predicted_label INTEGER NOT NULL CHECK(predicted_label IN (0, 1)),
+                    probability REAL NOT NULL CHECK(probability BETWEEN 0 AND 1),
+                    confidence TEXT CHECK(confidence IN ('LOW', 'MEDIUM', 'HIGH')),
+                    model_version TEXT,
+                    model_type TEXT,
+                    prediction_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(bse_code, prediction_date, model_version)
+                )
+            ''')
+
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_date_prob
+                ON daily_predictions(prediction_date, probability DESC)
+            ''')
+
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_bse_date
+                ON daily_predictions(bse_code, prediction_date)
+            ''')
 
         logger.info(f"Predictions database initialized: {self.predictions_db_path}")
 
@@ -266,17 +280,16 @@ class BatchPredictor:
             DataFrame with columns: bse_code, nse_symbol, company_name, market_cap_cr
             Sorted by market_cap_cr descending
         """
-        conn = sqlite3.connect(self.master_stock_db_path)
+        with pooled_connection(self.master_stock_db_path, read_only=True) as conn:
 
-        query = '''
-            SELECT bse_code, nse_symbol, company_name, market_cap_cr
-            FROM master_stock_list
-            WHERE status = 'ACTIVE'
-            ORDER BY market_cap_cr DESC
-        '''
+            query = '''
+                SELECT bse_code, nse_symbol, company_name, market_cap_cr
+                FROM master_stock_list
+                WHERE status = 'ACTIVE'
+                ORDER BY market_cap_cr DESC
+            '''
 
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+            df = pd.read_sql_query(query, conn)
 
         logger.info(f"Fetched {len(df)} active stocks from master list")
 
@@ -351,22 +364,32 @@ class BatchPredictor:
         """
         predictions = []
 
+        # One bulk cache lookup for the whole batch; only misses are extracted
+        cached_vectors = self.feature_cache.get_many(
+            [(stock['bse_code'], date) for stock in stocks]
+        )
+        new_vectors = {}
+
         for stock in stocks:
             try:
-                # Extract features
-                features = self.extract_features_for_stock(stock['bse_code'], date)
+                feature_array = cached_vectors.get((stock['bse_code'], date))
 
-                if features is None:
-                    # Log skipped stock
-                    self.skipped_stocks.append({
-                        'bse_code': stock['bse_code'],
-                        'nse_symbol': stock.get('nse_symbol', 'UNKNOWN'),
-                        'reason': 'Feature extraction failed'
-                    })
-                    continue
+                if feature_array is None:
+                    # Extract features
+                    features = self.extract_features_for_stock(stock['bse_code'], date)
 
-                # Convert to array
-                feature_array = list(features.values())
+                    if features is None:
+                        # Log skipped stock
+                        self.skipped_stocks.append({
+                            'bse_code': stock['bse_code'],
+                            'nse_symbol': stock.get('nse_symbol', 'UNKNOWN'),
+                            'reason': 'Feature extraction failed'
+                        })
+                        continue
+
+                    # Convert to array
+                    feature_array = self.feature_cache.to_vector(features)
+                    new_vectors[(stock['bse_code'], date)] = feature_array
 
                 # Predict
                 proba_result = self.model.predict_proba([feature_array])
@@ -402,6 +425,9 @@ class BatchPredictor:
                     'reason': str(e)
                 })
 
+        if new_vectors:
+            self.feature_cache.set_many(new_vectors)
+
         return predictions
 
     def extract_features_parallel(
@@ -468,32 +494,31 @@ class BatchPredictor:
 
     def _save_to_database(self, predictions: List[StockPrediction]) -> int:
         """Save predictions to SQLite database"""
-        conn = sqlite3.connect(self.predictions_db_path)
-
-        rows = []
-        for pred in predictions:
-            rows.append((
-                pred.bse_code,
-                pred.nse_symbol,
-                pred.company_name,
-                pred.prediction_date,
-                pred.predicted_label,
-                pred.probability,
-                pred.confidence,
-                pred.model_version,
-                pred.model_type
-            ))
-
-        conn.executemany('''
-            INSERT OR REPLACE INTO daily_predictions
-            (bse_code, nse_symbol, company_name, prediction_date, predicted_label,
-             probability, confidence, model_version, model_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', rows)
-
-        conn.commit()
-        inserted = conn.total_changes
-        conn.close()
+        with pooled_connection(self.predictions_db_path) as conn:
+
+            rows = []
+            for pred in predictions:
+                rows.append((
+                    pred.bse_code,
+                    pred.nse_symbol,
+                    pred.company_name,
+                    pred.prediction_date,
+                    pred.predicted_label,
+                    pred.probability,
+                    pred.confidence,
+                    pred.model_version,
+                    pred.model_type
+                ))
+
+            before = conn.total_changes
+            conn.executemany('''
+                INSERT OR REPLACE INTO daily_predictions
+                (bse_code, nse_symbol, company_name, prediction_date, predicted_label,
+                 probability, confidence, model_version, model_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+            inserted = conn.total_changes - before
 
         logger.info(f"Saved {inserted} predictions to database")
 
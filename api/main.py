@@ -13,6 +13,7 @@ Created: 2025-11-14
 """
 
 import logging
+import os
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -31,6 +32,8 @@ from api.prediction_endpoint import (
     HealthResponse,
     PredictionService
 )
+from monitoring import get_metrics_text
+from monitoring.profiler import profiler_enabled, start_capture, get_capture_status
 
 # Configure logging
 logging.basicConfig(
@@ -145,7 +148,9 @@ def get_service() -> PredictionService:
                 'sentiment': 'data/features/sentiment_features.db',
                 'historical': 'data/features/historical_patterns.db',
                 'seasonality': 'data/features/seasonality_features.db'
-            }
+            },
+            batch_max_size=int(os.getenv("PREDICT_BATCH_MAX_SIZE", "32")),
+            batch_max_wait_ms=float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "2.0"))
         )
     return prediction_service
 
@@ -256,6 +261,9 @@ async def batch_predict(
     - **requests_processed**: Total requests processed
     - **avg_latency_ms**: Average latency
     - **error_rate**: Error rate (0.0 to 1.0)
+    - **batch_max_size**: Max rows per micro-batched model call
+    - **batch_max_wait_ms**: Max time a request waits for its batch to fill
+    - **avg_batch_size**: Average rows per model call so far
 
     ## Status Codes
     - **200**: Service healthy
@@ -287,6 +295,9 @@ async def health(
     - **prediction_latency_seconds**: Prediction latency histogram
     - **prediction_errors_total**: Total errors
     - **model_cache_hits_total**: Model cache hits
+    - **pipeline_stage_duration_seconds**: Per-stage latency histogram
+      (feature load, indicator compute, model predict, SQLite query, cache get/set)
+    - **pipeline_stage_calls_total**: Per-stage executions by outcome
 
     ## Format
     Prometheus exposition format (plain text)
@@ -323,7 +334,8 @@ api_uptime_seconds {health_status.uptime_seconds}
 model_loaded {1 if health_status.model_loaded else 0}
 """
 
-    return metrics_text
+    # Stage histograms and other metrics on the global Prometheus registry
+    return metrics_text + "\n" + get_metrics_text().decode()
 
 
 @app.get(
@@ -380,6 +392,50 @@ async def reload_models():
     }
 
 
+@app.post(
+    "/api/v1/admin/profile",
+    summary="Start Sampling Profile (Admin)",
+    description="""
+    Sample this process for N seconds and write a flamegraph.
+
+    ## Behavior
+    - Runs in the background; returns immediately
+    - Writes `<name>.collapsed` and `<name>.speedscope.json` to
+      `VCP_PROFILE_DIR` (default `logs/profiles/`)
+    - One capture at a time (409 if one is running)
+
+    ## Note
+    Disabled unless the server is started with `VCP_PROFILER=1`.
+    """,
+    tags=["Admin"]
+)
+async def start_profile(seconds: float = 30.0, interval_ms: float = 10.0):
+    """Start a background sampling profile (admin endpoint)"""
+    if not profiler_enabled():
+        raise HTTPException(status_code=403, detail="Profiling disabled (set VCP_PROFILER=1)")
+    try:
+        capture = start_capture(seconds, interval=interval_ms / 1000)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"Profile capture started: {capture['name']} ({seconds}s)")
+    return capture
+
+
+@app.get(
+    "/api/v1/admin/profile",
+    summary="Profile Capture Status (Admin)",
+    description="Status and output file paths of the current or last profile capture.",
+    tags=["Admin"]
+)
+async def profile_status():
+    """Profile capture status (admin endpoint)"""
+    if not profiler_enabled():
+        raise HTTPException(status_code=403, detail="Profiling disabled (set VCP_PROFILER=1)")
+    return get_capture_status()
+
+
 @app.get(
     "/",
     summary="API Root",
@@ -0,0 +1,116 @@
+"""
+Async Micro-Batching for Model Inference
+
+Coalesces concurrent single-row predictions into one vectorized
+`predict_proba` call. Tree models score a 32-row batch in roughly the time
+of a few single rows, so under load this cuts per-request inference cost.
+
+Behavior:
+- Requests are queued until `max_batch_size` rows are pending or
+  `max_wait_ms` has elapsed since the first queued row, whichever is first
+- One predict call is made per batch; results fan back to each awaiting caller
+- A failing predict call propagates the exception to every caller in the batch
+
+Author: VCP Financial Research Team
+Created: 2025-11-14
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Bounded async micro-batcher in front of a vectorized predict function.
+
+    Args:
+        predict_fn: Callable taking a list of feature rows and returning one
+                    probability per row (same order)
+        max_batch_size: Maximum rows per predict call (1 disables batching)
+        max_wait_ms: Maximum time the first queued row waits for company
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[List[float]]], Sequence[float]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: List[Tuple[List[float], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Statistics (reported via /health)
+        self.batches_run = 0
+        self.rows_scored = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        """Average rows per predict call so far"""
+        return self.rows_scored / self.batches_run if self.batches_run > 0 else 0.0
+
+    async def submit(self, row: List[float]) -> float:
+        """
+        Queue one feature row and wait for its probability.
+
+        Args:
+            row: Feature vector
+
+        Returns:
+            Predicted probability for the row
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Score all pending rows in one predict call and resolve their futures"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if not batch:
+            return
+
+        # Rows beyond max_batch_size start a new wait window
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        rows = [row for row, _ in batch]
+        try:
+            probabilities = list(self.predict_fn(rows))
+            if len(probabilities) != len(rows):
+                raise ValueError(f"predict returned {len(probabilities)} results for {len(rows)} rows")
+        except Exception as e:
+            logger.error(f"Batched predict failed for {len(rows)} rows: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.rows_scored += len(rows)
+
+        for (_, future), probability in zip(batch, probabilities):
+            if not future.done():
+                future.set_result(probability)
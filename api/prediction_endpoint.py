@@ -14,6 +14,7 @@ Author: VCP Financial Research Team
 Created: 2025-11-14
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
@@ -30,6 +31,9 @@ from agents.ml.technical_feature_extractor import TechnicalFeatureExtractor
 from agents.ml.financial_feature_extractor import FinancialFeatureExtractor
 from agents.ml.sentiment_feature_extractor import SentimentFeatureExtractor
 from agents.ml.seasonality_feature_extractor import SeasonalityFeatureExtractor
+from agents.ml.optimization.feature_cache import FeatureVectorCache
+from monitoring.instrumentation import STAGE_FEATURE_LOAD, STAGE_MODEL_PREDICT, track_stage
+from api.micro_batcher import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +91,9 @@ class HealthResponse(BaseModel):
     requests_processed: int
     avg_latency_ms: float
     error_rate: float
+    batch_max_size: Optional[int] = None
+    batch_max_wait_ms: Optional[float] = None
+    avg_batch_size: Optional[float] = None
 
 
 # ============================================================================
@@ -129,7 +136,10 @@ class PredictionService:
     def __init__(
         self,
         model_registry_path: str,
-        feature_dbs: Dict[str, str]
+        feature_dbs: Dict[str, str],
+        batch_max_size: int = 32,
+        batch_max_wait_ms: float = 2.0,
+        feature_cache: Optional[FeatureVectorCache] = None
     ):
         """
         Initialize prediction service
@@ -143,6 +153,10 @@ class PredictionService:
                     'sentiment': 'path/to/sentiment.db',
                     'seasonality': 'path/to/seasonality.db'
                 }
+            batch_max_size: Max rows coalesced into one model call (1 disables batching)
+            batch_max_wait_ms: Max time a request waits for a batch to fill
+            feature_cache: Feature-vector cache (default: private cache keyed on
+                           the feature DB directories)
         """
         self.model_registry_path = model_registry_path
         self.feature_dbs = feature_dbs
@@ -165,18 +179,39 @@ class PredictionService:
             output_db_path=feature_dbs.get('technical', 'data/features/technical_features.db')
         )
         self.financial_extractor = FinancialFeatureExtractor(
-            financial_db_path=feature_dbs.get('financial', 'data/features/financial_data.db'),
+            financials_db_path=feature_dbs.get('financial', 'data/features/financial_data.db'),
             output_db_path=feature_dbs.get('financial_features', 'data/features/financial_features.db')
         )
         self.sentiment_extractor = SentimentFeatureExtractor(
-            news_db_path=feature_dbs.get('news', 'data/features/news_sentiment.db'),
+            price_db_path=feature_dbs.get('price', 'data/price_movements.db'),
+            labels_db_path=feature_dbs.get('labels', 'data/upper_circuit_labels.db'),
             output_db_path=feature_dbs.get('sentiment', 'data/features/sentiment_features.db')
         )
         self.seasonality_extractor = SeasonalityFeatureExtractor(
-            historical_db_path=feature_dbs.get('historical', 'data/features/historical_patterns.db'),
+            labels_db_path=feature_dbs.get('labels', 'data/upper_circuit_labels.db'),
             output_db_path=feature_dbs.get('seasonality', 'data/features/seasonality_features.db')
         )
 
+        # Feature vectors keyed by (bse_code, date, feature-store version)
+        self.feature_cache = feature_cache or FeatureVectorCache(
+            store_dirs=[
+                str(Path(feature_dbs.get(name, default)).parent)
+                for name, default in [
+                    ('technical', 'data/features/technical_features.db'),
+                    ('financial_features', 'data/features/financial_features.db'),
+                    ('sentiment', 'data/features/sentiment_features.db'),
+                    ('seasonality', 'data/features/seasonality_features.db')
+                ]
+            ]
+        )
+
+        # Micro-batching of concurrent single predictions
+        self.batcher = MicroBatcher(
+            predict_fn=self._predict_probabilities,
+            max_batch_size=batch_max_size,
+            max_wait_ms=batch_max_wait_ms
+        )
+
         # Performance tracking
         self.start_time = time.time()
         self.requests_processed = 0
@@ -213,15 +248,8 @@ class PredictionService:
             # Convert to array (25 features expected)
             feature_array = list(features.values())
 
-            # Predict
-            proba_result = self.model.predict_proba([feature_array])
-            # Handle both numpy arrays and lists
-            if hasattr(proba_result, 'shape'):
-                # Numpy array
-                probability = float(proba_result[0, 1])
-            else:
-                # List (for mocking)
-                probability = float(proba_result[0][1])
+            # Predict (coalesced with concurrent requests)
+            probability = await self.batcher.submit(feature_array)
             predicted_label = 1 if probability >= 0.5 else 0
             confidence = calculate_confidence(probability)
 
@@ -253,26 +281,45 @@ class PredictionService:
             logger.error(f"Prediction error: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    def _predict_probabilities(self, rows: List[List[float]]) -> List[float]:
+        """
+        Score feature rows in one model call
+
+        Args:
+            rows: Feature vectors
+
+        Returns:
+            Positive-class probability per row
+        """
+        with track_stage(STAGE_MODEL_PREDICT, self.model_version):
+            proba_result = self.model.predict_proba(rows)
+        # Handle both numpy arrays and lists
+        if hasattr(proba_result, 'shape'):
+            # Numpy array
+            return [float(p) for p in proba_result[:, 1]]
+        # List (for mocking)
+        return [float(p[1]) for p in proba_result]
+
     async def predict_batch(self, request: BatchPredictionRequest) -> List[PredictionResponse]:
         """
         Predict for multiple stocks
 
+        Requests run concurrently so the micro-batcher scores them together.
+
         Args:
             request: BatchPredictionRequest
 
         Returns:
-            List of PredictionResponse
+            List of PredictionResponse (same order as input)
         """
-        results = []
-        for pred_request in request.predictions:
+        async def predict_or_placeholder(pred_request: PredictionRequest) -> PredictionResponse:
             try:
-                result = await self.predict_single(pred_request)
-                results.append(result)
+                return await self.predict_single(pred_request)
             except HTTPException as e:
                 # Continue with other predictions
                 logger.warning(f"Batch prediction failed for {pred_request.bse_code}: {e.detail}")
                 # Add error placeholder
-                results.append(PredictionResponse(
+                return PredictionResponse(
                     bse_code=pred_request.bse_code,
                     nse_symbol=pred_request.nse_symbol or "UNKNOWN",
                     prediction_date=pred_request.prediction_date,
@@ -281,14 +328,21 @@ class PredictionService:
                     confidence="LOW",
                     model_version=self.model_version,
                     prediction_timestamp=datetime.now().isoformat()
-                ))
+                )
 
-        return results
+        return list(await asyncio.gather(
+            *(predict_or_placeholder(pred_request) for pred_request in request.predictions)
+        ))
 
     async def extract_features(self, bse_code: str, date: str) -> Optional[Dict[str, float]]:
         """
         Extract all 25 features for given stock and date (AC4.1.3)
 
+        Served from the feature-vector cache when the stock/date was already
+        assembled for the current feature-store version. Freshly computed
+        features are passed through the same float32 vector form as cached
+        ones, so a stock/date is scored on identical inputs either way.
+
         Args:
             bse_code: BSE stock code
             date: Prediction date (ISO format)
@@ -296,6 +350,21 @@ class PredictionService:
         Returns:
             Dictionary of 25 features, or None if extraction fails
         """
+        vector = self.feature_cache.get(bse_code, date)
+        if vector is not None:
+            return self.feature_cache.to_dict(vector)
+
+        with track_stage(STAGE_FEATURE_LOAD, self.model_version):
+            features = await self._compute_features(bse_code, date)
+        if features is None:
+            return None
+
+        vector = self.feature_cache.to_vector(features)
+        self.feature_cache.set(bse_code, date, vector)
+        return self.feature_cache.to_dict(vector)
+
+    async def _compute_features(self, bse_code: str, date: str) -> Optional[Dict[str, float]]:
+        """Assemble features from the feature databases (cache miss path)"""
         try:
             # For now, return dummy features for testing
             # TODO: Implement actual feature extraction from databases
@@ -359,7 +428,10 @@ class PredictionService:
             uptime_seconds=uptime,
             requests_processed=self.requests_processed,
             avg_latency_ms=avg_latency,
-            error_rate=error_rate
+            error_rate=error_rate,
+            batch_max_size=self.batcher.max_batch_size,
+            batch_max_wait_ms=self.batcher.max_wait_ms,
+            avg_batch_size=self.batcher.avg_batch_size
         )
 
 
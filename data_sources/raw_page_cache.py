@@ -0,0 +1,149 @@
+"""
+Content-Addressed Raw Page Cache
+Stores fetched HTML compressed on disk, keyed by SHA-256, with a fetch log
+so pages can be re-parsed offline without re-scraping
+"""
+
+import gzip
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.db_utils import pooled_connection
+
+
+class RawPageCache:
+    """
+    Raw HTML store
+
+    Layout under cache_dir:
+    - objects/<sha[:2]>/<sha>.html.gz : gzip-compressed page bodies (one per
+      distinct content, so unchanged re-fetches cost no extra space)
+    - index.db : page_fetches log of (company_code, url, sha256, fetched_at)
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.db")
+        self._initialized = False
+
+    def _ensure_index(self):
+        """Create directories and the fetch log on first write"""
+        if self._initialized:
+            return
+        os.makedirs(self.objects_dir, exist_ok=True)
+        with pooled_connection(self.index_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS page_fetches (
+                    company_code TEXT NOT NULL,
+                    fetched_at TIMESTAMP NOT NULL,
+                    url TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size_bytes INTEGER,
+                    PRIMARY KEY (company_code, fetched_at)
+                )
+            """)
+        self._initialized = True
+
+    def blob_path(self, sha256: str) -> str:
+        """Path of the compressed body for a content hash"""
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}.html.gz")
+
+    def put(self, company_code: str, url: str, html: str, fetched_at: Optional[datetime] = None) -> str:
+        """
+        Store a fetched page and log the fetch
+
+        Args:
+            company_code: Code the page was fetched for
+            url: Final URL that served the page
+            html: Page body
+            fetched_at: Fetch time (default: now)
+
+        Returns:
+            SHA-256 hex digest of the body
+        """
+        self._ensure_index()
+        body = html.encode('utf-8')
+        sha256 = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(sha256)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)  # Atomic: readers never see partial blobs
+
+        fetched_at = fetched_at or datetime.now()
+        with pooled_connection(self.index_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO page_fetches VALUES (?, ?, ?, ?, ?)",
+                (company_code, fetched_at.isoformat(), url, sha256, len(body))
+            )
+        return sha256
+
+    def get(self, sha256: str) -> Optional[str]:
+        """Page body for a content hash, or None if not stored"""
+        path = self.blob_path(sha256)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def latest(self, company_code: str, max_age: Optional[timedelta] = None) -> Optional[Dict]:
+        """
+        Most recent fetch of a company page
+
+        Args:
+            company_code: Company code
+            max_age: Ignore fetches older than this (default: any age)
+
+        Returns:
+            Dict with company_code, url, sha256, fetched_at (datetime), or None
+        """
+        entries = self.entries([company_code])
+        if not entries:
+            return None
+        entry = entries[0]
+        if max_age is not None and datetime.now() - entry['fetched_at'] > max_age:
+            return None
+        return entry
+
+    def entries(self, company_codes: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Latest fetch per company
+
+        Args:
+            company_codes: Restrict to these codes (default: whole cache)
+
+        Returns:
+            List of dicts with company_code, url, sha256, fetched_at
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        query = """
+            SELECT company_code, url, sha256, MAX(fetched_at)
+            FROM page_fetches
+        """
+        params = ()
+        if company_codes is not None:
+            query += f" WHERE company_code IN ({','.join('?' * len(company_codes))})"
+            params = tuple(company_codes)
+        query += " GROUP BY company_code ORDER BY company_code"
+
+        with pooled_connection(self.index_path, read_only=True) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'company_code': code,
+                'url': url,
+                'sha256': sha256,
+                'fetched_at': datetime.fromisoformat(fetched_at)
+            }
+            for code, url, sha256, fetched_at in rows
+        ]
@@ -5,15 +5,44 @@ Provides reliable financial data extraction with validation and fallback mechani
 
 import requests
 from bs4 import BeautifulSoup
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 import time
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.fiscal_year_utils import IndianFiscalYear, DataTimestamp
+from data_sources.raw_page_cache import RawPageCache
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+DEFAULT_CACHE_DIR = "data/screener_cache"
+
+# Below this many cached pages, re-parsing in-process beats pool start-up
+PARALLEL_PARSE_MIN_PAGES = 16
+
+# Per-process parser for pool workers (no session or cache needed)
+_worker_parser = None
+
+
+def _parse_cached_page(cache_dir: str, company_code: str, sha256: str, fetched_at: datetime) -> Dict:
+    """Pool worker: read one cached page and parse it"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ScreenerEnhancedFetcher(cache_dir=None)
+
+    html = RawPageCache(cache_dir).get(sha256)
+    if html is None:
+        return _worker_parser._error_result(company_code, DataTimestamp.create_timestamp(fetched_at),
+                                            f'Cached page {sha256} missing')
+    return _worker_parser.parse_company_page(company_code, html, fetched_at)
 
 
 class ScreenerEnhancedFetcher:
@@ -24,9 +53,15 @@ class ScreenerEnhancedFetcher:
     - Data validation
     - Fallback mechanisms
     - Comprehensive logging
+    - Raw page cache (re-parse offline without re-scraping)
     """
 
-    def __init__(self, rate_limit_seconds: float = 1.0):
+    def __init__(self, rate_limit_seconds: float = 1.0, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            rate_limit_seconds: Minimum gap between requests
+            cache_dir: Raw page cache directory (None disables caching)
+        """
         self.base_url = "https://www.screener.in"
         self.rate_limit_seconds = rate_limit_seconds
         self.last_request_time = 0
@@ -42,6 +77,7 @@ class ScreenerEnhancedFetcher:
         })
         self.retry_count = 3
         self.timeout = 15
+        self.cache = RawPageCache(cache_dir) if cache_dir else None
 
     def _enforce_rate_limit(self):
         """Enforce rate limiting between requests"""
@@ -90,42 +126,89 @@ class ScreenerEnhancedFetcher:
 
         return None
 
-    def fetch_company_data(self, company_code: str) -> Optional[Dict]:
+    def fetch_company_data(
+        self, company_code: str, max_cache_age_hours: Optional[float] = None
+    ) -> Optional[Dict]:
         """
         Fetch comprehensive company data from Screener.in
 
         Args:
             company_code: NSE symbol or BSE code
+            max_cache_age_hours: Serve a cached page this fresh instead of
+                fetching (default: always fetch)
 
         Returns:
             Dict with company data and confidence scores
         """
-        timestamp = DataTimestamp.create_timestamp()
+        if self.cache and max_cache_age_hours is not None:
+            cached = self.cache.latest(company_code, timedelta(hours=max_cache_age_hours))
+            if cached:
+                html = self.cache.get(cached['sha256'])
+                if html is not None:
+                    return self.parse_company_page(company_code, html, cached['fetched_at'])
+
+        fetched = self._fetch_page(company_code)
+        if not fetched:
+            return self._error_result(company_code, DataTimestamp.create_timestamp(),
+                                      'Failed to fetch data after retries')
+
+        url, html, fetched_at = fetched
+        if self.cache:
+            try:
+                self.cache.put(company_code, url, html, fetched_at)
+            except Exception as e:
+                print(f"Error caching page for {company_code}: {e}")
 
-        # Try different URL patterns
+        return self.parse_company_page(company_code, html, fetched_at)
+
+    def _fetch_page(self, company_code: str) -> Optional[Tuple[str, str, datetime]]:
+        """
+        Download a company page, trying each URL pattern
+
+        Returns:
+            (url, html, fetched_at) or None if all URLs fail
+        """
         urls_to_try = [
             f"{self.base_url}/company/{company_code}/",
             f"{self.base_url}/company/{company_code.upper()}/",
             f"{self.base_url}/company/{company_code.lower()}/"
         ]
 
-        response = None
         for url in urls_to_try:
             response = self._make_request(url)
             if response:
-                break
+                return url, response.text, datetime.now()
 
-        if not response:
-            return {
-                'company_code': company_code,
-                'fetch_timestamp': timestamp,
-                'source': 'SCREENER_ENHANCED',
-                'status': 'error',
-                'error': 'Failed to fetch data after retries'
-            }
+        return None
+
+    def _error_result(self, company_code: str, timestamp: Dict, error: str) -> Dict:
+        """Result dict for a failed fetch or parse"""
+        return {
+            'company_code': company_code,
+            'fetch_timestamp': timestamp,
+            'source': 'SCREENER_ENHANCED',
+            'status': 'error',
+            'error': error
+        }
+
+    def parse_company_page(
+        self, company_code: str, html: str, fetched_at: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Parse a company page into company data (no network access)
+
+        Args:
+            company_code: NSE symbol or BSE code
+            html: Raw page body
+            fetched_at: When the page was fetched (default: now)
+
+        Returns:
+            Dict with company data and confidence scores
+        """
+        timestamp = DataTimestamp.create_timestamp(fetched_at)
 
         try:
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
 
             # Extract company info
             company_data = {
@@ -171,13 +254,41 @@ class ScreenerEnhancedFetcher:
             return company_data
 
         except Exception as e:
-            return {
-                'company_code': company_code,
-                'fetch_timestamp': timestamp,
-                'source': 'SCREENER_ENHANCED',
-                'status': 'error',
-                'error': f'Parse error: {str(e)}'
-            }
+            return self._error_result(company_code, timestamp, f'Parse error: {str(e)}')
+
+    def reparse_cache(
+        self, company_codes: Optional[List[str]] = None, workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Re-parse the latest cached page of every company, offline
+
+        Args:
+            company_codes: Restrict to these codes (default: whole cache)
+            workers: Parser processes (default: CPU count)
+
+        Returns:
+            Dict of company_code -> company data
+        """
+        if not self.cache:
+            return {}
+
+        entries = self.cache.entries(company_codes)
+        args = (
+            [self.cache.cache_dir] * len(entries),
+            [e['company_code'] for e in entries],
+            [e['sha256'] for e in entries],
+            [e['fetched_at'] for e in entries]
+        )
+
+        if len(entries) >= PARALLEL_PARSE_MIN_PAGES:
+            workers = workers or os.cpu_count() or 1
+            chunksize = max(1, len(entries) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_parse_cached_page, *args, chunksize=chunksize))
+        else:
+            results = list(map(_parse_cached_page, *args))
+
+        return {data['company_code']: data for data in results}
 
     def _extract_ratios(self, soup: BeautifulSoup) -> Optional[Dict]:
         """Extract key financial ratios"""
@@ -499,13 +610,19 @@ class ScreenerEnhancedFetcher:
         # Cap between 0 and 100
         return max(0, min(100, confidence))
 
-    def fetch_peer_comparison(self, company_code: str, peer_codes: List[str]) -> Dict:
+    def fetch_peer_comparison(
+        self, company_code: str, peer_codes: List[str], max_cache_age_hours: Optional[float] = 24
+    ) -> Dict:
         """
         Fetch data for peer comparison
 
+        Pages fetched within max_cache_age_hours are parsed from the raw
+        cache instead of being downloaded again.
+
         Args:
             company_code: Primary company code
             peer_codes: List of peer company codes
+            max_cache_age_hours: Cache freshness limit (None: always fetch)
 
         Returns:
             Comparison data with all peers
@@ -517,13 +634,13 @@ class ScreenerEnhancedFetcher:
         }
 
         # Fetch primary company
-        primary_data = self.fetch_company_data(company_code)
+        primary_data = self.fetch_company_data(company_code, max_cache_age_hours)
         if primary_data:
             comparison['companies'][company_code] = primary_data
 
         # Fetch peer companies
         for peer in peer_codes[:5]:  # Limit to 5 peers
-            peer_data = self.fetch_company_data(peer)
+            peer_data = self.fetch_company_data(peer, max_cache_age_hours)
             if peer_data:
                 comparison['companies'][peer] = peer_data
 
@@ -11,6 +11,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.fiscal_year_utils import DataTimestamp
+from tools.db_utils import configure_connection
 
 
 class ValidationDatabase:
@@ -25,7 +26,7 @@ class ValidationDatabase:
 
     def initialize_database(self):
         """Create database tables if they don't exist"""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = configure_connection(sqlite3.connect(self.db_path, timeout=30.0))
         cursor = self.conn.cursor()
 
         # Source tracking table
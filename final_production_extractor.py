@@ -1,303 +1,18 @@
-import pdfplumber
-import pandas as pd
 import json
-import re
 from pathlib import Path
-from typing import Dict, List, Optional
-import warnings
-warnings.filterwarnings('ignore')
+from indian_pdf_extractor import IndianFinancialPDFExtractor as _PagedExtractor
 
-class IndianFinancialPDFExtractor:
+
+class IndianFinancialPDFExtractor(_PagedExtractor):
     """
     PRODUCTION-READY: 100% Automated Indian BSE/NSE Earnings PDF Extractor
     Multi-strategy extraction with 80%+ success rate guarantee
+
+    Shares the cached page model and strategies of indian_pdf_extractor,
+    without the OCR fallback.
     """
-    
-    def __init__(self):
-        self.keywords = {
-            'revenue': [
-                'revenue from operations', 'total revenue', 'revenue (net)',
-                'revenue from operation', 'total income', 'sales', 'turnover',
-                'income from operations', 'operating revenue'
-            ],
-            'profit': [
-                'net profit', 'profit after tax', 'pat', 'profit for the period',
-                'profit for the year', 'profit attributable', 'profit (loss) for',
-                'profit before tax', 'pbt'
-            ],
-            'eps': [
-                'earnings per share', 'eps', 'earning per equity share',
-                'basic eps', 'diluted eps', 'per share', 'earnings per equity'
-            ]
-        }
-        
-    def extract_from_pdf(self, pdf_path: str) -> Dict:
-        """Extract financial data using multi-strategy approach"""
-        result = {
-            'file': Path(pdf_path).name,
-            'company_name': self._extract_company_name(pdf_path),
-            'status': 'failed',
-            'data': {},
-            'error': None,
-            'method': None
-        }
-        
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Try all extraction strategies
-                strategies = [
-                    ('text_patterns', self._extract_via_text),
-                    ('table_extraction', self._extract_via_tables),
-                    ('deep_analysis', self._extract_deep),
-                    ('aggressive_extraction', self._extract_aggressive),
-                ]
-                
-                for name, func in strategies:
-                    data = func(pdf)
-                    if data and len(data) >= 2:
-                        result['data'] = data
-                        result['status'] = 'success'
-                        result['method'] = name
-                        return result
-                
-                result['error'] = 'No data extracted'
-                    
-        except Exception as e:
-            result['error'] = f'{type(e).__name__}: {str(e)}'
-            
-        return result
-    
-    def _extract_company_name(self, pdf_path: str) -> str:
-        filename = Path(pdf_path).stem
-        parts = filename.split('_', 1)
-        return parts[1].replace('_', ' ') if len(parts) > 1 else filename
-    
-    def _extract_via_text(self, pdf) -> Optional[Dict]:
-        """Primary strategy: Text pattern matching"""
-        for page in pdf.pages[:20]:  # Check more pages
-            text = page.extract_text()
-            if not text:
-                continue
-            
-            metrics = {}
-            lines = text.split('\n')
-            
-            for line in lines:
-                line_clean = ' '.join(line.split())
-                line_lower = line_clean.lower()
-                
-                if not metrics.get('revenue'):
-                    for kw in self.keywords['revenue']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['revenue'] = nums
-                                break
-                
-                if not metrics.get('profit'):
-                    for kw in self.keywords['profit']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['profit'] = nums
-                                break
-                
-                if not metrics.get('eps'):
-                    for kw in self.keywords['eps']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['eps'] = nums
-                                break
-            
-            if len(metrics) >= 2:
-                return metrics
-        
-        return None
-    
-    def _extract_via_tables(self, pdf) -> Optional[Dict]:
-        """Secondary strategy: Table extraction"""
-        for page in pdf.pages[:20]:
-            try:
-                tables = page.extract_tables()
-                for table in tables:
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    metrics = {}
-                    for row in table:
-                        if not row:
-                            continue
-                        
-                        row_text = ' '.join(str(c).lower() for c in row if c)
-                        
-                        if not metrics.get('revenue'):
-                            for kw in self.keywords['revenue']:
-                                if kw in row_text:
-                                    nums = self._get_numbers_from_list(row)
-                                    if nums:
-                                        metrics['revenue'] = nums
-                                        break
-                        
-                        if not metrics.get('profit'):
-                            for kw in self.keywords['profit']:
-                                if kw in row_text:
-                                    nums = self._get_numbers_from_list(row)
-                                    if nums:
-                                        metrics['profit'] = nums
-                                        break
-                        
-                        if not metrics.get('eps'):
-                            for kw in self.keywords['eps']:
-                                if kw in row_text:
-                                    nums = self._get_numbers_from_list(row)
-                                    if nums:
-                                        metrics['eps'] = nums
-                                        break
-                    
-                    if len(metrics) >= 2:
-                        return metrics
-            except:
-                continue
-        
-        return None
-    
-    def _extract_deep(self, pdf) -> Optional[Dict]:
-        """Tertiary strategy: Deep contextual search"""
-        full_text = ''
-        for page in pdf.pages[:20]:
-            text = page.extract_text()
-            if text:
-                full_text += text + '\n'
-        
-        if not full_text:
-            return None
-        
-        lines = full_text.split('\n')
-        metrics = {}
-        
-        # Look for statement sections
-        in_results_section = False
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            
-            # Detect results section
-            if any(x in line_lower for x in ['statement of profit', 'profit and loss', 
-                                              'statement of income', 'financial results']):
-                in_results_section = True
-            
-            if in_results_section:
-                for kw in self.keywords['revenue']:
-                    if kw in line_lower and not metrics.get('revenue'):
-                        nums = self._get_numbers(line)
-                        if nums:
-                            metrics['revenue'] = nums
-                
-                for kw in self.keywords['profit']:
-                    if kw in line_lower and not metrics.get('profit'):
-                        nums = self._get_numbers(line)
-                        if nums:
-                            metrics['profit'] = nums
-                
-                for kw in self.keywords['eps']:
-                    if kw in line_lower and not metrics.get('eps'):
-                        nums = self._get_numbers(line)
-                        if nums:
-                            metrics['eps'] = nums
-            
-            if len(metrics) >= 2:
-                return metrics
-        
-        return None
-    
-    def _extract_aggressive(self, pdf) -> Optional[Dict]:
-        """Last resort: Aggressive extraction"""
-        all_revenue, all_profit, all_eps = [], [], []
-        
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            
-            for line in text.split('\n'):
-                line_lower = line.lower()
-                
-                if any(kw in line_lower for kw in self.keywords['revenue']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_revenue.append(nums)
-                
-                if any(kw in line_lower for kw in self.keywords['profit']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_profit.append(nums)
-                
-                if any(kw in line_lower for kw in self.keywords['eps']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_eps.append(nums)
-        
-        # Take first valid occurrence
-        metrics = {}
-        if all_revenue:
-            metrics['revenue'] = all_revenue[0]
-        if all_profit:
-            metrics['profit'] = all_profit[0]
-        if all_eps:
-            metrics['eps'] = all_eps[0]
-        
-        return metrics if len(metrics) >= 2 else None
-    
-    def _get_numbers(self, text: str) -> Optional[Dict]:
-        """Extract numbers from text string"""
-        numbers = []
-        matches = re.findall(r'-?\d+[,\d]*\.?\d*', text)
-        
-        for m in matches:
-            try:
-                num = float(m.replace(',', ''))
-                if 1900 <= abs(num) <= 2100:  # Skip years
-                    continue
-                numbers.append(num)
-            except:
-                continue
-        
-        return self._format_nums(numbers)
-    
-    def _get_numbers_from_list(self, items: List) -> Optional[Dict]:
-        """Extract numbers from list of items"""
-        numbers = []
-        for item in items:
-            if not item:
-                continue
-            matches = re.findall(r'-?\d+[,\d]*\.?\d*', str(item))
-            for m in matches:
-                try:
-                    num = float(m.replace(',', ''))
-                    if 1900 <= abs(num) <= 2100:
-                        continue
-                    numbers.append(num)
-                except:
-                    continue
-        
-        return self._format_nums(numbers)
-    
-    def _format_nums(self, nums: List[float]) -> Optional[Dict]:
-        """Format numbers into standard output"""
-        if not nums:
-            return None
-        
-        result = {}
-        if len(nums) >= 1:
-            result['current_quarter_cr'] = nums[0]
-        if len(nums) >= 2:
-            result['previous_quarter_cr'] = nums[1]
-        if len(nums) >= 3:
-            result['yoy_quarter_cr'] = nums[2]
-        if len(nums) >= 4:
-            result['current_half_year_cr'] = nums[3]
-        
-        return result
+
+    use_ocr = False
 
 
 def main():
@@ -316,16 +31,13 @@ def main():
     
     print(f'Found {len(pdf_files)} PDFs to process\n')
     
-    results = []
+    results = extractor.extract_batch(pdf_files)
     success = 0
     
-    for i, pdf_path in enumerate(pdf_files, 1):
+    for i, (pdf_path, result) in enumerate(zip(pdf_files, results), 1):
         name = pdf_path.name
         print(f'[{i:2d}/{len(pdf_files)}] {name[:55]:<55}', end=' ')
         
-        result = extractor.extract_from_pdf(str(pdf_path))
-        results.append(result)
-        
         if result['status'] == 'success':
             success += 1
             print(f'✓ ({result["method"]})')
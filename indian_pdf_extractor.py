@@ -1,19 +1,154 @@
-import pdfplumber
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+import hashlib
+import os
 import pandas as pd
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+DEFAULT_PAGE_CACHE_DIR = 'data/pdf_page_cache'
+
+# Phrases that mark a page as likely holding the P&L statement
+PNL_PAGE_MARKERS = [
+    'statement of profit', 'profit and loss', 'financial results',
+    'statement of income', 'quarter ended', 'revenue from operations',
+    'total income', 'profit for the period', 'earnings per share'
+]
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes, streamed"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PDFPageModel:
+    """
+    Lazily extracted, memoized view of a PDF's pages
+
+    Text, tables and OCR text are each extracted at most once per page and
+    stored on disk under cache_dir/<sha[:2]>/<sha>/<page>.json, so re-runs
+    and later strategies never touch pdfplumber for a page already seen.
+    """
+
+    def __init__(self, pdf_path: str, pdf=None, cache_dir: Optional[str] = None):
+        self.pdf_path = pdf_path
+        self.pdf = pdf
+        self.file_hash = file_sha256(pdf_path)
+        self.cache_dir = (
+            os.path.join(cache_dir, self.file_hash[:2], self.file_hash) if cache_dir else None
+        )
+        self._pages: Dict[int, Dict] = {}
+        self._num_pages = len(pdf.pages) if pdf is not None else None
+
+    @property
+    def num_pages(self) -> int:
+        if self._num_pages is None:
+            meta = self._read_json('meta')
+            if meta is None:
+                self._num_pages = len(self._open().pages)
+                self._write_json('meta', {'num_pages': self._num_pages})
+            else:
+                self._num_pages = meta['num_pages']
+        return self._num_pages
+
+    def text(self, index: int) -> str:
+        return self._get(index, 'text', lambda: self._open().pages[index].extract_text() or '')
+
+    def tables(self, index: int) -> List:
+        return self._get(index, 'tables', lambda: self._open().pages[index].extract_tables() or [])
+
+    def ocr_text(self, index: int) -> str:
+        """Tesseract text of one page (raises ImportError without OCR deps)"""
+        def run_ocr():
+            import pytesseract
+            from pdf2image import convert_from_path
+            images = convert_from_path(self.pdf_path, first_page=index + 1, last_page=index + 1)
+            return ''.join(pytesseract.image_to_string(img) + '\n' for img in images)
+        return self._get(index, 'ocr_text', run_ocr)
+
+    def score_page(self, index: int) -> int:
+        """Count of P&L markers on a page (higher = more likely the results table)"""
+        text = self.text(index).lower()
+        return sum(text.count(marker) for marker in PNL_PAGE_MARKERS)
+
+    def ranked_pages(self, limit: int) -> List[int]:
+        """First `limit` pages, most P&L-like first (ties keep document order)"""
+        pages = range(min(limit, self.num_pages))
+        return sorted(pages, key=lambda i: -self.score_page(i))
+
+    def close(self):
+        if self.pdf is not None:
+            self.pdf.close()
+            self.pdf = None
+
+    def _open(self):
+        if self.pdf is None:
+            self.pdf = pdfplumber.open(self.pdf_path)
+        return self.pdf
+
+    def _get(self, index: int, field: str, extract):
+        page = self._pages.get(index)
+        if page is None:
+            page = self._read_json(str(index)) or {}
+            self._pages[index] = page
+        if field not in page:
+            page[field] = extract()
+            self._write_json(str(index), page)
+        return page[field]
+
+    def _read_json(self, name: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f'{name}.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, name: str, data: Dict):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f'{name}.json')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _extract_worker(extractor: 'IndianFinancialPDFExtractor', pdf_path: str) -> Dict:
+    """Batch worker: extract one PDF with a pickled copy of the extractor"""
+    return extractor.extract_from_pdf(pdf_path)
+
+
 class IndianFinancialPDFExtractor:
     """
     PRODUCTION-READY: 100% Automated Indian BSE/NSE Earnings PDF Extractor
     Multi-strategy extraction with 80%+ success rate guarantee
     """
-    
-    def __init__(self):
+
+    use_ocr = True
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_PAGE_CACHE_DIR, max_pages: int = 20):
+        """
+        Args:
+            cache_dir: Page cache directory (None keeps pages in memory only)
+            max_pages: Pages searched by the text, table and deep strategies
+        """
+        self.cache_dir = cache_dir
+        self.max_pages = max_pages
         self.keywords = {
             'revenue': [
                 'revenue from operations', 'total revenue', 'revenue (net)',
@@ -30,7 +165,7 @@ class IndianFinancialPDFExtractor:
                 'basic eps', 'diluted eps', 'per share', 'earnings per equity'
             ]
         }
-        
+
     def extract_from_pdf(self, pdf_path: str) -> Dict:
         """Extract financial data using multi-strategy approach"""
         result = {
@@ -41,91 +176,122 @@ class IndianFinancialPDFExtractor:
             'error': None,
             'method': None
         }
-        
+
+        if not PDFPLUMBER_AVAILABLE:
+            result['error'] = 'pdfplumber not installed'
+            return result
+
+        model = None
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Try all extraction strategies
-                strategies = [
-                    ('text_patterns', self._extract_via_text),
-                    ('table_extraction', self._extract_via_tables),
-                    ('deep_analysis', self._extract_deep),
-                    ('aggressive_extraction', self._extract_aggressive),
-                    ('ocr_fallback', self._extract_via_ocr),  # NEW: OCR Strategy
-                ]
-                
-                for name, func in strategies:
-                    # Pass pdf object for standard methods, path for OCR
-                    if name == 'ocr_fallback':
-                        data = func(pdf_path)
-                    else:
-                        data = func(pdf)
-                        
-                    if data and len(data) >= 2:
-                        result['data'] = data
-                        result['status'] = 'success'
-                        result['method'] = name
-                        return result
-                
-                result['error'] = 'No data extracted (even with OCR)'
-                    
+            # Pages are opened lazily: a fully cached PDF is never parsed again
+            model = PDFPageModel(pdf_path, cache_dir=self.cache_dir)
+
+            # Strategies run cheapest first and stop at the first hit
+            strategies = [
+                ('text_patterns', self._extract_via_text),
+                ('table_extraction', self._extract_via_tables),
+                ('deep_analysis', self._extract_deep),
+                ('aggressive_extraction', self._extract_aggressive),
+            ]
+            if self.use_ocr:
+                strategies.append(('ocr_fallback', self._extract_via_ocr))
+
+            for name, func in strategies:
+                data = func(model)
+                if data and len(data) >= 2:
+                    result['data'] = data
+                    result['status'] = 'success'
+                    result['method'] = name
+                    return result
+
+            result['error'] = 'No data extracted (even with OCR)' if self.use_ocr else 'No data extracted'
+
         except Exception as e:
             result['error'] = f'{type(e).__name__}: {str(e)}'
-            
+        finally:
+            if model is not None:
+                model.close()
+
         return result
-    
+
+    def extract_batch(self, pdf_paths: List[str], workers: Optional[int] = None) -> List[Dict]:
+        """
+        Extract many PDFs across processes
+
+        Args:
+            pdf_paths: PDF files to extract
+            workers: Worker processes (default: CPU count)
+
+        Returns:
+            Results in the same order as pdf_paths
+        """
+        pdf_paths = [str(p) for p in pdf_paths]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pdf_paths) < 2:
+            return [self.extract_from_pdf(p) for p in pdf_paths]
+
+        chunksize = max(1, len(pdf_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                _extract_worker, [self] * len(pdf_paths), pdf_paths, chunksize=chunksize
+            ))
+
     def _extract_company_name(self, pdf_path: str) -> str:
         filename = Path(pdf_path).stem
         parts = filename.split('_', 1)
         return parts[1].replace('_', ' ') if len(parts) > 1 else filename
     
-    def _extract_via_text(self, pdf) -> Optional[Dict]:
-        """Primary strategy: Text pattern matching"""
-        for page in pdf.pages[:20]:  # Check more pages
-            text = page.extract_text()
+    def _extract_via_text(self, model: PDFPageModel) -> Optional[Dict]:
+        """Primary strategy: Text pattern matching, most P&L-like pages first"""
+        for index in model.ranked_pages(self.max_pages):
+            text = model.text(index)
             if not text:
                 continue
-            
-            metrics = {}
-            lines = text.split('\n')
-            
-            for line in lines:
-                line_clean = ' '.join(line.split())
-                line_lower = line_clean.lower()
-                
-                if not metrics.get('revenue'):
-                    for kw in self.keywords['revenue']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['revenue'] = nums
-                                break
-                
-                if not metrics.get('profit'):
-                    for kw in self.keywords['profit']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['profit'] = nums
-                                break
-                
-                if not metrics.get('eps'):
-                    for kw in self.keywords['eps']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['eps'] = nums
-                                break
-            
+
+            metrics = self._match_lines(text.split('\n'))
             if len(metrics) >= 2:
                 return metrics
-        
+
         return None
-    
-    def _extract_via_tables(self, pdf) -> Optional[Dict]:
-        """Secondary strategy: Table extraction"""
-        for page in pdf.pages[:20]:
+
+    def _match_lines(self, lines: List[str]) -> Dict:
+        """First line per metric whose keyword match carries numbers"""
+        metrics = {}
+        for line in lines:
+            line_clean = ' '.join(line.split())
+            line_lower = line_clean.lower()
+            
+            if not metrics.get('revenue'):
+                for kw in self.keywords['revenue']:
+                    if kw in line_lower:
+                        nums = self._get_numbers(line_clean)
+                        if nums:
+                            metrics['revenue'] = nums
+                            break
+            
+            if not metrics.get('profit'):
+                for kw in self.keywords['profit']:
+                    if kw in line_lower:
+                        nums = self._get_numbers(line_clean)
+                        if nums:
+                            metrics['profit'] = nums
+                            break
+            
+            if not metrics.get('eps'):
+                for kw in self.keywords['eps']:
+                    if kw in line_lower:
+                        nums = self._get_numbers(line_clean)
+                        if nums:
+                            metrics['eps'] = nums
+                            break
+
+        return metrics
+
+    def _extract_via_tables(self, model: PDFPageModel) -> Optional[Dict]:
+        """Secondary strategy: Table extraction, most P&L-like pages first"""
+        for index in model.ranked_pages(self.max_pages):
             try:
-                tables = page.extract_tables()
+                tables = model.tables(index)
                 for table in tables:
                     if not table or len(table) < 2:
                         continue
@@ -168,11 +334,11 @@ class IndianFinancialPDFExtractor:
         
         return None
     
-    def _extract_deep(self, pdf) -> Optional[Dict]:
-        """Tertiary strategy: Deep contextual search"""
+    def _extract_deep(self, model: PDFPageModel) -> Optional[Dict]:
+        """Tertiary strategy: Deep contextual search (document order)"""
         full_text = ''
-        for page in pdf.pages[:20]:
-            text = page.extract_text()
+        for index in range(min(self.max_pages, model.num_pages)):
+            text = model.text(index)
             if text:
                 full_text += text + '\n'
         
@@ -216,103 +382,50 @@ class IndianFinancialPDFExtractor:
         
         return None
     
-    def _extract_aggressive(self, pdf) -> Optional[Dict]:
-        """Last resort: Aggressive extraction"""
-        all_revenue, all_profit, all_eps = [], [], []
-        
-        for page in pdf.pages:
-            text = page.extract_text()
+    def _extract_aggressive(self, model: PDFPageModel) -> Optional[Dict]:
+        """Last resort: Aggressive extraction (first valid occurrence anywhere)"""
+        metrics = {}
+
+        for index in range(model.num_pages):
+            text = model.text(index)
             if not text:
                 continue
-            
+
             for line in text.split('\n'):
                 line_lower = line.lower()
-                
-                if any(kw in line_lower for kw in self.keywords['revenue']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_revenue.append(nums)
-                
-                if any(kw in line_lower for kw in self.keywords['profit']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_profit.append(nums)
-                
-                if any(kw in line_lower for kw in self.keywords['eps']):
-                    nums = self._get_numbers(line)
-                    if nums:
-                        all_eps.append(nums)
-        
-        # Take first valid occurrence
-        metrics = {}
-        if all_revenue:
-            metrics['revenue'] = all_revenue[0]
-        if all_profit:
-            metrics['profit'] = all_profit[0]
-        if all_eps:
-            metrics['eps'] = all_eps[0]
-        
+
+                for metric in ('revenue', 'profit', 'eps'):
+                    if metric not in metrics and any(kw in line_lower for kw in self.keywords[metric]):
+                        nums = self._get_numbers(line)
+                        if nums:
+                            metrics[metric] = nums
+
+            # Later pages cannot change a first occurrence
+            if len(metrics) == 3:
+                break
+
         return metrics if len(metrics) >= 2 else None
     
-    def _extract_via_ocr(self, pdf_path: str) -> Optional[Dict]:
+    def _extract_via_ocr(self, model: PDFPageModel) -> Optional[Dict]:
         """
         OCR Strategy: Use Tesseract to read scanned PDFs.
         Requires 'tesseract' and 'pdf2image' to be installed.
         """
         try:
-            import pytesseract
-            from pdf2image import convert_from_path
-            
-            # Convert first 3 pages to images (usually results are on page 1-2)
-            images = convert_from_path(pdf_path, first_page=1, last_page=3)
-            
-            full_text = ""
-            for img in images:
-                text = pytesseract.image_to_string(img)
-                full_text += text + "\n"
-            
+            # First 3 pages (usually results are on page 1-2)
+            full_text = ''.join(model.ocr_text(i) for i in range(min(3, model.num_pages)))
+
             # Reuse text extraction logic on OCR output
-            metrics = {}
-            lines = full_text.split('\n')
-            
-            for line in lines:
-                line_clean = ' '.join(line.split())
-                line_lower = line_clean.lower()
-                
-                if not metrics.get('revenue'):
-                    for kw in self.keywords['revenue']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['revenue'] = nums
-                                break
-                
-                if not metrics.get('profit'):
-                    for kw in self.keywords['profit']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['profit'] = nums
-                                break
-                
-                if not metrics.get('eps'):
-                    for kw in self.keywords['eps']:
-                        if kw in line_lower:
-                            nums = self._get_numbers(line_clean)
-                            if nums:
-                                metrics['eps'] = nums
-                                break
-            
+            metrics = self._match_lines(full_text.split('\n'))
             if len(metrics) >= 2:
                 return metrics
-                
+
         except ImportError:
-            # print("Warning: pytesseract or pdf2image not installed. Skipping OCR.")
+            # pytesseract or pdf2image not installed
             pass
-        except Exception as e:
-            # print(f"OCR Error: {e}")
+        except Exception:
             pass
-            
+
         return None
 
     def _get_numbers(self, text: str) -> Optional[Dict]:
@@ -383,16 +496,13 @@ def main():
     
     print(f'Found {len(pdf_files)} PDFs to process\n')
     
-    results = []
+    results = extractor.extract_batch(pdf_files)
     success = 0
     
-    for i, pdf_path in enumerate(pdf_files, 1):
+    for i, (pdf_path, result) in enumerate(zip(pdf_files, results), 1):
         name = pdf_path.name
         print(f'[{i:2d}/{len(pdf_files)}] {name[:55]:<55}', end=' ')
         
-        result = extractor.extract_from_pdf(str(pdf_path))
-        results.append(result)
-        
         if result['status'] == 'success':
             success += 1
             print(f'✓ ({result["method"]})')
@@ -3,6 +3,8 @@ Monitoring Package (Epic 5)
 
 Provides monitoring and alerting capabilities:
 - Performance monitoring (Story 5.1)
+- Hot-path stage instrumentation (Story 5.1 follow-up)
+- Sampling profiler with flamegraph export (Story 5.1 follow-up)
 - Data drift detection (Story 5.2)
 - Model degradation alerts (Story 5.3)
 - Structured logging (Story 5.4)
@@ -13,10 +15,34 @@ Created: 2025-11-14
 """
 
 from monitoring.performance_monitor import PerformanceMonitor, get_metrics_text
+from monitoring.instrumentation import (
+    StageInstrumentation,
+    get_instrumentation,
+    instrument_stage,
+    instrumentation_enabled,
+    set_instrumentation_enabled,
+    track_stage
+)
+from monitoring.profiler import (
+    SamplingProfiler,
+    capture_profile,
+    get_capture_status,
+    start_capture
+)
 
 __all__ = [
     'PerformanceMonitor',
     'get_metrics_text',
+    'StageInstrumentation',
+    'get_instrumentation',
+    'instrument_stage',
+    'instrumentation_enabled',
+    'set_instrumentation_enabled',
+    'track_stage',
+    'SamplingProfiler',
+    'capture_profile',
+    'get_capture_status',
+    'start_capture',
 ]
 
 __version__ = '1.0.0'
@@ -8,6 +8,12 @@ Monitors model performance degradation in production:
 - Generates performance reports
 - Recommends model rollback when needed
 
+Production metrics are served from per-day accumulators
+(production_metric_buckets): confusion-matrix counts plus probability
+histograms per (model_version, prediction_date), maintained as labels are
+stored. A rolling window is a sum over at most window_days rows, independent
+of how many labels were collected.
+
 Author: VCP ML Team
 Created: 2025-11-14
 """
@@ -16,9 +22,71 @@ import sqlite3
 import json
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
-from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
 import numpy as np
 
+# Probability histogram resolution for ROC-AUC / calibration (bin width 0.001)
+PROBA_BINS = 1000
+CALIBRATION_BINS = 10
+
+
+# Confusion-matrix cell for each (actual_label, predicted_label) pair
+CONFUSION_CELLS = {(1, 1): 'tp', (0, 1): 'fp', (0, 0): 'tn', (1, 0): 'fn'}
+
+
+def _confusion_cell(actual_label: Any, predicted_label: Any) -> str:
+    """Confusion-matrix cell of a label pair; both labels must be 0 or 1"""
+    for name, value in (('actual_label', actual_label), ('predicted_label', predicted_label)):
+        if value not in (0, 1):
+            raise ValueError(f"{name} must be 0 or 1, got {value!r}")
+    return CONFUSION_CELLS[(int(actual_label), int(predicted_label))]
+
+
+def _proba_bin(probability: float) -> int:
+    return min(max(int(probability * PROBA_BINS), 0), PROBA_BINS - 1)
+
+
+def _histogram_blob(hist: np.ndarray) -> bytes:
+    return hist.astype(np.int64).tobytes()
+
+
+def _histogram_from_blob(blob: Optional[bytes]) -> np.ndarray:
+    if not blob:
+        return np.zeros(PROBA_BINS, dtype=np.int64)
+    return np.frombuffer(blob, dtype=np.int64).copy()
+
+
+def binned_roc_auc(pos_hist: np.ndarray, neg_hist: np.ndarray) -> Optional[float]:
+    """
+    ROC-AUC from per-bin positive/negative counts.
+
+    Equals the Mann-Whitney statistic with scores inside one bin treated as
+    ties, i.e. sklearn's roc_auc_score on probabilities rounded down to the
+    bin width. None when only one class is present.
+    """
+    n_pos = pos_hist.sum()
+    n_neg = neg_hist.sum()
+    if n_pos == 0 or n_neg == 0:
+        return None
+    # Positives ranked strictly above each negative bin, plus half the ties
+    pos_above = np.cumsum(pos_hist[::-1])[::-1] - pos_hist
+    wins = (neg_hist * pos_above).sum() + 0.5 * (neg_hist * pos_hist).sum()
+    return float(wins / (n_pos * n_neg))
+
+
+def binned_calibration_error(pos_hist: np.ndarray, neg_hist: np.ndarray) -> Optional[float]:
+    """Expected calibration error over CALIBRATION_BINS equal-width bins (bin-centre confidence)"""
+    total = pos_hist.sum() + neg_hist.sum()
+    if total == 0:
+        return None
+    centres = (np.arange(PROBA_BINS) + 0.5) / PROBA_BINS
+    group = np.arange(PROBA_BINS) * CALIBRATION_BINS // PROBA_BINS
+    counts = np.bincount(group, weights=pos_hist + neg_hist, minlength=CALIBRATION_BINS)
+    positives = np.bincount(group, weights=pos_hist, minlength=CALIBRATION_BINS)
+    confidence = np.bincount(group, weights=(pos_hist + neg_hist) * centres, minlength=CALIBRATION_BINS)
+    filled = counts > 0
+    gaps = np.abs(positives[filled] - confidence[filled])
+    return float(gaps.sum() / total)
+
 
 class ModelMonitor:
     """
@@ -69,9 +137,106 @@ class ModelMonitor:
             )
         """)
 
+        # Per-day metric accumulators, kept in step with production_labels
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS production_metric_buckets (
+                model_version TEXT NOT NULL,
+                prediction_date DATE NOT NULL,
+                tp INTEGER NOT NULL DEFAULT 0,
+                fp INTEGER NOT NULL DEFAULT 0,
+                tn INTEGER NOT NULL DEFAULT 0,
+                fn INTEGER NOT NULL DEFAULT 0,
+                with_probability INTEGER NOT NULL DEFAULT 0,
+                pos_histogram BLOB,
+                neg_histogram BLOB,
+                PRIMARY KEY (model_version, prediction_date)
+            )
+        """)
+
+        # Databases written before the accumulators existed: build them once
+        has_labels = cursor.execute("SELECT 1 FROM production_labels LIMIT 1").fetchone()
+        has_buckets = cursor.execute("SELECT 1 FROM production_metric_buckets LIMIT 1").fetchone()
+
         conn.commit()
         conn.close()
 
+        if has_labels and not has_buckets:
+            self.rebuild_metric_buckets()
+
+    @staticmethod
+    def _apply_to_bucket(
+        cursor: sqlite3.Cursor,
+        model_version: str,
+        prediction_date: str,
+        actual_label: int,
+        predicted_label: int,
+        predicted_probability: Optional[float],
+        sign: int
+    ):
+        """Add (sign=1) or remove (sign=-1) one label's contribution to its day bucket"""
+        cell = _confusion_cell(actual_label, predicted_label)
+
+        cursor.execute("""
+            INSERT OR IGNORE INTO production_metric_buckets (model_version, prediction_date)
+            VALUES (?, ?)
+        """, (model_version, prediction_date))
+        cursor.execute(f"""
+            UPDATE production_metric_buckets SET {cell} = {cell} + ?
+            WHERE model_version = ? AND prediction_date = ?
+        """, (sign, model_version, prediction_date))
+
+        if predicted_probability is None:
+            return
+
+        column = 'pos_histogram' if int(actual_label) == 1 else 'neg_histogram'
+        blob = cursor.execute(f"""
+            SELECT {column} FROM production_metric_buckets
+            WHERE model_version = ? AND prediction_date = ?
+        """, (model_version, prediction_date)).fetchone()[0]
+        hist = _histogram_from_blob(blob)
+        hist[_proba_bin(predicted_probability)] += sign
+
+        cursor.execute(f"""
+            UPDATE production_metric_buckets
+            SET {column} = ?, with_probability = with_probability + ?
+            WHERE model_version = ? AND prediction_date = ?
+        """, (_histogram_blob(hist), sign, model_version, prediction_date))
+
+    def rebuild_metric_buckets(self):
+        """Recompute all per-day accumulators from production_labels"""
+        conn = sqlite3.connect(self.predictions_db)
+        try:
+            rows = conn.execute("""
+                SELECT model_version, prediction_date, actual_label, predicted_label, predicted_probability
+                FROM production_labels
+            """).fetchall()
+
+            buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for version, day, actual, predicted, probability in rows:
+                bucket = buckets.setdefault((version, day), {
+                    'tp': 0, 'fp': 0, 'tn': 0, 'fn': 0, 'with_probability': 0,
+                    'pos': np.zeros(PROBA_BINS, dtype=np.int64),
+                    'neg': np.zeros(PROBA_BINS, dtype=np.int64)
+                })
+                bucket[_confusion_cell(actual, predicted)] += 1
+                if probability is not None:
+                    bucket['pos' if actual == 1 else 'neg'][_proba_bin(probability)] += 1
+                    bucket['with_probability'] += 1
+
+            with conn:
+                conn.execute("DELETE FROM production_metric_buckets")
+                conn.executemany("""
+                    INSERT INTO production_metric_buckets
+                    (model_version, prediction_date, tp, fp, tn, fn, with_probability, pos_histogram, neg_histogram)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (version, day, b['tp'], b['fp'], b['tn'], b['fn'], b['with_probability'],
+                     _histogram_blob(b['pos']), _histogram_blob(b['neg']))
+                    for (version, day), b in buckets.items()
+                ])
+        finally:
+            conn.close()
+
     def store_production_label(
         self,
         bse_code: str,
@@ -93,29 +258,53 @@ class ModelMonitor:
             predicted_label: Predicted label (0 or 1)
             predicted_probability: Predicted probability
             model_version: Model version (defaults to self.model_version)
+
+        Raises:
+            ValueError: If actual_label or predicted_label is not 0 or 1
         """
+        _confusion_cell(actual_label, predicted_label)
+
         if model_version is None:
             model_version = self.model_version
 
-        conn = sqlite3.connect(self.predictions_db)
+        conn = sqlite3.connect(self.predictions_db, isolation_level=None)
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO production_labels
-            (bse_code, prediction_date, earnings_date, actual_label, predicted_label, predicted_probability, model_version)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            bse_code,
-            prediction_date,
-            earnings_date,
-            actual_label,
-            predicted_label,
-            predicted_probability,
-            model_version
-        ))
+        try:
+            # Label row and its day bucket change together (IMMEDIATE: no lost bucket updates)
+            cursor.execute("BEGIN IMMEDIATE")
+
+            previous = cursor.execute("""
+                SELECT model_version, prediction_date, actual_label, predicted_label, predicted_probability
+                FROM production_labels
+                WHERE bse_code = ? AND prediction_date = ?
+            """, (bse_code, prediction_date)).fetchone()
+            if previous is not None:
+                self._apply_to_bucket(cursor, *previous, sign=-1)
+
+            cursor.execute("""
+                INSERT OR REPLACE INTO production_labels
+                (bse_code, prediction_date, earnings_date, actual_label, predicted_label, predicted_probability, model_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                bse_code,
+                prediction_date,
+                earnings_date,
+                actual_label,
+                predicted_label,
+                predicted_probability,
+                model_version
+            ))
+            self._apply_to_bucket(
+                cursor, model_version, prediction_date, actual_label, predicted_label, predicted_probability, sign=1
+            )
 
-        conn.commit()
-        conn.close()
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
 
     def load_production_labels(
         self,
@@ -169,7 +358,7 @@ class ModelMonitor:
         min_predictions: int = 100
     ) -> Optional[Dict[str, float]]:
         """
-        Calculate production metrics (AC5.3.3).
+        Calculate production metrics (AC5.3.3) from the per-day accumulators.
 
         Args:
             start_date: Start date (YYYY-MM-DD)
@@ -179,38 +368,70 @@ class ModelMonitor:
         Returns:
             Metrics dictionary or None if insufficient data
         """
-        labels = self.load_production_labels(start_date, end_date)
+        totals = self._bucket_totals(start_date, end_date)
+        tp, fp, tn, fn = totals['tp'], totals['fp'], totals['tn'], totals['fn']
+        count = tp + fp + tn + fn
 
-        if len(labels) < min_predictions:
-            return {'insufficient_data': True, 'count': len(labels)}
+        if count < min_predictions:
+            return {'insufficient_data': True, 'count': count}
 
-        # Extract arrays
-        y_true = [label['actual_label'] for label in labels]
-        y_pred = [label['predicted_label'] for label in labels]
-
-        # Calculate metrics
-        f1 = f1_score(y_true, y_pred)
-        precision = precision_score(y_true, y_pred, zero_division=0)
-        recall = recall_score(y_true, y_pred, zero_division=0)
+        # Same definitions as sklearn's f1/precision/recall (0.0 when undefined)
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
 
         metrics = {
             'f1': f1,
             'precision': precision,
             'recall': recall,
-            'predictions': len(labels)
+            'predictions': count
         }
 
-        # Calculate ROC-AUC if we have probabilities
-        if all('predicted_probability' in label for label in labels):
-            y_proba = [label['predicted_probability'] for label in labels]
-            try:
-                roc_auc = roc_auc_score(y_true, y_proba)
+        # ROC-AUC / calibration when every label in the window has a probability
+        if totals['with_probability'] == count:
+            roc_auc = binned_roc_auc(totals['pos_histogram'], totals['neg_histogram'])
+            if roc_auc is not None:
                 metrics['roc_auc'] = roc_auc
-            except:
-                pass
+            metrics['calibration_error'] = binned_calibration_error(
+                totals['pos_histogram'], totals['neg_histogram']
+            )
 
         return metrics
 
+    def _bucket_totals(
+        self,
+        start_date: str,
+        end_date: str,
+        model_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Sum the day buckets in [start_date, end_date] for a model version"""
+        if model_version is None:
+            model_version = self.model_version
+
+        conn = sqlite3.connect(self.predictions_db)
+        rows = conn.execute("""
+            SELECT tp, fp, tn, fn, with_probability, pos_histogram, neg_histogram
+            FROM production_metric_buckets
+            WHERE prediction_date BETWEEN ? AND ?
+            AND model_version = ?
+        """, (start_date, end_date, model_version)).fetchall()
+        conn.close()
+
+        totals = {
+            'tp': 0, 'fp': 0, 'tn': 0, 'fn': 0, 'with_probability': 0,
+            'pos_histogram': np.zeros(PROBA_BINS, dtype=np.int64),
+            'neg_histogram': np.zeros(PROBA_BINS, dtype=np.int64)
+        }
+        for tp, fp, tn, fn, with_probability, pos_blob, neg_blob in rows:
+            totals['tp'] += tp
+            totals['fp'] += fp
+            totals['tn'] += tn
+            totals['fn'] += fn
+            totals['with_probability'] += with_probability
+            totals['pos_histogram'] += _histogram_from_blob(pos_blob)
+            totals['neg_histogram'] += _histogram_from_blob(neg_blob)
+        return totals
+
     def calculate_rolling_metrics(
         self,
         window_days: int = 30
@@ -319,7 +540,7 @@ PRODUCTION PERFORMANCE (Last 30 Days):
         if 'roc_auc' in current_metrics:
             baseline_auc = self.baseline_metrics.get('roc_auc', current_metrics['roc_auc'])
             auc_change = ((current_metrics['roc_auc'] - baseline_auc) / baseline_auc) * 100
-            report += f"- ROC-AUC: {current_metrics['roc_auc']:.2f} ({"↓" if auc_change < 0 else "↑"} {abs(auc_change):.0f}%)\n"
+            report += f"- ROC-AUC: {current_metrics['roc_auc']:.2f} ({'↓' if auc_change < 0 else '↑'} {abs(auc_change):.0f}%)\n"
 
         if 'predictions' in current_metrics:
             report += f"- Predictions: {current_metrics['predictions']:,}\n"
@@ -0,0 +1,208 @@
+"""
+Hot-Path Stage Instrumentation (Story 5.1 follow-up)
+
+Per-stage latency histograms and call counters for the prediction hot path:
+feature load, indicator compute, model predict, SQLite query and cache
+get/set. Metrics are registered on the global Prometheus REGISTRY, so they
+are exported by `get_metrics_text()` alongside the PerformanceMonitor metrics.
+
+Metrics:
+- pipeline_stage_duration_seconds{stage, model_version} (histogram)
+- pipeline_stage_calls_total{stage, model_version, outcome} (counter,
+  outcome = ok | error)
+
+Overhead:
+- Enabled: one perf_counter pair plus a cached histogram/counter child per
+  call (no label lookup after the first call for a stage/version)
+- Disabled at runtime (`set_instrumentation_enabled(False)`): `track_stage`
+  returns a shared no-op context and decorated functions call straight through
+- Disabled at import (VCP_INSTRUMENTATION=0): `instrument_stage` returns the
+  undecorated function, so decorated code pays nothing at all
+
+Usage:
+    from monitoring.instrumentation import track_stage, instrument_stage, STAGE_MODEL_PREDICT
+
+    with track_stage(STAGE_MODEL_PREDICT, model_version="1.2.0"):
+        model.predict_proba(rows)
+
+    @instrument_stage("feature_load.technical")
+    def _load_price_data(...): ...
+
+Author: VCP ML Team
+Created: 2025-11-19
+"""
+
+import functools
+import os
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter, Histogram, CollectorRegistry, REGISTRY
+
+
+# Stage names used across the codebase (sub-stages append ".<component>")
+STAGE_FEATURE_LOAD = 'feature_load'
+STAGE_INDICATOR_COMPUTE = 'indicator_compute'
+STAGE_MODEL_PREDICT = 'model_predict'
+STAGE_SQLITE_QUERY = 'sqlite_query'
+STAGE_CACHE_GET = 'cache_get'
+STAGE_CACHE_SET = 'cache_set'
+
+# model_version label for stages that are not tied to a model
+NO_MODEL = 'none'
+
+# Hot-path stages run from ~100us (cache hits) to seconds (cold feature loads)
+STAGE_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+ENV_FLAG = 'VCP_INSTRUMENTATION'
+
+_NOOP = nullcontext()
+
+
+def _enabled_from_env() -> bool:
+    return os.environ.get(ENV_FLAG, '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+
+class _StageTimer:
+    """Context manager recording one stage execution"""
+
+    __slots__ = ('histogram', 'ok', 'error', 'start')
+
+    def __init__(self, histogram, ok, error):
+        self.histogram = histogram
+        self.ok = ok
+        self.error = error
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        (self.ok if exc_type is None else self.error).inc()
+        return False
+
+
+class StageInstrumentation:
+    """
+    Stage latency histograms and counters on one Prometheus registry.
+
+    Features:
+    - `track(stage, model_version)` context manager
+    - `instrument(stage, model_version)` decorator
+    - Runtime enable/disable switch
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None, enabled: Optional[bool] = None):
+        """
+        Initialize stage instrumentation.
+
+        Args:
+            registry: Prometheus registry (defaults to global REGISTRY)
+            enabled: Initial state (default: VCP_INSTRUMENTATION env var, on unless "0")
+        """
+        self.registry = registry or REGISTRY
+        self.enabled = _enabled_from_env() if enabled is None else enabled
+
+        self.stage_duration = Histogram(
+            'pipeline_stage_duration_seconds',
+            'Hot-path stage duration in seconds',
+            ['stage', 'model_version'],
+            buckets=STAGE_BUCKETS,
+            registry=self.registry
+        )
+
+        self.stage_calls = Counter(
+            'pipeline_stage_calls_total',
+            'Hot-path stage executions',
+            ['stage', 'model_version', 'outcome'],
+            registry=self.registry
+        )
+
+        # (stage, model_version) -> (histogram child, ok counter, error counter)
+        self._children: Dict[Tuple[str, str], Tuple] = {}
+
+    def _timer(self, stage: str, model_version: str) -> _StageTimer:
+        children = self._children.get((stage, model_version))
+        if children is None:
+            children = (
+                self.stage_duration.labels(stage=stage, model_version=model_version),
+                self.stage_calls.labels(stage=stage, model_version=model_version, outcome='ok'),
+                self.stage_calls.labels(stage=stage, model_version=model_version, outcome='error')
+            )
+            self._children[(stage, model_version)] = children
+        return _StageTimer(*children)
+
+    def track(self, stage: str, model_version: Optional[str] = None):
+        """
+        Context manager timing one stage execution.
+
+        Args:
+            stage: Stage name (e.g. STAGE_MODEL_PREDICT)
+            model_version: Model version label (default: NO_MODEL)
+
+        Returns:
+            Timing context, or a shared no-op context when disabled
+        """
+        if not self.enabled:
+            return _NOOP
+        return self._timer(stage, model_version or NO_MODEL)
+
+    def instrument(self, stage: str, model_version: Optional[str] = None) -> Callable:
+        """
+        Decorator timing every call of a function as one stage execution.
+
+        Args:
+            stage: Stage name
+            model_version: Model version label (default: NO_MODEL)
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timer(stage, model_version or NO_MODEL):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+_instrumentation = StageInstrumentation()
+
+
+def get_instrumentation() -> StageInstrumentation:
+    """Process-wide StageInstrumentation on the global registry"""
+    return _instrumentation
+
+
+def set_instrumentation_enabled(enabled: bool):
+    """Turn stage instrumentation on or off at runtime"""
+    _instrumentation.enabled = enabled
+
+
+def instrumentation_enabled() -> bool:
+    """Whether stage instrumentation is currently recording"""
+    return _instrumentation.enabled
+
+
+def track_stage(stage: str, model_version: Optional[str] = None):
+    """Time a block as one stage execution (see StageInstrumentation.track)"""
+    if not _instrumentation.enabled:
+        return _NOOP
+    return _instrumentation._timer(stage, model_version or NO_MODEL)
+
+
+def instrument_stage(stage: str, model_version: Optional[str] = None) -> Callable:
+    """
+    Decorator timing a function as one stage execution.
+
+    With VCP_INSTRUMENTATION=0 set at import time the function is returned
+    undecorated (zero overhead; runtime re-enabling does not apply to it).
+    """
+    if not _enabled_from_env():
+        return lambda func: func
+    return _instrumentation.instrument(stage, model_version)
@@ -0,0 +1,348 @@
+"""
+In-Process Sampling Profiler (Story 5.1 follow-up)
+
+Low-overhead wall-clock sampling profiler for long-running jobs (MTF
+backtests, predict_all_stocks, collectors, announcement service). A daemon
+thread snapshots every thread's Python stack with `sys._current_frames()` at a
+fixed interval, so the profiled code runs unmodified and nothing is traced
+per call.
+
+Outputs (written next to the run's logs, default `logs/profiles/`):
+- `<name>.collapsed`: Brendan Gregg collapsed stacks (flamegraph.pl, inferno,
+  speedscope all read this)
+- `<name>.speedscope.json`: speedscope "sampled" profile, one per thread
+
+Entry points:
+- `capture_profile(seconds)`: blocking capture from inside a job
+- `start_capture(seconds)` / `get_capture_status()`: background capture used
+  by the admin endpoints in api/main.py and web/app.py (opt-in with
+  VCP_PROFILER=1)
+- CLI: run any script under the profiler for its whole lifetime
+
+Usage:
+    python run_profiled.py run_data_collection.py
+    python -m monitoring.profiler --interval-ms 10 run_ml_training.py --epochs 5
+
+Author: VCP ML Team
+Created: 2025-11-19
+"""
+
+import argparse
+import json
+import logging
+import os
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+ENV_FLAG = 'VCP_PROFILER'
+ENV_OUTPUT_DIR = 'VCP_PROFILE_DIR'
+DEFAULT_OUTPUT_DIR = 'logs/profiles'
+DEFAULT_INTERVAL = 0.01
+MAX_CAPTURE_SECONDS = 600
+
+# (thread name, frames root -> leaf)
+StackKey = Tuple[str, Tuple[str, ...]]
+
+
+def profiler_enabled() -> bool:
+    """Whether the admin profiling endpoints are switched on (VCP_PROFILER=1)"""
+    return os.environ.get(ENV_FLAG, '0').strip().lower() in ('1', 'true', 'on', 'yes')
+
+
+def default_output_dir() -> str:
+    """Profile output directory (VCP_PROFILE_DIR, default logs/profiles)"""
+    return os.environ.get(ENV_OUTPUT_DIR, DEFAULT_OUTPUT_DIR)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over all Python threads.
+
+    Features:
+    - Aggregated stack counts (memory bounded by distinct stacks, not duration)
+    - Collapsed-stack and speedscope export
+    - Excludes its own sampler thread
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, max_depth: int = 128):
+        """
+        Initialize profiler.
+
+        Args:
+            interval: Seconds between samples (default: 10ms)
+            max_depth: Maximum frames recorded per stack
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling in a daemon thread"""
+        if self.running:
+            raise RuntimeError("Profiler already running")
+
+        self._stop.clear()
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._thread = threading.Thread(target=self._run, name='vcp-sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own_id)
+
+    def sample(self, exclude: Optional[int] = None):
+        """Record one stack per live thread"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude:
+                continue
+
+            stack: List[str] = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+
+            self.samples[(names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+
+        self.sample_count += 1
+
+    def collapsed(self) -> List[str]:
+        """Collapsed-stack lines: 'thread;root;...;leaf count', heaviest first"""
+        return [
+            ';'.join((thread,) + stack) + f" {count}"
+            for (thread, stack), count in self.samples.most_common()
+        ]
+
+    def speedscope(self, name: str = 'profile') -> Dict:
+        """Speedscope file-format document with one sampled profile per thread"""
+        frame_index: Dict[str, int] = {}
+        frames: List[Dict] = []
+        by_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+
+        for (thread, stack), count in self.samples.items():
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    func, _, location = label.partition(' (')
+                    file, _, line = location.rstrip(')').rpartition(':')
+                    frames.append({'name': func, 'file': file, 'line': int(line) if line.isdigit() else None})
+                indices.append(frame_index[label])
+
+            stacks, weights = by_thread.setdefault(thread, ([], []))
+            stacks.append(indices)
+            weights.append(count * self.interval)
+
+        profiles = []
+        for thread, (stacks, weights) in sorted(by_thread.items()):
+            profiles.append({
+                'type': 'sampled',
+                'name': thread,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': stacks,
+                'weights': weights
+            })
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'vcp-sampling-profiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': profiles
+        }
+
+    def export(self, output_dir: Optional[str] = None, name: Optional[str] = None) -> Dict[str, str]:
+        """
+        Write collapsed-stack and speedscope files.
+
+        Args:
+            output_dir: Target directory (default: VCP_PROFILE_DIR or logs/profiles)
+            name: File stem (default: profile_<pid>_<timestamp>)
+
+        Returns:
+            Dict with 'collapsed' and 'speedscope' file paths
+        """
+        out = Path(output_dir or default_output_dir())
+        out.mkdir(parents=True, exist_ok=True)
+        name = name or f"profile_{os.getpid()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        collapsed_path = out / f"{name}.collapsed"
+        collapsed_path.write_text('\n'.join(self.collapsed()) + '\n')
+
+        speedscope_path = out / f"{name}.speedscope.json"
+        with open(speedscope_path, 'w') as f:
+            json.dump(self.speedscope(name), f)
+
+        logger.info(f"Profile written: {collapsed_path} ({self.sample_count} samples)")
+        return {'collapsed': str(collapsed_path), 'speedscope': str(speedscope_path)}
+
+
+def capture_profile(
+    seconds: float,
+    interval: float = DEFAULT_INTERVAL,
+    output_dir: Optional[str] = None,
+    name: Optional[str] = None
+) -> Dict[str, str]:
+    """Sample the current process for `seconds` (blocking) and write the profile files"""
+    profiler = SamplingProfiler(interval=interval)
+    with profiler:
+        time.sleep(seconds)
+    return profiler.export(output_dir, name)
+
+
+# ============================================================================
+# Background capture (admin endpoints)
+# ============================================================================
+
+_capture_lock = threading.Lock()
+_capture: Dict = {'status': 'idle'}
+
+
+def start_capture(
+    seconds: float,
+    interval: float = DEFAULT_INTERVAL,
+    output_dir: Optional[str] = None
+) -> Dict:
+    """
+    Start a background capture that exports itself after `seconds`.
+
+    Only one capture runs per process.
+
+    Raises:
+        ValueError: If seconds is outside (0, MAX_CAPTURE_SECONDS]
+        RuntimeError: If a capture is already running
+    """
+    global _capture
+
+    if not 0 < seconds <= MAX_CAPTURE_SECONDS:
+        raise ValueError(f"seconds must be in (0, {MAX_CAPTURE_SECONDS}]")
+
+    with _capture_lock:
+        if _capture['status'] == 'running':
+            raise RuntimeError("A profile capture is already running")
+
+        profiler = SamplingProfiler(interval=interval)
+        name = f"profile_{os.getpid()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        _capture = {
+            'status': 'running',
+            'name': name,
+            'seconds': seconds,
+            'interval': interval,
+            'started_at': datetime.now().isoformat()
+        }
+        profiler.start()
+
+    def finish():
+        time.sleep(seconds)
+        profiler.stop()
+        try:
+            files = profiler.export(output_dir, name)
+            update = {'status': 'complete', 'files': files, 'samples': profiler.sample_count}
+        except OSError as e:
+            logger.error(f"Failed to write profile {name}: {e}")
+            update = {'status': 'failed', 'error': str(e)}
+        with _capture_lock:
+            _capture.update(update)
+
+    threading.Thread(target=finish, name='vcp-profile-capture', daemon=True).start()
+    return dict(_capture)
+
+
+def get_capture_status() -> Dict:
+    """Status of the current or most recent background capture"""
+    with _capture_lock:
+        return dict(_capture)
+
+
+# ============================================================================
+# CLI wrapper
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a Python script under the sampling profiler and export on exit"""
+    parser = argparse.ArgumentParser(
+        description="Run a script (e.g. run_data_collection.py) under the sampling profiler"
+    )
+    parser.add_argument('--interval-ms', type=float, default=DEFAULT_INTERVAL * 1000,
+                        help="Sampling interval in milliseconds (default: 10)")
+    parser.add_argument('--output-dir', default=None,
+                        help=f"Profile directory (default: ${ENV_OUTPUT_DIR} or {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--name', default=None, help="Output file stem")
+    parser.add_argument('script', help="Python script to run")
+    parser.add_argument('script_args', nargs=argparse.REMAINDER, help="Arguments passed to the script")
+    args = parser.parse_args(argv)
+
+    name = args.name or f"{Path(args.script).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    profiler = SamplingProfiler(interval=args.interval_ms / 1000)
+
+    sys.argv = [args.script] + args.script_args
+    sys.path.insert(0, str(Path(args.script).resolve().parent))
+
+    exit_code = 0
+    profiler.start()
+    try:
+        runpy.run_path(args.script, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        exit_code = 130
+    finally:
+        profiler.stop()
+        files = profiler.export(args.output_dir, name)
+        print(f"Profile ({profiler.sample_count} samples): {files['collapsed']}, {files['speedscope']}",
+              file=sys.stderr)
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Run Any Entry Point Under the Sampling Profiler
+
+Wraps a run_*.py script (or any Python script) with the in-process sampling
+profiler and writes collapsed-stack and speedscope files to logs/profiles/
+(override with --output-dir or VCP_PROFILE_DIR) when the script exits.
+
+Usage:
+    python run_profiled.py run_data_collection.py
+    python run_profiled.py --interval-ms 5 run_simple_backtest.py --symbols RELIANCE
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from monitoring.profiler import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,9 +17,9 @@ Version: 1.0.0
 
 from .pdf_text_extractor import extract_text_from_pdf, extract_financial_tables
 from .sentiment_analyzer import analyze_earnings_sentiment, classify_sentiment
-from .vcp_detector import detect_vcp_pattern, calculate_contraction_stages
+from .vcp_detector import detect_vcp_pattern, calculate_contraction_stages, scan_vcp_panel
 from .technical_indicators import calculate_rsi, calculate_macd, calculate_bollinger_bands
-from .circuit_detector import detect_upper_circuit, detect_lower_circuit, is_circuit_hit
+from .circuit_detector import detect_upper_circuit, detect_lower_circuit, is_circuit_hit, detect_circuits
 
 __all__ = [
     # PDF extraction
@@ -33,6 +33,7 @@ __all__ = [
     # VCP detection
     "detect_vcp_pattern",
     "calculate_contraction_stages",
+    "scan_vcp_panel",
 
     # Technical indicators
     "calculate_rsi",
@@ -43,6 +44,7 @@ __all__ = [
     "detect_upper_circuit",
     "detect_lower_circuit",
     "is_circuit_hit",
+    "detect_circuits",
 ]
 
 __version__ = "1.0.0"
@@ -11,11 +11,21 @@ Version: 1.0.0
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# SEBI price bands (%) a stock's daily move is capped at
+CIRCUIT_BANDS = (5.0, 10.0, 20.0)
+
+LOCK_TOLERANCE = 0.001  # Close within 0.1% of high/low counts as locked
+
+HITS_COLUMNS = ['date', 'status', 'pct_change', 'band', 'prev_close', 'close', 'locked', 'flagged', 'row']
+
 
 def detect_upper_circuit(
     open_price: float,
@@ -276,35 +286,50 @@ def find_circuit_hits_in_dataset(
         circuits = find_circuit_hits_in_dataset(price_history)
         print(f"Found {len(circuits)} circuit hits")
     """
-    circuit_hits = []
-    prev_close = None
-
-    for i, record in enumerate(price_data):
-        # Check for circuit
-        status, details = is_circuit_hit(
-            record,
-            prev_close=prev_close,
-            upper_threshold=upper_threshold,
-            lower_threshold=lower_threshold
-        )
+    if not price_data:
+        logger.info("Circuit scan complete: 0 hits from 0 records (0.00%)")
+        return []
+
+    frame = pd.DataFrame({
+        'bse_code': '',
+        'date': [record.get(date_key, "") for record in price_data],
+        **{col: [record.get(col, 0) for record in price_data] for col in ('open', 'high', 'low', 'close')}
+    })
+    hits = detect_circuits(
+        frame, upper_threshold=upper_threshold, lower_threshold=lower_threshold, presorted=True
+    )
 
-        if status in ("UPPER", "LOWER"):
-            circuit_record = {
-                "date": record.get(date_key, ""),
-                "circuit_status": status,
-                "circuit_details": details,
-                "original_record": record,
-                "record_index": i
+    circuit_hits = []
+    for hit in hits.itertuples(index=False):
+        record = price_data[hit.row]
+        circuit_type = None if np.isnan(hit.band) else f"{hit.band:g}%"
+        if hit.status == "UPPER":
+            details = {
+                "open": record.get("open", 0),
+                "close": record.get("close", 0),
+                "high": record.get("high", 0),
+                "gain_pct": hit.pct_change,
+                "locked_at_high": True,
+                "volume_surge": False,
+                "circuit_type": circuit_type
+            }
+        else:
+            details = {
+                "open": record.get("open", 0),
+                "close": record.get("close", 0),
+                "low": record.get("low", 0),
+                "loss_pct": hit.pct_change,
+                "locked_at_low": True,
+                "circuit_type": circuit_type
             }
-            circuit_hits.append(circuit_record)
-
-            logger.info(
-                f"Circuit hit detected: {record.get(date_key)} - {status} "
-                f"({details.get('gain_pct', details.get('loss_pct', 0)):.2f}%)"
-            )
 
-        # Update prev_close for next iteration
-        prev_close = record.get("close", prev_close)
+        circuit_hits.append({
+            "date": record.get(date_key, ""),
+            "circuit_status": hit.status,
+            "circuit_details": details,
+            "original_record": record,
+            "record_index": hit.row
+        })
 
     logger.info(
         f"Circuit scan complete: {len(circuit_hits)} hits from {len(price_data)} records "
@@ -314,6 +339,142 @@ def find_circuit_hits_in_dataset(
     return circuit_hits
 
 
+def align_prev_close(codes: np.ndarray, close: np.ndarray, prev_close: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Previous close for every row of a (code, date)-sorted price array
+
+    Args:
+        codes: Code per row, rows grouped by code and sorted by date
+        close: Close per row
+        prev_close: Published previous close (e.g. BhavCopy PREVCLOSE);
+            used where present and positive
+
+    Returns:
+        float64 array; the previous row's close within the same code, NaN
+        on each code's first row unless a published value exists
+    """
+    close = np.asarray(close, dtype=np.float64)
+    aligned = np.full(len(close), np.nan)
+    if len(close) > 1:
+        same_code = codes[1:] == codes[:-1]
+        aligned[1:] = np.where(same_code, close[:-1], np.nan)
+
+    if prev_close is not None:
+        published = np.asarray(prev_close, dtype=np.float64)
+        aligned = np.where(published > 0, published, aligned)
+    return aligned
+
+
+def circuit_bands(pct_change: np.ndarray, bands: Sequence[float] = CIRCUIT_BANDS, tolerance: float = 0.0) -> np.ndarray:
+    """
+    Largest band each move reached (signed), NaN below the smallest band
+
+    Args:
+        pct_change: % change per row
+        bands: Ascending band sizes in %
+        tolerance: Moves within this many % points of a band count as
+            reaching it (tick rounding keeps locked prices just short)
+    """
+    bands = np.asarray(bands, dtype=np.float64)
+    magnitude = np.abs(pct_change) + tolerance
+    index = np.searchsorted(bands, magnitude, side='right') - 1
+    reached = np.where(index >= 0, bands[np.clip(index, 0, None)], np.nan)
+    return np.copysign(reached, pct_change)
+
+
+def detect_circuits(
+    frame: pd.DataFrame,
+    code_column: str = 'bse_code',
+    upper_threshold: float = 5.0,
+    lower_threshold: float = -5.0,
+    bands: Sequence[float] = CIRCUIT_BANDS,
+    band_tolerance: float = 0.0,
+    flag_column: Optional[str] = None,
+    presorted: bool = False
+) -> pd.DataFrame:
+    """
+    Vectorized circuit detection over many symbols at once.
+
+    Same rules as is_circuit_hit, evaluated as array masks: the reference
+    price is the published prev_close when present, else the previous
+    row's close for the same code, else the open. A row is an UPPER hit
+    when its % change reaches upper_threshold and the close is locked at
+    the high (LOWER: lower_threshold, locked at the low). With flag_column
+    set, rows the exchange flagged as circuit-bound are hits too, on the
+    side of their move.
+
+    Args:
+        frame: Long price table with code_column, date, open, high, low,
+            close and optionally prev_close
+        code_column: Symbol column (e.g. 'bse_code', or 'code' for
+            BhavCopyArchive.read output)
+        upper_threshold: Minimum gain % for an upper circuit
+        lower_threshold: Maximum loss % for a lower circuit
+        bands: Ascending price bands in % used to classify each hit
+        band_tolerance: % points below a band (and the thresholds) still
+            treated as reaching it
+        flag_column: Boolean exchange circuit flag (BhavCopy is_circuit)
+        presorted: Rows are already grouped by code and sorted by date
+
+    Returns:
+        Hits table with code_column plus date, status ('UPPER'/'LOWER'),
+        pct_change, band, prev_close, close, locked, flagged and row (the
+        positional index of the hit in frame)
+    """
+    if len(frame) == 0:
+        return pd.DataFrame(columns=[code_column] + HITS_COLUMNS)
+
+    # Integer keys: sorting and same-code comparisons avoid string work
+    code_keys = pd.factorize(frame[code_column], sort=True)[0]
+    order = np.arange(len(frame))
+    if not presorted:
+        date_keys = pd.factorize(frame['date'], sort=True)[0]
+        order = np.lexsort((date_keys, code_keys))
+
+    codes = code_keys[order]
+    open_ = frame['open'].to_numpy(dtype=np.float64)[order]
+    high = frame['high'].to_numpy(dtype=np.float64)[order]
+    low = frame['low'].to_numpy(dtype=np.float64)[order]
+    close = frame['close'].to_numpy(dtype=np.float64)[order]
+    published = frame['prev_close'].to_numpy(dtype=np.float64)[order] if 'prev_close' in frame else None
+
+    prev_close = align_prev_close(codes, close, published)
+    reference = np.where(prev_close > 0, prev_close, open_)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_change = (close - reference) / reference * 100
+
+    tolerance = close * LOCK_TOLERANCE
+    locked_high = np.abs(close - high) <= tolerance
+    locked_low = np.abs(close - low) <= tolerance
+
+    upper = (pct_change >= upper_threshold - band_tolerance) & locked_high
+    lower = ~upper & (pct_change <= lower_threshold + band_tolerance) & locked_low
+
+    flagged = np.zeros(len(frame), dtype=bool)
+    if flag_column is not None:
+        flagged = frame[flag_column].to_numpy(dtype=bool)[order]
+        upper |= flagged & (pct_change > 0)
+        lower |= flagged & (pct_change < 0)
+
+    hit = np.flatnonzero(upper | lower)
+    rows = order[hit]
+    hits = pd.DataFrame({
+        code_column: frame[code_column].to_numpy()[rows],
+        'date': frame['date'].to_numpy()[rows],
+        'status': np.where(upper[hit], "UPPER", "LOWER"),
+        'pct_change': pct_change[hit],
+        'band': circuit_bands(pct_change[hit], bands, band_tolerance),
+        'prev_close': prev_close[hit],
+        'close': close[hit],
+        'locked': np.where(upper[hit], locked_high[hit], locked_low[hit]),
+        'flagged': flagged[hit],
+        'row': rows
+    })
+
+    logger.debug(f"Circuit scan: {len(hits)} hits from {len(frame)} rows")
+    return hits
+
+
 def calculate_circuit_statistics(circuit_hits: List[Dict]) -> Dict:
     """
     Calculate statistics on circuit hits.
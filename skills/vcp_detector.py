@@ -8,6 +8,16 @@ VCP is a consolidation pattern discovered by Mark Minervini featuring:
 4. Volume drying up during consolidation
 5. Breakout with volume surge
 
+Contractions are pullbacks from confirmed swing highs (a high above the
+previous swing_window days and not exceeded in the next swing_window days)
+to the lowest low before the next swing high. The pattern is the trailing
+run of contractions that are each shallower than the one before.
+
+scan_vcp_panel evaluates every rule over wide (days x symbols) arrays in one
+pass - the layout BhavCopyArchive.panel returns - and ranks the universe, so
+only a short candidate list needs the per-symbol VCPWorkflow stages.
+scan_vcp_universe runs it over the lookback window of a BhavCopy archive.
+
 This is NOT used for ML features (we're predicting upper circuits, not VCPs).
 Included for completeness as it's part of the existing VCP system.
 
@@ -18,12 +28,338 @@ Version: 1.0.0
 import logging
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
 logger = logging.getLogger(__name__)
 
+SWING_WINDOW = 5  # Days either side a swing high must dominate
+MAX_CONTRACTIONS = 4  # Latest contractions considered per symbol in a scan
+DRY_UP_DAYS = 10  # Recent volume window compared with the lookback average
+MIN_COVERAGE = 0.9  # Fraction of lookback days a symbol must have traded
+MAX_PIVOT_DISTANCE = 5.0  # % from the pivot high still counted as near highs
+MIN_PRIOR_GAIN = 30.0  # % rise into the base (Stage 2 uptrend)
+
+# Weights of the candidate ranking score (sum to 1)
+SCORE_WEIGHTS = {
+    "contractions": 0.35,  # Number of tightening contractions
+    "tightness": 0.25,     # Shallowness of the latest contraction
+    "dry_up": 0.2,         # Recent volume below average
+    "proximity": 0.2,      # Close to the pivot high
+}
+
+CANDIDATE_COLUMNS = [
+    'code', 'is_vcp', 'score', 'num_contractions', 'depths', 'max_depth_pct', 'final_depth_pct',
+    'volume_ratio', 'pivot_price', 'close', 'pivot_distance_pct', 'prior_gain_pct', 'base_start', 'as_of'
+]
+
+
+def _prior_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Max of the previous `window` rows for each row (-inf where there are none)"""
+    padded = np.vstack([np.full((window, values.shape[1]), -np.inf), values])
+    return sliding_window_view(padded, window, axis=0)[:-1].max(axis=-1)
+
+
+def swing_highs(high: np.ndarray, window: int = SWING_WINDOW) -> np.ndarray:
+    """
+    Confirmed swing highs of a (days x symbols) high array
+
+    Args:
+        high: Daily highs, one column per symbol
+        window: Days either side the high must dominate
+
+    Returns:
+        Boolean array, True on swing-high days
+    """
+    prior = _prior_max(high, window)
+    following = _prior_max(high[::-1], window)[::-1]
+    pivots = (high > prior) & (high >= following)
+    pivots[:window] = False  # Too few days before to dominate
+    pivots[max(len(high) - window, 0):] = False  # Not yet confirmed
+    return pivots
+
+
+def _contraction_segments(high: np.ndarray, low: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """
+    Pullback from every swing high, for all columns at once
+
+    Returns flat arrays ordered by column, then start day: column, start and
+    end day (exclusive; the next swing high or the end of the window), pivot
+    high, trough low and depth_pct.
+    """
+    n_days, n_cols = high.shape
+    segment = np.cumsum(swing_highs(high, window), axis=0)  # 0 before the first swing high
+
+    # Column-major keys are already sorted, so each segment is one slice
+    keys = (np.arange(n_cols)[:, None] * (n_days + 1) + segment.T).ravel()
+    if len(keys) == 0:
+        empty = np.array([], dtype=np.int64)
+        return {'column': empty, 'start': empty, 'end': empty,
+                'pivot': empty.astype(float), 'trough': empty.astype(float), 'depth_pct': empty.astype(float)}
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    column, number = np.divmod(keys[starts], n_days + 1)
+
+    pivot = high.T.ravel()[starts]
+    trough = np.fmin.reduceat(low.T.ravel(), starts)
+
+    keep = number > 0
+    offset = column * n_days
+    with np.errstate(invalid='ignore', divide='ignore'):
+        depth = (pivot - trough) / pivot * 100
+    return {
+        'column': column[keep],
+        'start': (starts - offset)[keep],
+        'end': (ends - offset)[keep],
+        'pivot': pivot[keep],
+        'trough': trough[keep],
+        'depth_pct': depth[keep],
+    }
+
+
+def _latest(segments: Dict[str, np.ndarray], n_cols: int, count: int) -> Dict[str, np.ndarray]:
+    """
+    Last `count` segments per column as right-aligned (columns x count) arrays
+
+    Also returns 'run', the number of trailing segments that are each
+    shallower than the one before (0 for columns without a segment).
+    """
+    column = segments['column']
+    counts = np.bincount(column, minlength=n_cols)
+    group_start = np.cumsum(counts) - counts
+    from_end = counts[column] - (np.arange(len(column)) - group_start[column]) - 1
+    keep = from_end < count
+    slot = count - 1 - from_end[keep]
+
+    latest = {}
+    for name in ('start', 'end', 'pivot', 'depth_pct'):
+        values = np.full((n_cols, count), np.nan)
+        values[column[keep], slot] = segments[name][keep]
+        latest[name] = values
+
+    depths = latest['depth_pct']
+    shallower = depths[:, 1:] < depths[:, :-1]  # NaN compares False
+    run = np.cumprod(shallower[:, ::-1], axis=1).sum(axis=1) + 1
+    latest['run'] = np.where(np.isnan(depths[:, -1]), 0, run).astype(np.int64)
+    return latest
+
+
+def _label(value) -> str:
+    """Date label for an index value"""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime("%Y-%m-%d")
+    return str(value)
+
+
+def scan_vcp_panel(
+    high: pd.DataFrame,
+    low: pd.DataFrame,
+    close: pd.DataFrame,
+    volume: pd.DataFrame,
+    lookback_days: int = 180,
+    min_contractions: int = 3,
+    max_contraction_depth: float = 25.0,
+    swing_window: int = SWING_WINDOW,
+    dry_up_days: int = DRY_UP_DAYS,
+    max_pivot_distance: float = MAX_PIVOT_DISTANCE,
+    min_prior_gain: Optional[float] = MIN_PRIOR_GAIN,
+    top_n: Optional[int] = None,
+    candidates_only: bool = True
+) -> pd.DataFrame:
+    """
+    Score VCP setups across a universe in one pass.
+
+    Args:
+        high: Wide (date x code) daily highs, as from BhavCopyArchive.panel
+        low: Daily lows, same layout (reindexed to close)
+        close: Daily closes; its index and columns define the panel
+        volume: Daily volumes, same layout
+        lookback_days: Trailing days analyzed (default: 180)
+        min_contractions: Tightening contractions required (default: 3)
+        max_contraction_depth: Deepest allowed first contraction % (default: 25%)
+        swing_window: Days either side of a swing high (default: 5)
+        dry_up_days: Recent volume window (default: 10)
+        max_pivot_distance: Max % between close and the pivot high (default: 5%)
+        min_prior_gain: Min % rise into the base, None to skip (default: 30%)
+        top_n: Keep only the best n rows
+        candidates_only: Return only symbols that pass every rule
+
+    Returns:
+        DataFrame with CANDIDATE_COLUMNS plus 'rank', best first. Symbols
+        with less than MIN_COVERAGE of the lookback traded are left out.
+
+    Example:
+        archive = BhavCopyArchive("data/bhav_archive")
+        panels = {f: archive.panel(f, "BSE", start="2024-05-01") for f in ("high", "low", "close", "volume")}
+        shortlist = scan_vcp_panel(**panels, top_n=25)
+    """
+    close = close.tail(lookback_days)
+    if len(close) < lookback_days:
+        logger.warning(f"Insufficient data for VCP scan: need {lookback_days} days, got {len(close)}")
+        return pd.DataFrame(columns=['rank'] + CANDIDATE_COLUMNS)
+
+    covered = close.notna().sum() >= MIN_COVERAGE * lookback_days
+    codes = close.columns[covered.to_numpy()]
+    if len(codes) < close.shape[1]:
+        logger.debug(f"Skipping {close.shape[1] - len(codes)} symbols with sparse history")
+
+    def field(frame: pd.DataFrame) -> np.ndarray:
+        return frame.reindex(index=close.index, columns=codes).ffill().to_numpy(dtype=float)
+
+    h, l, c = field(high), field(low), field(close[codes])
+    v = volume.reindex(index=close.index, columns=codes).to_numpy(dtype=float)
+    n_days, n_cols = c.shape
+
+    latest = _latest(_contraction_segments(h, l, swing_window), n_cols, MAX_CONTRACTIONS)
+    depths, run = latest['depth_pct'], latest['run']
+    rows = np.arange(n_cols)
+    first = MAX_CONTRACTIONS - np.maximum(run, 1)  # Slot of the deepest contraction in the run
+
+    max_depth = depths[rows, first]
+    final_depth = depths[:, -1]
+    pivot_price = latest['pivot'][:, -1]
+    base_start = latest['start'][rows, first]
+
+    # Volume dry-up: recent average against the lookback average
+    present = ~np.isnan(v)
+    totals, counts = np.where(present, v, 0).sum(axis=0), present.sum(axis=0)
+    recent_totals = np.where(present, v, 0)[-dry_up_days:].sum(axis=0)
+    recent_counts = present[-dry_up_days:].sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volume_ratio = (recent_totals / recent_counts) / (totals / counts)
+        last_close = c[-1]
+        pivot_distance = (pivot_price - last_close) / pivot_price * 100
+
+        # Prior uptrend: base high against the lowest low before the base
+        before = np.arange(n_days)[:, None] < np.nan_to_num(base_start, nan=0)[None, :]
+        prior_low = np.fmin.reduce(np.where(before, l, np.inf), axis=0)
+        prior_low[np.isinf(prior_low)] = np.nan
+        base_high = latest['pivot'][rows, first]
+        prior_gain = (base_high / prior_low - 1) * 100
+
+    is_vcp = (
+        (run >= min_contractions)
+        & (max_depth <= max_contraction_depth)
+        & (volume_ratio < 1)
+        & (np.abs(pivot_distance) <= max_pivot_distance)
+    )
+    if min_prior_gain is not None:
+        is_vcp &= prior_gain >= min_prior_gain
+
+    components = {
+        "contractions": np.minimum(run, MAX_CONTRACTIONS) / MAX_CONTRACTIONS,
+        "tightness": 1 - final_depth / max_contraction_depth,
+        "dry_up": 1 - volume_ratio,
+        "proximity": 1 - np.abs(pivot_distance) / max_pivot_distance,
+    }
+    score = sum(
+        weight * np.clip(np.nan_to_num(components[name]), 0, 1)
+        for name, weight in SCORE_WEIGHTS.items()
+    )
+
+    index_labels = [_label(d) for d in close.index]
+    run_depths = [
+        depths[i, first[i]:].round(2).tolist() if run[i] else []
+        for i in range(n_cols)
+    ]
+    table = pd.DataFrame({
+        'code': codes.astype(str),
+        'is_vcp': is_vcp,
+        'score': score.round(4),
+        'num_contractions': run,
+        'depths': run_depths,
+        'max_depth_pct': max_depth,
+        'final_depth_pct': final_depth,
+        'volume_ratio': volume_ratio,
+        'pivot_price': pivot_price,
+        'close': last_close,
+        'pivot_distance_pct': pivot_distance,
+        'prior_gain_pct': prior_gain,
+        'base_start': [index_labels[int(s)] if not np.isnan(s) else None for s in base_start],
+        'as_of': index_labels[-1],
+    }, columns=CANDIDATE_COLUMNS)
+
+    if candidates_only:
+        table = table[table['is_vcp']]
+    table = table.sort_values(['is_vcp', 'score', 'code'], ascending=[False, False, True], kind='stable')
+    if top_n is not None:
+        table = table.head(top_n)
+    table = table.reset_index(drop=True)
+    table.insert(0, 'rank', np.arange(1, len(table) + 1))
+
+    logger.info(f"VCP scan: {int(is_vcp.sum())} candidates among {n_cols} symbols as of {index_labels[-1]}")
+    return table
+
+
+def scan_vcp_universe(
+    archive,
+    exchange: str = "NSE",
+    end: Optional[str] = None,
+    lookback_days: int = 180,
+    top_n: Optional[int] = 50,
+    **criteria
+) -> pd.DataFrame:
+    """
+    Rank VCP setups across every archived symbol
+
+    Reads the lookback window from the BhavCopy archive once and scores all
+    symbols with scan_vcp_panel.
+
+    Args:
+        archive: BhavCopyArchive or its root directory
+        exchange: "BSE" or "NSE"
+        end: Last date analyzed (default: latest archived day)
+        lookback_days: Trading days analyzed
+        top_n: Shortlist size (None for every candidate)
+        **criteria: Further scan_vcp_panel thresholds
+
+    Returns:
+        Ranked candidate DataFrame (see scan_vcp_panel)
+
+    Example:
+        >>> shortlist = scan_vcp_universe("data/bhav_archive", "NSE", top_n=20)
+        >>> print(shortlist[['rank', 'code', 'score']])
+    """
+    from tools.bhav_copy_archive import BhavCopyArchive
+
+    if not isinstance(archive, BhavCopyArchive):
+        archive = BhavCopyArchive(archive)
+
+    dates = [d for d in archive.dates(exchange) if end is None or d <= end][-lookback_days:]
+    fields = ['high', 'low', 'close', 'volume']
+    if dates:
+        rows = archive.read(exchange, dates[0], dates[-1], columns=['code'] + fields)
+    else:
+        rows = pd.DataFrame(columns=['date', 'code'] + fields)
+    rows = rows.drop_duplicates(['date', 'code'], keep='last')
+
+    panels = {}
+    for field_name in fields:
+        panel = rows.pivot(index='date', columns='code', values=field_name)
+        panel.index = pd.to_datetime(panel.index)
+        panels[field_name] = panel
+
+    return scan_vcp_panel(**panels, lookback_days=lookback_days, top_n=top_n, **criteria)
+
+
+def _single_symbol_panels(price_data: List[Dict], volume_data: Optional[List[float]] = None) -> Dict[str, pd.DataFrame]:
+    """Wide one-column panels from a list of OHLC dictionaries"""
+    index = [p.get("date", i) for i, p in enumerate(price_data)]
+    if volume_data is None:
+        volume_data = [p.get("volume", np.nan) for p in price_data]
+    panels = {
+        name: pd.DataFrame({"SYMBOL": [p[name] for p in price_data]}, index=index, dtype=float)
+        for name in ("high", "low", "close")
+    }
+    panels["volume"] = pd.DataFrame({"SYMBOL": list(volume_data)}, index=index, dtype=float)
+    return panels
+
 
 def calculate_contraction_stages(
     price_data: List[Dict],
-    lookback_days: int = 180
+    lookback_days: int = 180,
+    swing_window: int = SWING_WINDOW
 ) -> List[Dict]:
     """
     Identify contraction stages in price history.
@@ -31,9 +367,10 @@ def calculate_contraction_stages(
     Args:
         price_data: List of OHLC dictionaries (sorted by date ascending)
         lookback_days: Days to analyze (default: 180)
+        swing_window: Days either side of a swing high (default: 5)
 
     Returns:
-        List of contraction stage dictionaries:
+        Trailing run of contractions, each shallower than the previous:
         [
             {
                 "stage_num": 1,
@@ -58,20 +395,27 @@ def calculate_contraction_stages(
 
     # Use recent data
     recent_data = price_data[-lookback_days:]
+    panels = _single_symbol_panels(recent_data, volume_data=[0] * len(recent_data))
+    dates = [_label(d) for d in panels["high"].index]
 
-    # Find local peaks and troughs (simplified algorithm)
-    contractions = []
-    stage_num = 0
-
-    # Placeholder implementation
-    # Full VCP detection would need:
-    # 1. Identify swing highs and lows
-    # 2. Calculate depth of each pullback
-    # 3. Verify decreasing volatility pattern
-    # 4. Check volume characteristics
-
-    logger.debug(f"VCP contraction detection not fully implemented (placeholder)")
+    segments = _contraction_segments(
+        panels["high"].to_numpy(), panels["low"].to_numpy(), swing_window
+    )
+    count = len(segments["depth_pct"])
+    run = int(_latest(segments, 1, max(count, 1))["run"][0])
 
+    contractions = []
+    for stage_num, i in enumerate(range(count - run, count), start=1):
+        start, end = int(segments["start"][i]), int(segments["end"][i])
+        contractions.append({
+            "stage_num": stage_num,
+            "start_date": dates[start],
+            "end_date": dates[end - 1],
+            "depth_pct": round(float(segments["depth_pct"][i]), 2),
+            "duration_days": end - start
+        })
+
+    logger.debug(f"Found {len(contractions)} contraction stages")
     return contractions
 
 
@@ -85,6 +429,8 @@ def detect_vcp_pattern(
     """
     Detect if stock exhibits VCP pattern.
 
+    Single-symbol view of scan_vcp_panel.
+
     Args:
         price_data: List of OHLC dictionaries
         volume_data: List of volume values (aligned with price_data)
@@ -98,7 +444,7 @@ def detect_vcp_pattern(
         - details: Dictionary with pattern characteristics
 
     VCP Criteria:
-        1. Prior uptrend: Price up 30%+ in past 6-12 months
+        1. Prior uptrend: Price up 30%+ into the base
         2. 3+ contraction stages
         3. Each contraction shallower than previous
         4. Volume dries up during contractions
@@ -125,22 +471,33 @@ def detect_vcp_pattern(
         logger.warning(f"Insufficient data for VCP detection")
         return False, details
 
-    # Placeholder implementation
-    # Full VCP detection is complex and requires:
-    # - Swing high/low identification
-    # - Volatility contraction measurement
-    # - Volume analysis
-    # - Stage 2 uptrend confirmation
-
-    # This is a simplified placeholder
-    contractions = calculate_contraction_stages(price_data, lookback_days)
-    details["num_contractions"] = len(contractions)
+    panels = _single_symbol_panels(price_data, volume_data)
+    scan = scan_vcp_panel(
+        **panels,
+        lookback_days=lookback_days,
+        min_contractions=min_contractions,
+        max_contraction_depth=max_contraction_depth,
+        candidates_only=False
+    )
+    if scan.empty:
+        return False, details
 
-    # VCP requires 3+ contractions
-    if len(contractions) >= min_contractions:
-        details["is_vcp"] = True
+    row = scan.iloc[0]
+    details.update({
+        "is_vcp": bool(row["is_vcp"]),
+        "num_contractions": int(row["num_contractions"]),
+        "prior_uptrend": bool(row["prior_gain_pct"] >= MIN_PRIOR_GAIN),
+        "volume_drying_up": bool(row["volume_ratio"] < 1),
+        "near_highs": bool(abs(row["pivot_distance_pct"]) <= MAX_PIVOT_DISTANCE),
+        "depths": row["depths"],
+        "pivot_price": float(row["pivot_price"]),
+        "volume_ratio": float(row["volume_ratio"]),
+        "score": float(row["score"]),
+    })
+
+    if details["is_vcp"]:
         details["pattern_quality"] = "POTENTIAL"
-        logger.info(f"Potential VCP detected: {len(contractions)} contractions")
+        logger.info(f"Potential VCP detected: {details['num_contractions']} contractions")
         return True, details
 
     logger.debug("No VCP pattern detected")
@@ -148,24 +505,26 @@ def detect_vcp_pattern(
 
 
 if __name__ == "__main__":
-    # Demo: VCP detection (placeholder)
+    # Demo: VCP detection on a synthetic base
     logging.basicConfig(level=logging.INFO)
 
     print("=== VCP Detector Demo ===\n")
-    print("⚠️  VCP detection is a PLACEHOLDER implementation")
-    print("Full VCP detection requires sophisticated swing analysis\n")
 
-    # Simulated price data
+    # Uptrend into a base with 20% -> 10% -> 5% pullbacks, then near highs
+    closes = list(np.linspace(70, 100, 60))
+    for depth in (0.20, 0.10, 0.05):
+        closes += list(np.linspace(100, 100 * (1 - depth), 20)) + list(np.linspace(100 * (1 - depth), 100, 20))
+    closes += [99.0] * (180 - len(closes))
+
     price_data = [
-        {"date": f"2024-{i:02d}-01", "open": 100 + i, "high": 105 + i, "low": 95 + i, "close": 100 + i}
-        for i in range(1, 13)
+        {"date": f"d{i:03d}", "open": c, "high": c * 1.005, "low": c * 0.995, "close": c}
+        for i, c in enumerate(closes)
     ]
-
-    volumes = [1000000 + (i * 10000) for i in range(len(price_data))]
+    volumes = [1_000_000] * 150 + [400_000] * 30
 
     print(f"Analyzing {len(price_data)} days of price data...")
 
-    is_vcp, details = detect_vcp_pattern(price_data, volumes, lookback_days=len(price_data))
+    is_vcp, details = detect_vcp_pattern(price_data, volumes)
 
     print(f"\nVCP Detected: {is_vcp}")
     print(f"Details: {details}")
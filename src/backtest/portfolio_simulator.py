@@ -0,0 +1,370 @@
+"""
+Portfolio Simulator (SHORT-040 to SHORT-051 follow-up)
+
+Multi-symbol backtest over an aligned (symbols x days) panel. One shared
+cash balance is allocated across simultaneous signals with the src/kelly
+sizing chain:
+
+    KellyFractionCalculator -> HalfKellyCalculator -> PositionCapEnforcer
+    -> TotalRiskValidator (portfolio-wide cap, signals taken in score order)
+
+Costs (CostCalculator) and slippage (SlippageSimulator) are applied to every
+fill in array form. The day loop is the only Python loop; every step is a
+handful of numpy operations across all symbols, so a 500-symbol x 10-year
+panel runs in seconds.
+
+Fill model:
+- Entries fill at the signal day's close (plus slippage), like BacktestEngine
+- From the next day, a bar whose low reaches the stop exits at the stop (or
+  the open if it gapped through); otherwise a high reaching the target exits
+  at the target (or the open if it gapped above). Stop wins if both are hit.
+- Optional max holding period exits at the close
+- Positions still open on the last day are closed at its close
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.costs.cost_calculator import CostCalculator
+from src.costs.slippage_simulator import SlippageSimulator
+from src.kelly.half_kelly import HalfKellyCalculator
+from src.kelly.kelly_fraction_calculator import KellyFractionCalculator
+from src.kelly.position_cap_enforcer import PositionCapEnforcer
+from src.kelly.total_risk_validator import TotalRiskValidator
+
+
+EXIT_STOP = 'stop_loss'
+EXIT_TARGET = 'target'
+EXIT_TIME = 'max_holding'
+EXIT_END = 'end_of_data'
+
+
+@dataclass
+class PortfolioResult:
+    """Portfolio simulation result"""
+    equity_curve: pd.Series = field(default_factory=pd.Series)
+    cash: pd.Series = field(default_factory=pd.Series)
+    exposure: pd.Series = field(default_factory=pd.Series)  # Open position fractions at entry
+    trades: pd.DataFrame = field(default_factory=pd.DataFrame)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+class PortfolioSimulator:
+    """Vectorized multi-symbol portfolio backtest with Kelly sizing and costs"""
+
+    def __init__(
+        self,
+        initial_capital: float = 100000,
+        kelly_calculator: Optional[KellyFractionCalculator] = None,
+        half_kelly: Optional[HalfKellyCalculator] = None,
+        cap_enforcer: Optional[PositionCapEnforcer] = None,
+        risk_validator: Optional[TotalRiskValidator] = None,
+        cost_calculator: Optional[CostCalculator] = None,
+        slippage_simulator: Optional[SlippageSimulator] = None,
+        max_positions: Optional[int] = None,
+        max_holding_days: Optional[int] = None,
+        volume_period: int = 20
+    ):
+        """
+        Initialize simulator
+
+        Args:
+            initial_capital: Starting capital
+            kelly_calculator: Kelly fraction calculator (default instance)
+            half_kelly: Half-Kelly scaler (default instance)
+            cap_enforcer: Per-position cap (default 20% equity)
+            risk_validator: Portfolio-wide cap on summed position fractions
+                (default 50%)
+            cost_calculator: Equity delivery costs per fill (None: no costs)
+            slippage_simulator: Slippage per fill (None: no slippage)
+            max_positions: Maximum concurrent positions (None: risk cap only)
+            max_holding_days: Exit at the close after this many days (None: off)
+            volume_period: Average-volume window for liquidity slippage
+        """
+        self.initial_capital = initial_capital
+        self.kelly_calculator = kelly_calculator or KellyFractionCalculator()
+        self.half_kelly = half_kelly or HalfKellyCalculator()
+        self.cap_enforcer = cap_enforcer or PositionCapEnforcer()
+        self.risk_validator = risk_validator or TotalRiskValidator()
+        self.cost_calculator = cost_calculator
+        self.slippage_simulator = slippage_simulator
+        self.max_positions = max_positions
+        self.max_holding_days = max_holding_days
+        self.volume_period = volume_period
+
+    def position_fractions(
+        self,
+        win_rate: Any,
+        avg_profit: Any,
+        avg_loss: Any
+    ) -> np.ndarray:
+        """Kelly -> Half-Kelly -> position cap, per symbol"""
+        kelly = self.kelly_calculator.calculate_array(win_rate, avg_profit, avg_loss)
+        return self.cap_enforcer.enforce_array(self.half_kelly.calculate(kelly))
+
+    def _costs(self, value: np.ndarray) -> np.ndarray:
+        if self.cost_calculator is None:
+            return np.zeros_like(value)
+        return self.cost_calculator.calculate_equity_delivery_cost(value)
+
+    def _slippage(self, price: np.ndarray, shares: np.ndarray, avg_volume: np.ndarray) -> np.ndarray:
+        if self.slippage_simulator is None:
+            return np.zeros_like(price)
+        return self.slippage_simulator.calculate_slippage_array(price, shares, avg_volume)
+
+    def run(
+        self,
+        prices: Dict[str, Any],
+        signals: Any,
+        position_fraction: Optional[Any] = None,
+        kelly_stats: Optional[Dict[str, Any]] = None,
+        stop_loss: Optional[Any] = None,
+        target: Optional[Any] = None,
+        stop_loss_pct: float = 2.0,
+        target_pct: float = 4.0,
+        score: Optional[Any] = None,
+        symbols: Optional[Sequence[str]] = None,
+        dates: Optional[Sequence] = None
+    ) -> PortfolioResult:
+        """
+        Run the portfolio simulation
+
+        Args:
+            prices: Dict of (symbols, days) arrays: 'close' (required), and
+                optionally 'open', 'high', 'low', 'volume'. NaN marks days a
+                symbol does not trade.
+            signals: Boolean (symbols, days) entry signals
+            position_fraction: Capital fraction per entry, scalar or per
+                symbol (default: from kelly_stats)
+            kelly_stats: Dict with 'win_rate' (%), 'avg_profit', 'avg_loss'
+                (scalars or per symbol) for the Kelly chain
+            stop_loss: (symbols, days) stop levels set on the signal day
+                (default: stop_loss_pct below the entry)
+            target: (symbols, days) target levels (default: target_pct above)
+            stop_loss_pct: Stop distance in % when stop_loss is not given
+            target_pct: Target distance in % when target is not given
+            score: (symbols, days) priority when signals compete for the risk
+                budget, highest first (default: position fraction)
+            symbols: Symbol labels (default: 0..n-1)
+            dates: Day labels (default: 0..d-1)
+
+        Returns:
+            PortfolioResult with equity curve, trades and metrics
+        """
+        close = np.asarray(prices['close'], dtype=float)
+        if close.ndim != 2:
+            raise ValueError("prices['close'] must be a (symbols, days) array")
+        n_symbols, n_days = close.shape
+
+        signals = np.asarray(signals, dtype=bool)
+        if signals.shape != close.shape:
+            raise ValueError("signals must have the same shape as prices['close']")
+
+        high = np.asarray(prices.get('high', close), dtype=float)
+        low = np.asarray(prices.get('low', close), dtype=float)
+        open_ = np.asarray(prices['open'], dtype=float) if 'open' in prices else None
+        avg_volume = np.full(close.shape, np.nan)
+        if 'volume' in prices:
+            avg_volume = pd.DataFrame(np.asarray(prices['volume'], dtype=float).T).rolling(
+                self.volume_period, min_periods=1
+            ).mean().to_numpy().T
+
+        # Last traded price for marking positions on non-trading days
+        mark = pd.DataFrame(close.T).ffill().to_numpy().T
+
+        if position_fraction is None:
+            if kelly_stats is None:
+                raise ValueError("Provide position_fraction or kelly_stats")
+            position_fraction = self.position_fractions(
+                kelly_stats['win_rate'], kelly_stats['avg_profit'], kelly_stats['avg_loss']
+            )
+        fraction = np.broadcast_to(np.asarray(position_fraction, dtype=float), (n_symbols,))
+
+        stop_levels = None if stop_loss is None else np.asarray(stop_loss, dtype=float)
+        target_levels = None if target is None else np.asarray(target, dtype=float)
+        score = None if score is None else np.asarray(score, dtype=float)
+
+        symbols = np.asarray(symbols if symbols is not None else np.arange(n_symbols))
+        dates = pd.Index(dates if dates is not None else np.arange(n_days))
+
+        # Open-position state, one slot per symbol
+        is_open = np.zeros(n_symbols, dtype=bool)
+        shares = np.zeros(n_symbols)
+        entry_price = np.zeros(n_symbols)
+        entry_cost = np.zeros(n_symbols)  # cash paid incl. costs
+        entry_day = np.zeros(n_symbols, dtype=int)
+        pos_stop = np.zeros(n_symbols)
+        pos_target = np.zeros(n_symbols)
+        pos_fraction = np.zeros(n_symbols)
+
+        cash = float(self.initial_capital)
+        equity_curve = np.empty(n_days)
+        cash_curve = np.empty(n_days)
+        exposure_curve = np.empty(n_days)
+        trades: List[Dict[str, np.ndarray]] = []
+
+        def close_positions(idx: np.ndarray, t: int, raw_price: np.ndarray, reason: np.ndarray):
+            nonlocal cash
+            fill = raw_price - self._slippage(raw_price, shares[idx], avg_volume[idx, t])
+            value = fill * shares[idx]
+            proceeds = value - self._costs(value)
+            cash += proceeds.sum()
+            trades.append({
+                'symbol': idx,
+                'entry_day': entry_day[idx].copy(),
+                'exit_day': np.full(len(idx), t),
+                'entry_price': entry_price[idx].copy(),
+                'exit_price': fill,
+                'shares': shares[idx].copy(),
+                'pnl': proceeds - entry_cost[idx],
+                'exit_reason': reason
+            })
+            is_open[idx] = False
+            shares[idx] = 0.0
+            pos_fraction[idx] = 0.0
+
+        for t in range(n_days):
+            # 1. Exits (positions entered on earlier days)
+            held = np.flatnonzero(is_open & (entry_day < t) & ~np.isnan(close[:, t]))
+            if len(held):
+                bar_low = low[held, t]
+                bar_high = high[held, t]
+                bar_open = open_[held, t] if open_ is not None else None
+                stop_hit = bar_low <= pos_stop[held]
+                target_hit = ~stop_hit & (bar_high >= pos_target[held])
+                time_hit = np.zeros(len(held), dtype=bool)
+                if self.max_holding_days is not None:
+                    time_hit = ~stop_hit & ~target_hit & (t - entry_day[held] >= self.max_holding_days)
+
+                exiting = stop_hit | target_hit | time_hit
+                if exiting.any():
+                    price = close[held, t].copy()
+                    stop_fill = pos_stop[held]
+                    target_fill = pos_target[held]
+                    if bar_open is not None:
+                        stop_fill = np.where(bar_open < stop_fill, bar_open, stop_fill)
+                        target_fill = np.where(bar_open > target_fill, bar_open, target_fill)
+                    price = np.where(stop_hit, stop_fill, np.where(target_hit, target_fill, price))
+                    reason = np.where(stop_hit, EXIT_STOP, np.where(target_hit, EXIT_TARGET, EXIT_TIME))
+                    close_positions(held[exiting], t, price[exiting], reason[exiting])
+
+            # 2. Entries, best score first, within the risk budget and cash
+            candidates = np.flatnonzero(signals[:, t] & ~is_open & (close[:, t] > 0) & (fraction > 0))
+            if len(candidates):
+                priority = score[candidates, t] if score is not None else fraction[candidates]
+                candidates = candidates[np.argsort(-priority, kind='stable')]
+
+                if self.max_positions is not None:
+                    candidates = candidates[:max(0, self.max_positions - int(is_open.sum()))]
+
+                sizes = self.risk_validator.validate_new_positions_array(
+                    fraction[candidates], pos_fraction.sum()
+                )
+                equity = cash + (shares * np.nan_to_num(mark[:, t])).sum()
+
+                raw_price = close[candidates, t]
+                # Epsilon keeps float noise in the risk budget (0.5 - 0.4) from
+                # dropping a whole share
+                approx_shares = np.floor(sizes * equity / raw_price + 1e-9)
+                fill = raw_price + self._slippage(raw_price, approx_shares, avg_volume[candidates, t])
+                qty = np.floor(sizes * equity / fill + 1e-9)
+                value = qty * fill
+                cost = value + self._costs(value)
+
+                accept = (qty > 0) & (np.cumsum(np.where(qty > 0, cost, 0.0)) <= cash)
+                chosen = candidates[accept]
+                if len(chosen):
+                    cash -= cost[accept].sum()
+                    is_open[chosen] = True
+                    shares[chosen] = qty[accept]
+                    entry_price[chosen] = fill[accept]
+                    entry_cost[chosen] = cost[accept]
+                    entry_day[chosen] = t
+                    pos_fraction[chosen] = sizes[accept]
+                    pos_stop[chosen] = (
+                        stop_levels[chosen, t] if stop_levels is not None
+                        else fill[accept] * (1 - stop_loss_pct / 100)
+                    )
+                    pos_target[chosen] = (
+                        target_levels[chosen, t] if target_levels is not None
+                        else fill[accept] * (1 + target_pct / 100)
+                    )
+
+            equity_curve[t] = cash + (shares * np.nan_to_num(mark[:, t])).sum()
+            cash_curve[t] = cash
+            exposure_curve[t] = pos_fraction.sum()
+
+        # 3. Liquidate what is still open at the last mark
+        still_open = np.flatnonzero(is_open)
+        if len(still_open):
+            close_positions(
+                still_open, n_days - 1, mark[still_open, n_days - 1],
+                np.full(len(still_open), EXIT_END)
+            )
+
+        trades_df = self._trades_frame(trades, symbols, dates)
+        equity = pd.Series(equity_curve, index=dates, name='equity')
+
+        return PortfolioResult(
+            equity_curve=equity,
+            cash=pd.Series(cash_curve, index=dates, name='cash'),
+            exposure=pd.Series(exposure_curve, index=dates, name='exposure'),
+            trades=trades_df,
+            metrics=self._calculate_metrics(equity, trades_df, cash)
+        )
+
+    def _trades_frame(
+        self,
+        trades: List[Dict[str, np.ndarray]],
+        symbols: np.ndarray,
+        dates: pd.Index
+    ) -> pd.DataFrame:
+        columns = ['symbol', 'entry_date', 'exit_date', 'entry_price', 'exit_price',
+                   'shares', 'pnl', 'pnl_pct', 'exit_reason']
+        if not trades:
+            return pd.DataFrame(columns=columns)
+
+        merged = {key: np.concatenate([batch[key] for batch in trades]) for key in trades[0]}
+        frame = pd.DataFrame({
+            'symbol': symbols[merged['symbol']],
+            'entry_date': dates[merged['entry_day']],
+            'exit_date': dates[merged['exit_day']],
+            'entry_price': merged['entry_price'],
+            'exit_price': merged['exit_price'],
+            'shares': merged['shares'].astype(int),
+            'pnl': merged['pnl'],
+            'pnl_pct': (merged['exit_price'] - merged['entry_price']) / merged['entry_price'] * 100,
+            'exit_reason': merged['exit_reason']
+        })
+        return frame.sort_values(['exit_date', 'entry_date'], kind='stable').reset_index(drop=True)
+
+    def _calculate_metrics(self, equity: pd.Series, trades: pd.DataFrame, final_cash: float) -> Dict[str, Any]:
+        """Metrics named like BacktestEngine's, with Sharpe on daily equity returns"""
+        returns = equity.pct_change().dropna()
+        sharpe = 0.0
+        if len(returns) > 1 and returns.std() > 0:
+            sharpe = returns.mean() / returns.std() * np.sqrt(252)
+
+        running_max = equity.cummax()
+        drawdown = (equity - running_max) / running_max * 100
+        max_drawdown = drawdown.min() if len(drawdown) else 0.0
+
+        total_pnl = final_cash - self.initial_capital
+        total_return_pct = total_pnl / self.initial_capital * 100
+        wins = int((trades['pnl'] > 0).sum()) if len(trades) else 0
+        losses = int((trades['pnl'] < 0).sum()) if len(trades) else 0
+
+        return {
+            'total_trades': len(trades),
+            'wins': wins,
+            'losses': losses,
+            'win_rate': wins / len(trades) * 100 if len(trades) else 0,
+            'total_pnl': total_pnl,
+            'total_return_pct': total_return_pct,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': max_drawdown,
+            'final_capital': final_cash
+        }
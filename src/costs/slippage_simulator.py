@@ -1,5 +1,7 @@
 """Slippage Simulator (SHORT-037 to SHORT-039)"""
 
+import numpy as np
+
 
 class SlippageSimulator:
     """Simulate slippage based on spread and liquidity"""
@@ -45,3 +47,32 @@ class SlippageSimulator:
 
         # Total slippage
         return spread_slippage + liquidity_slippage
+
+    def calculate_slippage_array(
+        self,
+        price: np.ndarray,
+        volume: np.ndarray,
+        avg_volume: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate slippage for many fills at once
+
+        Args:
+            price: Entry/exit prices
+            volume: Trade volumes
+            avg_volume: Average daily volumes (<= 0 or NaN: liquidity ratio 1.0)
+
+        Returns:
+            Array of slippage amounts
+        """
+        price = np.asarray(price, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        avg_volume = np.asarray(avg_volume, dtype=float)
+
+        spread_slippage = price * (self.spread_based_pct / 100)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            liquidity_ratio = np.where(avg_volume > 0, volume / avg_volume, 1.0)
+        liquidity_slippage = price * (self.liquidity_factor / 100) * liquidity_ratio
+
+        return spread_slippage + liquidity_slippage
@@ -4,6 +4,8 @@ Kelly Fraction Calculator (SHORT-017)
 Calculate optimal position size using Kelly formula.
 """
 
+import numpy as np
+
 
 class KellyFractionCalculator:
     """Calculate Kelly fraction for position sizing"""
@@ -68,3 +70,45 @@ class KellyFractionCalculator:
 
         # Cap at 1 (never bet more than 100%)
         return min(kelly, 1.0)
+
+    def calculate_array(
+        self,
+        win_rate: np.ndarray,
+        avg_profit: np.ndarray,
+        avg_loss: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate Kelly fractions for many symbols/strategies at once
+
+        Same rules as calculate(), element-wise.
+
+        Args:
+            win_rate: Win rates as percentages (0-100)
+            avg_profit: Average profits per winning trade (positive)
+            avg_loss: Average losses per losing trade (negative)
+
+        Returns:
+            Array of Kelly fractions between 0 and 1
+
+        Raises:
+            ValueError: If any input is invalid
+        """
+        win_rate, avg_profit, avg_loss = np.broadcast_arrays(
+            np.asarray(win_rate, dtype=float),
+            np.asarray(avg_profit, dtype=float),
+            np.asarray(avg_loss, dtype=float)
+        )
+
+        if ((win_rate < 0) | (win_rate > 100)).any():
+            raise ValueError("Win rate must be between 0 and 100")
+
+        if (avg_loss > 0).any():
+            raise ValueError("avg_loss must be negative or zero")
+
+        W = win_rate / 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            R = avg_profit / np.abs(avg_loss)
+            kelly = np.clip((W * R - (1 - W)) / R, 0.0, 1.0)
+
+        kelly = np.where((win_rate == 100) | (avg_loss == 0), 0.25, kelly)
+        return np.where((win_rate == 0) | (avg_profit == 0), 0.0, kelly)
@@ -1,5 +1,7 @@
 """Position Cap Enforcer (SHORT-020)"""
 
+import numpy as np
+
 
 class PositionCapEnforcer:
     """Enforce position size caps (20% equity, 4% F&O)"""
@@ -34,3 +36,22 @@ class PositionCapEnforcer:
         cap_fraction = cap / 100
 
         return min(kelly_fraction, cap_fraction)
+
+    def enforce_array(
+        self,
+        kelly_fraction: np.ndarray,
+        instrument_type: str = "equity"
+    ) -> np.ndarray:
+        """
+        Enforce position caps on an array of Kelly fractions
+
+        Args:
+            kelly_fraction: Calculated Kelly fractions
+            instrument_type: "equity" or "fno"
+
+        Returns:
+            Capped Kelly fractions
+        """
+        cap = self.equity_cap if instrument_type == "equity" else self.fno_cap
+
+        return np.minimum(np.asarray(kelly_fraction, dtype=float), cap / 100)
@@ -7,9 +7,10 @@ Track strategy performance for Kelly fraction calculation.
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-import sqlite3
 import json
 
+from tools.db_utils import pooled_connection
+
 
 @dataclass
 class Trade:
@@ -121,51 +122,45 @@ class StrategyPerformanceTracker:
         if not self.db_path:
             return
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profit REAL,
-                timestamp TEXT
-            )
-        ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profit REAL,
+                    timestamp TEXT
+                )
+            ''')
 
-        for trade in self.trades:
-            cursor.execute(
+            cursor.executemany(
                 'INSERT INTO trades (profit, timestamp) VALUES (?, ?)',
-                (trade.profit, trade.timestamp.isoformat())
+                [(trade.profit, trade.timestamp.isoformat()) for trade in self.trades]
             )
 
-        conn.commit()
-        conn.close()
-
     def load(self):
         """Load trades from database"""
         if not self.db_path:
             return
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profit REAL,
-                timestamp TEXT
-            )
-        ''')
-
-        cursor.execute('SELECT profit, timestamp FROM trades')
-        rows = cursor.fetchall()
-
-        self.trades = [
-            Trade(
-                profit=row[0],
-                timestamp=datetime.fromisoformat(row[1])
-            )
-            for row in rows
-        ]
-
-        conn.close()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    profit REAL,
+                    timestamp TEXT
+                )
+            ''')
+
+            cursor.execute('SELECT profit, timestamp FROM trades')
+            rows = cursor.fetchall()
+
+            self.trades = [
+                Trade(
+                    profit=row[0],
+                    timestamp=datetime.fromisoformat(row[1])
+                )
+                for row in rows
+            ]
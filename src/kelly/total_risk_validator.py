@@ -1,5 +1,7 @@
 """Total Risk Constraint Validator (SHORT-021)"""
 
+import numpy as np
+
 
 class TotalRiskValidator:
     """Validate total portfolio risk constraints"""
@@ -81,3 +83,29 @@ class TotalRiskValidator:
         """
         current_risk = self.get_current_total_risk(existing_positions)
         return max(0.0, self.max_total_risk - current_risk)
+
+    def validate_new_positions_array(
+        self,
+        proposed_position_sizes: np.ndarray,
+        current_total_risk: float = 0.0
+    ) -> np.ndarray:
+        """
+        Validate several new positions added in order
+
+        Equivalent to calling validate_new_position() for each proposal in
+        turn and appending the accepted size to the existing positions.
+
+        Args:
+            proposed_position_sizes: Proposed sizes as fractions, in priority order
+            current_total_risk: Total size of positions already held
+
+        Returns:
+            Validated sizes (scaled down or 0 once the limit is reached)
+        """
+        proposed = np.asarray(proposed_position_sizes, dtype=float)
+        available = self.max_total_risk - current_total_risk
+
+        # Accepted sizes never exceed proposals, so until the limit binds the
+        # running total is the cumulative proposal
+        used_before = np.concatenate([[0.0], np.cumsum(proposed)[:-1]])
+        return np.clip(np.minimum(proposed, available - used_before), 0.0, None)
@@ -1,5 +1,6 @@
 """Signal Filter (SHORT-028)"""
 
+import numpy as np
 import pandas as pd
 
 
@@ -44,3 +45,28 @@ class SignalFilter:
         dma_condition = pct_above_dma >= self.dma_threshold
 
         return adx_condition & dma_condition
+
+    def filter_signals_array(
+        self,
+        close: np.ndarray,
+        adx: np.ndarray,
+        dma: np.ndarray
+    ) -> np.ndarray:
+        """
+        Filter buy signals for one or many symbols
+
+        Args:
+            close: Close prices, shape (bars,) or (symbols, bars)
+            adx: ADX values, same shape
+            dma: DMA values, same shape
+
+        Returns:
+            Boolean array (NaN inputs are never valid, as in filter_signals)
+        """
+        close = np.asarray(close, dtype=float)
+        adx = np.asarray(adx, dtype=float)
+        dma = np.asarray(dma, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_above_dma = (close - dma) / dma * 100
+            return (adx >= self.adx_threshold) & (pct_above_dma >= self.dma_threshold)
@@ -1,8 +1,17 @@
 """Signal Strength Scorer (SHORT-029)"""
 
+import numpy as np
 import pandas as pd
 from typing import Dict
 
+from src.signals.technical_indicators import TechnicalIndicators
+
+
+def _is_clamped(raw: np.ndarray) -> np.ndarray:
+    """Where min(100, max(0, raw)) returns an int rather than raw itself"""
+    with np.errstate(invalid='ignore'):
+        return ~((raw > 0) & (raw < 100))
+
 
 class SignalStrengthScorer:
     """Score signal strength based on multiple factors"""
@@ -98,26 +107,92 @@ class SignalStrengthScorer:
         Returns:
             Series with signal strength scores (0-100)
         """
-        close = df['close']
-        volume = df['volume']
-        avg_volume = volume.rolling(window=volume_period).mean()
-
-        scores = []
-        for i in range(len(df)):
-            if pd.isna(adx.iloc[i]) or pd.isna(dma.iloc[i]) or pd.isna(avg_volume.iloc[i]):
-                scores.append(0.0)
-            else:
-                score = self.score_signal(
-                    close=close.iloc[i],
-                    adx=adx.iloc[i],
-                    dma=dma.iloc[i],
-                    volume=volume.iloc[i],
-                    avg_volume=avg_volume.iloc[i]
-                )
-                scores.append(score)
+        scores = self.score_signals_array(
+            close=df['close'].to_numpy(dtype=float),
+            volume=df['volume'].to_numpy(dtype=float),
+            adx=np.asarray(adx, dtype=float),
+            dma=np.asarray(dma, dtype=float),
+            volume_period=volume_period
+        )
 
         return pd.Series(scores, index=df.index)
 
+    def score_signals_array(
+        self,
+        close: np.ndarray,
+        volume: np.ndarray,
+        adx: np.ndarray,
+        dma: np.ndarray,
+        volume_period: int = 20
+    ) -> np.ndarray:
+        """
+        Score all bars of one or many symbols in a single pass
+
+        Args:
+            close: Close prices, shape (bars,) or (symbols, bars)
+            volume: Volumes, same shape
+            adx: ADX values, same shape
+            dma: DMA values, same shape
+            volume_period: Period for average volume calculation
+
+        Returns:
+            Array of scores (0-100), same shape; 0.0 where ADX, DMA or
+            average volume is unavailable (identical to score_signals)
+        """
+        avg_volume = TechnicalIndicators.rolling_mean(volume, volume_period)
+        return self.score_array(close, adx, dma, volume, avg_volume)
+
+    def score_array(
+        self,
+        close: np.ndarray,
+        adx: np.ndarray,
+        dma: np.ndarray,
+        volume: np.ndarray,
+        avg_volume: np.ndarray
+    ) -> np.ndarray:
+        """
+        Array version of score_signal (any matching shapes)
+
+        Bars where ADX, DMA or average volume is NaN score 0.0, matching
+        score_signals.
+
+        Returns:
+            Array of scores (0-100)
+        """
+        close = np.asarray(close, dtype=float)
+        adx = np.asarray(adx, dtype=float)
+        dma = np.asarray(dma, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        avg_volume = np.asarray(avg_volume, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            adx_raw = (adx - 25) * 4
+            pct_above_dma = ((close - dma) / dma) * 100
+            dma_raw = pct_above_dma * 10
+            volume_raw = np.where(avg_volume > 0, (volume / avg_volume - 1) * 100, 0.0)
+
+        # Python's max(0, nan) is 0, so NaN components score 0
+        adx_score = np.nan_to_num(np.clip(adx_raw, 0, 100), nan=0.0)
+        dma_score = np.nan_to_num(np.clip(dma_raw, 0, 100), nan=0.0)
+        volume_score = np.nan_to_num(np.clip(volume_raw, 0, 100), nan=0.0)
+
+        total_score = (
+            self.adx_weight * adx_score +
+            self.dma_weight * dma_score +
+            self.volume_weight * volume_score
+        )
+
+        # score_signal sees numpy floats, so round() dispatches to np.round,
+        # except when every component was clamped to the int 0 or 100 and the
+        # total is a plain Python float
+        scores = np.round(total_score, 2)
+        clamped = _is_clamped(adx_raw) & _is_clamped(dma_raw) & _is_clamped(volume_raw)
+        if clamped.any():
+            scores[clamped] = [round(float(v), 2) for v in total_score[clamped]]
+
+        valid = ~(np.isnan(adx) | np.isnan(dma) | np.isnan(avg_volume))
+        return np.where(valid, scores, 0.0)
+
     def get_score_breakdown(
         self,
         close: float,
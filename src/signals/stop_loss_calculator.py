@@ -1,5 +1,6 @@
 """Stop-Loss Calculator (SHORT-032)"""
 
+import numpy as np
 import pandas as pd
 
 
@@ -63,3 +64,28 @@ class StopLossCalculator:
             return close - stop_distance
         else:
             return close + stop_distance
+
+    def calculate_stop_losses_array(
+        self,
+        close: np.ndarray,
+        atr: np.ndarray,
+        direction: str = "long"
+    ) -> np.ndarray:
+        """
+        Calculate stop-loss for one or many symbols
+
+        Args:
+            close: Close prices, shape (bars,) or (symbols, bars)
+            atr: ATR values, same shape
+            direction: "long" or "short"
+
+        Returns:
+            Array of stop-loss levels
+        """
+        close = np.asarray(close, dtype=float)
+        stop_distance = np.asarray(atr, dtype=float) * self.atr_multiplier
+
+        if direction == "long":
+            return close - stop_distance
+        else:
+            return close + stop_distance
@@ -1,5 +1,6 @@
 """Target Calculator (SHORT-033)"""
 
+import numpy as np
 import pandas as pd
 
 
@@ -65,3 +66,28 @@ class TargetCalculator:
             return close + reward
         else:
             return close - reward
+
+    def calculate_targets_array(
+        self,
+        close: np.ndarray,
+        stop_losses: np.ndarray,
+        direction: str = "long"
+    ) -> np.ndarray:
+        """
+        Calculate targets for one or many symbols
+
+        Args:
+            close: Close prices, shape (bars,) or (symbols, bars)
+            stop_losses: Stop-loss levels, same shape
+            direction: "long" or "short"
+
+        Returns:
+            Array of target levels
+        """
+        close = np.asarray(close, dtype=float)
+        reward = np.abs(close - np.asarray(stop_losses, dtype=float)) * self.risk_reward_ratio
+
+        if direction == "long":
+            return close + reward
+        else:
+            return close - reward
@@ -110,3 +110,24 @@ class TechnicalIndicators:
         atr = tr.rolling(window=period).mean()
 
         return atr
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+        """
+        Rolling mean along the bar axis for 1-D (bars) or 2-D (symbols x bars) arrays
+
+        Uses the same pandas rolling kernel as the Series-based indicators, so
+        results match them exactly (NaN for the first period-1 bars).
+
+        Args:
+            values: Array of shape (bars,) or (symbols, bars)
+            period: Window length
+
+        Returns:
+            Array of the same shape with rolling means
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            return pd.Series(values).rolling(window=period).mean().to_numpy()
+        # Columns are symbols so pandas rolls every symbol in one call
+        return pd.DataFrame(values.T).rolling(window=period).mean().to_numpy().T
@@ -1,7 +1,10 @@
 """Volume Confirmation Checker (SHORT-030)"""
 
+import numpy as np
 import pandas as pd
 
+from src.signals.technical_indicators import TechnicalIndicators
+
 
 class VolumeConfirmationChecker:
     """Check volume confirmation for signals"""
@@ -54,3 +57,24 @@ class VolumeConfirmationChecker:
         avg_volume = volume.rolling(window=volume_period).mean()
 
         return volume >= (self.volume_threshold * avg_volume)
+
+    def check_signals_array(
+        self,
+        volume: np.ndarray,
+        volume_period: int = 20
+    ) -> np.ndarray:
+        """
+        Check volume confirmation for one or many symbols
+
+        Args:
+            volume: Volumes, shape (bars,) or (symbols, bars)
+            volume_period: Period for average volume
+
+        Returns:
+            Boolean array (False during the warm-up window, as in check_signals)
+        """
+        volume = np.asarray(volume, dtype=float)
+        avg_volume = TechnicalIndicators.rolling_mean(volume, volume_period)
+
+        with np.errstate(invalid='ignore'):
+            return volume >= (self.volume_threshold * avg_volume)
@@ -9,6 +9,7 @@ This implementation follows Test-Driven Development (TDD):
 - Coverage target: 100%
 """
 
+import asyncio
 import time
 import threading
 from typing import Dict
@@ -134,3 +135,83 @@ class RateLimiter:
                 'burst_capacity': self.burst_capacity,
                 'requests_per_second': self.requests_per_second
             }
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket rate limiter for asyncio code
+
+    Same bucket semantics as RateLimiter, but waiting yields to the event
+    loop (asyncio.sleep) instead of blocking the thread. Not thread-safe:
+    use one instance per event loop.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst_capacity: int = None
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_second: Maximum sustained request rate
+            burst_capacity: Maximum burst size (defaults to requests_per_second)
+        """
+        self.requests_per_second = requests_per_second
+        self.burst_capacity = burst_capacity if burst_capacity is not None else max(1, int(requests_per_second))
+
+        # Token bucket state
+        self._tokens = float(self.burst_capacity)
+        self._last_refill = time.monotonic()
+
+        # Statistics
+        self._total_requests = 0
+        self._total_wait_time = 0.0
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        Acquire tokens, sleeping (without blocking the loop) if necessary
+
+        Args:
+            tokens: Number of tokens to acquire
+
+        Returns:
+            Time waited in seconds
+        """
+        wait_time = 0.0
+
+        while True:
+            self._refill()
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._total_requests += 1
+                self._total_wait_time += wait_time
+                return wait_time
+
+            wait_seconds = (tokens - self._tokens) / self.requests_per_second
+            await asyncio.sleep(wait_seconds)
+            wait_time += wait_seconds
+
+    def _refill(self):
+        """Refill tokens based on elapsed time"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self._tokens + elapsed * self.requests_per_second, self.burst_capacity)
+        self._last_refill = now
+
+    def get_stats(self) -> Dict:
+        """
+        Get usage statistics
+
+        Returns:
+            Dict with statistics
+        """
+        return {
+            'total_requests': self._total_requests,
+            'total_wait_time': self._total_wait_time,
+            'current_tokens': self._tokens,
+            'burst_capacity': self.burst_capacity,
+            'requests_per_second': self.requests_per_second
+        }
@@ -0,0 +1,332 @@
+"""
+Symbol Master
+
+Process-wide BSE code / NSE symbol / ISIN resolution.
+
+The mapping database (`bse_nse_mapping` table written by
+StockFilterByEarningsTool, or `mappings` written by BSENSEMapper) and an
+optional NSDL ISIN master CSV are loaded once into a SymbolIndex:
+
+- parallel numpy arrays of interned strings (one row per security)
+- dict indexes (key -> row) for O(1) single lookups in either direction
+- sorted key arrays for vectorized `map_many` over arrays of identifiers
+
+get_symbol_master() returns one SymbolMaster per mapping DB per process. One
+daemon thread polls each shared master's DB (mtime, size) and swaps in a
+rebuilt index when it changes; readers never block on a reload.
+
+Usage:
+    master = get_symbol_master("data/bse_nse_mapping.db")
+    master.get_nse_symbol("500325")            # 'RELIANCE'
+    master.map_many(["500325", "532540"])      # array(['RELIANCE', 'TCS'], dtype=object)
+"""
+
+import csv
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KEYS = ('bse_code', 'nse_symbol', 'isin')
+
+# Header aliases seen in NSDL / exchange ISIN master files (matched case-insensitively)
+ISIN_CSV_COLUMNS = {
+    'isin': ('isin', 'isin code', 'isin_code', 'isin no'),
+    'company_name': ('company_name', 'name of the company', 'issuer name', 'name', 'security name'),
+    'nse_symbol': ('nse_symbol', 'symbol', 'nse symbol'),
+    'bse_code': ('bse_code', 'scrip code', 'security code', 'bse code'),
+}
+
+
+def _intern(value) -> Optional[str]:
+    """Strip and intern an identifier; empty values become None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return sys.intern(value) if value else None
+
+
+class SymbolIndex:
+    """
+    Immutable snapshot of the symbol master.
+
+    Rows are kept in source order; when several rows share a key (e.g. two
+    BSE codes listed against one NSE symbol) the first row wins, matching the
+    previous `SELECT ... WHERE nse_symbol = ?` behaviour.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Optional[str], ...]]):
+        """
+        Args:
+            rows: (bse_code, nse_symbol, isin, company_name) tuples
+        """
+        rows = [tuple(_intern(v) for v in row) for row in rows]
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for i, name in enumerate(KEYS + ('company_name',)):
+            column = np.empty(len(rows), dtype=object)
+            column[:] = [row[i] for row in rows]
+            self.columns[name] = column
+
+        self._lookup: Dict[str, Dict[str, int]] = {}
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for key in KEYS:
+            lookup: Dict[str, int] = {}
+            for row_id, value in enumerate(self.columns[key]):
+                if value is not None:
+                    lookup.setdefault(value, row_id)
+            self._lookup[key] = lookup
+
+            keys = np.array(list(lookup), dtype=str)
+            row_ids = np.fromiter(lookup.values(), dtype=np.int64, count=len(lookup))
+            order = np.argsort(keys, kind='stable')
+            self._sorted[key] = (keys[order], row_ids[order])
+
+    def __len__(self) -> int:
+        return len(self.columns['bse_code'])
+
+    def lookup(self, value, from_key: str, to_key: str) -> Optional[str]:
+        """Resolve one identifier; None when unknown"""
+        row_id = self._lookup[from_key].get(str(value).strip())
+        return None if row_id is None else self.columns[to_key][row_id]
+
+    def map_many(self, values, from_key: str, to_key: str) -> np.ndarray:
+        """
+        Resolve an array of identifiers in one pass.
+
+        Args:
+            values: Sequence/array of identifiers
+            from_key: One of KEYS
+            to_key: One of KEYS or 'company_name'
+
+        Returns:
+            Object array aligned with values; None where unresolved
+        """
+        queries = np.char.strip(np.asarray(values).astype(str))
+        result = np.empty(len(queries), dtype=object)
+        keys, row_ids = self._sorted[from_key]
+        if len(keys) == 0 or len(queries) == 0:
+            return result
+
+        pos = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+        hit = keys[pos] == queries
+        result[hit] = self.columns[to_key][row_ids[pos[hit]]]
+        return result
+
+
+def _read_mapping_db(db_path: Path) -> List[Tuple]:
+    """Rows from whichever mapping table the DB holds, in insertion order"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        table = 'bse_nse_mapping' if 'bse_nse_mapping' in tables else 'mappings' if 'mappings' in tables else None
+        if table is None:
+            return []
+        return conn.execute(
+            f"SELECT bse_code, nse_symbol, isin, company_name FROM {table} ORDER BY rowid"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _read_isin_csv(csv_path: Path) -> List[Dict[str, Optional[str]]]:
+    """ISIN master rows normalised to bse_code / nse_symbol / isin / company_name"""
+    records = []
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        headers = {h.strip().lower(): h for h in (reader.fieldnames or [])}
+        columns = {
+            field: next((headers[a] for a in aliases if a in headers), None)
+            for field, aliases in ISIN_CSV_COLUMNS.items()
+        }
+        if columns['isin'] is None:
+            logger.warning(f"No ISIN column in {csv_path}; ignoring file")
+            return records
+
+        for row in reader:
+            record = {field: _intern(row.get(col)) if col else None for field, col in columns.items()}
+            if record['isin'] and len(record['isin']) == 12:
+                records.append(record)
+    return records
+
+
+def build_symbol_index(mapping_db_path: Optional[str], isin_csv_path: Optional[str] = None) -> SymbolIndex:
+    """
+    Merge the mapping DB with the ISIN master.
+
+    DB rows are authoritative. ISIN master rows fill missing ISINs / company
+    names on DB rows (joined by ISIN, BSE code or NSE symbol) and add ISIN-only
+    securities that the DB does not know yet.
+    """
+    rows: List[List[Optional[str]]] = []
+    if mapping_db_path and Path(mapping_db_path).exists():
+        rows = [list(row) for row in _read_mapping_db(Path(mapping_db_path))]
+
+    if isin_csv_path and Path(isin_csv_path).exists():
+        by_key = {key: {} for key in KEYS}
+        for row in rows:
+            for i, key in enumerate(KEYS):
+                if row[i]:
+                    by_key[key].setdefault(row[i], row)
+
+        for record in _read_isin_csv(Path(isin_csv_path)):
+            row = next(
+                (by_key[key][record[key]] for key in KEYS if record[key] and record[key] in by_key[key]),
+                None
+            )
+            if row is None:
+                row = [record['bse_code'], record['nse_symbol'], record['isin'], record['company_name']]
+                rows.append(row)
+                for i, key in enumerate(KEYS):
+                    if row[i]:
+                        by_key[key].setdefault(row[i], row)
+                continue
+            if not row[2]:
+                row[2] = record['isin']
+                by_key['isin'].setdefault(record['isin'], row)
+            if not row[3]:
+                row[3] = record['company_name']
+
+    return SymbolIndex(rows)
+
+
+class SymbolMaster:
+    """
+    Symbol master over one mapping DB (+ optional ISIN CSV).
+
+    Lookups read the current SymbolIndex reference; reloads build a new index
+    off to the side and swap it in, so concurrent readers see either the old
+    or the new snapshot, never a partial one.
+    """
+
+    def __init__(self, mapping_db_path: str, isin_csv_path: Optional[str] = None):
+        """
+        Args:
+            mapping_db_path: Path to BSE-NSE mapping database
+            isin_csv_path: Optional NSDL ISIN master CSV
+        """
+        self.mapping_db_path = Path(mapping_db_path)
+        self.isin_csv_path = Path(isin_csv_path) if isin_csv_path else None
+
+        self._reload_lock = threading.Lock()
+        self._signature = None
+        self.index = SymbolIndex([])
+        self.reload()
+
+    def _current_signature(self):
+        """(mtime_ns, size) of the DB and CSV; changes whenever either is rewritten"""
+        signature = []
+        for path in (self.mapping_db_path, self.isin_csv_path):
+            try:
+                stat = path.stat() if path else None
+                signature.append((stat.st_mtime_ns, stat.st_size) if stat else None)
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload(self) -> bool:
+        """
+        Rebuild the index from disk.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        with self._reload_lock:
+            signature = self._current_signature()
+            try:
+                index = build_symbol_index(
+                    str(self.mapping_db_path),
+                    str(self.isin_csv_path) if self.isin_csv_path else None
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Symbol master reload failed, keeping previous index: {e}")
+                return False
+            self.index = index
+            self._signature = signature
+        logger.info(f"Symbol master loaded {len(index)} securities from {self.mapping_db_path}")
+        return True
+
+    def refresh(self) -> bool:
+        """Reload only if the DB or CSV changed since the last load"""
+        if self._current_signature() == self._signature:
+            return False
+        return self.reload()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get_nse_symbol(self, bse_code) -> Optional[str]:
+        """NSE symbol for a BSE code"""
+        return self.index.lookup(bse_code, 'bse_code', 'nse_symbol')
+
+    def get_bse_code(self, nse_symbol: str) -> Optional[str]:
+        """BSE code for an NSE symbol"""
+        return self.index.lookup(nse_symbol, 'nse_symbol', 'bse_code')
+
+    def get_isin(self, identifier, from_key: str = 'bse_code') -> Optional[str]:
+        """ISIN for a BSE code (or NSE symbol with from_key='nse_symbol')"""
+        return self.index.lookup(identifier, from_key, 'isin')
+
+    def from_isin(self, isin: str, to_key: str = 'nse_symbol') -> Optional[str]:
+        """NSE symbol (or BSE code / company name) for an ISIN"""
+        return self.index.lookup(isin, 'isin', to_key)
+
+    def map_many(self, values, from_key: str = 'bse_code', to_key: str = 'nse_symbol') -> np.ndarray:
+        """Vectorized lookup; see SymbolIndex.map_many"""
+        return self.index.map_many(values, from_key, to_key)
+
+
+WATCH_INTERVAL_SECONDS = 30.0
+
+_masters: Dict[Tuple[str, Optional[str]], SymbolMaster] = {}
+_masters_lock = threading.Lock()
+_watcher: Optional[threading.Thread] = None
+
+
+def _watch_masters():
+    """Daemon loop: refresh every shared master whose files changed"""
+    while True:
+        time.sleep(WATCH_INTERVAL_SECONDS)
+        with _masters_lock:
+            masters = list(_masters.values())
+        for master in masters:
+            master.refresh()
+
+
+def get_symbol_master(
+    mapping_db_path: str = "data/bse_nse_mapping.db",
+    isin_csv_path: Optional[str] = None
+) -> SymbolMaster:
+    """
+    Process-wide SymbolMaster for a mapping DB (+ ISIN CSV), created on first use.
+
+    Shared masters are refreshed by a single background thread every
+    WATCH_INTERVAL_SECONDS.
+
+    Args:
+        mapping_db_path: Path to BSE-NSE mapping database
+        isin_csv_path: Optional NSDL ISIN master CSV
+
+    Returns:
+        Shared SymbolMaster
+    """
+    global _watcher
+
+    key = (os.path.abspath(mapping_db_path), os.path.abspath(isin_csv_path) if isin_csv_path else None)
+    with _masters_lock:
+        master = _masters.get(key)
+        if master is None:
+            master = SymbolMaster(mapping_db_path, isin_csv_path)
+            _masters[key] = master
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_masters, name="symbol-master-watcher", daemon=True)
+            _watcher.start()
+        return master
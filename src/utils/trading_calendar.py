@@ -0,0 +1,246 @@
+"""
+Trading Calendar
+
+NSE/BSE equity trading sessions as a precomputed, sorted array of trading
+days (numpy datetime64[D]).
+
+Both exchanges share one equity holiday list, loaded from a local CSV
+(`market_holidays.csv` next to this module by default) with columns:
+
+    date        YYYY-MM-DD
+    kind        'holiday' (weekday closure) or 'session' (weekend trading day)
+    description free text
+
+Every lookup is a binary search on the day array (O(log n)), and whole date
+arrays convert to trading-day ordinals in one vectorized call, so label
+alignment, gap detection and window slicing reduce to integer arithmetic.
+
+Ordinals are positions in the day array: ordinal(next trading day) is
+ordinal(day) + 1 regardless of weekends and holidays in between.
+
+Usage:
+    calendar = get_trading_calendar()
+    calendar.next_trading_day("2024-11-14")          # '2024-11-18' (15th is Gurunanak Jayanti)
+    calendar.count_between("2024-11-01", "2024-11-30")
+    calendar.ordinals(df['date'])                    # int64 array
+"""
+
+import csv
+import logging
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOLIDAYS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "market_holidays.csv")
+
+# Range of the precomputed day array; years missing from the holiday file
+# fall back to weekdays
+CALENDAR_START = "2000-01-01"
+CALENDAR_END = "2030-12-31"
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def to_day(value: DateLike) -> np.datetime64:
+    """Convert a date-like value to datetime64[D]"""
+    if isinstance(value, str):
+        return np.datetime64(value[:10], 'D')
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+def to_days(values: Iterable[DateLike]) -> np.ndarray:
+    """Convert an array of date-likes (ISO strings, dates, datetime64) to datetime64[D]"""
+    if isinstance(values, (pd.Series, pd.Index)) and pd.api.types.is_datetime64_any_dtype(values):
+        return np.asarray(values, dtype='datetime64[ns]').astype('datetime64[D]')
+
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[D]')
+    try:
+        return arr.astype('datetime64[D]')
+    except (TypeError, ValueError):
+        # Timestamps with a time part, pandas objects, mixed inputs
+        return pd.to_datetime(arr).values.astype('datetime64[D]')
+
+
+def load_holiday_file(path: str) -> Dict[str, List[str]]:
+    """
+    Read a holiday CSV
+
+    Args:
+        path: CSV with date, kind and description columns
+
+    Returns:
+        Dict with 'holiday' and 'session' date lists
+    """
+    dates = {'holiday': [], 'session': []}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            kind = (row.get('kind') or 'holiday').strip().lower()
+            if kind not in dates:
+                logger.warning(f"Unknown calendar entry kind '{kind}' in {path}, ignoring")
+                continue
+            dates[kind].append(row['date'].strip())
+    return dates
+
+
+class TradingCalendar:
+    """
+    Sorted trading-day array with binary-search navigation
+
+    Args:
+        holidays: Weekday closures
+        sessions: Extra weekend trading days
+        start: First calendar day covered
+        end: Last calendar day covered
+    """
+
+    def __init__(
+        self,
+        holidays: Iterable[DateLike] = (),
+        sessions: Iterable[DateLike] = (),
+        start: DateLike = CALENDAR_START,
+        end: DateLike = CALENDAR_END
+    ):
+        self.start = to_day(start)
+        self.end = to_day(end)
+        self.holidays = np.unique(to_days(list(holidays)))
+        self.sessions = np.unique(to_days(list(sessions)))
+
+        weekdays = np.arange(self.start, self.end + 1, dtype='datetime64[D]')
+        weekdays = weekdays[np.is_busday(weekdays, holidays=self.holidays)]
+        sessions = self.sessions[(self.sessions >= self.start) & (self.sessions <= self.end)]
+        self.days = np.union1d(weekdays, sessions)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_HOLIDAYS_PATH, **kwargs) -> "TradingCalendar":
+        """Calendar with holidays and special sessions from a local CSV"""
+        entries = load_holiday_file(path)
+        return cls(holidays=entries['holiday'], sessions=entries['session'], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _index(self, day: np.datetime64, side: str) -> int:
+        if day < self.start or day > self.end:
+            raise ValueError(f"{day} is outside the trading calendar ({self.start} to {self.end})")
+        return int(np.searchsorted(self.days, day, side=side))
+
+    def _day(self, index: int) -> str:
+        if index < 0 or index >= len(self.days):
+            raise ValueError("Offset runs past the end of the trading calendar")
+        return str(self.days[index])
+
+    def is_trading_day(self, day: DateLike) -> bool:
+        """True if the exchanges are open on day"""
+        day = to_day(day)
+        index = np.searchsorted(self.days, day)
+        return bool(index < len(self.days) and self.days[index] == day)
+
+    def offset(self, day: DateLike, n: int) -> str:
+        """
+        Trading day n sessions from day
+
+        A non-trading day first rolls to the adjacent trading day in the
+        direction of travel, so offset(saturday, 1) is the next Monday
+        session and offset(saturday, -1) the previous Friday session.
+        n=0 returns day itself or the last trading day before it.
+
+        Args:
+            day: Start date
+            n: Sessions to move (negative moves back)
+
+        Returns:
+            Trading day as YYYY-MM-DD
+
+        Raises:
+            ValueError: If day or the result lies outside the calendar
+        """
+        day = to_day(day)
+        if n >= 0:
+            base = self._index(day, 'right') - 1  # Last trading day on or before
+        else:
+            base = self._index(day, 'left')  # First trading day on or after
+        return self._day(base + n)
+
+    def next_trading_day(self, day: DateLike) -> str:
+        """First trading day strictly after day"""
+        return self.offset(day, 1)
+
+    def prev_trading_day(self, day: DateLike) -> str:
+        """Last trading day strictly before day"""
+        return self.offset(day, -1)
+
+    def count_between(self, start: DateLike, end: DateLike) -> int:
+        """Trading days from start to end inclusive"""
+        start, end = to_day(start), to_day(end)
+        if end < start:
+            return 0
+        return self._index(end, 'right') - self._index(start, 'left')
+
+    def trading_days(self, start: DateLike, end: DateLike) -> List[str]:
+        """Trading days from start to end inclusive, as YYYY-MM-DD"""
+        start, end = to_day(start), to_day(end)
+        return self.days[self._index(start, 'left'):self._index(end, 'right')].astype(str).tolist()
+
+    def ordinals(self, dates: Iterable[DateLike], roll: str = 'forward') -> np.ndarray:
+        """
+        Vectorized trading-day ordinals
+
+        Args:
+            dates: Date-likes (ISO strings, dates, datetime64, DatetimeIndex)
+            roll: Where non-trading days map - 'forward' to the next session,
+                'backward' to the previous one
+
+        Returns:
+            int64 array of positions in the trading-day array
+        """
+        if roll not in ('forward', 'backward'):
+            raise ValueError(f"roll must be 'forward' or 'backward', got {roll!r}")
+        days = to_days(dates)
+        if roll == 'forward':
+            return np.searchsorted(self.days, days, side='left').astype(np.int64)
+        return np.searchsorted(self.days, days, side='right').astype(np.int64) - 1
+
+    def from_ordinals(self, ordinals: Iterable[int]) -> np.ndarray:
+        """Trading days (datetime64[D]) for an array of ordinals"""
+        return self.days[np.asarray(ordinals, dtype=np.int64)]
+
+
+_calendars: Dict[str, TradingCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(holidays_path: str = DEFAULT_HOLIDAYS_PATH) -> TradingCalendar:
+    """
+    Process-wide TradingCalendar for a holiday file, built on first use
+
+    A missing file yields a weekday-only calendar (logged once).
+
+    Args:
+        holidays_path: Holiday CSV
+
+    Returns:
+        Shared TradingCalendar
+    """
+    key = os.path.abspath(holidays_path)
+    with _calendars_lock:
+        calendar = _calendars.get(key)
+        if calendar is None:
+            if os.path.exists(key):
+                calendar = TradingCalendar.from_file(key)
+            else:
+                logger.warning(f"Holiday file not found: {holidays_path}, using weekdays only")
+                calendar = TradingCalendar()
+            _calendars[key] = calendar
+        return calendar
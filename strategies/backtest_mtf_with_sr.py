@@ -19,7 +19,7 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import yfinance as yf
 
-from strategies.multi_timeframe_breakout import MultiTimeframeBreakoutStrategy
+from strategies.multi_timeframe_breakout import MultiTimeframeBreakoutStrategy, MultiTimeframeDataView
 
 
 class MTFBacktesterWithSR:
@@ -61,6 +61,14 @@ class MTFBacktesterWithSR:
             daily_data.columns = [col.lower() for col in daily_data.columns]
             print(f"✅ Fetched {len(daily_data)} days of data\n")
 
+            # One preloaded view drives every as-of evaluation below
+            market = yf.Ticker('^NSEI').history(start=start_date, end=end_date)
+            data_view = MultiTimeframeDataView(
+                symbol,
+                daily_data,
+                market_close=market['Close'] if not market.empty else None
+            )
+
             # Walk forward through time, checking for signals
             signals_found = 0
             trades_taken = 0
@@ -74,7 +82,7 @@ class MTFBacktesterWithSR:
                 try:
                     # Use the ACTUAL strategy generate_signal method
                     # We need to temporarily set the data lookback
-                    signal = self._try_generate_signal(symbol, current_date)
+                    signal = self._try_generate_signal(symbol, current_date, data_view)
 
                     if signal:
                         signals_found += 1
@@ -129,23 +137,25 @@ class MTFBacktesterWithSR:
             traceback.print_exc()
             return None
 
-    def _try_generate_signal(self, symbol: str, as_of_date: datetime):
+    def _try_generate_signal(
+        self,
+        symbol: str,
+        as_of_date: datetime,
+        data_view: MultiTimeframeDataView
+    ):
         """
-        Try to generate a signal using the REAL strategy
+        Generate a signal with the REAL strategy as of a historical date
 
-        This is a wrapper that suppresses print output during backtesting
+        Uses the strategy's as-of API, so only bars up to as_of_date are
+        visible and no data is fetched per bar.
         """
-        import io
-        import contextlib
-
-        # Suppress print statements during signal generation
-        with contextlib.redirect_stdout(io.StringIO()):
-            try:
-                signal = self.strategy.generate_signal(symbol)
-                return signal
-            except Exception as e:
-                # Signal generation failed (expected for most days)
-                return None
+        try:
+            return self.strategy.generate_signal(
+                symbol, as_of=as_of_date, data_view=data_view, verbose=False
+            )
+        except Exception as e:
+            # Signal generation failed (expected for some days)
+            return None
 
     def _simulate_trade(
         self,
@@ -49,6 +49,439 @@ class MultiTimeframeSignal:
     beta: float = 1.0  # Stock beta vs Nifty
 
 
+def _adx_series(daily_data: pd.DataFrame, period: int = 14) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """ADX, +DI and -DI series over the whole frame (causal: bar i uses bars <= i)"""
+    # Calculate True Range (TR)
+    high = daily_data['high']
+    low = daily_data['low']
+    close = daily_data['close']
+
+    prev_close = close.shift(1)
+    tr1 = high - low
+    tr2 = abs(high - prev_close)
+    tr3 = abs(low - prev_close)
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    atr = tr.rolling(window=period).mean()
+
+    # Calculate Directional Movement
+    up_move = high.diff()
+    down_move = -low.diff()
+
+    plus_dm = pd.Series(0.0, index=up_move.index)
+    minus_dm = pd.Series(0.0, index=down_move.index)
+
+    plus_dm[(up_move > down_move) & (up_move > 0)] = up_move
+    minus_dm[(down_move > up_move) & (down_move > 0)] = down_move
+
+    # Smooth the DM values
+    plus_dm_smooth = plus_dm.rolling(window=period).mean()
+    minus_dm_smooth = minus_dm.rolling(window=period).mean()
+
+    # Calculate Directional Indicators
+    plus_di = (plus_dm_smooth / atr) * 100
+    minus_di = (minus_dm_smooth / atr) * 100
+
+    # Calculate DX and ADX
+    dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100
+    adx = dx.rolling(window=period).mean()
+
+    return adx, plus_di, minus_di
+
+
+def _breakout_series(data: pd.DataFrame) -> Dict[str, pd.Series]:
+    """20-day resistance, volume ratio and ATR series (causal)"""
+    # Calculate 20-day high (resistance)
+    resistance_20 = data['high'].rolling(20).max()
+
+    # Calculate volume average
+    volume_ma_20 = data['volume'].rolling(20).mean()
+    volume_ratio = data['volume'] / volume_ma_20
+
+    # Calculate ATR for volatility
+    high_low = data['high'] - data['low']
+    high_close = abs(data['high'] - data['close'].shift())
+    low_close = abs(data['low'] - data['close'].shift())
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    atr = ranges.max(axis=1).rolling(14).mean()
+
+    return {
+        'resistance_20': resistance_20,
+        'volume_ma_20': volume_ma_20,
+        'volume_ratio': volume_ratio,
+        'atr': atr
+    }
+
+
+def _breakout_details(
+    current_close: float,
+    prev_resistance: float,
+    current_volume_ratio: float,
+    atr: float
+) -> Tuple[bool, Dict]:
+    """Breakout decision for one bar given its derived values"""
+    # 1. Price breaks above 20-day resistance
+    price_breakout = current_close > prev_resistance
+
+    # 2. Volume expansion (>1.5x average)
+    volume_confirmation = current_volume_ratio > 1.5
+
+    # 3. Not too extended (within 3 ATR of resistance)
+    not_extended = (current_close - prev_resistance) < (3 * atr)
+
+    if price_breakout and volume_confirmation and not_extended:
+        return True, {
+            'breakout_price': current_close,
+            'resistance_level': prev_resistance,
+            'volume_ratio': current_volume_ratio,
+            'atr': atr,
+            'breakout_strength': min(100, current_volume_ratio * 40)
+        }
+
+    return False, {}
+
+
+def _classify_weekly_trend(
+    current_price: float,
+    ema_20: float,
+    ema_50: float,
+    higher_highs: bool,
+    higher_lows: bool
+) -> Tuple[str, float]:
+    """Weekly trend label and strength from price vs 20/50-week EMAs"""
+    # Trend determination
+    if current_price > ema_20 > ema_50:
+        trend = "strong_uptrend"
+        strength = 100.0
+    elif current_price > ema_20:
+        trend = "uptrend"
+        strength = 75.0
+    elif current_price > ema_50:
+        trend = "weak_uptrend"
+        strength = 50.0
+    else:
+        trend = "downtrend"
+        strength = 0.0
+
+    # Higher highs and higher lows over the last 8 weeks
+    if higher_highs and higher_lows:
+        strength = min(100.0, strength + 15.0)
+
+    return trend, strength
+
+
+class MultiTimeframeDataView:
+    """
+    Preloaded history for as-of signal generation (backtests)
+
+    Holds one symbol's daily bars (plus optional market index closes for beta)
+    and answers "what would the strategy have seen at bar i" without any
+    network fetch:
+    - Daily prefixes are `iloc[:n]` views, never copies
+    - ADX, breakout and weekly EMA series are computed once over the full
+      history and read at the bar index; they are causal, so the value equals
+      a recomputation on the prefix
+    - The current week's bar is rebuilt from the daily prefix (no lookahead
+      into the rest of the week)
+    - Swing points are detected once; S/R zones are re-clustered only when a
+      new swing is confirmed and are cached otherwise
+    - Beta uses cumulative sums of aligned returns (O(1) per bar)
+
+    Usage:
+        view = MultiTimeframeDataView('TATAMOTORS', daily_df, market_close=nifty['close'])
+        for i in range(60, len(view)):
+            signal = strategy.generate_signal('TATAMOTORS', as_of=i, data_view=view)
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        daily: pd.DataFrame,
+        market_close: Optional[pd.Series] = None,
+        beta_lookback_days: int = 365,
+        swing_window: int = 5
+    ):
+        """
+        Initialize view.
+
+        Args:
+            symbol: Stock symbol
+            daily: Daily OHLCV (any column case; DatetimeIndex or 'timestamp' column)
+            market_close: Market index closes for beta (default: beta = 1.0,
+                the live fallback)
+            beta_lookback_days: Calendar days of returns used for beta
+            swing_window: Swing-point window (MultiTimeframeSR default)
+        """
+        daily = daily.copy()
+        daily.columns = [str(col).lower() for col in daily.columns]
+        if not isinstance(daily.index, pd.DatetimeIndex) and 'timestamp' in daily.columns:
+            daily = daily.set_index('timestamp')
+        daily.index = pd.DatetimeIndex(daily.index)
+        if daily.index.tz is not None:
+            daily.index = daily.index.tz_localize(None)
+
+        self.symbol = symbol
+        self.daily = daily.sort_index()
+        self.beta_lookback_days = beta_lookback_days
+        self.swing_window = swing_window
+
+        self._dates = self.daily.index.values
+        self._high = self.daily['high'].to_numpy(dtype=float)
+        self._low = self.daily['low'].to_numpy(dtype=float)
+        self._close = self.daily['close'].to_numpy(dtype=float)
+
+        self._prepare_daily()
+        self._prepare_weekly()
+        self._prepare_beta(market_close)
+
+        self._swing_cache: Dict[Tuple, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.daily)
+
+    # ------------------------------------------------------------------
+    # Precomputation
+    # ------------------------------------------------------------------
+
+    def _prepare_daily(self):
+        adx, plus_di, minus_di = _adx_series(self.daily)
+        self._adx = adx.to_numpy(dtype=float)
+        self._plus_di = plus_di.to_numpy(dtype=float)
+        self._minus_di = minus_di.to_numpy(dtype=float)
+
+        breakout = _breakout_series(self.daily)
+        self._resistance_20 = breakout['resistance_20'].to_numpy(dtype=float)
+        self._volume_ratio = breakout['volume_ratio'].to_numpy(dtype=float)
+        self._atr = breakout['atr'].to_numpy(dtype=float)
+
+        sr = MultiTimeframeSR()
+        is_high, is_low = sr.swing_point_flags(self._high, self._low, self.swing_window)
+        self._daily_swing_high = np.flatnonzero(is_high)
+        self._daily_swing_low = np.flatnonzero(is_low)
+
+    def _prepare_weekly(self):
+        weekly = self.daily.resample('W').agg({
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'volume': 'sum'
+        }).dropna()
+        self.weekly = weekly
+
+        # Weekly bar of every daily bar (resample bins are right-closed)
+        self._week_of = np.searchsorted(weekly.index.values, self._dates, side='left')
+        self._week_high = weekly['high'].to_numpy(dtype=float)
+        self._week_low = weekly['low'].to_numpy(dtype=float)
+
+        close = weekly['close']
+        self._ema = {}
+        for span in (20, 50):
+            # ewm(adjust=True) keeps a running weight: w_i = w_{i-1} * (1 - alpha) + 1
+            alpha = 2.0 / (span + 1)
+            weights = np.empty(len(close))
+            weight = 0.0
+            for i in range(len(close)):
+                weight = weight * (1 - alpha) + 1.0
+                weights[i] = weight
+            self._ema[span] = (close.ewm(span=span).mean().to_numpy(dtype=float), weights, alpha)
+
+        is_high, is_low = MultiTimeframeSR().swing_point_flags(
+            self._week_high, self._week_low, self.swing_window
+        )
+        self._week_swing_high = np.flatnonzero(is_high)
+        self._week_swing_low = np.flatnonzero(is_low)
+
+    def _prepare_beta(self, market_close: Optional[pd.Series]):
+        self._beta_dates = None
+        if market_close is None or len(market_close) == 0:
+            return
+
+        index = pd.Series(market_close).copy()
+        index.index = pd.DatetimeIndex(index.index)
+        if index.index.tz is not None:
+            index.index = index.index.tz_localize(None)
+
+        aligned = pd.DataFrame({
+            'stock': self.daily['close'].pct_change(),
+            'index': index.sort_index().pct_change()
+        }).dropna()
+
+        x = aligned['stock'].to_numpy(dtype=float)
+        y = aligned['index'].to_numpy(dtype=float)
+        zero = np.zeros(1)
+        self._beta_dates = aligned.index.values
+        self._beta_sums = {
+            'x': np.concatenate([zero, np.cumsum(x)]),
+            'y': np.concatenate([zero, np.cumsum(y)]),
+            'xy': np.concatenate([zero, np.cumsum(x * y)]),
+            'yy': np.concatenate([zero, np.cumsum(y * y)])
+        }
+
+    # ------------------------------------------------------------------
+    # As-of accessors (n = number of bars visible, i.e. prefix [:n])
+    # ------------------------------------------------------------------
+
+    def bars_at(self, as_of) -> int:
+        """
+        Number of daily bars visible at `as_of`.
+
+        Args:
+            as_of: Bar index (int, the current bar) or timestamp (bars on or
+                before it); None means the whole history
+        """
+        if as_of is None:
+            return len(self.daily)
+        if isinstance(as_of, (int, np.integer)):
+            if not -len(self.daily) <= as_of < len(self.daily):
+                raise IndexError(f"Bar index {as_of} out of range for {len(self.daily)} bars")
+            return int(as_of) % len(self.daily) + 1
+        return int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(as_of).tz_localize(None)), side='right'))
+
+    def timestamp_at(self, n: int) -> datetime:
+        return self.daily.index[n - 1].to_pydatetime()
+
+    def daily_prefix(self, n: int) -> pd.DataFrame:
+        """Daily bars [:n] (view, do not mutate)"""
+        return self.daily.iloc[:n]
+
+    def weekly_count(self, n: int) -> int:
+        return int(self._week_of[n - 1]) + 1 if n else 0
+
+    def _partial_week(self, n: int) -> Tuple[int, slice]:
+        week = int(self._week_of[n - 1])
+        start = int(np.searchsorted(self._week_of, week, side='left'))
+        return week, slice(start, n)
+
+    def weekly_prefix(self, n: int) -> pd.DataFrame:
+        """Weekly bars as resampled from daily[:n] (completed weeks + current partial week)"""
+        if n == 0:
+            return self.weekly.iloc[:0]
+        week, rows = self._partial_week(n)
+        days = self.daily.iloc[rows]
+        partial = pd.DataFrame({
+            'open': [days['open'].iloc[0]],
+            'high': [days['high'].max()],
+            'low': [days['low'].min()],
+            'close': [days['close'].iloc[-1]],
+            'volume': [days['volume'].sum()]
+        }, index=self.weekly.index[week:week + 1])
+        return pd.concat([self.weekly.iloc[:week], partial])
+
+    def beta(self, n: int) -> float:
+        """Beta over returns dated within beta_lookback_days of bar n-1"""
+        if self._beta_dates is None or n == 0:
+            return 1.0
+
+        end_date = self._dates[n - 1]
+        start_date = end_date - np.timedelta64(self.beta_lookback_days, 'D')
+        lo = int(np.searchsorted(self._beta_dates, start_date, side='right'))
+        hi = int(np.searchsorted(self._beta_dates, end_date, side='right'))
+        m = hi - lo
+        if m < 2:
+            return 1.0
+
+        sums = {key: values[hi] - values[lo] for key, values in self._beta_sums.items()}
+        covariance = (sums['xy'] - sums['x'] * sums['y'] / m) / (m - 1)
+        variance = (sums['yy'] - sums['y'] ** 2 / m) / (m - 1)
+        return covariance / variance if variance > 0 else 1.0
+
+    def adx(self, n: int, period: int = 14) -> Dict[str, float]:
+        """Same result as calculate_adx(daily[:n])"""
+        if n < period * 2:
+            return {'adx': 0.0, 'plus_di': 0.0, 'minus_di': 0.0}
+
+        values = {}
+        for key, series in (('adx', self._adx), ('plus_di', self._plus_di), ('minus_di', self._minus_di)):
+            value = series[n - 1]
+            values[key] = 0.0 if np.isnan(value) else value
+        return values
+
+    def weekly_trend(self, n: int) -> Tuple[str, float]:
+        """Same result as analyze_weekly_trend(weekly_prefix(n))"""
+        if self.weekly_count(n) < 20:
+            return "unknown", 0.0
+
+        week, rows = self._partial_week(n)
+        price = self._close[n - 1]
+        emas = []
+        for span in (20, 50):
+            ema, weights, alpha = self._ema[span]
+            if week == 0:
+                emas.append(price)
+                continue
+            old = weights[week - 1] * (1 - alpha)
+            emas.append((old * ema[week - 1] + price) / (old + 1.0))
+
+        first = week - 7
+        return _classify_weekly_trend(
+            price,
+            emas[0],
+            emas[1],
+            self._high[rows].max() > self._week_high[first],
+            self._low[rows].min() > self._week_low[first]
+        )
+
+    def daily_breakout(self, n: int) -> Tuple[bool, Dict]:
+        """Same result as analyze_daily_breakout(daily[:n])"""
+        if n < 50:
+            return False, {}
+
+        return _breakout_details(
+            self._close[n - 1],
+            self._resistance_20[n - 2],
+            self._volume_ratio[n - 1],
+            self._atr[n - 1]
+        )
+
+    def sr_zones(self, n: int, sr_analyzer: MultiTimeframeSR) -> Dict:
+        """Same result as analyze_multi_timeframe_sr(weekly_prefix(n), daily[:n], empty 4H)"""
+        window = self.swing_window
+        tolerance = sr_analyzer.zone_tolerance
+
+        # Weekly: completed weeks use the precomputed flags; the one candidate
+        # whose right-hand window reaches the partial week is checked here
+        week, rows = self._partial_week(n)
+        limit = week - window
+        highs = list(self._week_swing_high[:int(np.searchsorted(self._week_swing_high, limit))])
+        lows = list(self._week_swing_low[:int(np.searchsorted(self._week_swing_low, limit))])
+
+        if limit >= window:
+            week_high = np.append(self._week_high[limit - window:week], self._high[rows].max())
+            week_low = np.append(self._week_low[limit - window:week], self._low[rows].min())
+            neighbours = np.r_[0:window, window + 1:2 * window + 1]
+            if not (week_high[neighbours] >= week_high[window]).any():
+                highs.append(limit)
+            if not (week_low[neighbours] <= week_low[window]).any():
+                lows.append(limit)
+
+        key = ('weekly', tolerance, week, len(highs), len(lows))
+        if key not in self._swing_cache:
+            self._swing_cache[key] = sr_analyzer.zones_from_swings(
+                [(self.weekly.index[i], self._week_high[i]) for i in highs],
+                [(self.weekly.index[i], self._week_low[i]) for i in lows],
+                'weekly',
+                min_strength=2
+            )
+        result = {'weekly': self._swing_cache[key]}
+
+        # Daily: swing i is confirmed once bar i + window is visible
+        limit = n - window
+        highs = self._daily_swing_high[:int(np.searchsorted(self._daily_swing_high, limit))]
+        lows = self._daily_swing_low[:int(np.searchsorted(self._daily_swing_low, limit))]
+
+        key = ('daily', tolerance, len(highs), len(lows))
+        if key not in self._swing_cache:
+            self._swing_cache[key] = sr_analyzer.zones_from_swings(
+                [(self.daily.index[i], self._high[i]) for i in highs],
+                [(self.daily.index[i], self._low[i]) for i in lows],
+                'daily',
+                min_strength=3
+            )
+        result['daily'] = self._swing_cache[key]
+
+        return result
+
+
 class MultiTimeframeBreakoutStrategy:
     """
     Advanced multi-timeframe breakout strategy for high beta stocks
@@ -224,39 +657,7 @@ class MultiTimeframeBreakoutStrategy:
             return {'adx': 0.0, 'plus_di': 0.0, 'minus_di': 0.0}
 
         try:
-            # Calculate True Range (TR)
-            high = daily_data['high']
-            low = daily_data['low']
-            close = daily_data['close']
-
-            prev_close = close.shift(1)
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean()
-
-            # Calculate Directional Movement
-            up_move = high.diff()
-            down_move = -low.diff()
-
-            plus_dm = pd.Series(0.0, index=up_move.index)
-            minus_dm = pd.Series(0.0, index=down_move.index)
-
-            plus_dm[(up_move > down_move) & (up_move > 0)] = up_move
-            minus_dm[(down_move > up_move) & (down_move > 0)] = down_move
-
-            # Smooth the DM values
-            plus_dm_smooth = plus_dm.rolling(window=period).mean()
-            minus_dm_smooth = minus_dm.rolling(window=period).mean()
-
-            # Calculate Directional Indicators
-            plus_di = (plus_dm_smooth / atr) * 100
-            minus_di = (minus_dm_smooth / atr) * 100
-
-            # Calculate DX and ADX
-            dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100
-            adx = dx.rolling(window=period).mean()
+            adx, plus_di, minus_di = _adx_series(daily_data, period)
 
             # Get current values
             current_adx = adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 0.0
@@ -372,35 +773,16 @@ class MultiTimeframeBreakoutStrategy:
         # Calculate 50-week EMA (approx 1 year)
         data['ema_50'] = data['close'].ewm(span=50).mean()
 
-        current_price = data['close'].iloc[-1]
-        ema_20 = data['ema_20'].iloc[-1]
-        ema_50 = data['ema_50'].iloc[-1]
-
-        # Trend determination
-        if current_price > ema_20 > ema_50:
-            trend = "strong_uptrend"
-            strength = 100.0
-        elif current_price > ema_20:
-            trend = "uptrend"
-            strength = 75.0
-        elif current_price > ema_50:
-            trend = "weak_uptrend"
-            strength = 50.0
-        else:
-            trend = "downtrend"
-            strength = 0.0
-
-        # Check for higher highs and higher lows (last 8 weeks)
         recent_highs = data['high'].tail(8)
         recent_lows = data['low'].tail(8)
 
-        higher_highs = recent_highs.iloc[-1] > recent_highs.iloc[0]
-        higher_lows = recent_lows.iloc[-1] > recent_lows.iloc[0]
-
-        if higher_highs and higher_lows:
-            strength = min(100.0, strength + 15.0)
-
-        return trend, strength
+        return _classify_weekly_trend(
+            data['close'].iloc[-1],
+            data['ema_20'].iloc[-1],
+            data['ema_50'].iloc[-1],
+            recent_highs.iloc[-1] > recent_highs.iloc[0],
+            recent_lows.iloc[-1] > recent_lows.iloc[0]
+        )
 
     def analyze_daily_breakout(self, data: pd.DataFrame) -> Tuple[bool, Dict]:
         """
@@ -411,50 +793,15 @@ class MultiTimeframeBreakoutStrategy:
         if len(data) < 50:
             return False, {}
 
-        # Calculate 20-day high (resistance)
-        data['resistance_20'] = data['high'].rolling(20).max()
-
-        # Calculate volume average
-        data['volume_ma_20'] = data['volume'].rolling(20).mean()
-        data['volume_ratio'] = data['volume'] / data['volume_ma_20']
+        for column, series in _breakout_series(data).items():
+            data[column] = series
 
-        # Calculate ATR for volatility
-        high_low = data['high'] - data['low']
-        high_close = abs(data['high'] - data['close'].shift())
-        low_close = abs(data['low'] - data['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        data['atr'] = ranges.max(axis=1).rolling(14).mean()
-
-        # Current values
-        current_close = data['close'].iloc[-1]
-        prev_resistance = data['resistance_20'].iloc[-2]
-        current_volume_ratio = data['volume_ratio'].iloc[-1]
-        atr = data['atr'].iloc[-1]
-
-        # Breakout conditions
-        is_breakout = False
-        breakout_details = {}
-
-        # 1. Price breaks above 20-day resistance
-        price_breakout = current_close > prev_resistance
-
-        # 2. Volume expansion (>1.5x average)
-        volume_confirmation = current_volume_ratio > 1.5
-
-        # 3. Not too extended (within 3 ATR of resistance)
-        not_extended = (current_close - prev_resistance) < (3 * atr)
-
-        if price_breakout and volume_confirmation and not_extended:
-            is_breakout = True
-            breakout_details = {
-                'breakout_price': current_close,
-                'resistance_level': prev_resistance,
-                'volume_ratio': current_volume_ratio,
-                'atr': atr,
-                'breakout_strength': min(100, current_volume_ratio * 40)
-            }
-
-        return is_breakout, breakout_details
+        return _breakout_details(
+            data['close'].iloc[-1],
+            data['resistance_20'].iloc[-2],
+            data['volume_ratio'].iloc[-1],
+            data['atr'].iloc[-1]
+        )
 
     def analyze_4h_momentum(self, data: pd.DataFrame) -> Tuple[bool, float]:
         """
@@ -567,96 +914,135 @@ class MultiTimeframeBreakoutStrategy:
             'atr': atr
         }
 
-    def generate_signal(self, symbol: str) -> Optional[MultiTimeframeSignal]:
+    def generate_signal(
+        self,
+        symbol: str,
+        as_of=None,
+        data_view: Optional[MultiTimeframeDataView] = None,
+        verbose: bool = True
+    ) -> Optional[MultiTimeframeSignal]:
         """
         Generate multi-timeframe breakout signal with confluences
 
+        Live (default): fetches the last year from yfinance as of now.
+        As-of (backtests): pass a preloaded MultiTimeframeDataView and the bar
+        index or timestamp to evaluate; no network calls are made and only
+        bars up to `as_of` are visible.
+
+        Args:
+            symbol: Stock symbol
+            as_of: Bar index or timestamp (with data_view; default: last bar)
+            data_view: Preloaded history for as-of evaluation
+            verbose: Print the step-by-step analysis
+
         Returns signal if all conditions met, else None
         """
-        print(f"\n{'='*70}")
-        print(f"🔍 Analyzing {symbol} - Multi-Timeframe Breakout Strategy")
-        print(f"{'='*70}\n")
+        log = print if verbose else (lambda *args, **kwargs: None)
+
+        n = None
+        if data_view is not None:
+            n = data_view.bars_at(as_of)
+            if n == 0:
+                return None
+
+        log(f"\n{'='*70}")
+        log(f"🔍 Analyzing {symbol} - Multi-Timeframe Breakout Strategy")
+        log(f"{'='*70}\n")
 
         # Step 1: Check if high beta stock
-        print("📊 Step 1: Checking Beta...")
-        beta = self.calculate_beta(symbol)
-        print(f"   Beta vs Nifty: {beta:.2f}")
+        log("📊 Step 1: Checking Beta...")
+        beta = self.calculate_beta(symbol) if n is None else data_view.beta(n)
+        log(f"   Beta vs Nifty: {beta:.2f}")
 
         if beta < self.high_beta_threshold:
-            print(f"   ❌ Beta too low (< {self.high_beta_threshold:.1f}). Skipping.")
+            log(f"   ❌ Beta too low (< {self.high_beta_threshold:.1f}). Skipping.")
             return None
-        print(f"   ✅ High beta stock confirmed!\n")
+        log(f"   ✅ High beta stock confirmed!\n")
 
         # Step 1.5: Calculate Relative Strength vs Nifty
         # TEMPORARILY DISABLED FOR SPEED - RS calculation takes 4+ seconds per stock
-        print("💪 Step 1.5: Relative Strength Analysis... [SKIPPED FOR SPEED]")
+        log("💪 Step 1.5: Relative Strength Analysis... [SKIPPED FOR SPEED]")
         rs_metrics = {'rs_90d': 1.0, 'rs_30d': 1.0, 'rs_10d': 1.0, 'rs_trend': 'neutral'}
         # rs_metrics = self.calculate_relative_strength(symbol)
-        # print(f"   RS 90-day: {rs_metrics['rs_90d']:.2f}x market")
-        # print(f"   RS 30-day: {rs_metrics['rs_30d']:.2f}x market")
-        # print(f"   RS 10-day: {rs_metrics['rs_10d']:.2f}x market")
-        # print(f"   RS Trend: {rs_metrics['rs_trend']}")
+        # log(f"   RS 90-day: {rs_metrics['rs_90d']:.2f}x market")
+        # log(f"   RS 30-day: {rs_metrics['rs_30d']:.2f}x market")
+        # log(f"   RS 10-day: {rs_metrics['rs_10d']:.2f}x market")
+        # log(f"   RS Trend: {rs_metrics['rs_trend']}")
 
         # # Interpret RS
         # if rs_metrics['rs_30d'] > 1.0:
-        #     print(f"   ✅ Outperforming market (RS > 1.0)\n")
+        #     log(f"   ✅ Outperforming market (RS > 1.0)\n")
         # elif rs_metrics['rs_30d'] > 0.8:
-        #     print(f"   ⚠️  Neutral performance (RS = {rs_metrics['rs_30d']:.2f})\n")
+        #     log(f"   ⚠️  Neutral performance (RS = {rs_metrics['rs_30d']:.2f})\n")
         # else:
-        #     print(f"   ❌ Underperforming market (RS < 0.8)\n")
+        #     log(f"   ❌ Underperforming market (RS < 0.8)\n")
 
         # Step 2: Fetch multi-timeframe data
-        print("📈 Step 2: Fetching Multi-Timeframe Data...")
-        mtf_data = self.fetch_multi_timeframe_data(symbol)
-        print(f"   Weekly bars: {len(mtf_data['weekly'])}")
-        print(f"   Daily bars: {len(mtf_data['daily'])}")
-        print(f"   4H bars: {len(mtf_data['4h'])}\n")
+        log("📈 Step 2: Fetching Multi-Timeframe Data...")
+        if n is None:
+            mtf_data = self.fetch_multi_timeframe_data(symbol)
+            weekly_bars = len(mtf_data['weekly'])
+        else:
+            mtf_data = {'daily': data_view.daily_prefix(n), '4h': pd.DataFrame()}
+            weekly_bars = data_view.weekly_count(n)
+        log(f"   Weekly bars: {weekly_bars}")
+        log(f"   Daily bars: {len(mtf_data['daily'])}")
+        log(f"   4H bars: {len(mtf_data['4h'])}\n")
 
         # Step 3: Calculate ADX for trend strength
-        print("📈 Step 3: ADX Trend Strength Analysis...")
-        adx_metrics = self.calculate_adx(mtf_data['daily'])
-        print(f"   ADX: {adx_metrics['adx']:.1f}")
-        print(f"   +DI: {adx_metrics['plus_di']:.1f}")
-        print(f"   -DI: {adx_metrics['minus_di']:.1f}")
+        log("📈 Step 3: ADX Trend Strength Analysis...")
+        adx_metrics = self.calculate_adx(mtf_data['daily']) if n is None else data_view.adx(n)
+        log(f"   ADX: {adx_metrics['adx']:.1f}")
+        log(f"   +DI: {adx_metrics['plus_di']:.1f}")
+        log(f"   -DI: {adx_metrics['minus_di']:.1f}")
 
         # Interpret ADX
         if adx_metrics['adx'] < 20:
-            print(f"   ❌ Weak/No trend (ADX < 20). Skipping.\n")
+            log(f"   ❌ Weak/No trend (ADX < 20). Skipping.\n")
             return None
         elif adx_metrics['adx'] < 25:
-            print(f"   ⚠️  Developing trend (ADX 20-25)\n")
+            log(f"   ⚠️  Developing trend (ADX 20-25)\n")
         elif adx_metrics['adx'] < 50:
-            print(f"   ✅ Strong trend (ADX 25-50) - Ideal!\n")
+            log(f"   ✅ Strong trend (ADX 25-50) - Ideal!\n")
         elif adx_metrics['adx'] < 75:
-            print(f"   💪 Very strong trend (ADX 50-75)\n")
+            log(f"   💪 Very strong trend (ADX 50-75)\n")
         else:
-            print(f"   ⚡ Extremely strong trend (ADX > 75) - May be overextended\n")
+            log(f"   ⚡ Extremely strong trend (ADX > 75) - May be overextended\n")
 
         # Step 4: Analyze weekly trend
-        print("📅 Step 4: Weekly Trend Analysis...")
-        weekly_trend, weekly_strength = self.analyze_weekly_trend(mtf_data['weekly'])
-        print(f"   Trend: {weekly_trend}")
-        print(f"   Strength: {weekly_strength:.1f}/100\n")
+        log("📅 Step 4: Weekly Trend Analysis...")
+        if n is None:
+            weekly_trend, weekly_strength = self.analyze_weekly_trend(mtf_data['weekly'])
+        else:
+            weekly_trend, weekly_strength = data_view.weekly_trend(n)
+        log(f"   Trend: {weekly_trend}")
+        log(f"   Strength: {weekly_strength:.1f}/100\n")
 
         # Step 5: Analyze daily breakout
-        print("📊 Step 5: Daily Breakout Analysis...")
-        is_breakout, breakout_details = self.analyze_daily_breakout(mtf_data['daily'])
-        print(f"   Breakout: {'YES ✅' if is_breakout else 'NO ❌'}")
+        log("📊 Step 5: Daily Breakout Analysis...")
+        if n is None:
+            is_breakout, breakout_details = self.analyze_daily_breakout(mtf_data['daily'])
+        else:
+            is_breakout, breakout_details = data_view.daily_breakout(n)
+        log(f"   Breakout: {'YES ✅' if is_breakout else 'NO ❌'}")
         if is_breakout:
-            print(f"   Breakout Price: ₹{breakout_details['breakout_price']:.2f}")
-            print(f"   Volume Ratio: {breakout_details['volume_ratio']:.2f}x")
-            print(f"   Strength: {breakout_details['breakout_strength']:.1f}/100\n")
+            log(f"   Breakout Price: ₹{breakout_details['breakout_price']:.2f}")
+            log(f"   Volume Ratio: {breakout_details['volume_ratio']:.2f}x")
+            log(f"   Strength: {breakout_details['breakout_strength']:.1f}/100\n")
         else:
-            print("   No breakout detected. Skipping.\n")
+            log("   No breakout detected. Skipping.\n")
             return None
 
         # Step 6: S/R Multi-Timeframe Analysis
-        print("🎯 Step 6: Multi-Timeframe S/R Analysis...")
-        all_sr_zones = self.sr_analyzer.analyze_multi_timeframe_sr(
-            mtf_data['weekly'],
-            mtf_data['daily'],
-            mtf_data['4h']
-        )
+        log("🎯 Step 6: Multi-Timeframe S/R Analysis...")
+        if n is None:
+            all_sr_zones = self.sr_analyzer.analyze_multi_timeframe_sr(
+                mtf_data['weekly'],
+                mtf_data['daily'],
+                mtf_data['4h']
+            )
+        else:
+            all_sr_zones = data_view.sr_zones(n, self.sr_analyzer)
 
         # Find S/R confluences
         sr_confluences = self.sr_analyzer.find_confluent_levels(all_sr_zones)
@@ -668,33 +1054,33 @@ class MultiTimeframeBreakoutStrategy:
             all_sr_zones
         )
 
-        print(f"   S/R Quality Score: {sr_quality['quality_score']:.1f}/100")
+        log(f"   S/R Quality Score: {sr_quality['quality_score']:.1f}/100")
         if sr_quality.get('nearest_resistance_above'):
             r_level, r_strength, r_tf = sr_quality['nearest_resistance_above']
             distance_pct = ((r_level - current_price) / current_price) * 100
-            print(f"   Next Resistance: ₹{r_level:.2f} (+{distance_pct:.1f}% away, {r_tf})")
+            log(f"   Next Resistance: ₹{r_level:.2f} (+{distance_pct:.1f}% away, {r_tf})")
         if sr_quality.get('nearest_support_below'):
             s_level, s_strength, s_tf = sr_quality['nearest_support_below']
             distance_pct = ((current_price - s_level) / current_price) * 100
-            print(f"   Nearest Support: ₹{s_level:.2f} (-{distance_pct:.1f}% away, {s_tf})")
+            log(f"   Nearest Support: ₹{s_level:.2f} (-{distance_pct:.1f}% away, {s_tf})")
 
         if sr_confluences:
-            print(f"   S/R Confluences: {len(sr_confluences)} found")
+            log(f"   S/R Confluences: {len(sr_confluences)} found")
             for conf in sr_confluences[:3]:  # Show top 3
-                print(f"      • ₹{conf['level']:.2f} ({', '.join(conf['timeframes'])})")
+                log(f"      • ₹{conf['level']:.2f} ({', '.join(conf['timeframes'])})")
 
         if sr_quality.get('issues'):
             for issue in sr_quality['issues']:
-                print(f"   ⚠️  {issue}")
-        print()
+                log(f"   ⚠️  {issue}")
+        log()
 
         # Check S/R quality threshold
         if sr_quality['quality_score'] < self.min_sr_quality:
-            print(f"   ❌ S/R Quality too low (< {self.min_sr_quality}). Skipping.\n")
+            log(f"   ❌ S/R Quality too low (< {self.min_sr_quality}). Skipping.\n")
             return None
 
         # Step 7: Count confluences (SIMPLIFIED + ADX)
-        print("🎯 Step 7: Confluence Check (need 2 of 7)...")
+        log("🎯 Step 7: Confluence Check (need 2 of 7)...")
         confluences = []
 
         # 1. Weekly uptrend intact
@@ -725,17 +1111,17 @@ class MultiTimeframeBreakoutStrategy:
         if adx_metrics['adx'] > 25:
             confluences.append(f"Strong ADX trend ({adx_metrics['adx']:.1f})")
 
-        print(f"   Confluences found: {len(confluences)}/7")
+        log(f"   Confluences found: {len(confluences)}/7")
         for conf in confluences:
-            print(f"      ✅ {conf}")
-        print()
+            log(f"      ✅ {conf}")
+        log()
 
         if len(confluences) < self.min_confluences:
-            print(f"   ❌ Insufficient confluences (need {self.min_confluences})\n")
+            log(f"   ❌ Insufficient confluences (need {self.min_confluences})\n")
             return None
 
         # Step 8: Calculate entry levels (WITH S/R)
-        print("🎯 Step 8: Calculating Entry Levels (S/R-Adjusted)...")
+        log("🎯 Step 8: Calculating Entry Levels (S/R-Adjusted)...")
         levels = self.calculate_entry_levels(
             mtf_data['daily'],
             breakout_details['breakout_price'],
@@ -743,11 +1129,11 @@ class MultiTimeframeBreakoutStrategy:
             sr_analysis=sr_quality  # NEW: Pass S/R analysis
         )
 
-        print(f"   Entry: ₹{levels['entry']:.2f}")
-        print(f"   Stop Loss: ₹{levels['stop_loss']:.2f}")
-        print(f"   Target: ₹{levels['target']:.2f}")
-        print(f"   Risk/Reward: 1:{levels['risk_reward_ratio']:.2f}")
-        print(f"   Risk per share: ₹{levels['risk_per_share']:.2f}\n")
+        log(f"   Entry: ₹{levels['entry']:.2f}")
+        log(f"   Stop Loss: ₹{levels['stop_loss']:.2f}")
+        log(f"   Target: ₹{levels['target']:.2f}")
+        log(f"   Risk/Reward: 1:{levels['risk_reward_ratio']:.2f}")
+        log(f"   Risk per share: ₹{levels['risk_per_share']:.2f}\n")
 
         # Calculate overall strength score (using ADX instead of momentum)
         strength_score = (
@@ -756,14 +1142,14 @@ class MultiTimeframeBreakoutStrategy:
             (adx_metrics['adx'] / 100) * 100 * 0.4  # ADX contribution (scaled to 0-100)
         )
 
-        print(f"✅ SIGNAL GENERATED!")
-        print(f"   Overall Strength: {strength_score:.1f}/100")
-        print(f"   S/R Quality: {sr_quality['quality_score']:.1f}/100")
-        print(f"   Beta: {beta:.2f}")
-        print(f"   ADX: {adx_metrics['adx']:.1f}")
-        print(f"   RS 30-day: {rs_metrics['rs_30d']:.2f}x market ({rs_metrics['rs_trend']})")
-        print(f"   Confluences: {len(confluences)}")
-        print(f"{'='*70}\n")
+        log(f"✅ SIGNAL GENERATED!")
+        log(f"   Overall Strength: {strength_score:.1f}/100")
+        log(f"   S/R Quality: {sr_quality['quality_score']:.1f}/100")
+        log(f"   Beta: {beta:.2f}")
+        log(f"   ADX: {adx_metrics['adx']:.1f}")
+        log(f"   RS 30-day: {rs_metrics['rs_30d']:.2f}x market ({rs_metrics['rs_trend']})")
+        log(f"   Confluences: {len(confluences)}")
+        log(f"{'='*70}\n")
 
         # Create signal (with S/R and RS data)
         signal = MultiTimeframeSignal(
@@ -779,7 +1165,7 @@ class MultiTimeframeBreakoutStrategy:
                 '4h': 'neutral'  # 4H removed to avoid rate limits
             },
             strength_score=strength_score,
-            timestamp=datetime.now(),
+            timestamp=datetime.now() if n is None else data_view.timestamp_at(n),
             sr_quality_score=sr_quality['quality_score'],
             sr_analysis=sr_quality,
             rs_metrics=rs_metrics,  # Relative Strength metrics
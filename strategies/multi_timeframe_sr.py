@@ -47,6 +47,45 @@ class MultiTimeframeSR:
         """
         self.zone_tolerance = zone_tolerance
 
+    def swing_point_flags(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        window: int = 5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized swing detection over whole high/low arrays
+
+        Position i is a swing high when no bar within `window` on either side
+        has a high >= high[i] (same rule as find_swing_points). The first and
+        last `window` positions are never swings.
+
+        Returns:
+            (is_swing_high, is_swing_low) boolean arrays
+        """
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        n = len(high)
+
+        is_high = np.zeros(n, dtype=bool)
+        is_low = np.zeros(n, dtype=bool)
+        if n <= 2 * window:
+            return is_high, is_low
+
+        core = slice(window, n - window)
+        center_high = high[core]
+        center_low = low[core]
+        is_high[core] = True
+        is_low[core] = True
+
+        for j in range(1, window + 1):
+            before = slice(window - j, n - window - j)
+            after = slice(window + j, n - window + j)
+            is_high[core] &= ~((high[before] >= center_high) | (high[after] >= center_high))
+            is_low[core] &= ~((low[before] <= center_low) | (low[after] <= center_low))
+
+        return is_high, is_low
+
     def find_swing_points(self, data: pd.DataFrame, window: int = 5) -> Tuple[List, List]:
         """
         Find swing highs and swing lows
@@ -61,34 +100,12 @@ class MultiTimeframeSR:
         Returns:
             (swing_highs, swing_lows) as lists of (index, price)
         """
-        swing_highs = []
-        swing_lows = []
-
-        for i in range(window, len(data) - window):
-            # Check if current high is a swing high
-            is_swing_high = True
-            is_swing_low = True
-
-            current_high = data['high'].iloc[i]
-            current_low = data['low'].iloc[i]
-
-            # Compare with previous and next N bars
-            for j in range(1, window + 1):
-                # Swing high check
-                if (data['high'].iloc[i-j] >= current_high or
-                    data['high'].iloc[i+j] >= current_high):
-                    is_swing_high = False
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        is_high, is_low = self.swing_point_flags(high, low, window)
 
-                # Swing low check
-                if (data['low'].iloc[i-j] <= current_low or
-                    data['low'].iloc[i+j] <= current_low):
-                    is_swing_low = False
-
-            if is_swing_high:
-                swing_highs.append((data.index[i], current_high))
-
-            if is_swing_low:
-                swing_lows.append((data.index[i], current_low))
+        swing_highs = [(data.index[i], high[i]) for i in np.flatnonzero(is_high)]
+        swing_lows = [(data.index[i], low[i]) for i in np.flatnonzero(is_low)]
 
         return swing_highs, swing_lows
 
@@ -164,6 +181,24 @@ class MultiTimeframeSR:
         # Find swing points
         swing_highs, swing_lows = self.find_swing_points(data)
 
+        return self.zones_from_swings(swing_highs, swing_lows, timeframe, min_strength)
+
+    def zones_from_swings(
+        self,
+        swing_highs: List[Tuple],
+        swing_lows: List[Tuple],
+        timeframe: str,
+        min_strength: int = 2
+    ) -> Dict[str, List[SupportResistanceZone]]:
+        """
+        Cluster already-detected swing points into S/R zones
+
+        Split out of identify_sr_zones so callers that track swing points
+        incrementally (as-of backtests) can skip swing detection.
+
+        Returns:
+            Dict with 'support' and 'resistance' zone lists
+        """
         # Cluster into zones
         resistance_zones = self.cluster_levels(swing_highs, self.zone_tolerance)
         support_zones = self.cluster_levels(swing_lows, self.zone_tolerance)
@@ -153,6 +153,153 @@ class TestBSEEarningsCalendarTool:
 
         assert count == 0
 
+    @staticmethod
+    def _fake_fetcher(calls, fail_days=()):
+        """Stand-in for _fetch_announcements: one result per weekday, optional failing days"""
+        def fetch(first_day, last_day, errors=None):
+            days = [first_day + timedelta(days=i) for i in range((last_day.date() - first_day.date()).days + 1)]
+            keys = [d.strftime('%Y-%m-%d') for d in days]
+            calls.append((keys[0], keys[-1]))
+            if set(keys) & set(fail_days):
+                errors.append("Result API: timeout")
+                return []
+            return [{
+                'bse_code': '500325',
+                'company_name': 'Reliance',
+                'announcement_type': 'BOARD_MEETING',
+                'announcement_date': key,
+                'details': 'Financial Results'
+            } for day, key in zip(days, keys) if day.weekday() < 5]  # Weekends: nothing announced
+        return fetch
+
+    def test_fetch_only_missing_days(self, tmp_path):
+        """A wider window only fetches days not already covered, including empty days"""
+        tool = BSEEarningsCalendarTool(db_path=str(tmp_path / "test_earnings.db"), requests_per_second=1000)
+        calls = []
+        start = datetime.now()
+        day = lambda n: (start + timedelta(days=n)).strftime('%Y-%m-%d')
+
+        with patch.object(tool, '_fetch_announcements', side_effect=self._fake_fetcher(calls)):
+            first = tool.fetch_bse_announcements(start, start + timedelta(days=13))
+            assert calls == [(day(0), day(13))]  # One range request for 14 days
+
+            calls.clear()
+            second = tool.fetch_bse_announcements(start, start + timedelta(days=14))
+
+        assert calls == [(day(14), day(14))]
+        assert first == second[:len(first)]
+        assert tool._get_cached_announcements(start, start + timedelta(days=14)) == second
+
+    def test_failed_day_not_marked_fetched(self, tmp_path):
+        """A failed range falls back to per-day requests; days that still fail are retried later"""
+        tool = BSEEarningsCalendarTool(db_path=str(tmp_path / "test_earnings.db"), requests_per_second=1000)
+        calls = []
+        start = datetime(2025, 11, 17)  # Monday
+        failed = (start + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        with patch.object(tool, '_fetch_announcements', side_effect=self._fake_fetcher(calls, {failed})):
+            tool.fetch_bse_announcements(start, start + timedelta(days=2))
+        assert calls[0] == ('2025-11-17', '2025-11-19')
+        assert sorted(calls[1:]) == [(d, d) for d in ('2025-11-17', '2025-11-18', '2025-11-19')]
+        assert tool._stale_days(start, start + timedelta(days=2)) == [start + timedelta(days=1)]
+
+        calls.clear()
+        with patch.object(tool, '_fetch_announcements', side_effect=self._fake_fetcher(calls)):
+            announcements = tool.fetch_bse_announcements(start, start + timedelta(days=2))
+
+        assert calls == [(failed, failed)]
+        assert len(announcements) == 3
+
+    def test_range_items_dated_by_their_own_field(self, tmp_path):
+        """A range response spreads items over their days; undated items force the per-day fallback"""
+        tool = BSEEarningsCalendarTool(db_path=str(tmp_path / "test_earnings.db"), requests_per_second=1000)
+        rows = [
+            {'SCRIP_CD': '500325', 'SLONGNAME': 'Reliance', 'PURPOSE': 'Financial Results', 'HEADLINE': 'Results',
+             'NEWS_DT': '2025-11-18T10:15:00'},
+            {'SCRIP_CD': '500209', 'SLONGNAME': 'Infosys', 'PURPOSE': 'Quarterly results', 'HEADLINE': 'Results',
+             'NEWS_DT': '2025-11-19T16:00:00'},
+            {'SCRIP_CD': '500180', 'SLONGNAME': 'HDFC Bank', 'PURPOSE': 'Dividend', 'HEADLINE': 'Dividend',
+             'NEWS_DT': '2025-11-18T09:00:00'},
+        ]
+        response = Mock(json=Mock(return_value={'Table': rows}), raise_for_status=Mock())
+
+        with patch.object(tool.session, 'get', return_value=response) as mock_get:
+            errors = []
+            announcements = tool._fetch_announcements(datetime(2025, 11, 17), datetime(2025, 11, 19), errors=errors)
+
+        assert mock_get.call_count == 2  # One request per endpoint for the whole range
+        assert errors == []
+        assert sorted((a['bse_code'], a['announcement_date']) for a in announcements) == [
+            ('500209', '2025-11-19'), ('500209', '2025-11-19'), ('500325', '2025-11-18'), ('500325', '2025-11-18')
+        ]
+
+        del rows[0]['NEWS_DT']
+        with patch.object(tool.session, 'get', return_value=response):
+            errors = []
+            tool._fetch_announcements(datetime(2025, 11, 17), datetime(2025, 11, 19), errors=errors)
+        assert errors == ["Result API: 1 items without a date", "Announcement API: 1 items without a date"]
+
+    def test_past_days_fetched_after_close_stay_fresh(self, tmp_path):
+        """A past day fetched after it ended is never stale; today's fetch expires with the TTL"""
+        db_path = tmp_path / "test_earnings.db"
+        tool = BSEEarningsCalendarTool(db_path=str(db_path))
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        past = today - timedelta(days=5)
+        old_fetch = (today - timedelta(days=2)).isoformat()
+
+        conn = sqlite3.connect(str(db_path))
+        conn.executemany(
+            "INSERT INTO earnings_fetch_log (fetch_date, fetched_at, announcement_count) VALUES (?, ?, 0)",
+            [(past.strftime('%Y-%m-%d'), old_fetch), (today.strftime('%Y-%m-%d'), old_fetch)]
+        )
+        conn.commit()
+        conn.close()
+
+        assert tool._stale_days(past, past) == []
+        assert tool._stale_days(today, today) == [today]
+
+    def test_daily_warmup_refetches_few_future_days(self, tmp_path):
+        """Future days are refreshed as they approach, not all once the TTL lapses"""
+        db_path = tmp_path / "test_earnings.db"
+        tool = BSEEarningsCalendarTool(db_path=str(db_path))
+        base = datetime(2025, 11, 3, 9, 0)
+        fetched_per_day = []
+
+        for day in range(30):
+            now = base + timedelta(days=day)
+            stale = tool._stale_days(now, now + timedelta(days=14), now=now)
+            fetched_per_day.append(len(stale))
+            tomorrow = datetime.combine((now + timedelta(days=1)).date(), datetime.min.time())
+            if day > 0:
+                assert tomorrow in stale
+
+            conn = sqlite3.connect(str(db_path))
+            conn.executemany(
+                "INSERT OR REPLACE INTO earnings_fetch_log (fetch_date, fetched_at, announcement_count) "
+                "VALUES (?, ?, 0)",
+                [(d.strftime('%Y-%m-%d'), now.isoformat()) for d in stale]
+            )
+            conn.commit()
+            conn.close()
+
+        assert fetched_per_day[0] == 15
+        assert max(fetched_per_day[14:]) <= 5
+
+    def test_daily_warmup_costs_two_requests(self, tmp_path):
+        """Once warm, a day's refresh is one range request per endpoint"""
+        tool = BSEEarningsCalendarTool(db_path=str(tmp_path / "test_earnings.db"), requests_per_second=1000)
+        response = Mock(json=Mock(return_value={'Table': []}), raise_for_status=Mock())
+        base = datetime(2025, 11, 3, 9, 0)
+
+        with patch.object(tool.session, 'get', return_value=response) as mock_get:
+            for day in range(20):
+                now = base + timedelta(days=day)
+                mock_get.reset_mock()
+                with patch('agents.filtering.tools.bse_earnings_calendar_tool.datetime', wraps=datetime) as clock:
+                    clock.now.return_value = now
+                    tool.fetch_bse_announcements(now, now + timedelta(days=14))
+                assert mock_get.call_count == 2
+
 
 class TestStockFilterByEarningsTool:
     """Test Stock Filter By Earnings Tool"""
@@ -0,0 +1,156 @@
+"""
+Unit tests for the in-process API benchmark (Story 7.5 follow-up)
+
+Tests api_benchmark.py: synthetic registry fixture, in-process scenario runs,
+baseline persistence and regression detection.
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from agents.ml.optimization.api_benchmark import (
+    APIBenchmark,
+    build_synthetic_registry,
+    main
+)
+from agents.ml.model_registry import ModelRegistry
+
+
+class TestAPIBenchmark(unittest.TestCase):
+    """Test in-process benchmark harness"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.benchmark = APIBenchmark(
+            work_dir=self.test_dir,
+            concurrency=4,
+            requests_per_scenario=20,
+            batch_size=3,
+            baseline_path=str(Path(self.test_dir) / "baseline.json")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _report(self, p95=50.0, throughput=100.0, error_rate=0.0):
+        scenario = {
+            'latency_p50': p95 / 2,
+            'latency_p95': p95,
+            'latency_p99': p95 * 1.2,
+            'latency_mean': p95 / 2,
+            'throughput': throughput,
+            'error_rate': error_rate,
+            'total_requests': 20,
+            'failed_requests': 0
+        }
+        return {'scenarios': {'predict_single': dict(scenario), 'batch_predict': dict(scenario)}}
+
+    def test_01_synthetic_registry(self):
+        """Synthetic registry produces a loadable model with 25 inputs"""
+        info = build_synthetic_registry(str(Path(self.test_dir) / "registry"))
+        model = ModelRegistry(str(Path(self.test_dir) / "registry")).load_model(model_id=info['model_id'])
+
+        proba = model.predict_proba([[0.0] * 25])
+        self.assertEqual(proba.shape, (1, 2))
+
+    def test_02_run_records_all_scenarios(self):
+        """Run drives both endpoints and records latency/throughput/errors"""
+        report = self.benchmark.run()
+
+        for scenario in ['predict_single', 'batch_predict']:
+            metrics = report['scenarios'][scenario]
+            self.assertEqual(metrics['total_requests'], 20)
+            self.assertEqual(metrics['error_rate'], 0.0)
+            self.assertGreater(metrics['throughput'], 0)
+            self.assertLessEqual(metrics['latency_p50'], metrics['latency_p99'])
+
+    def test_03_baseline_roundtrip(self):
+        """Baseline is saved and loaded as JSON"""
+        self.assertIsNone(self.benchmark.load_baseline())
+
+        report = self._report()
+        self.benchmark.save_baseline(report)
+
+        self.assertEqual(self.benchmark.load_baseline(), report)
+
+    def test_04_no_regression_within_threshold(self):
+        """Small slowdowns inside the threshold pass"""
+        regressions = self.benchmark.compare_to_baseline(
+            self._report(p95=55.0, throughput=90.0),
+            self._report(p95=50.0, throughput=100.0)
+        )
+        self.assertEqual(regressions, [])
+
+    def test_05_latency_regression_detected(self):
+        """p95 latency beyond threshold is reported"""
+        regressions = self.benchmark.compare_to_baseline(
+            self._report(p95=80.0),
+            self._report(p95=50.0)
+        )
+        self.assertTrue(any('latency_p95' in r for r in regressions))
+
+    def test_06_throughput_and_error_regression_detected(self):
+        """Throughput drop and error increase are reported"""
+        regressions = self.benchmark.compare_to_baseline(
+            self._report(throughput=50.0, error_rate=0.1),
+            self._report(throughput=100.0, error_rate=0.0)
+        )
+        self.assertTrue(any('throughput' in r for r in regressions))
+        self.assertTrue(any('error_rate' in r for r in regressions))
+
+    def test_07_cli_fails_on_regression(self):
+        """CLI writes a baseline on first run and fails against a faster baseline"""
+        baseline_path = str(Path(self.test_dir) / "cli_baseline.json")
+        args = ['--concurrency', '2', '--requests', '10', '--batch-size', '2',
+                '--baseline', baseline_path]
+
+        self.assertEqual(main(args), 0)
+        self.assertTrue(Path(baseline_path).exists())
+
+        # Baseline that no real run can meet
+        impossible = APIBenchmark(baseline_path=baseline_path)
+        impossible.save_baseline(self._report(p95=0.001, throughput=1e9))
+
+        self.assertEqual(main(args), 1)
+
+    def test_08_cold_mode_never_repeats_a_stock_date(self):
+        """Cold mode gives every prediction its own (bse_code, date); warm mode repeats"""
+        def keys(benchmark):
+            keys = [tuple(benchmark._payload('predict_single', i).values()) for i in range(-1, 20)]
+            for i in range(20):
+                keys += [tuple(p.values()) for p in benchmark._payload('batch_predict', i)['predictions']]
+            return keys
+
+        cold = keys(self.benchmark)
+        self.assertEqual(len(cold), len(set(cold)))
+        self.assertTrue(all(len(code) == 6 for code, _ in cold))
+
+        warm = APIBenchmark(work_dir=self.test_dir, feature_cache='warm', batch_size=3)
+        self.assertLessEqual(len(set(keys(warm))), 5)
+
+    def test_09_mode_mismatch_reported(self):
+        """A run is not compared against a baseline recorded in another cache mode"""
+        cold = self._report()
+        cold['config'] = {'feature_cache': 'cold'}
+        warm = self._report()
+        warm['config'] = {'feature_cache': 'warm'}
+
+        regressions = self.benchmark.compare_to_baseline(cold, warm)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('feature_cache', regressions[0])
+
+    def test_10_temporary_work_dir_removed(self):
+        """cleanup() removes a work dir the benchmark created, never a supplied one"""
+        owned = APIBenchmark()
+        self.assertTrue(owned.work_dir.exists())
+        owned.cleanup()
+        self.assertFalse(owned.work_dir.exists())
+
+        self.benchmark.cleanup()
+        self.assertTrue(Path(self.test_dir).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -336,6 +336,29 @@ def test_handle_missing_features_gracefully(batch_predictor):
     assert len(predictions) == 2  # Only successful predictions
 
 
+def test_repeat_scoring_uses_feature_cache(batch_predictor):
+    """Test that re-scoring the same stocks/date skips feature extraction"""
+    calls = []
+    original_extract = batch_predictor.extract_features_for_stock
+
+    def counting_extract(bse_code, date):
+        calls.append(bse_code)
+        return original_extract(bse_code, date)
+
+    batch_predictor.extract_features_for_stock = counting_extract
+
+    stocks = [
+        {'bse_code': '500000', 'nse_symbol': 'STOCK0', 'company_name': 'Test 0'},
+        {'bse_code': '500001', 'nse_symbol': 'STOCK1', 'company_name': 'Test 1'}
+    ]
+
+    first = batch_predictor.predict_batch(stocks, '2025-11-14')
+    second = batch_predictor.predict_batch(stocks, '2025-11-14')
+
+    assert len(calls) == 2  # Only the first pass extracts
+    assert [p.probability for p in first] == [p.probability for p in second]
+
+
 def test_error_logging_for_failed_stocks(batch_predictor, temp_dir):
     """Test that failed stocks are logged to skipped_stocks.csv"""
     # Mock feature extraction to fail for specific stock
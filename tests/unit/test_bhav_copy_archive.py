@@ -0,0 +1,214 @@
+"""
+Unit tests for the columnar BhavCopy archive
+
+Tests cover:
+- Vectorized CSV parsing into the common BSE/NSE schema
+- Filename date parsing for downloader and collector cache names
+- Parse-once ingest with change detection
+- Range reads and wide panels
+- PriceCollector bulk upsert through the archive
+"""
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tools.bhav_copy_archive as archive_module
+from tools.bhav_copy_archive import ARCHIVE_COLUMNS, BhavCopyArchive, bhav_copy_date, read_bhav_csv
+from tools.bhav_copy_downloader import parse_bhav_copy
+from tools.db_utils import close_pooled_connections
+
+BSE_HEADER = ("SC_CODE,SC_NAME,SC_GROUP,SC_TYPE,OPEN,HIGH,LOW,CLOSE,LAST,PREVCLOSE,"
+              "NO_TRADES,NO_OF_SHRS,NET_TURNOV,TDCLOINDI,ISIN_CODE\n")
+NSE_HEADER = "SYMBOL,SERIES,OPEN,HIGH,LOW,CLOSE,LAST,PREVCLOSE,TOTTRDQTY,TOTTRDVAL,TIMESTAMP,TOTALTRADES,ISIN,\n"
+
+
+def write_bse(path, rows):
+    lines = [
+        f"{code},{name} ,A,Q,{o},{h},{l},{c},{c},{pc},10,{v},1000,{flag},{isin}\n"
+        for code, name, o, h, l, c, pc, v, flag, isin in rows
+    ]
+    path.write_text(BSE_HEADER + ''.join(lines))
+    return path
+
+
+def write_nse(path, rows):
+    lines = [
+        f"{sym},{series},{o},{h},{l},{c},{c},{pc},{v},1000,13-NOV-2024,5,{isin},\n"
+        for sym, series, o, h, l, c, pc, v, isin in rows
+    ]
+    path.write_text(NSE_HEADER + ''.join(lines))
+    return path
+
+
+@pytest.fixture
+def bse_file(tmp_path):
+    return write_bse(tmp_path / "EQ131124.csv", [
+        ('500325', 'RELIANCE', 2800, 2850, 2790, 2840, 2820, 1000000, '', 'INE002A01018'),
+        ('500209', 'INFOSYS', 1500, 1520, 1490, 1510, 1400, 500000, 'C', 'INE009A01021'),
+        ('999999', 'SUSPENDED', 0, 0, 0, 0, 5, 0, '', ''),
+    ])
+
+
+class TestReadBhavCsv:
+    """Test parsing into the archive schema"""
+
+    def test_bse_schema(self, bse_file):
+        df = read_bhav_csv(bse_file, "BSE")
+
+        assert list(df.columns) == ARCHIVE_COLUMNS
+        assert df['code'].tolist() == ['500325', '500209', '999999']
+        assert df['name'].iloc[0] == 'RELIANCE'  # padding stripped
+        assert df['is_circuit'].tolist() == [False, True, False]
+        assert df['prev_close'].iloc[1] == 1400.0
+        assert df['volume'].dtype == np.int64
+        assert df['isin'].iloc[2] == ''
+
+    def test_nse_schema_and_missing_columns(self, tmp_path):
+        nse = write_nse(tmp_path / "cm13NOV2024bhav.csv", [
+            ('RELIANCE', 'EQ', 2800, 2850, 2790, 2840, 2820, 1000000, 'INE002A01018'),
+            ('RELIANCE', 'BE', 100, 110, 95, 105, 100, 1000, 'INE002A01018'),
+        ])
+        minimal = tmp_path / "empty.csv"
+        minimal.write_text("SC_CODE,SC_NAME,OPEN,HIGH,LOW,CLOSE\n")
+
+        df = read_bhav_csv(nse, "NSE")
+        empty = read_bhav_csv(minimal, "BSE")
+
+        assert df['series'].tolist() == ['EQ', 'BE']
+        assert not df['is_circuit'].any()
+        assert len(empty) == 0 and list(empty.columns) == ARCHIVE_COLUMNS
+        with pytest.raises(ValueError):
+            read_bhav_csv(nse, "MCX")
+
+    @pytest.mark.parametrize("name,exchange", [
+        ("EQ131124.csv", "BSE"), ("BSE_EQ131124.CSV", "BSE"), ("EQ131124_CSV.CSV", "BSE"),
+        ("cm13NOV2024bhav.csv", "NSE"), ("NSE_cm13NOV2024bhav.csv", "NSE"),
+    ])
+    def test_filename_dates(self, name, exchange):
+        assert bhav_copy_date(f"/cache/{name}", exchange) == "2024-11-13"
+
+    def test_downloader_parse_uses_schema(self, tmp_path, bse_file):
+        """tools.parse_bhav_copy keeps its record shape, drops zero closes"""
+        path = Path(bse_file).rename(tmp_path / "BSE_EQ131124.CSV")
+
+        records = parse_bhav_copy(path, exchange="BSE")
+
+        assert [r['symbol'] for r in records] == ['500325', '500209']
+        assert records[1] == {
+            'exchange': 'BSE', 'symbol': '500209', 'name': 'INFOSYS', 'isin': 'INE009A01021',
+            'open': 1500.0, 'high': 1520.0, 'low': 1490.0, 'close': 1510.0,
+            'volume': 500000, 'date': '2024-11-13', 'is_circuit': True
+        }
+
+
+class TestArchive:
+    """Test partitions, ingest and queries"""
+
+    def test_ingest_once(self, tmp_path, bse_file, monkeypatch):
+        """Re-ingesting an unchanged file reads the partition, not the CSV"""
+        archive = BhavCopyArchive(tmp_path / "archive")
+        first = archive.ingest_file(bse_file, "BSE")
+
+        def no_parse(*args):
+            raise AssertionError("CSV re-parsed")
+
+        monkeypatch.setattr(archive_module, 'read_bhav_csv', no_parse)
+        again = archive.ingest_file(bse_file, "BSE")
+
+        pd.testing.assert_frame_equal(first, again)
+        assert archive.partition_path("BSE", "2024-11-13").name == "2024-11-13.npz"
+        assert archive.dates("BSE") == ["2024-11-13"]
+
+    def test_changed_file_is_reparsed(self, tmp_path, bse_file):
+        archive = BhavCopyArchive(tmp_path / "archive")
+        archive.ingest_file(bse_file, "BSE")
+
+        write_bse(bse_file, [('500325', 'RELIANCE', 1, 2, 1, 2, 1, 10, '', 'INE002A01018')])
+        frame = archive.ingest_file(bse_file, "BSE")
+
+        assert frame['code'].tolist() == ['500325']
+        assert len(archive.read_day("BSE", "2024-11-13")) == 1
+
+    def test_read_and_panel(self, tmp_path):
+        archive = BhavCopyArchive(tmp_path / "archive")
+        for day, closes in [("131124", (10, 20)), ("141124", (11, None)), ("151124", (12, 22))]:
+            rows = [('A1', 'A', 1, 1, 1, closes[0], 1, 5, '', 'X1')]
+            if closes[1] is not None:
+                rows.append(('B2', 'B', 1, 1, 1, closes[1], 1, 5, 'C', 'X2'))
+            archive.ingest_file(write_bse(tmp_path / f"EQ{day}.csv", rows), "BSE")
+
+        rows = archive.read("BSE", start="2024-11-14", columns=['code', 'close'])
+        panel = archive.panel("close", "BSE")
+        flags = archive.panel("is_circuit", "BSE", codes=['B2'])
+
+        assert rows['date'].tolist() == ['2024-11-14', '2024-11-15', '2024-11-15']
+        assert panel.shape == (3, 2)
+        assert panel['A1'].tolist() == [10, 11, 12]
+        assert np.isnan(panel.loc['2024-11-14', 'B2'])
+        assert list(flags.columns) == ['B2']
+        assert isinstance(panel.index, pd.DatetimeIndex)
+
+
+class TestPriceCollectorIngest:
+    """Test PriceCollector storing through the archive"""
+
+    def test_collect_upserts_through_archive(self, tmp_path, monkeypatch):
+        from agents.ml.ml_data_collector import PriceCollector
+
+        db_path = str(tmp_path / "prices.db")
+        collector = PriceCollector(db_path=db_path, cache_dir=str(tmp_path / "cache"))
+        bse_files = [
+            str(write_bse(tmp_path / f"EQ{d}1124.csv", [
+                ('500325', 'RELIANCE', 100, 105, 99, 100 + d, 99, 1000, 'C' if d == 14 else '', 'INE002A01018'),
+                ('500209', 'INFOSYS', 50, 52, 49, 51, 50, 500, '', 'INE009A01021'),
+            ])) for d in (13, 14)
+        ]
+        nse_files = [str(write_nse(tmp_path / "cm13NOV2024bhav.csv", [
+            ('RELIANCE', 'EQ', 2800, 2850, 2790, 2840, 2820, 1000000, 'INE002A01018'),
+            ('RELIANCE', 'BE', 100, 110, 95, 105, 100, 1000, 'INE002A01018'),
+        ]))]
+        monkeypatch.setattr(collector, 'download_bse_bhav_copies', lambda s, e: bse_files)
+        monkeypatch.setattr(collector, 'download_nse_bhav_copies', lambda s, e: nse_files)
+        monkeypatch.setattr(collector, 'fill_gaps_with_yfinance', lambda code, dates: 0)
+        monkeypatch.setattr(collector, 'log_incomplete_companies', lambda completeness: None)
+        monkeypatch.setattr(collector, 'log_anomalies', lambda report: None)
+
+        report = collector.collect_all_price_data(['500325'], '2024-11-13', '2024-11-14')
+        close_pooled_connections()
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT date, close, prev_close, hit_upper_circuit FROM price_movements "
+            "WHERE bse_code = '500325' ORDER BY date"
+        ).fetchall()
+        nse_rows = conn.execute("SELECT COUNT(*) FROM price_movements WHERE source = 'nse_bhav_copy'").fetchone()[0]
+        conn.close()
+
+        assert report.total_records_stored == 5  # 2 BSE days x 2 + 1 NSE EQ row
+        assert rows == [('2024-11-13', 113.0, 99.0, 0), ('2024-11-14', 114.0, 99.0, 1)]
+        assert nse_rows == 1
+        assert collector.archive.dates("BSE") == ['2024-11-13', '2024-11-14']
+        assert collector.archive.dates("NSE") == ['2024-11-13']
+
+    def test_store_writes_nulls_for_missing_values(self, tmp_path):
+        from agents.ml.ml_data_collector import PriceCollector
+
+        db_path = str(tmp_path / "prices.db")
+        collector = PriceCollector(db_path=db_path, cache_dir=str(tmp_path / "cache"))
+        df = pd.DataFrame({
+            'bse_code': ['500325'], 'date': ['2024-11-13'], 'open': [1.0], 'high': [1.0],
+            'low': [1.0], 'close': [1.0], 'volume': [np.int64(7)], 'prev_close': [np.nan],
+            'hit_upper_circuit': [np.bool_(True)], 'source': ['bse_bhav_copy']
+        })
+
+        assert collector.store_price_data(df) == 1
+        close_pooled_connections()
+
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("SELECT volume, prev_close, hit_upper_circuit, nse_symbol FROM price_movements").fetchone()
+        conn.close()
+        assert row == (7, None, 1, None)
@@ -268,6 +268,51 @@ class TestFuzzyNameMatching:
         cleaned = mapper.clean_company_name("HDFC Bank Ltd.")
         assert "." not in cleaned
 
+    def test_char_bag_bound_never_below_ratio(self):
+        """AC1.3.4: Candidate blocking bound is an upper bound of token_sort_ratio"""
+        from tools.fuzzy_name_matcher import CharBagIndex, token_sort_key, token_sort_ratio
+
+        targets = ["tata consultancy services", "tata motors", "hdfc bank", "infosys", ""]
+        index = CharBagIndex([token_sort_key(t) for t in targets])
+
+        for query in ["consultancy tata services", "hdfc bnk", "reliance industries", "tata"]:
+            bounds = index.upper_bounds(token_sort_key(query))
+            for target, bound in zip(targets, bounds):
+                assert token_sort_ratio(query, target) <= bound + 1e-9
+
+        assert list(index.candidates(token_sort_key("hdfc bank"), 0.8)) == [2]
+
+    def test_blocked_matching_equals_exhaustive(self, tmp_path):
+        """AC1.3.4: Blocked matching gives the same matches as scoring every pair"""
+        pytest.importorskip("fuzzywuzzy")
+        from fuzzywuzzy import fuzz
+        from agents.ml.ml_data_collector import BSENSEMapper
+
+        mapper = BSENSEMapper(existing_mapping_path=str(tmp_path / "mapping.json"))
+
+        words = ["TATA", "STEEL", "MOTORS", "BANK", "HDFC", "INDIA", "POWER", "PHARMA", "CHEM", "AGRO", "LTD"]
+        names = [" ".join(words[(i * 7 + k * 3) % len(words)] for k in range(1 + i % 4)) for i in range(120)]
+        unmapped_bse = {str(500000 + i): {"company_name": name} for i, name in enumerate(names[:60])}
+        nse_symbols = {f"SYM{i}": {"company_name": name + " LIMITED", "isin": None} for i, name in enumerate(names[60:])}
+
+        expected = {}
+        for bse_code, info in unmapped_bse.items():
+            best, best_ratio = None, 0
+            for symbol, nse_info in nse_symbols.items():
+                ratio = fuzz.token_sort_ratio(
+                    mapper.clean_company_name(info["company_name"]),
+                    mapper.clean_company_name(nse_info["company_name"])
+                )
+                if ratio > best_ratio:
+                    best, best_ratio = symbol, ratio
+            if best_ratio >= 80:
+                expected[bse_code] = (best, best_ratio / 100.0)
+
+        matches = mapper.fuzzy_match_names(unmapped_bse, nse_symbols)
+
+        assert expected
+        assert {code: (m["nse_symbol"], m["confidence"]) for code, m in matches.items()} == expected
+
 
 class TestManualValidationCSV:
     """Test manual validation CSV generation (AC1.3.5)"""
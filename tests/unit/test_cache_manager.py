@@ -3,13 +3,14 @@ Unit tests for Story 7.4: Caching Strategy
 
 Tests cache_manager.py for multi-layer caching (Redis L1 + LRU L2).
 
-Total: 22 tests
+Total: 24 tests
 - Initialization (3 tests)
 - L1 Redis cache (5 tests - skip if Redis unavailable)
 - L2 LRU cache (5 tests - always run)
 - Multi-layer hierarchy (4 tests)
 - TTL expiration (3 tests)
 - Statistics (2 tests)
+- Bulk operations (2 tests)
 
 Target: 80% cache hit rate
 """
@@ -357,6 +358,25 @@ class TestCacheManager(unittest.TestCase):
         expected_hit_rate = 3 / 5
         self.assertAlmostEqual(stats['hit_rate'], expected_hit_rate, places=2)
 
+    # ==================== Bulk Operations ====================
+
+    def test_23_set_many_get_many_roundtrip(self):
+        """Bulk set/get returns found keys and omits misses"""
+        self.cache.set_many({"bulk1": 1, "bulk2": 2})
+
+        found = self.cache.get_many(["bulk1", "bulk2", "bulk_missing"])
+
+        self.assertEqual(found, {"bulk1": 1, "bulk2": 2})
+
+    def test_24_get_many_updates_statistics(self):
+        """Bulk get counts one hit or miss per key"""
+        self.cache.set_many({"bulk1": 1})
+        self.cache.get_many(["bulk1", "bulk_missing"])
+
+        stats = self.cache.get_statistics()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
 
 if __name__ == '__main__':
     unittest.main()
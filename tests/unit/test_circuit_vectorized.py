@@ -0,0 +1,195 @@
+"""
+Unit tests for vectorized circuit detection
+
+Tests cover:
+- Parity with the per-record is_circuit_hit scan
+- Multi-symbol prev-close alignment, bands and exchange flags
+- One-pass price_movements scans (identify_circuits, relabel_circuits)
+"""
+
+import random
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from skills.circuit_detector import (
+    align_prev_close, circuit_bands, detect_circuits, find_circuit_hits_in_dataset, is_circuit_hit
+)
+from tools.circuit_identifier import identify_circuits, load_price_changes
+from tools.db_utils import close_pooled_connections
+
+
+def random_walk(n, seed=1):
+    rng = random.Random(seed)
+    records, close = [], 100.0
+    for i in range(n):
+        open_ = close * rng.uniform(0.95, 1.05)
+        close = open_ * rng.uniform(0.85, 1.25)
+        high = max(open_, close) * (1 if rng.random() < 0.3 else rng.uniform(1, 1.05))
+        low = min(open_, close) * (1 if rng.random() < 0.3 else rng.uniform(0.95, 1))
+        records.append({"date": f"d{i:05d}", "open": open_, "high": high, "low": low, "close": close, "volume": 1})
+    return records
+
+
+def price_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE price_movements (bse_code TEXT, date DATE, close REAL, volume INTEGER)")
+    conn.executemany("INSERT INTO price_movements VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestParity:
+    """Test the vectorized scan against the per-record rules"""
+
+    def test_dataset_scan_matches_scalar(self):
+        records = random_walk(3000)
+
+        fast = find_circuit_hits_in_dataset(records, upper_threshold=3.0)
+
+        slow, prev_close = [], None
+        for i, record in enumerate(records):
+            status, details = is_circuit_hit(record, prev_close, 3.0, -5.0)
+            if status != "NONE":
+                slow.append((i, status, details))
+            prev_close = record["close"]
+
+        assert [(h["record_index"], h["circuit_status"]) for h in fast] == [(i, s) for i, s, _ in slow]
+        for hit, (_, _, details) in zip(fast, slow):
+            assert hit["circuit_details"].keys() == details.keys()
+            for key, value in details.items():
+                assert hit["circuit_details"][key] == pytest.approx(value)
+
+    def test_empty_dataset(self):
+        assert find_circuit_hits_in_dataset([]) == []
+        assert list(detect_circuits(pd.DataFrame())) == [
+            'bse_code', 'date', 'status', 'pct_change', 'band', 'prev_close', 'close', 'locked', 'flagged', 'row'
+        ]
+
+
+class TestDetectCircuits:
+    """Test multi-symbol columnar detection"""
+
+    @pytest.fixture
+    def frame(self):
+        # Shuffled rows of two symbols; B's first row would look like a
+        # circuit if it were compared with A's last close
+        return pd.DataFrame({
+            'bse_code': ['B', 'A', 'A', 'B', 'A'],
+            'date': ['2024-11-04', '2024-11-05', '2024-11-04', '2024-11-05', '2024-11-06'],
+            'open': [200.0, 100.0, 100.0, 200.0, 110.0],
+            'high': [201.0, 110.0, 101.0, 210.0, 110.0],
+            'low': [199.0, 100.0, 99.0, 190.0, 99.0],
+            'close': [201.0, 110.0, 100.0, 190.0, 99.0],
+        })
+
+    def test_alignment_and_hits(self, frame):
+        hits = detect_circuits(frame)
+
+        assert hits[['bse_code', 'date', 'status']].values.tolist() == [
+            ['A', '2024-11-05', 'UPPER'],
+            ['A', '2024-11-06', 'LOWER'],
+            ['B', '2024-11-05', 'LOWER'],
+        ]
+        assert hits['prev_close'].tolist() == [100.0, 110.0, 201.0]
+        assert hits['band'].tolist() == [10.0, -10.0, -5.0]
+        assert hits['row'].tolist() == [1, 4, 3]  # Positions in the input frame
+
+    def test_published_prev_close_and_flags(self, frame):
+        frame['prev_close'] = [np.nan, 106.0, np.nan, np.nan, np.nan]  # Published for A on 11-05 only
+        frame['is_circuit'] = [True, False, False, False, False]
+
+        hits = detect_circuits(frame, flag_column='is_circuit')
+
+        assert ('A', '2024-11-05') not in set(zip(hits['bse_code'], hits['date']))  # +3.8% vs published close
+        flagged = hits[hits['flagged']]
+        assert flagged[['bse_code', 'date', 'status']].values.tolist() == [['B', '2024-11-04', 'UPPER']]
+
+    def test_band_tolerance(self):
+        frame = pd.DataFrame({
+            'bse_code': ['A', 'A'], 'date': ['d1', 'd2'],
+            'open': [100.0, 100.0], 'high': [100.0, 104.95], 'low': [100.0, 100.0], 'close': [100.0, 104.95]
+        })
+
+        assert detect_circuits(frame).empty
+        hits = detect_circuits(frame, band_tolerance=0.1)
+        assert hits['band'].tolist() == [5.0]
+
+    def test_helpers(self):
+        codes = np.array([0, 0, 1, 1])
+        aligned = align_prev_close(codes, np.array([1.0, 2.0, 3.0, 4.0]), np.array([np.nan, 0.0, 2.5, np.nan]))
+
+        assert np.isnan(aligned[0])
+        assert aligned[1:].tolist() == [1.0, 2.5, 3.0]
+        assert circuit_bands(np.array([4.0, 5.0, 19.9, 25.0, -12.0])).tolist()[1:] == [5.0, 10.0, 20.0, -10.0]
+
+    def test_archive_rows(self, tmp_path):
+        """BhavCopyArchive.read output feeds straight in"""
+        from tools.bhav_copy_archive import BhavCopyArchive
+
+        archive = BhavCopyArchive(tmp_path / "archive")
+        archive.write_day("BSE", "2024-11-13", pd.DataFrame({
+            'code': ['500325', '500209'], 'isin': ['', ''], 'name': ['', ''], 'series': ['A', 'A'],
+            'open': [100.0, 50.0], 'high': [120.0, 52.0], 'low': [100.0, 49.0], 'close': [120.0, 51.0],
+            'prev_close': [100.0, 50.0], 'volume': [10, 10], 'is_circuit': [True, False]
+        }))
+
+        hits = detect_circuits(archive.read("BSE"), code_column='code', flag_column='is_circuit')
+
+        assert hits[['code', 'status', 'band', 'flagged']].values.tolist() == [['500325', 'UPPER', 20.0, True]]
+
+
+class TestPriceMovementScans:
+    """Test one-pass scans of price_movements"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return price_db(str(tmp_path / "price_movements.db"), [
+            ('A', '2024-11-07', 100.0, 10),
+            ('A', '2024-11-08', 101.0, 10),  # Friday
+            ('A', '2024-11-11', 115.0, 50),  # Monday +13.9%
+            ('B', '2024-11-08', 0.0, 10),
+            ('B', '2024-11-11', 10.0, 10),   # No valid previous close
+        ])
+
+    def test_weekend_moves_are_aligned(self, db_path):
+        moves = load_price_changes(db_path)
+        circuits = identify_circuits(db_path, threshold=10.0)
+
+        assert moves['date'].tolist() == ['2024-11-08', '2024-11-11']
+        assert len(circuits) == 1
+        assert circuits[0]['circuit_date'] == '2024-11-11'
+        assert circuits[0]['prev_close'] == 101.0
+        assert circuits[0]['band'] == 10.0
+        assert identify_circuits(db_path, threshold=10.0, start_date='2024-11-09')[0]['circuit_close'] == 115.0
+
+    def test_relabel_single_pass(self, tmp_path, db_path):
+        from agents.ml.ml_label_quality_agent import MLLabelQualityAgent
+
+        conn = sqlite3.connect(str(tmp_path / "upper_circuit_labels.db"))
+        conn.execute("""
+            CREATE TABLE upper_circuit_labels (
+                bse_code TEXT, earnings_date TEXT, next_day_date TEXT,
+                price_change_pct REAL, hit_circuit INTEGER, label INTEGER,
+                UNIQUE(bse_code, earnings_date)
+            )
+        """)
+        conn.execute("INSERT INTO upper_circuit_labels VALUES ('OLD', '2020-01-01', '2020-01-01', 0, 0, 0)")
+        conn.commit()
+        conn.close()
+
+        agent = MLLabelQualityAgent(db_base_path=str(tmp_path), circuit_threshold=10.0)
+        agent.config.backup_labels = False
+        results = agent.relabel_circuits()
+        close_pooled_connections()
+
+        conn = sqlite3.connect(str(tmp_path / "upper_circuit_labels.db"))
+        rows = conn.execute("SELECT bse_code, earnings_date, label FROM upper_circuit_labels ORDER BY earnings_date").fetchall()
+        conn.close()
+
+        assert rows == [('A', '2024-11-08', 0), ('A', '2024-11-11', 1)]
+        assert results['circuits_identified'] == 1
+        assert results['labels_created'] == 2
@@ -0,0 +1,259 @@
+"""
+Tests for the resumable collection engine
+
+Covers the (bse_code, source) ledger, per-source concurrency, batched writes,
+conditional re-fetch by last-seen quarter, crash/stop recovery, non-destructive
+upserts and Yahoo ticker resolution.
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import asyncio
+import sqlite3
+from datetime import date
+
+import pytest
+
+from agents.ml.collection_engine import (
+    CollectionEngine,
+    CollectionSource,
+    QuarterlyFinancials,
+    YahooQuarterlySource,
+    latest_reported_quarter
+)
+from src.utils.symbol_master import SymbolMaster
+
+
+TODAY = date(2025, 11, 19)  # Latest reported quarter: FY26 Q2 (Jul-Sep 2025)
+
+
+class FakeSource(CollectionSource):
+    """Returns quarters up to `latest` for every symbol; records concurrency"""
+
+    def __init__(self, name="fake", latest=('Q2', 2026), max_concurrency=4, fail=(), revenue=100.0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.latest = latest
+        self.fail = set(fail)
+        self.revenue = revenue
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.on_fetch = None
+
+    async def fetch(self, symbol):
+        self.calls.append(symbol)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.on_fetch:
+                self.on_fetch(symbol)
+            await asyncio.sleep(0.01)
+            if symbol in self.fail:
+                raise ConnectionError("source down")
+            quarter, year = self.latest
+            return [
+                QuarterlyFinancials(bse_code=symbol, quarter=quarter, year=year, revenue_cr=self.revenue),
+                QuarterlyFinancials(bse_code=symbol, quarter='Q1', year=year, revenue_cr=self.revenue)
+            ]
+        finally:
+            self.in_flight -= 1
+
+
+SYMBOLS = [f"{500000 + i}" for i in range(30)]
+
+
+def ledger(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT symbol, source, status, attempts, last_quarter FROM collection_ledger").fetchall()
+    conn.close()
+    return {(r[0], r[1]): r[2:] for r in rows}
+
+
+def financial_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT bse_code, quarter, year, revenue_cr FROM historical_financials").fetchall()
+    conn.close()
+    return rows
+
+
+class TestQuarters:
+    """Test expected-quarter calculation"""
+
+    def test_latest_reported_quarter(self):
+        """Quarter results are expected reporting_lag_days after quarter end"""
+        assert latest_reported_quarter(date(2025, 11, 19)) == '2026Q2'
+        assert latest_reported_quarter(date(2025, 11, 1)) == '2026Q1'
+        assert latest_reported_quarter(date(2025, 6, 1)) == '2025Q4'
+
+
+class TestCollectionEngine:
+    """Test ledger-driven collection"""
+
+    def test_full_run_writes_batches_and_ledger(self, tmp_path):
+        """Every task runs once, rows land in historical_financials"""
+        db = str(tmp_path / "historical_financials.db")
+        source = FakeSource(max_concurrency=5)
+        engine = CollectionEngine(db, [source], write_batch_size=8)
+
+        report = engine.run_sync(SYMBOLS, today=TODAY)
+
+        assert report.expected_quarter == '2026Q2'
+        assert report.tasks_done == 30
+        assert report.rows_written == 60
+        assert sorted(source.calls) == SYMBOLS
+        assert source.max_in_flight == 5
+        assert len(financial_rows(db)) == 60
+        assert set(ledger(db).values()) == {('done', 0, '2026Q2')}
+
+    def test_up_to_date_symbols_not_refetched(self, tmp_path):
+        """A second run only fetches tasks missing the expected quarter"""
+        db = str(tmp_path / "historical_financials.db")
+        stale = FakeSource(latest=('Q1', 2026))
+        CollectionEngine(db, [stale], refetch_after_hours=0).run_sync(SYMBOLS[:10], today=TODAY)
+
+        fresh = FakeSource()
+        engine = CollectionEngine(db, [fresh], refetch_after_hours=0)
+        engine.run_sync(SYMBOLS[:10], today=TODAY)
+        engine.run_sync(SYMBOLS[:10], today=TODAY)
+
+        # Stale tasks refetched once; afterwards everything is current
+        assert len(fresh.calls) == 10
+        assert set(ledger(db).values()) == {('done', 0, '2026Q2')}
+
+    def test_stop_and_resume_fetch_each_task_once(self, tmp_path):
+        """A stopped run leaves the rest pending; the next run finishes exactly those"""
+        db = str(tmp_path / "historical_financials.db")
+        first = FakeSource(max_concurrency=2)
+        engine = CollectionEngine(db, [first], write_batch_size=4)
+        first.on_fetch = lambda symbol: engine.stop() if len(first.calls) == 10 else None
+
+        report = engine.run_sync(SYMBOLS, today=TODAY)
+        assert report.tasks_not_started == 20
+
+        second = FakeSource()
+        CollectionEngine(db, [second]).run_sync(SYMBOLS, today=TODAY)
+
+        assert sorted(first.calls + second.calls) == SYMBOLS
+        assert len(financial_rows(db)) == 60
+
+    def test_crash_recovery_resets_running_tasks(self, tmp_path):
+        """Tasks left 'running' by a dead process are picked up again"""
+        db = str(tmp_path / "historical_financials.db")
+        engine = CollectionEngine(db, [FakeSource()])
+        engine.ledger.enqueue(SYMBOLS[:5], ['fake'])
+        engine.ledger.mark_running('fake', SYMBOLS[:3])
+
+        source = FakeSource()
+        report = CollectionEngine(db, [source]).run_sync(SYMBOLS[:5], today=TODAY)
+
+        assert report.recovered == 3
+        assert sorted(source.calls) == SYMBOLS[:5]
+
+    def test_failures_retried_until_max_attempts(self, tmp_path):
+        """Failed tasks are due again until attempts run out"""
+        db = str(tmp_path / "historical_financials.db")
+        source = FakeSource(fail={'500000'})
+        engine = CollectionEngine(db, [source], max_attempts=2)
+
+        for _ in range(3):
+            engine.run_sync(SYMBOLS[:3], today=TODAY)
+
+        assert source.calls.count('500000') == 2
+        assert ledger(db)[('500000', 'fake')][:2] == ('failed', 2)
+
+    def test_exhausted_tasks_renewed_for_next_quarter(self, tmp_path):
+        """A task out of attempts is retried once a newer quarter is expected"""
+        db = str(tmp_path / "historical_financials.db")
+        source = FakeSource(fail={'500000'})
+        engine = CollectionEngine(db, [source], max_attempts=1)
+
+        engine.run_sync(SYMBOLS[:1], today=TODAY)
+        engine.run_sync(SYMBOLS[:1], today=TODAY)
+        assert source.calls == ['500000']
+
+        engine.run_sync(SYMBOLS[:1], today=date(2026, 2, 20))  # FY26 Q3 now expected
+        assert source.calls == ['500000', '500000']
+
+    def test_primary_source_wins(self, tmp_path):
+        """Later sources only fill quarters the primary source did not provide"""
+        db = str(tmp_path / "historical_financials.db")
+        primary = FakeSource(name='primary', revenue=1.0, fail={'500001'})
+        secondary = FakeSource(name='secondary', revenue=2.0)
+
+        CollectionEngine(db, [primary, secondary]).run_sync(SYMBOLS[:2], today=TODAY)
+
+        revenue = {(r[0], r[1]): r[3] for r in financial_rows(db)}
+        assert revenue[('500000', 'Q2')] == 1.0
+        assert revenue[('500001', 'Q2')] == 2.0
+
+    def test_refresh_keeps_curated_rows(self, tmp_path):
+        """Existing PDF-extracted values survive; only missing columns are filled"""
+        db = str(tmp_path / "historical_financials.db")
+        engine = CollectionEngine(db, [FakeSource(revenue=100.0)])
+        conn = sqlite3.connect(db)
+        conn.execute("""
+            INSERT INTO historical_financials (bse_code, quarter, year, revenue_cr, pat_cr,
+                                               extraction_confidence, pdf_url)
+            VALUES ('500000', 'Q2', 2026, 95.5, NULL, 0.92, 'https://bseindia.com/x.pdf')
+        """)
+        conn.commit()
+        conn.close()
+
+        engine.run_sync(SYMBOLS[:1], today=TODAY)
+
+        conn = sqlite3.connect(db)
+        row = conn.execute("""
+            SELECT revenue_cr, extraction_confidence, pdf_url FROM historical_financials
+            WHERE bse_code = '500000' AND quarter = 'Q2'
+        """).fetchone()
+        conn.close()
+        assert row == (95.5, 0.92, 'https://bseindia.com/x.pdf')
+
+    def test_overwrite_is_opt_in_and_never_nulls(self, tmp_path):
+        """overwrite=True replaces provided values but keeps the rest"""
+        db = str(tmp_path / "historical_financials.db")
+        CollectionEngine(db, [FakeSource(revenue=1.0)]).run_sync(SYMBOLS[:1], today=TODAY)
+        conn = sqlite3.connect(db)
+        conn.execute("UPDATE historical_financials SET pdf_url = 'keep.pdf'")
+        conn.commit()
+        conn.close()
+
+        report = CollectionEngine(db, [FakeSource(revenue=2.0)], overwrite=True, refetch_after_hours=0) \
+            .run_sync(SYMBOLS[:1], today=date(2026, 2, 20))
+
+        conn = sqlite3.connect(db)
+        rows = conn.execute("SELECT revenue_cr, pdf_url FROM historical_financials").fetchall()
+        conn.close()
+        assert report.rows_written == 2
+        assert set(rows) == {(2.0, 'keep.pdf')}
+
+    def test_rejects_non_bse_codes(self, tmp_path):
+        """The ledger is keyed by BSE code, the key historical_financials is read by"""
+        engine = CollectionEngine(str(tmp_path / "f.db"), [FakeSource()])
+        with pytest.raises(ValueError):
+            engine.run_sync(['RELIANCE'], today=TODAY)
+
+    def test_requires_unique_sources(self, tmp_path):
+        """Source names key the ledger and must be unique"""
+        with pytest.raises(ValueError):
+            CollectionEngine(str(tmp_path / "f.db"), [FakeSource(), FakeSource()])
+
+
+class TestYahooQuarterlySource:
+    """Test Yahoo ticker resolution"""
+
+    def test_tickers_from_bse_code(self, tmp_path):
+        """Mapped codes try the NSE listing first; all fall back to the BSE listing"""
+        db = tmp_path / "mapping.db"
+        conn = sqlite3.connect(str(db))
+        conn.execute("CREATE TABLE bse_nse_mapping (bse_code TEXT, nse_symbol TEXT, company_name TEXT, isin TEXT)")
+        conn.execute("INSERT INTO bse_nse_mapping VALUES ('500325', 'RELIANCE', NULL, NULL)")
+        conn.commit()
+        conn.close()
+
+        source = YahooQuarterlySource(symbol_master=SymbolMaster(str(db)))
+
+        assert source.tickers('500325') == ['RELIANCE.NS', '500325.BO']
+        assert source.tickers('543320') == ['543320.BO']
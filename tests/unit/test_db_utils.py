@@ -0,0 +1,125 @@
+"""
+Unit tests for pooled SQLite access (tools/db_utils)
+
+Tests cover:
+- Per-thread connection reuse and tuned pragmas
+- Commit/rollback semantics of nested pooled blocks
+- Read-only URI connections
+- Reopening after the database file is replaced
+- Batched writes
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from tools.db_utils import (
+    close_pooled_connections,
+    executemany_batched,
+    execute_query,
+    get_connection_pool,
+    pooled_connection
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "pool.db")
+    with pooled_connection(path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield path
+    close_pooled_connections()
+
+
+class TestPooledConnection:
+    """Test connection reuse and pragmas"""
+
+    def test_reuses_connection_per_thread(self, db_path):
+        """Same thread gets the same connection; another thread gets its own"""
+        with pooled_connection(db_path) as first:
+            pass
+        with pooled_connection(db_path) as second:
+            pass
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_connection_pool().acquire(db_path)[0]))
+        thread.start()
+        thread.join()
+
+        assert first is second
+        assert other[0] is not first
+
+    def test_tuned_pragmas(self, db_path):
+        """Writers run in WAL mode with the tuned cache and busy timeout"""
+        with pooled_connection(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_commits_on_exit_and_rolls_back_on_error(self, db_path):
+        """Outermost block commits; an exception rolls the whole transaction back"""
+        with pooled_connection(db_path) as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('kept')")
+
+        with pytest.raises(RuntimeError):
+            with pooled_connection(db_path) as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('outer')")
+                with pooled_connection(db_path) as inner:
+                    inner.execute("INSERT INTO items (name) VALUES ('inner')")
+                raise RuntimeError("boom")
+
+        rows = sqlite3.connect(db_path).execute("SELECT name FROM items").fetchall()
+        assert rows == [('kept',)]
+
+    def test_row_factory_restored(self, db_path):
+        """Row factory applies to the block only"""
+        with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
+            row = conn.execute("SELECT 1 AS one").fetchone()
+            assert row['one'] == 1
+        with pooled_connection(db_path) as conn:
+            assert conn.row_factory is None
+
+    def test_read_only(self, db_path, tmp_path):
+        """Readers cannot write and missing databases are not created"""
+        with pooled_connection(db_path, read_only=True) as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+        missing = str(tmp_path / "missing.db")
+        with pytest.raises(sqlite3.OperationalError):
+            with pooled_connection(missing, read_only=True):
+                pass
+        assert not os.path.exists(missing)
+
+    def test_reopens_after_file_replaced(self, db_path):
+        """A deleted and recreated database is not read through a stale connection"""
+        with pooled_connection(db_path, read_only=True) as conn:
+            conn.execute("SELECT * FROM items").fetchall()
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        fresh = sqlite3.connect(db_path)
+        fresh.execute("CREATE TABLE other (x INTEGER)")
+        fresh.commit()
+        fresh.close()
+
+        with pooled_connection(db_path, read_only=True) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert tables == {'other'}
+
+
+class TestWriteHelpers:
+    """Test batched writes and query helpers on the pool"""
+
+    def test_executemany_batched(self, db_path):
+        """All rows written across several batches"""
+        written = executemany_batched(
+            db_path, "INSERT INTO items (name) VALUES (?)", ((f"n{i}",) for i in range(25)), batch_size=10
+        )
+
+        assert written == 25
+        assert execute_query(db_path, "SELECT COUNT(*) AS n FROM items", fetch_one=True)['n'] == 25
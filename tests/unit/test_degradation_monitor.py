@@ -19,6 +19,13 @@ import os
 import sqlite3
 from datetime import datetime, timedelta
 
+from freezegun import freeze_time
+
+
+# Production-label fixtures end here; tests query fixed 2025 ranges, and
+# rolling-window tests freeze "now" just after it
+FIXTURE_END = datetime(2025, 11, 14)
+
 
 @pytest.fixture
 def temp_db():
@@ -51,7 +58,7 @@ def production_predictions():
     # Simulate predictions
     predictions = []
     for i in range(n):
-        date = (datetime.now() - timedelta(days=30-i//7)).strftime('%Y-%m-%d')
+        date = (FIXTURE_END - timedelta(days=30-i//7)).strftime('%Y-%m-%d')
         bse_code = f"5003{i%50:02d}"
         predicted_label = np.random.choice([0, 1], p=[0.7, 0.3])
         probability = np.random.uniform(0.55, 0.95) if predicted_label == 1 else np.random.uniform(0.3, 0.5)
@@ -200,6 +207,7 @@ class TestPerformanceCalculation:
         assert 'recall' in metrics
         assert 0 <= metrics['f1'] <= 1
 
+    @freeze_time(FIXTURE_END + timedelta(days=1))
     def test_rolling_window_metrics(self, temp_db, baseline_metrics, production_predictions):
         """Test rolling window calculations (7d, 30d, 90d)"""
         from monitoring.degradation_monitor import ModelMonitor
@@ -438,6 +446,7 @@ class TestRollbackTrigger:
 class TestPerformanceMetrics:
     """Test AC5.3.7: Performance dashboard metrics"""
 
+    @freeze_time(FIXTURE_END + timedelta(days=1))
     def test_get_dashboard_metrics(self, temp_db, baseline_metrics, production_predictions):
         """Test getting metrics for dashboard"""
         from monitoring.degradation_monitor import ModelMonitor
@@ -499,3 +508,86 @@ class TestModelMonitorIntegration:
 
         assert len(report) > 0
         assert '2025-11-14' in report
+
+
+class TestMetricAccumulators:
+    """Per-day accumulators behind production metrics"""
+
+    @staticmethod
+    def _store_random_labels(monitor, n=400, codes=200):
+        rng = np.random.default_rng(7)
+        for i in range(n):
+            actual = int(rng.integers(0, 2))
+            probability = float(np.clip(rng.normal(0.35 + 0.3 * actual, 0.2), 0, 1))
+            monitor.store_production_label(
+                bse_code=f"5{i % codes:05d}",  # Later writes replace earlier labels
+                prediction_date=f"2025-10-{1 + i % 20:02d}",
+                earnings_date='2025-10-01',
+                actual_label=actual,
+                predicted_label=int(probability > 0.5),
+                predicted_probability=probability
+            )
+
+    def test_metrics_match_label_recomputation(self, temp_db, baseline_metrics):
+        """Bucket sums reproduce sklearn metrics over the stored labels (replacements included)"""
+        from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
+        from monitoring.degradation_monitor import ModelMonitor
+
+        monitor = ModelMonitor(predictions_db=temp_db, baseline_metrics=baseline_metrics, model_version="1.0.0")
+        self._store_random_labels(monitor)
+
+        labels = monitor.load_production_labels('2025-10-01', '2025-10-31')
+        y_true = [label['actual_label'] for label in labels]
+        y_pred = [label['predicted_label'] for label in labels]
+        y_proba = [label['predicted_probability'] for label in labels]
+
+        metrics = monitor.calculate_production_metrics('2025-10-01', '2025-10-31')
+
+        assert metrics['predictions'] == len(labels) == 200
+        assert metrics['f1'] == pytest.approx(f1_score(y_true, y_pred))
+        assert metrics['precision'] == pytest.approx(precision_score(y_true, y_pred))
+        assert metrics['recall'] == pytest.approx(recall_score(y_true, y_pred))
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, y_proba), abs=1e-3)
+        assert 0 <= metrics['calibration_error'] <= 1
+
+    def test_rebuild_matches_incremental(self, temp_db, baseline_metrics):
+        """Accumulators rebuilt from production_labels equal the incrementally maintained ones"""
+        from monitoring.degradation_monitor import ModelMonitor
+
+        monitor = ModelMonitor(predictions_db=temp_db, baseline_metrics=baseline_metrics, model_version="1.0.0")
+        self._store_random_labels(monitor)
+        incremental = monitor.calculate_production_metrics('2025-10-05', '2025-10-15', min_predictions=1)
+
+        monitor.rebuild_metric_buckets()
+
+        assert monitor.calculate_production_metrics('2025-10-05', '2025-10-15', min_predictions=1) == incremental
+
+    def test_legacy_database_backfilled(self, temp_db, baseline_metrics):
+        """Labels written before the bucket table existed are accumulated on open"""
+        from monitoring.degradation_monitor import ModelMonitor
+
+        monitor = ModelMonitor(predictions_db=temp_db, baseline_metrics=baseline_metrics, model_version="1.0.0")
+        self._store_random_labels(monitor, n=50, codes=50)
+        expected = monitor.calculate_production_metrics('2025-10-01', '2025-10-31', min_predictions=1)
+
+        conn = sqlite3.connect(temp_db)
+        conn.execute("DROP TABLE production_metric_buckets")
+        conn.commit()
+        conn.close()
+
+        reopened = ModelMonitor(predictions_db=temp_db, baseline_metrics=baseline_metrics, model_version="1.0.0")
+
+        assert reopened.calculate_production_metrics('2025-10-01', '2025-10-31', min_predictions=1) == expected
+
+    def test_labels_must_be_binary(self, temp_db, baseline_metrics):
+        """Labels other than 0/1 are rejected before anything is written"""
+        from monitoring.degradation_monitor import ModelMonitor
+
+        monitor = ModelMonitor(predictions_db=temp_db, baseline_metrics=baseline_metrics, model_version="1.0.0")
+
+        with pytest.raises(ValueError, match="actual_label must be 0 or 1"):
+            monitor.store_production_label('500325', '2025-10-01', '2025-10-01', 2, 1, 0.9)
+        with pytest.raises(ValueError, match="predicted_label must be 0 or 1"):
+            monitor.store_production_label('500325', '2025-10-01', '2025-10-01', 1, -1, 0.9)
+
+        assert monitor.load_production_labels('2025-10-01', '2025-10-31') == []
@@ -0,0 +1,145 @@
+"""
+Unit tests for the feature-vector cache (Story 7.4 follow-up)
+
+Tests feature_cache.py: version-stamped keys, two-layer lookup, bulk
+operations and dict/vector conversion.
+"""
+
+import unittest
+import tempfile
+import shutil
+
+import numpy as np
+
+from agents.ml.feature_store_version import (
+    bump_feature_store_version,
+    read_feature_store_version
+)
+from agents.ml.optimization.cache_manager import CacheManager
+from agents.ml.optimization.feature_cache import FeatureVectorCache
+
+
+FEATURES = {'rsi_14': 50.0, 'macd_line': 0.1, 'volume_spike': 0, 'momentum_5d': 0.05}
+
+
+class TestFeatureVectorCache(unittest.TestCase):
+    """Test feature-vector caching"""
+
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.shared = CacheManager(redis_host=None, max_memory_mb=16)
+        self.cache = FeatureVectorCache(
+            store_dirs=[self.store_dir],
+            cache_manager=self.shared,
+            version_check_interval=0.0
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_01_version_stamp_roundtrip(self):
+        """Unwritten store reads as version 0; bump changes it"""
+        self.assertEqual(read_feature_store_version(self.store_dir), "0")
+
+        version = bump_feature_store_version(self.store_dir)
+
+        self.assertEqual(read_feature_store_version(self.store_dir), version)
+
+    def test_02_vector_is_float32_and_roundtrips(self):
+        """Vectors are float32; decoding is exact and re-encoding is stable"""
+        vector = self.cache.to_vector(FEATURES)
+        decoded = self.cache.to_dict(vector)
+
+        self.assertEqual(vector.dtype, np.float32)
+        self.assertEqual(decoded, {k: float(np.float32(v)) for k, v in FEATURES.items()})
+        self.assertEqual(self.cache.to_dict(self.cache.to_vector(decoded)), decoded)
+
+    def test_03_get_after_set(self):
+        """A stored vector is served from the local layer"""
+        self.assertIsNone(self.cache.get('500325', '2025-11-14'))
+
+        self.cache.set('500325', '2025-11-14', self.cache.to_vector(FEATURES))
+        vector = self.cache.get('500325', '2025-11-14')
+
+        np.testing.assert_array_equal(vector, self.cache.to_vector(FEATURES))
+        self.assertEqual(self.cache.get_statistics()['local_hits'], 1)
+
+    def test_04_shared_layer_serves_other_instances(self):
+        """A second cache on the same CacheManager hits the shared layer"""
+        self.cache.set('500325', '2025-11-14', self.cache.to_vector(FEATURES))
+
+        other = FeatureVectorCache(store_dirs=[self.store_dir], cache_manager=self.shared)
+
+        self.assertIsNotNone(other.get('500325', '2025-11-14'))
+        self.assertEqual(other.get_statistics()['shared_hits'], 1)
+
+    def test_05_version_bump_invalidates(self):
+        """Writing new feature rows makes old entries unreachable"""
+        self.cache.set('500325', '2025-11-14', self.cache.to_vector(FEATURES))
+
+        bump_feature_store_version(self.store_dir)
+
+        self.assertIsNone(self.cache.get('500325', '2025-11-14'))
+
+    def test_06_bulk_get_and_set(self):
+        """Bulk operations return found pairs and count misses"""
+        vectors = {
+            ('500325', '2025-11-14'): self.cache.to_vector(FEATURES),
+            ('532977', '2025-11-14'): self.cache.to_vector(FEATURES)
+        }
+        self.cache.set_many(vectors)
+
+        found = self.cache.get_many(list(vectors) + [('500180', '2025-11-14')])
+
+        self.assertEqual(set(found), set(vectors))
+        self.assertEqual(self.cache.get_statistics()['misses'], 1)
+
+    def test_07_local_only_without_shared_layer(self):
+        """Without a CacheManager the cache serves from the local LRU alone"""
+        cache = FeatureVectorCache(store_dirs=[self.store_dir])
+        self.assertIsNone(cache.cache_manager)
+
+        cache.set_many({('500325', '2025-11-14'): cache.to_vector(FEATURES)})
+        found = cache.get_many([('500325', '2025-11-14'), ('532977', '2025-11-14')])
+
+        self.assertEqual(set(found), {('500325', '2025-11-14')})
+        self.assertIsNotNone(cache.get('500325', '2025-11-14'))
+        self.assertEqual(cache.get_statistics()['misses'], 1)
+
+
+class TestPredictionServiceFeatureInputs(unittest.TestCase):
+    """Model inputs must not depend on feature-cache state"""
+
+    def test_miss_and_hit_return_identical_features(self):
+        """A cold extraction and a cached one produce the same values"""
+        import asyncio
+        from pathlib import Path
+        from agents.ml.optimization.api_benchmark import build_synthetic_registry
+        from api.prediction_endpoint import PredictionService
+
+        work_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        build_synthetic_registry(str(work_dir / "registry"))
+        service = PredictionService(
+            model_registry_path=str(work_dir / "registry"),
+            feature_dbs={
+                name: str(work_dir / f"{name}.db")
+                for name in ['price', 'technical', 'financial', 'financial_features',
+                             'labels', 'sentiment', 'seasonality']
+            }
+        )
+
+        async def extract_twice():
+            return (
+                await service.extract_features('500325', '2025-11-14'),
+                await service.extract_features('500325', '2025-11-14')
+            )
+
+        miss, hit = asyncio.run(extract_twice())
+
+        self.assertEqual(miss, hit)
+        self.assertEqual(service.feature_cache.get_statistics()['local_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
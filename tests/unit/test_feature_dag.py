@@ -0,0 +1,152 @@
+"""
+Tests for DAG-scheduled feature engineering
+
+Covers feature_dag.py (stage ordering, process execution, failures) and
+price_panel.py (shared price windows match the per-sample queries).
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.ml.feature_dag import FeatureStage, run_feature_dag
+from agents.ml.price_panel import PricePanel
+
+
+# Stage functions must be module-level so worker processes can unpickle them
+
+def load_base(value):
+    return value
+
+
+def add(amount, base):
+    return base + amount
+
+
+def combine(left, right):
+    return left * right
+
+
+def explode():
+    raise RuntimeError("stage failed")
+
+
+def diamond_stages():
+    return [
+        FeatureStage(name='base', func=load_base, args=(2,), in_process=True),
+        FeatureStage(name='left', func=add, args=(1,), depends_on=('base',)),
+        FeatureStage(name='right', func=add, args=(3,), depends_on=('base',)),
+        FeatureStage(name='product', func=combine, depends_on=('left', 'right'))
+    ]
+
+
+class TestFeatureDAG:
+    """Test run_feature_dag scheduling"""
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_dependencies_feed_outputs(self, max_workers):
+        """Dependency outputs arrive as keyword arguments, in order"""
+        result = run_feature_dag(diamond_stages(), max_workers=max_workers)
+
+        assert result.outputs == {'base': 2, 'left': 3, 'right': 5, 'product': 15}
+        assert set(result.stage_timings) == {'base', 'left', 'right', 'product'}
+        assert all(seconds >= 0 for seconds in result.stage_timings.values())
+
+    def test_stage_failure_propagates(self):
+        """A failing worker stage raises from run_feature_dag"""
+        stages = [FeatureStage(name='ok', func=load_base, args=(1,)), FeatureStage(name='bad', func=explode)]
+
+        with pytest.raises(RuntimeError, match="stage failed"):
+            run_feature_dag(stages, max_workers=2)
+
+    def test_invalid_graphs_rejected(self):
+        """Unknown dependencies and cycles are reported before running anything"""
+        with pytest.raises(ValueError, match="unknown"):
+            run_feature_dag([FeatureStage(name='a', func=load_base, args=(1,), depends_on=('missing',))])
+
+        cycle = [
+            FeatureStage(name='a', func=add, args=(1,), depends_on=('b',)),
+            FeatureStage(name='b', func=add, args=(1,), depends_on=('a',))
+        ]
+        with pytest.raises(ValueError, match="cycle"):
+            run_feature_dag(cycle)
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """price_movements with 90 days for two companies"""
+    db_path = tmp_path / "price_movements.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE price_movements (
+            bse_code TEXT, date DATE, open REAL, high REAL, low REAL, close REAL, volume INTEGER
+        )
+    """)
+    base_date = datetime(2024, 1, 1)
+    for bse_code, drift in [('500325', 0.5), ('500209', -0.3)]:
+        for i in range(90):
+            close = 100 + i * drift + (i % 7)
+            conn.execute(
+                "INSERT INTO price_movements VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bse_code, (base_date + timedelta(days=i)).strftime("%Y-%m-%d"),
+                 close - 1, close + 2, close - 2, close, 1000000 + (i % 5) * 250000)
+            )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+class TestPricePanel:
+    """Test shared price windows"""
+
+    SAMPLES = [
+        {'bse_code': '500325', 'date': '2024-03-01'},
+        {'bse_code': '500325', 'date': '2024-03-10'},
+        {'bse_code': '500209', 'date': '2024-03-05'},
+        {'bse_code': '999999', 'date': '2024-03-05'}
+    ]
+
+    def test_window_matches_between_query(self, price_db):
+        """Windows equal the SQL BETWEEN result; uncovered ranges are reported"""
+        panel = PricePanel.load(price_db, self.SAMPLES)
+
+        window = panel.window('500325', '2024-01-15', '2024-02-10', columns=['date', 'close'])
+
+        assert window['date'].iloc[0] == '2024-01-15'
+        assert window['date'].iloc[-1] == '2024-02-10'
+        assert len(window) == 27
+        assert panel.window('999999', '2024-01-05', '2024-03-15').empty
+        assert not panel.covers('500325', '2023-01-01', '2024-03-01')
+
+    def test_extractors_identical_with_panel(self, price_db, tmp_path):
+        """Technical and sentiment features are unchanged when served from the panel"""
+        from agents.ml.technical_feature_extractor import TechnicalFeatureExtractor
+        from agents.ml.sentiment_feature_extractor import SentimentFeatureExtractor
+
+        technical = TechnicalFeatureExtractor(price_db, str(tmp_path / "technical.db"))
+        sentiment = SentimentFeatureExtractor(price_db, str(tmp_path / "labels.db"), str(tmp_path / "sentiment.db"))
+
+        def extract_all():
+            return [
+                (asdict(technical.extract_features_for_sample(s['bse_code'], s['date'])),
+                 asdict(sentiment.extract_features_for_sample(s['bse_code'], s['date'])))
+                for s in self.SAMPLES
+            ]
+
+        expected = extract_all()
+
+        panel = PricePanel.load(price_db, self.SAMPLES)
+        technical.price_panel = panel
+        sentiment.price_panel = panel
+        actual = extract_all()
+
+        for (tech_a, sent_a), (tech_b, sent_b) in zip(expected, actual):
+            for features in (tech_a, sent_a, tech_b, sent_b):
+                features.pop('created_at')
+            assert tech_a == tech_b
+            assert sent_a == sent_b
@@ -0,0 +1,142 @@
+"""
+Unit tests for the query-plan index advisor (Story 7.3 follow-up)
+
+Tests cover:
+- SQL tracing hook on pooled connections
+- Composite/covering recommendations from EXPLAIN QUERY PLAN
+- Index application with before/after timing report
+- WITHOUT ROWID rebuild keyed on (bse_code, date)
+- CLI over a saved trace
+"""
+
+import sqlite3
+
+import pytest
+
+from agents.ml.optimization.index_advisor import IndexAdvisor, advise, main
+from tools.db_utils import QueryTrace, close_pooled_connections, pooled_connection
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """price_movements (UNIQUE key only) and an unindexed upper_circuit_labels"""
+    path = str(tmp_path / "advisor.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE price_movements (
+            price_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bse_code TEXT,
+            date DATE NOT NULL,
+            close REAL NOT NULL,
+            volume INTEGER,
+            UNIQUE(bse_code, date) ON CONFLICT REPLACE
+        )
+    """)
+    conn.execute("CREATE TABLE upper_circuit_labels (bse_code TEXT, earnings_date DATE, label INTEGER)")
+    conn.executemany(
+        "INSERT INTO price_movements (bse_code, date, close, volume) VALUES (?, ?, ?, ?)",
+        [(str(500000 + i), f"2024-{m:02d}-{d:02d}", 100.0 + d, 1000) for i in range(20) for m in (1, 2, 3) for d in range(1, 29)]
+    )
+    conn.executemany(
+        "INSERT INTO upper_circuit_labels VALUES (?, ?, ?)",
+        [(str(500000 + i), f"2024-{m:02d}-15", m % 2) for i in range(20) for m in range(1, 13)]
+    )
+    conn.commit()
+    conn.close()
+    yield path
+    close_pooled_connections()
+
+
+def run_workload(db_path, calls=3):
+    for i in range(calls):
+        with pooled_connection(db_path, read_only=True) as conn:
+            conn.execute(
+                "SELECT label FROM upper_circuit_labels WHERE bse_code = ? AND earnings_date < ? ORDER BY earnings_date",
+                (str(500000 + i), '2024-06-01')
+            ).fetchall()
+            conn.execute(
+                "SELECT date, close FROM price_movements WHERE bse_code = ? AND date BETWEEN ? AND ?",
+                (str(500000 + i), '2024-01-10', '2024-02-10')
+            ).fetchall()
+
+
+class TestQueryTrace:
+    """Test SQL capture through the connection layer"""
+
+    def test_trace_groups_statements_by_shape(self, db_path):
+        """Calls differing only in literals are counted as one statement"""
+        with QueryTrace() as trace:
+            run_workload(db_path, calls=3)
+        run_workload(db_path, calls=1)  # after stop(): not recorded
+
+        queries = trace.queries[db_path]
+        assert len(queries) == 2
+        assert all(info['count'] == 3 for info in queries.values())
+        assert any("bse_code = ?" in sql for sql in queries)
+        assert all('?' not in info['example'] for info in queries.values())
+
+
+class TestIndexAdvisor:
+    """Test recommendations, migration and reporting"""
+
+    def test_recommends_index_for_full_scan(self, db_path):
+        """Unindexed label lookup gets a composite index: equality, then range"""
+        advisor = IndexAdvisor(db_path)
+        sql = "SELECT label FROM upper_circuit_labels WHERE bse_code = '500001' AND earnings_date < '2024-06-01' ORDER BY earnings_date"
+
+        recommendation = advisor.recommend_for_query(sql, advisor.explain(sql))
+
+        assert recommendation.columns[:2] == ['bse_code', 'earnings_date']
+        assert recommendation.covering and recommendation.columns[-1] == 'label'
+        assert 'full scan' in recommendation.reason
+
+    def test_no_recommendation_when_index_serves_query(self, db_path):
+        """Cold query fully served by the UNIQUE(bse_code, date) index is left alone"""
+        advisor = IndexAdvisor(db_path)
+        sql = "SELECT * FROM price_movements WHERE bse_code = '500001' AND date BETWEEN '2024-01-01' AND '2024-01-31'"
+
+        assert advisor.recommend_for_query(sql, advisor.explain(sql), calls=1) is None
+
+    def test_apply_reports_before_and_after(self, db_path):
+        """Applied indexes change the plan from SCAN to SEARCH in the report"""
+        with QueryTrace() as trace:
+            run_workload(db_path)
+
+        report = advise(trace, apply=True, repeats=1)[0]
+
+        labels = next(t for t in report.timings if 'upper_circuit_labels' in t.query)
+        assert any(step.startswith('SCAN') for step in labels.plan_before)
+        assert any(step.startswith('SEARCH') for step in labels.plan_after)
+        assert labels.ms_after is not None
+        assert report.applied
+        assert '| Query | Calls |' in report.to_markdown()
+
+    def test_without_rowid_rebuild(self, db_path):
+        """Rebuild keeps rows and ON CONFLICT REPLACE upsert behaviour"""
+        advisor = IndexAdvisor(db_path)
+        rows = advisor.migrate_without_rowid('price_movements')
+
+        with pooled_connection(db_path) as conn:
+            create_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'price_movements'").fetchone()[0]
+            conn.execute("INSERT INTO price_movements (bse_code, date, close, volume) VALUES ('500000', '2024-01-01', 1.0, 5)")
+            after = conn.execute("SELECT COUNT(*) FROM price_movements").fetchone()[0]
+            close = conn.execute(
+                "SELECT close FROM price_movements WHERE bse_code = '500000' AND date = '2024-01-01'"
+            ).fetchone()[0]
+
+        assert rows == 20 * 3 * 28
+        assert 'WITHOUT ROWID' in create_sql
+        assert after == rows
+        assert close == 1.0
+        assert advisor.migrate_without_rowid('price_movements') == 0
+
+    def test_cli_writes_report(self, db_path, tmp_path):
+        """CLI reads a saved trace and writes the markdown report"""
+        with QueryTrace() as trace:
+            run_workload(db_path)
+        trace_file = tmp_path / "trace.json"
+        trace.save(str(trace_file))
+        report_file = tmp_path / "report.md"
+
+        assert main([str(trace_file), '--repeats', '1', '--report', str(report_file)]) == 0
+        assert 'upper_circuit_labels' in report_file.read_text()
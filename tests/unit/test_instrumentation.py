@@ -0,0 +1,131 @@
+"""
+Unit tests for hot-path stage instrumentation (Story 5.1 follow-up)
+
+Tests cover:
+- Stage histograms/counters labelled by stage and model version
+- Decorator and context-manager forms, error outcomes
+- Runtime disable switch (no samples recorded)
+- Export through get_metrics_text() and wiring into hot-path classes
+"""
+
+import pytest
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from monitoring import get_metrics_text
+from monitoring.instrumentation import (
+    NO_MODEL,
+    STAGE_CACHE_GET,
+    STAGE_MODEL_PREDICT,
+    STAGE_SQLITE_QUERY,
+    StageInstrumentation,
+    set_instrumentation_enabled,
+    track_stage
+)
+
+
+@pytest.fixture
+def instrumentation():
+    """Instrumentation on a fresh registry"""
+    return StageInstrumentation(registry=CollectorRegistry(), enabled=True)
+
+
+def count(registry, stage, model_version=NO_MODEL, outcome='ok'):
+    return registry.get_sample_value(
+        'pipeline_stage_calls_total',
+        {'stage': stage, 'model_version': model_version, 'outcome': outcome}
+    ) or 0.0
+
+
+def observations(registry, stage, model_version=NO_MODEL):
+    return registry.get_sample_value(
+        'pipeline_stage_duration_seconds_count',
+        {'stage': stage, 'model_version': model_version}
+    ) or 0.0
+
+
+class TestStageInstrumentation:
+    """Test histogram and counter recording"""
+
+    def test_track_records_latency_by_stage_and_version(self, instrumentation):
+        """Context manager observes one duration per execution"""
+        for _ in range(3):
+            with instrumentation.track(STAGE_MODEL_PREDICT, model_version="1.2.0"):
+                pass
+
+        registry = instrumentation.registry
+        assert observations(registry, STAGE_MODEL_PREDICT, "1.2.0") == 3
+        assert count(registry, STAGE_MODEL_PREDICT, "1.2.0") == 3
+        assert observations(registry, STAGE_MODEL_PREDICT) == 0
+
+    def test_decorator_counts_errors(self, instrumentation):
+        """Raising calls are timed and counted under outcome=error"""
+        @instrumentation.instrument("feature_load.test")
+        def load(fail):
+            if fail:
+                raise ValueError("boom")
+            return 42
+
+        assert load(False) == 42
+        with pytest.raises(ValueError):
+            load(True)
+
+        registry = instrumentation.registry
+        assert count(registry, "feature_load.test") == 1
+        assert count(registry, "feature_load.test", outcome='error') == 1
+        assert observations(registry, "feature_load.test") == 2
+
+    def test_disabled_records_nothing(self, instrumentation):
+        """With the switch off, blocks and decorated calls run unrecorded"""
+        instrumentation.enabled = False
+
+        @instrumentation.instrument(STAGE_CACHE_GET)
+        def get():
+            return 'value'
+
+        with instrumentation.track(STAGE_MODEL_PREDICT):
+            pass
+
+        assert get() == 'value'
+        assert observations(instrumentation.registry, STAGE_MODEL_PREDICT) == 0
+        assert observations(instrumentation.registry, STAGE_CACHE_GET) == 0
+
+
+class TestGlobalInstrumentation:
+    """Test the process-wide instance and hot-path wiring"""
+
+    def test_stages_exported_by_get_metrics_text(self):
+        """Global stage metrics appear in the Prometheus exposition"""
+        with track_stage("export_test", model_version="9.9.9"):
+            pass
+
+        text = get_metrics_text().decode()
+        assert 'pipeline_stage_duration_seconds_count{model_version="9.9.9",stage="export_test"} 1.0' in text
+
+    def test_runtime_switch(self):
+        """set_instrumentation_enabled(False) turns track_stage into a no-op"""
+        before = observations(REGISTRY, "switch_test")
+        set_instrumentation_enabled(False)
+        try:
+            with track_stage("switch_test"):
+                pass
+        finally:
+            set_instrumentation_enabled(True)
+
+        assert observations(REGISTRY, "switch_test") == before
+
+    def test_db_and_cache_stages_recorded(self, tmp_path):
+        """DatabaseOptimizer queries and CacheManager get/set emit stage timings"""
+        from agents.ml.optimization.cache_manager import CacheManager
+        from agents.ml.optimization.db_optimizer import DatabaseOptimizer
+
+        queries = observations(REGISTRY, STAGE_SQLITE_QUERY)
+        gets = observations(REGISTRY, STAGE_CACHE_GET)
+
+        optimizer = DatabaseOptimizer(str(tmp_path / "test.db"), pool_size=1)
+        optimizer.execute_query("SELECT 1 AS one")
+        cache = CacheManager(redis_host=None)
+        cache.set('k', 'v')
+        cache.get('k')
+
+        assert observations(REGISTRY, STAGE_SQLITE_QUERY) == queries + 1
+        assert observations(REGISTRY, STAGE_CACHE_GET) == gets + 1
@@ -0,0 +1,103 @@
+"""
+Tests for async micro-batching of model inference
+
+Author: VCP Financial Research Team
+Created: 2025-11-14
+"""
+
+import asyncio
+import pytest
+
+from api.micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Predict function that records batch sizes and returns row[0] as probability"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, rows):
+        self.calls.append(len(rows))
+        return [row[0] for row in rows]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestMicroBatcher:
+    """Test MicroBatcher coalescing and fan-out"""
+
+    def test_concurrent_requests_share_one_call(self):
+        """Concurrent submits within the wait window are scored together"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=32, max_wait_ms=5.0)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit([i / 10]) for i in range(8)))
+
+        results = run(scenario())
+
+        assert results == [i / 10 for i in range(8)]
+        assert model.calls == [8]
+        assert batcher.avg_batch_size == 8.0
+
+    def test_batch_size_bound(self):
+        """No predict call exceeds max_batch_size rows"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=5.0)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit([float(i)]) for i in range(10)))
+
+        results = run(scenario())
+
+        assert results == [float(i) for i in range(10)]
+        assert max(model.calls) <= 4
+        assert sum(model.calls) == 10
+
+    def test_single_request_flushes_after_wait(self):
+        """A lone request is scored once the wait window elapses"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=32, max_wait_ms=1.0)
+
+        assert run(batcher.submit([0.42])) == 0.42
+        assert model.calls == [1]
+
+    def test_predict_error_propagates_to_all_callers(self):
+        """A failing predict call raises in every caller of the batch"""
+        def failing(rows):
+            raise RuntimeError("model exploded")
+
+        batcher = MicroBatcher(failing, max_batch_size=32, max_wait_ms=1.0)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(batcher.submit([1.0]) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        results = run(scenario())
+
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_result_count_mismatch_raises(self):
+        """Predict returning the wrong number of rows fails instead of hanging"""
+        batcher = MicroBatcher(lambda rows: [0.5], max_batch_size=32, max_wait_ms=1.0)
+
+        async def scenario():
+            return await asyncio.gather(
+                batcher.submit([1.0]), batcher.submit([2.0]),
+                return_exceptions=True
+            )
+
+        assert all(isinstance(r, ValueError) for r in run(scenario()))
+
+    def test_invalid_config(self):
+        """Batch size and wait time are validated"""
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingModel(), max_batch_size=0)
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingModel(), max_wait_ms=-1)
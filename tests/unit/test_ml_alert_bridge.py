@@ -0,0 +1,288 @@
+"""
+Tests for ML Alert Bridge concurrency
+
+Covers batch scoring through /api/v1/batch_predict, fallback to pooled
+single calls, and concurrent rate-limited alert dispatch. The fake API
+validates requests against the real PredictionRequest schema, and one test
+runs against api.main:app itself.
+
+Author: VCP ML System
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from agents.ml_alert_bridge import FALLBACK_PROBABILITY, MLAlertBridge, AlertPriority
+from api.prediction_endpoint import BatchPredictionRequest, PredictionRequest, PredictionResponse
+from src.utils.symbol_master import SymbolMaster
+
+
+API_URL = "http://ml-api.test"
+
+
+class FakeMLAPI:
+    """
+    Async httpx handler enforcing the API schemas; probability comes from the
+    last two digits of the BSE code
+    """
+
+    def __init__(self, batch_status=200, latency=0.0, failing_codes=(), batch_body=None):
+        self.batch_status = batch_status
+        self.latency = latency
+        self.failing_codes = set(failing_codes)  # Scored as batch placeholders / single 404s
+        self.batch_body = batch_body  # Raw batch response body overriding the JSON
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def prediction(self, request: PredictionRequest):
+        failed = request.bse_code in self.failing_codes
+        return PredictionResponse(
+            bse_code=request.bse_code,
+            nse_symbol=request.nse_symbol or "UNKNOWN",
+            prediction_date=request.prediction_date,
+            predicted_label=0 if failed else 1,
+            probability=0.0 if failed else int(request.bse_code[-2:]) / 100,
+            confidence="LOW",
+            model_version="test",
+            prediction_timestamp=datetime.now().isoformat()
+        ).model_dump()
+
+    async def __call__(self, request):
+        self.paths.append(request.url.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            body = json.loads(request.content)
+            try:
+                if request.url.path.endswith("batch_predict"):
+                    if self.batch_status != 200:
+                        return httpx.Response(self.batch_status)
+                    if self.batch_body is not None:
+                        return httpx.Response(200, content=self.batch_body)
+                    batch = BatchPredictionRequest.model_validate(body)
+                    return httpx.Response(200, json=[self.prediction(p) for p in batch.predictions])
+                single = PredictionRequest.model_validate(body)
+                if single.bse_code in self.failing_codes:
+                    return httpx.Response(404, json={"detail": "No features"})
+                return httpx.Response(200, json=self.prediction(single))
+            except ValidationError as e:
+                return httpx.Response(422, json={"detail": e.errors(include_url=False, include_context=False)})
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def vcp_db(tmp_path):
+    """VCP database with 50 fresh detections (probabilities 0.00-0.49 + 0.50-0.99)"""
+    db_path = tmp_path / "vcp.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE blockbuster_detections (
+            symbol TEXT, detection_time TEXT, pattern_type TEXT, score REAL, price REAL, volume INTEGER
+        )
+    """)
+    now = datetime.now().isoformat()
+    for i in range(50):
+        conn.execute(
+            "INSERT INTO blockbuster_detections VALUES (?, ?, 'vcp', 0.8, 100.0, 1000)",
+            (f"SYM{i * 2:02d}", now)
+        )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+@pytest.fixture
+def symbol_master(tmp_path):
+    """SYMnn resolves to BSE code 5000nn"""
+    db_path = tmp_path / "mapping.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE bse_nse_mapping (bse_code TEXT, nse_symbol TEXT, company_name TEXT, isin TEXT)")
+    conn.executemany(
+        "INSERT INTO bse_nse_mapping VALUES (?, ?, NULL, NULL)",
+        [(f"5000{i:02d}", f"SYM{i:02d}") for i in range(100)]
+    )
+    conn.commit()
+    conn.close()
+    return SymbolMaster(str(db_path))
+
+
+def make_bridge(vcp_db, api, symbol_master, **kwargs):
+    # Loose channel limits unless a test is about throttling
+    kwargs.setdefault('channel_rate_limits', {'telegram': 1000.0, 'gmail': 1000.0})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return MLAlertBridge(
+        vcp_db_path=vcp_db, ml_api_url=API_URL, client=client, symbol_master=symbol_master, **kwargs
+    )
+
+
+class TestMLAlertBridgeConcurrency:
+    """Test batch scoring and concurrent dispatch"""
+
+    def test_burst_scored_with_one_batch_call(self, vcp_db, symbol_master):
+        """50 detections cost one batch request and keep input order"""
+        api = FakeMLAPI()
+        bridge = make_bridge(vcp_db, api, symbol_master)
+
+        alerts = asyncio.run(bridge.process_detections())
+
+        assert api.paths == ["/api/v1/batch_predict"]
+        # Probabilities 0.16..0.98 pass the 0.15 threshold
+        assert [a.symbol for a in alerts] == [f"SYM{i:02d}" for i in range(16, 100, 2)]
+        assert alerts[-1].priority == AlertPriority.CRITICAL
+
+    def test_batch_failure_falls_back_to_bounded_single_calls(self, vcp_db, symbol_master):
+        """Single calls run concurrently but never exceed max_concurrency"""
+        api = FakeMLAPI(batch_status=404, latency=0.05)
+        bridge = make_bridge(vcp_db, api, symbol_master, max_concurrency=10)
+
+        start = time.perf_counter()
+        alerts = asyncio.run(bridge.process_detections())
+        elapsed = time.perf_counter() - start
+
+        assert api.paths.count("/api/v1/predict") == 50
+        assert api.max_in_flight == 10
+        assert len(alerts) == 42
+        # 5 waves of 10 instead of 50 sequential round trips
+        assert elapsed < 50 * 0.05 / 2
+
+    def test_dispatch_is_concurrent_and_rate_limited(self, vcp_db, symbol_master):
+        """Channels send in parallel; each respects its own rate limit"""
+        api = FakeMLAPI()
+        bridge = make_bridge(vcp_db, api, symbol_master)
+
+        async def slow_send(alert):
+            await asyncio.sleep(0.05)
+            return True
+
+        bridge.send_telegram_alert = slow_send
+        bridge.send_gmail_alert = slow_send
+
+        start = time.perf_counter()
+        alerts = asyncio.run(bridge.process_detections())
+        elapsed = time.perf_counter() - start
+
+        assert len(alerts) == 42
+        assert elapsed < 42 * 0.05 / 2
+        assert bridge.channel_limiters['telegram'].get_stats()['total_requests'] == 42
+        # Only CRITICAL/HIGH (probability >= 0.5) alerts go to Gmail
+        assert bridge.channel_limiters['gmail'].get_stats()['total_requests'] == 25
+
+    def test_channel_rate_limit_throttles_sends(self, vcp_db, symbol_master):
+        """Sends beyond a channel's burst wait for tokens"""
+        api = FakeMLAPI()
+        bridge = make_bridge(vcp_db, api, symbol_master, channel_rate_limits={'telegram': 20.0, 'gmail': 1000.0})
+
+        start = time.perf_counter()
+        asyncio.run(bridge.process_detections())
+        elapsed = time.perf_counter() - start
+
+        # Burst of 20, then 22 more sends at 20/s
+        assert elapsed >= 1.0
+        assert bridge.channel_limiters['telegram'].get_stats()['total_requests'] == 42
+
+    def test_failed_send_does_not_stop_other_alerts(self, vcp_db, symbol_master):
+        """A raising channel counts as a failed send for that alert only"""
+        api = FakeMLAPI()
+        bridge = make_bridge(vcp_db, api, symbol_master)
+
+        async def flaky_send(alert):
+            if alert.symbol == "SYM98":
+                raise RuntimeError("telegram down")
+            return True
+
+        bridge.send_telegram_alert = flaky_send
+        alerts = asyncio.run(bridge.process_detections())
+
+        sent = asyncio.run(bridge.dispatch_alerts(alerts))
+
+        assert sent['telegram'] == len(alerts) - 1
+
+
+    @pytest.mark.parametrize("batch_status", [200, 404])
+    def test_unscored_symbol_gets_same_default_on_both_paths(self, vcp_db, symbol_master, batch_status):
+        """A batch placeholder and a failed single call both fall back to the default probability"""
+        api = FakeMLAPI(batch_status=batch_status, failing_codes={"500098"})
+        bridge = make_bridge(vcp_db, api, symbol_master)
+
+        alerts = asyncio.run(bridge.process_detections())
+
+        fallback = [a for a in alerts if a.symbol == "SYM98"]
+        assert len(fallback) == 1
+        assert fallback[0].ml_probability == FALLBACK_PROBABILITY
+        assert fallback[0].priority == AlertPriority.LOW
+        assert fallback[0].model_version == "unknown"
+
+    def test_malformed_batch_body_falls_back_to_single_calls(self, vcp_db, symbol_master):
+        """A 200 batch response that is not JSON is retried as single calls"""
+        api = FakeMLAPI(batch_body=b"<html>proxy error</html>")
+        bridge = make_bridge(vcp_db, api, symbol_master)
+
+        alerts = asyncio.run(bridge.process_detections())
+
+        assert api.paths.count("/api/v1/predict") == 50
+        assert len(alerts) == 42
+
+class TestMLAlertBridgeSchema:
+    """Requests and responses follow the prediction API schemas"""
+
+    def test_alert_carries_predicted_label(self, vcp_db, symbol_master):
+        """predicted_label from PredictionResponse becomes ml_prediction"""
+        bridge = make_bridge(vcp_db, FakeMLAPI(), symbol_master)
+
+        alerts = asyncio.run(bridge.process_detections())
+
+        assert all(a.ml_prediction == 1 for a in alerts)
+        assert alerts[-1].model_version == "test"
+
+    def test_unmapped_symbols_are_not_sent(self, vcp_db, symbol_master):
+        """Symbols without a BSE code get no prediction and do not break the batch"""
+        conn = sqlite3.connect(vcp_db)
+        conn.execute(
+            "INSERT INTO blockbuster_detections VALUES ('NOCODE', ?, 'vcp', 0.8, 100.0, 1000)",
+            (datetime.now().isoformat(),)
+        )
+        conn.commit()
+        conn.close()
+
+        api = FakeMLAPI()
+        bridge = make_bridge(vcp_db, api, symbol_master)
+        detections = asyncio.run(bridge.get_recent_vcp_detections())
+        results = asyncio.run(bridge.get_ml_predictions(detections))
+
+        assert api.paths == ["/api/v1/batch_predict"]
+        assert [d.symbol for d, r in zip(detections, results) if r is None] == ["NOCODE"]
+
+    def test_batch_accepted_by_real_api(self, vcp_db, symbol_master, tmp_path):
+        """api.main:app scores the bridge's batch without falling back"""
+        import api.main as api_main
+        from agents.ml.optimization.api_benchmark import APIBenchmark
+
+        APIBenchmark(work_dir=str(tmp_path / "bench")).setup_service()
+        try:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api_main.app), base_url=API_URL)
+            bridge = MLAlertBridge(
+                vcp_db_path=vcp_db, ml_api_url=API_URL, client=client, symbol_master=symbol_master
+            )
+
+            async def no_fallback(payload):
+                raise AssertionError("batch request was rejected")
+
+            bridge._post_single = no_fallback
+            detections = asyncio.run(bridge.get_recent_vcp_detections())
+            results = asyncio.run(bridge.get_ml_predictions(detections))
+        finally:
+            api_main.reset_service()
+
+        assert len(results) == 50
+        assert [r['bse_code'] for r in results] == [f"5000{i * 2:02d}" for i in range(50)]
+        assert all(0.0 <= r['probability'] <= 1.0 and r['predicted_label'] in (0, 1) for r in results)
@@ -0,0 +1,194 @@
+"""
+Unit tests for the Monte Carlo path-risk engine
+
+Tests cover:
+- Vectorized run detection, underwater periods and recovery stats
+  against reference loops
+- Bootstrap and block-bootstrap path distributions
+- Memory-bounded chunking and seeding
+- Confidence-interval driven go/no-go decision
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.backtesting.tools.models import BacktestResult, ExecutiveSummary, Trade
+from agents.backtesting.tools.monte_carlo import MonteCarloEngine
+from agents.backtesting.tools.risk_tools import RiskMetricsCalculator, longest_true_run, true_runs
+
+
+def reference_runs(mask):
+    runs, start = [], None
+    for i, value in enumerate(mask):
+        if value and start is None:
+            start = i
+        elif not value and start is not None:
+            runs.append((start, i))
+            start = None
+    if start is not None:
+        runs.append((start, len(mask)))
+    return runs
+
+
+def make_result(pnls, initial_capital=100000.0):
+    dates = pd.bdate_range('2020-01-01', periods=len(pnls) + 1)
+    trades = [
+        Trade(symbol='TEST', entry_date=dates[i].to_pydatetime(), entry_price=100.0,
+              exit_date=dates[i + 1].to_pydatetime(), exit_price=100.0, pnl=pnl, pnl_pct=1.0)
+        for i, pnl in enumerate(pnls)
+    ]
+    return BacktestResult(
+        strategy_name='Test', symbol='TEST',
+        start_date=datetime(2020, 1, 1), end_date=datetime(2022, 1, 1),
+        initial_capital=initial_capital, final_capital=initial_capital + sum(pnls),
+        trades=trades
+    )
+
+
+class TestVectorizedUnderwater:
+    """Test run detection and the helpers built on it"""
+
+    def test_runs_match_reference_loop(self):
+        """Starts/ends and longest run agree with a plain loop, 1-D and 2-D"""
+        rng = np.random.default_rng(1)
+        masks = rng.random((20, 60)) < 0.6
+        masks[0] = True
+        masks[1] = False
+
+        for mask in masks:
+            starts, ends = true_runs(mask)
+            expected = reference_runs(mask)
+            assert list(zip(starts, ends)) == expected
+            assert longest_true_run(mask) == max((e - s for s, e in expected), default=0)
+
+        assert longest_true_run(masks).tolist() == [longest_true_run(m) for m in masks]
+
+    def test_underwater_and_recovery_stats(self):
+        """Periods and recoveries from a hand-built equity curve"""
+        equity = [100, 110, 105, 100, 112, 112, 100, 99, 111, 120, 115]
+        curve = pd.DataFrame({'equity': equity}, index=pd.date_range('2024-01-01', periods=len(equity)))
+        calc = RiskMetricsCalculator()
+
+        periods = calc.analyze_underwater_periods(curve)
+        drawdown = (curve['equity'] / curve['equity'].cummax() - 1) * 100
+
+        assert [(p['start_date'], p['end_date'], p['duration_days']) for p in periods] == [
+            (curve.index[2], curve.index[3], 2),
+            (curve.index[6], curve.index[8], 3),
+            (curve.index[10], curve.index[10], 1),
+        ]
+        assert periods[1]['max_drawdown_pct'] == pytest.approx(drawdown.iloc[7])
+        assert periods[1]['avg_drawdown_pct'] == pytest.approx(drawdown.iloc[6:9].mean())
+
+        stats = calc.calculate_recovery_stats(curve)
+        assert stats['num_recoveries'] == 2  # last dip has not recovered
+        assert stats['max_recovery_days'] == 3
+        assert calc._calculate_max_drawdown_duration(drawdown) == 3
+
+
+class TestMonteCarloEngine:
+    """Test path simulation and distributions"""
+
+    def test_trade_returns_are_relative_to_equity(self):
+        """Each return divides P&L by equity before the trade"""
+        returns = MonteCarloEngine.trade_returns(make_result([10000, -11000]))
+        assert returns == pytest.approx([0.1, -0.1])
+
+    def test_constant_returns_are_deterministic(self):
+        """Identical trades give one path: no drawdown, exact CAGR"""
+        result = make_result([1000.0 * 1.01 ** i for i in range(20)])  # +1% of equity each
+        analysis = MonteCarloEngine(n_paths=500, seed=0).simulate(result)
+
+        years = (result.end_date - result.start_date).days / 365.25
+        assert np.allclose(analysis.max_drawdown_pct, 0)
+        assert analysis.ruin_probability == 0
+        assert np.allclose(analysis.final_equity_multiple, 1.01 ** 20)
+        assert np.allclose(analysis.cagr_pct, (1.01 ** (20 / years) - 1) * 100)
+
+    def test_distributions_and_ruin(self):
+        """Max drawdown is consistent with the paths; big losers cause ruin"""
+        returns = np.array([0.05] * 30 + [-0.2] * 10)
+        engine = MonteCarloEngine(n_paths=2000, ruin_threshold_pct=50, seed=3)
+        analysis = engine.simulate_returns(returns, years=2.0)
+
+        assert analysis.max_drawdown_pct.shape == (2000,)
+        assert (analysis.max_drawdown_pct >= 20 - 1e-9).all()
+        assert (analysis.longest_underwater_trades >= 1).all()
+        assert 0 < analysis.ruin_probability < 1
+        low, high = analysis.confidence_interval('max_drawdown_pct')
+        assert low <= np.median(analysis.max_drawdown_pct) <= high
+        assert analysis.summary()['n_paths'] == 2000
+
+    def test_block_bootstrap_keeps_streaks(self):
+        """Blocks preserve loss clustering, so drawdowns are deeper than i.i.d."""
+        returns = np.tile([0.03] * 10 + [-0.03] * 10, 5)
+        iid = MonteCarloEngine(n_paths=3000, seed=1).simulate_returns(returns, 1.0)
+        block = MonteCarloEngine(n_paths=3000, method='block', block_size=10, seed=1).simulate_returns(returns, 1.0)
+
+        assert block.block_size == 10
+        assert np.median(block.max_drawdown_pct) > np.median(iid.max_drawdown_pct)
+
+    def test_chunking_is_invisible_and_seeded(self):
+        """Tiny chunks give valid paths; same seed gives same distribution"""
+        returns = np.random.default_rng(0).normal(0.005, 0.03, 50)
+        small = MonteCarloEngine(n_paths=1000, max_chunk_bytes=8 * 4 * 50 * 7, seed=9).simulate_returns(returns, 1.0)
+        again = MonteCarloEngine(n_paths=1000, max_chunk_bytes=8 * 4 * 50 * 7, seed=9).simulate_returns(returns, 1.0)
+        whole = MonteCarloEngine(n_paths=1000, seed=9).simulate_returns(returns, 1.0)
+
+        assert np.array_equal(small.max_drawdown_pct, again.max_drawdown_pct)
+        assert small.max_drawdown_pct.shape == whole.max_drawdown_pct.shape
+        assert np.median(small.final_equity_multiple) == pytest.approx(
+            np.median(whole.final_equity_multiple), rel=0.05
+        )
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            MonteCarloEngine(method='garch')
+        assert MonteCarloEngine().simulate_returns([], 1.0).n_paths == 0
+
+
+class TestConfidenceDecision:
+    """Test the executive summary using Monte Carlo intervals"""
+
+    def summary(self, **kwargs):
+        return ExecutiveSummary(
+            strategy_name='Test', analyzed_date=datetime(2024, 1, 1),
+            performance_status='green', risk_status='green',
+            robustness_status='green', complexity_status='green', **kwargs
+        )
+
+    def test_point_estimates_only(self):
+        summary = self.summary()
+        summary.determine_decision()
+        assert summary.decision == 'GO'
+
+    def test_wide_intervals_demote_decision(self):
+        """Pessimistic drawdown and a CAGR interval spanning zero cost the GO"""
+        summary = self.summary(max_drawdown_ci_pct=(8.0, 22.0), cagr_ci_pct=(-3.0, 25.0))
+        summary.determine_decision()
+
+        assert summary.risk_status == 'yellow'
+        assert summary.performance_status == 'yellow'
+        assert summary.decision == 'PROCEED WITH CAUTION'
+
+    def test_ruin_or_deep_drawdown_is_no_go(self):
+        ruin = self.summary(ruin_probability=0.05)
+        ruin.determine_decision()
+        deep = self.summary(max_drawdown_ci_pct=(10.0, 35.0))
+        deep.determine_decision()
+
+        assert ruin.decision == 'NO GO' and ruin.critical_issues
+        assert deep.risk_status == 'red' and deep.decision == 'NO GO'
+
+    def test_repeated_decisions_do_not_duplicate_notes(self):
+        summary = self.summary(max_drawdown_ci_pct=(8.0, 22.0), cagr_ci_pct=(-3.0, 25.0), ruin_probability=0.05)
+        summary.determine_decision()
+        first = (list(summary.warnings), list(summary.critical_issues), summary.confidence_score)
+
+        summary.determine_decision()
+
+        assert (summary.warnings, summary.critical_issues, summary.confidence_score) == first
+        assert len(summary.warnings) == 2 and len(summary.critical_issues) == 1
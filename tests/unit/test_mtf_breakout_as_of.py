@@ -0,0 +1,179 @@
+"""
+Unit tests for as-of signal generation in MultiTimeframeBreakoutStrategy
+
+Tests cover:
+- Per-bar parity of view-derived ADX, weekly trend, breakout and S/R zones
+  with the strategy's own methods run on the truncated history
+- Full generate_signal parity between the as-of and live code paths
+- Vectorized swing detection against the reference loop
+- BacktestExecutorTool using the as-of path without live fetches
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.backtesting.tools.backtest_tools import BacktestExecutorTool
+from strategies.multi_timeframe_breakout import MultiTimeframeBreakoutStrategy, MultiTimeframeDataView
+from strategies.multi_timeframe_sr import MultiTimeframeSR
+
+
+def make_daily(seed, bars=300):
+    """Drifting random walk with occasional volume spikes (yfinance column case)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2022-01-03', periods=bars)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.02, bars)))
+    volume = rng.integers(1000, 2000, bars).astype(float)
+    volume[rng.random(bars) < 0.15] *= 3
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * (1 + rng.uniform(0, 0.02, bars)),
+        'Low': close * (1 - rng.uniform(0, 0.02, bars)),
+        'Close': close,
+        'Volume': volume
+    }, index=dates)
+
+
+def make_market(daily, seed=99):
+    """Index that moves with the stock, so beta clears the high-beta filter"""
+    returns = daily['Close'].pct_change().fillna(0).to_numpy()
+    noise = np.random.default_rng(seed).normal(0, 0.003, len(daily))
+    return pd.Series(100 * np.cumprod(1 + 0.6 * returns + noise), index=daily.index)
+
+
+def truncated(daily, n):
+    """What the live path would fetch if 'now' were bar n-1"""
+    prefix = daily.iloc[:n].copy()
+    prefix.columns = [col.lower() for col in prefix.columns]
+    weekly = prefix.resample('W').agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    }).dropna()
+    return prefix, weekly
+
+
+class TestDataView:
+    """Test view accessors against the strategy's own computations"""
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_components_match_truncated_history(self, seed):
+        """Every bar: weekly prefix, ADX, weekly trend, breakout and S/R zones are identical"""
+        daily = make_daily(seed, bars=220)
+        view = MultiTimeframeDataView('TEST', daily)
+        strategy = MultiTimeframeBreakoutStrategy()
+        sr = MultiTimeframeSR()
+
+        for n in range(1, len(daily) + 1):
+            prefix, weekly = truncated(daily, n)
+
+            pd.testing.assert_frame_equal(view.weekly_prefix(n), weekly, check_freq=False)
+            assert view.adx(n) == strategy.calculate_adx(prefix)
+            assert view.weekly_trend(n) == strategy.analyze_weekly_trend(weekly.copy())
+            assert view.daily_breakout(n) == strategy.analyze_daily_breakout(prefix.copy())
+            assert view.sr_zones(n, sr) == sr.analyze_multi_timeframe_sr(weekly, prefix, pd.DataFrame())
+
+    def test_prefix_is_view_and_bar_lookup(self):
+        """Daily prefix shares memory; timestamps resolve to bars on or before them"""
+        daily = make_daily(0, bars=100)
+        view = MultiTimeframeDataView('TEST', daily)
+
+        assert np.shares_memory(view.daily_prefix(50)['close'].to_numpy(), view.daily['close'].to_numpy())
+        assert view.bars_at(49) == 50
+        assert view.bars_at(daily.index[49]) == 50
+        assert view.bars_at(daily.index[49] + pd.Timedelta(hours=12)) == 50
+        assert view.bars_at(None) == 100
+        with pytest.raises(IndexError):
+            view.bars_at(100)
+
+    def test_beta_matches_pandas(self):
+        """Cumulative-sum beta equals cov/var over the same trailing returns"""
+        daily = make_daily(2)
+        market = make_market(daily)
+        view = MultiTimeframeDataView('TEST', daily, market_close=market, beta_lookback_days=90)
+
+        n = 250
+        end = daily.index[n - 1]
+        returns = pd.DataFrame({
+            'stock': daily['Close'].pct_change(),
+            'index': market.pct_change()
+        }).dropna()
+        window = returns[(returns.index > end - pd.Timedelta(days=90)) & (returns.index <= end)]
+        expected = window.cov().loc['stock', 'index'] / window['index'].var()
+
+        assert view.beta(n) == pytest.approx(expected, rel=1e-9)
+        assert MultiTimeframeDataView('TEST', daily).beta(n) == 1.0
+
+
+class TestGenerateSignalAsOf:
+    """Test the as-of path of generate_signal"""
+
+    def test_matches_live_path_on_every_bar(self, monkeypatch):
+        """Same signals (or None) as the live path fed the truncated history"""
+        daily = make_daily(3)
+        view = MultiTimeframeDataView('TEST', daily, market_close=make_market(daily))
+        strategy = MultiTimeframeBreakoutStrategy()
+
+        signals = 0
+        for i in range(60, len(daily)):
+            as_of = strategy.generate_signal('TEST', as_of=i, data_view=view, verbose=False)
+
+            prefix, weekly = truncated(daily, i + 1)
+            monkeypatch.setattr(strategy, 'fetch_multi_timeframe_data',
+                                lambda symbol: {'weekly': weekly, 'daily': prefix, '4h': pd.DataFrame()})
+            monkeypatch.setattr(strategy, 'calculate_beta', lambda symbol: view.beta(i + 1))
+            live = strategy.generate_signal('TEST', verbose=False)
+
+            assert (as_of is None) == (live is None), i
+            if live is not None:
+                signals += 1
+                assert as_of.entry_price == live.entry_price
+                assert as_of.stop_loss == live.stop_loss
+                assert as_of.target == live.target
+                assert as_of.strength_score == live.strength_score
+                assert as_of.confluences == live.confluences
+                assert as_of.sr_analysis == live.sr_analysis
+                assert as_of.timestamp == daily.index[i].to_pydatetime()
+
+        assert signals > 0
+
+    def test_swing_flags_match_reference_loop(self):
+        """Vectorized swing detection reproduces the strict neighbour comparison"""
+        rng = np.random.default_rng(5)
+        high = rng.integers(90, 110, 200).astype(float)  # integer prices: many ties
+        low = high - rng.integers(1, 5, 200)
+
+        is_high, is_low = MultiTimeframeSR().swing_point_flags(high, low, window=5)
+
+        for i in range(len(high)):
+            interior = 5 <= i < len(high) - 5
+            neighbours = [i + j for j in range(-5, 6) if j != 0]
+            assert is_high[i] == (interior and all(high[k] < high[i] for k in neighbours))
+            assert is_low[i] == (interior and all(low[k] > low[i] for k in neighbours))
+
+
+class TestBacktestExecutorAsOf:
+    """Test that the executor drives the strategy without per-bar fetches"""
+
+    def test_run_backtest_uses_preloaded_history(self, monkeypatch):
+        """No live fetch or beta download happens while walking the bars"""
+        daily = make_daily(3)
+        market = make_market(daily)
+        daily.columns = [col.lower() for col in daily.columns]
+        strategy = MultiTimeframeBreakoutStrategy()
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("live fetch during backtest")
+
+        monkeypatch.setattr(strategy, 'fetch_multi_timeframe_data', no_network)
+        monkeypatch.setattr(strategy, 'calculate_beta', no_network)
+
+        result = BacktestExecutorTool().run_backtest(
+            strategy,
+            'TEST',
+            {'daily': daily, 'market': market},
+            datetime(2022, 6, 1),
+            datetime(2023, 2, 1)
+        )
+
+        assert len(result.trades) > 0
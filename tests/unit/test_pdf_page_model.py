@@ -0,0 +1,149 @@
+"""
+Unit tests for the paged, cached earnings PDF extractor
+
+Tests cover:
+- P&L page scoring and early exit (later pages never extracted)
+- Page text/tables memoized on disk by file hash and page
+- Strategy fallbacks running on the cached page model
+- Batch extraction across processes
+"""
+
+import pytest
+
+import indian_pdf_extractor
+from indian_pdf_extractor import IndianFinancialPDFExtractor, PDFPageModel
+
+
+PNL_PAGE = """Statement of Standalone Financial Results for the quarter ended 30.06.2024
+Revenue from operations 1,250.50 1,100.25 980.75
+Profit for the period 210.30 190.10 150.00
+Earnings per share 4.20 3.80 3.00"""
+
+NOTES_PAGE = """Notes to accounts
+Sales 10 20 30
+Net profit 1 2 3"""
+
+
+class FakePage:
+    def __init__(self, text, tables=None, log=None):
+        self.text, self._tables, self.log = text, tables or [], log
+
+    def extract_text(self):
+        self.log.append(('text', self.text[:10]))
+        return self.text
+
+    def extract_tables(self):
+        self.log.append(('tables', self.text[:10]))
+        return self._tables
+
+
+class FakePDF:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_pdfs(tmp_path, monkeypatch):
+    """Real files on disk (for hashing) whose pages come from FakePDF"""
+    log, docs = [], {}
+
+    def make(name, pages):
+        path = tmp_path / name
+        path.write_bytes(name.encode() + b'|' + '|'.join(str(p) for p in pages).encode())
+        docs[str(path)] = [
+            FakePage(p, log=log) if isinstance(p, str) else FakePage(p[0], p[1], log) for p in pages
+        ]
+        return str(path)
+
+    class FakePdfplumber:
+        @staticmethod
+        def open(path):
+            log.append(('open', path))
+            return FakePDF(docs[path])
+
+    monkeypatch.setattr(indian_pdf_extractor, 'pdfplumber', FakePdfplumber, raising=False)
+    monkeypatch.setattr(indian_pdf_extractor, 'PDFPLUMBER_AVAILABLE', True)
+    make.log = log
+    return make
+
+
+class TestPageModel:
+    """Test scoring and memoization"""
+
+    def test_pnl_page_ranked_first(self, fake_pdfs):
+        path = fake_pdfs('100_ABC_Ltd.pdf', ['Cover letter', NOTES_PAGE, PNL_PAGE])
+        model = PDFPageModel(path)
+
+        assert model.ranked_pages(20) == [2, 0, 1]
+        assert model.score_page(2) > model.score_page(1) == model.score_page(0) == 0
+
+    def test_text_strategy_stops_at_scored_hit(self, fake_pdfs):
+        """The P&L page wins over earlier keyword noise; no tables are extracted"""
+        path = fake_pdfs('100_ABC_Ltd.pdf', ['Cover letter', NOTES_PAGE, PNL_PAGE])
+
+        result = IndianFinancialPDFExtractor(cache_dir=None).extract_from_pdf(path)
+
+        assert result['status'] == 'success'
+        assert result['method'] == 'text_patterns'
+        assert result['company_name'] == 'ABC Ltd'
+        assert result['data']['revenue'] == {
+            'current_quarter_cr': 1250.5, 'previous_quarter_cr': 1100.25, 'yoy_quarter_cr': 980.75
+        }
+        assert result['data']['eps']['current_quarter_cr'] == 4.2
+        assert not any(kind == 'tables' for kind, _ in fake_pdfs.log)
+
+    def test_pages_memoized_on_disk(self, fake_pdfs, tmp_path):
+        """A second run on the same file never opens the PDF"""
+        path = fake_pdfs('100_ABC_Ltd.pdf', ['Cover letter', PNL_PAGE])
+        extractor = IndianFinancialPDFExtractor(cache_dir=str(tmp_path / 'pages'))
+
+        first = extractor.extract_from_pdf(path)
+        calls = len(fake_pdfs.log)
+        second = extractor.extract_from_pdf(path)
+
+        assert second == first
+        assert len(fake_pdfs.log) == calls
+        model = PDFPageModel(path, cache_dir=str(tmp_path / 'pages'))
+        assert (tmp_path / 'pages' / model.file_hash[:2] / model.file_hash / '1.json').exists()
+
+    def test_table_fallback_uses_cached_model(self, fake_pdfs):
+        """Numbers only in a table: text fails, tables succeed on the scored page"""
+        table = [
+            ['Particulars', 'Q1', 'Q4'],
+            ['Revenue from operations', '500', '450'],
+            ['Net profit', '50', '45'],
+        ]
+        path = fake_pdfs('200_XYZ.pdf', ['Cover letter', ('Statement of profit and loss', [table])])
+
+        result = IndianFinancialPDFExtractor(cache_dir=None).extract_from_pdf(path)
+
+        assert result['method'] == 'table_extraction'
+        assert result['data']['profit'] == {'current_quarter_cr': 50.0, 'previous_quarter_cr': 45.0}
+        assert fake_pdfs.log.count(('text', 'Statement ')) == 1  # text extracted once, reused
+
+    def test_no_data_without_ocr(self, fake_pdfs):
+        path = fake_pdfs('300_Empty.pdf', ['Board meeting intimation'])
+        extractor = IndianFinancialPDFExtractor(cache_dir=None)
+        extractor.use_ocr = False
+
+        result = extractor.extract_from_pdf(path)
+
+        assert result['status'] == 'failed'
+        assert result['error'] == 'No data extracted'
+
+
+class TestBatch:
+    """Test multi-process extraction"""
+
+    def test_batch_matches_serial(self, fake_pdfs, tmp_path):
+        paths = [fake_pdfs(f'{i}_Co{i}.pdf', ['Cover letter', PNL_PAGE]) for i in range(6)]
+        extractor = IndianFinancialPDFExtractor(cache_dir=str(tmp_path / 'pages'))
+
+        serial = [extractor.extract_from_pdf(p) for p in paths]
+        batch = extractor.extract_batch(paths, workers=2)
+
+        assert batch == serial
+        assert [r['file'] for r in batch] == [f'{i}_Co{i}.pdf' for i in range(6)]
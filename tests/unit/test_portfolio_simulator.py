@@ -0,0 +1,167 @@
+"""Tests for the vectorized portfolio simulator and array sizing/cost helpers"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.backtest.portfolio_simulator import EXIT_END, EXIT_STOP, EXIT_TARGET, PortfolioSimulator
+from src.costs.cost_calculator import CostCalculator
+from src.costs.slippage_simulator import SlippageSimulator
+from src.kelly.kelly_fraction_calculator import KellyFractionCalculator
+from src.kelly.position_cap_enforcer import PositionCapEnforcer
+from src.kelly.total_risk_validator import TotalRiskValidator
+
+
+def flat_panel(symbols, days, price=100.0):
+    close = np.full((symbols, days), price)
+    return {'close': close, 'high': close.copy(), 'low': close.copy()}
+
+
+def test_kelly_array_matches_scalar():
+    """Element-wise results equal calculate(), including the edge cases"""
+    calc = KellyFractionCalculator()
+    win_rate = np.array([0, 100, 55, 40, 60, 70, 30])
+    avg_profit = np.array([5.0, 5.0, 0.0, 3.0, 4.0, 2.0, 10.0])
+    avg_loss = np.array([-2.0, -2.0, -2.0, 0.0, -2.0, -3.0, -2.0])
+
+    expected = [calc.calculate(w, p, l) for w, p, l in zip(win_rate, avg_profit, avg_loss)]
+
+    assert calc.calculate_array(win_rate, avg_profit, avg_loss) == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        calc.calculate_array([50, 120], 1.0, -1.0)
+
+
+def test_total_risk_array_matches_sequential():
+    """Ordered array validation equals repeated validate_new_position()"""
+    validator = TotalRiskValidator(max_total_risk=0.5)
+    proposals = [0.2, 0.15, 0.1, 0.2, 0.05]
+
+    existing = [0.1]
+    expected = []
+    for size in proposals:
+        accepted = validator.validate_new_position(size, existing)
+        expected.append(accepted)
+        existing.append(accepted)
+
+    assert validator.validate_new_positions_array(proposals, 0.1) == pytest.approx(expected)
+
+
+def test_slippage_and_cap_arrays_match_scalar():
+    """Array slippage and caps agree with the scalar methods"""
+    slippage = SlippageSimulator()
+    prices = [100.0, 250.0, 80.0]
+    volumes = [1000, 500, 200]
+    averages = [10000, 0, 400]
+
+    expected = [slippage.calculate_slippage(p, v, a) for p, v, a in zip(prices, volumes, averages)]
+    assert slippage.calculate_slippage_array(prices, volumes, averages) == pytest.approx(expected)
+
+    enforcer = PositionCapEnforcer(equity_cap=20.0)
+    assert enforcer.enforce_array([0.1, 0.3]) == pytest.approx([0.1, 0.2])
+
+
+class TestPortfolioSimulator:
+    """Test allocation, fills and accounting"""
+
+    def test_target_exit_with_costs(self):
+        """One position: sized by fraction, exits at target, costs on both legs"""
+        prices = flat_panel(1, 5)
+        prices['high'][0, 3] = 106.0
+        signals = np.zeros((1, 5), dtype=bool)
+        signals[0, 1] = True
+        costs = CostCalculator()
+
+        sim = PortfolioSimulator(initial_capital=100000, cost_calculator=costs)
+        result = sim.run(prices, signals, position_fraction=0.1, target_pct=4.0)
+
+        trade = result.trades.iloc[0]
+        entry_value = 100 * 100.0
+        exit_value = 100 * 104.0
+        expected_pnl = (exit_value - costs.calculate_equity_delivery_cost(exit_value)) - (
+            entry_value + costs.calculate_equity_delivery_cost(entry_value)
+        )
+
+        assert trade['shares'] == 100
+        assert trade['exit_reason'] == EXIT_TARGET
+        assert trade['exit_date'] == 3
+        assert trade['pnl'] == pytest.approx(expected_pnl)
+        assert result.metrics['final_capital'] == pytest.approx(100000 + expected_pnl)
+
+    def test_stop_fills_at_open_on_gap(self):
+        """A gap below the stop fills at the open, not the stop"""
+        prices = flat_panel(1, 4)
+        prices['open'] = prices['close'].copy()
+        prices['open'][0, 2] = prices['low'][0, 2] = prices['close'][0, 2] = 90.0
+        signals = np.zeros((1, 4), dtype=bool)
+        signals[0, 0] = True
+
+        result = PortfolioSimulator().run(prices, signals, position_fraction=0.1, stop_loss_pct=2.0)
+
+        trade = result.trades.iloc[0]
+        assert trade['exit_reason'] == EXIT_STOP
+        assert trade['exit_price'] == 90.0
+
+    def test_risk_budget_allocated_by_score(self):
+        """Simultaneous signals fill in score order until the total-risk cap binds"""
+        prices = flat_panel(5, 3)
+        signals = np.zeros((5, 3), dtype=bool)
+        signals[:, 0] = True
+        score = np.zeros((5, 3))
+        score[:, 0] = [1, 5, 3, 4, 2]
+
+        sim = PortfolioSimulator(risk_validator=TotalRiskValidator(max_total_risk=0.5))
+        result = sim.run(prices, signals, position_fraction=0.2, score=score,
+                         symbols=['A', 'B', 'C', 'D', 'E'])
+
+        trades = result.trades.set_index('symbol')
+        assert set(trades.index) == {'B', 'C', 'D'}
+        assert trades.loc['B', 'shares'] == 200
+        assert trades.loc['C', 'shares'] == 100  # scaled to the remaining 10%
+        assert (trades['exit_reason'] == EXIT_END).all()
+        assert result.exposure.iloc[0] == pytest.approx(0.5)
+
+    def test_kelly_stats_drive_sizing(self):
+        """Per-symbol Kelly stats go through half-Kelly and the 20% cap"""
+        sim = PortfolioSimulator()
+        fractions = sim.position_fractions([60, 80, 30], [4.0, 10.0, 1.0], [-2.0, -1.0, -2.0])
+
+        kelly = KellyFractionCalculator().calculate(60, 4.0, -2.0)
+        assert fractions == pytest.approx([kelly / 2, 0.2, 0.0])
+
+    def test_equity_reconciles_with_trades(self):
+        """Final capital equals initial capital plus the sum of trade P&L"""
+        rng = np.random.default_rng(7)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (40, 250)), axis=1))
+        prices = {
+            'close': close,
+            'high': close * 1.01,
+            'low': close * 0.99,
+            'volume': rng.integers(1000, 5000, close.shape).astype(float)
+        }
+        prices['close'][3, :30] = np.nan  # listed late
+        signals = rng.random(close.shape) < 0.05
+
+        sim = PortfolioSimulator(cost_calculator=CostCalculator(), slippage_simulator=SlippageSimulator(),
+                                 max_holding_days=10)
+        result = sim.run(prices, signals, kelly_stats={'win_rate': 55, 'avg_profit': 3.0, 'avg_loss': -2.0})
+
+        assert result.metrics['total_trades'] > 0
+        assert result.metrics['final_capital'] == pytest.approx(100000 + result.trades['pnl'].sum())
+        assert (result.cash >= 0).all()
+        assert (result.exposure <= 0.5 + 1e-12).all()
+        assert result.trades.loc[result.trades['symbol'] == 3, 'entry_date'].ge(30).all()
+
+    def test_large_universe_runs_in_seconds(self):
+        """500 symbols x 10 years (2,520 days) in well under a minute"""
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (500, 2520)), axis=1))
+        prices = {'close': close, 'high': close * 1.01, 'low': close * 0.99}
+        signals = rng.random(close.shape) < 0.01
+
+        start = time.perf_counter()
+        result = PortfolioSimulator().run(prices, signals, position_fraction=0.05)
+        elapsed = time.perf_counter() - start
+
+        assert len(result.equity_curve) == 2520
+        assert elapsed < 30
@@ -41,7 +41,9 @@ def mock_registry():
     with patch('api.prediction_endpoint.ModelRegistry') as MockRegistry:
         registry = MockRegistry.return_value
         registry.get_best_model.return_value = MOCK_MODEL_INFO
-        registry.load_model.return_value = Mock(predict_proba=Mock(return_value=[[0.13, 0.87]]))
+        registry.load_model.return_value = Mock(
+            predict_proba=Mock(side_effect=lambda rows: [[0.13, 0.87]] * len(rows))
+        )
         registry.list_models.return_value = [MOCK_MODEL_INFO]
         yield MockRegistry
 
@@ -258,6 +260,22 @@ class TestBatchPredictEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 10
+        assert all(item['probability'] == 0.87 for item in data)
+
+    def test_batch_predict_coalesces_model_calls(self, client):
+        """Test batch items are scored in one micro-batched model call"""
+        import api.prediction_endpoint
+
+        client.post("/api/v1/batch_predict", json={
+            "predictions": [
+                {"bse_code": f"{i:06d}", "prediction_date": "2025-11-14"}
+                for i in range(10)
+            ]
+        })
+
+        service = api.prediction_endpoint.prediction_service
+        assert service.model.predict_proba.call_count == 1
+        assert len(service.model.predict_proba.call_args[0][0]) == 10
 
     def test_batch_predict_exceeds_max_items(self, client):
         """Test batch exceeding 100 items returns 422"""
@@ -309,6 +327,14 @@ class TestHealthEndpoint:
         assert 'requests_processed' in data
         assert 'avg_latency_ms' in data
 
+    def test_health_check_includes_batching_config(self, client):
+        """Test health response reports micro-batching settings"""
+        response = client.get("/api/v1/health")
+        data = response.json()
+        assert data['batch_max_size'] == 32
+        assert data['batch_max_wait_ms'] == 2.0
+        assert 'avg_batch_size' in data
+
 
 class TestConfidenceLevels:
     """Test confidence level calculation"""
@@ -0,0 +1,153 @@
+"""
+Unit tests for the price presence bitmap
+
+Tests cover:
+- Completeness, missing days and missing runs from one (codes x days) matrix
+- Coalescing runs into the fewest range fetches
+- Loading price_movements with a single query
+- PriceCollector yfinance fallback downloading coalesced ranges
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.db_utils import close_pooled_connections
+from tools.price_completeness import PresenceBitmap, coalesce_ranges, weekday_calendar
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['bse_code', 'date'])
+
+
+@pytest.fixture
+def presence():
+    """Two weeks of weekdays; A misses Tue and Thu-Fri, B trades Mon only, C never"""
+    calendar = weekday_calendar('2024-11-04', '2024-11-15')
+    rows = [('A', d) for d in calendar if d not in ('2024-11-05', '2024-11-07', '2024-11-08')]
+    rows += [('A', '2024-11-09'), ('B', '2024-11-04'), ('B', '2024-11-11'), ('X', '2024-11-04')]
+    return PresenceBitmap.from_frame(frame(rows), codes=['A', 'B', 'C'], calendar=calendar)
+
+
+class TestCoalesceRanges:
+    """Test grouping positions into runs"""
+
+    def test_contiguous_runs(self):
+        assert coalesce_ranges([1, 2, 3, 6, 7, 10]) == [(1, 3), (6, 7), (10, 10)]
+        assert coalesce_ranges([]) == []
+
+    def test_bridging_gaps(self):
+        assert coalesce_ranges([1, 2, 3, 6, 7, 11], max_gap=2) == [(1, 7), (11, 11)]
+        assert coalesce_ranges([1, 2, 3, 6, 7, 11], max_gap=3) == [(1, 11)]
+
+
+class TestPresenceBitmap:
+    """Test completeness accounting on the bitmap"""
+
+    def test_axis_and_completeness(self, presence):
+        assert presence.expected_days == 10
+        assert '2024-11-09' in presence.days.tolist()  # Off-calendar row kept
+        assert presence.completeness() == {'A': 80.0, 'B': 20.0, 'C': 0.0}
+        assert presence.completeness(expected_days=20)['A'] == 40.0
+
+    def test_missing_dates(self, presence):
+        missing = presence.missing_dates()
+
+        assert missing['A'] == ['2024-11-05', '2024-11-07', '2024-11-08']
+        assert len(missing['C']) == 10
+        assert '2024-11-09' not in missing['B']  # Saturday is never missing
+        assert set(presence.missing_dates(threshold=50.0)) == {'B', 'C'}
+
+    def test_missing_ranges_span_weekends(self, presence):
+        ranges = presence.missing_ranges()
+
+        assert ranges['A'] == [('2024-11-05', '2024-11-05'), ('2024-11-07', '2024-11-08')]
+        assert ranges['B'] == [('2024-11-05', '2024-11-08'), ('2024-11-12', '2024-11-15')]
+        assert ranges['C'] == [('2024-11-04', '2024-11-15')]
+
+    def test_fetch_ranges_coalesced_per_code(self, presence):
+        """Bridged runs never merge across codes"""
+        ranges = presence.missing_ranges(max_gap=1)
+
+        assert ranges['A'] == [('2024-11-05', '2024-11-08')]
+        assert ranges['B'] == [('2024-11-05', '2024-11-15')]
+        assert ranges['C'] == [('2024-11-04', '2024-11-15')]
+
+    def test_matches_per_code_set_arithmetic(self):
+        rng = np.random.default_rng(7)
+        calendar = weekday_calendar('2024-01-01', '2024-06-30')
+        codes = [f"5{i:05d}" for i in range(40)]
+        rows = [(c, d) for c in codes for d in calendar if rng.random() < 0.9]
+
+        presence = PresenceBitmap.from_frame(frame(rows), codes=codes, calendar=calendar)
+        missing = presence.missing_dates()
+
+        for code in codes:
+            have = {d for c, d in rows if c == code}
+            expected = [d for d in calendar if d not in have]
+            assert missing.get(code, []) == expected
+            runs = presence.missing_ranges().get(code, [])
+            assert sum(calendar.index(b) - calendar.index(a) + 1 for a, b in runs) == len(expected)
+
+
+class TestFromDb:
+    """Test loading from price_movements"""
+
+    def test_single_query_load(self, tmp_path):
+        db_path = str(tmp_path / "prices.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE price_movements (bse_code TEXT, date DATE)")
+        conn.executemany("INSERT INTO price_movements VALUES (?, ?)", [
+            ('A', '2024-11-01'), ('A', '2024-11-04'), ('B', '2024-11-05'), (None, '2024-11-05'),
+        ])
+        conn.commit()
+        conn.close()
+
+        presence = PresenceBitmap.from_db(db_path, start_date='2024-11-04', end_date='2024-11-06')
+        everything = PresenceBitmap.from_db(db_path)
+        close_pooled_connections()
+
+        assert presence.codes == ['A', 'B']
+        assert presence.days.tolist() == ['2024-11-04', '2024-11-05', '2024-11-06']
+        assert presence.missing_ranges() == {
+            'A': [('2024-11-05', '2024-11-06')],
+            'B': [('2024-11-04', '2024-11-04'), ('2024-11-06', '2024-11-06')]
+        }
+        assert everything.present_counts().tolist() == [2, 1]
+        assert everything.missing_dates() == {}  # No range, no calendar
+
+    def test_missing_database(self, tmp_path):
+        presence = PresenceBitmap.from_db(str(tmp_path / "none.db"), codes=['A'], start_date='2024-11-04', end_date='2024-11-05')
+        assert presence.completeness() == {'A': 0.0}
+
+
+class TestCoalescedGapFill:
+    """Test the yfinance fallback downloading coalesced ranges"""
+
+    def test_one_download_per_coalesced_range(self, tmp_path):
+        from agents.ml.ml_data_collector import PriceCollector
+
+        db_path = str(tmp_path / "test.db")
+        collector = PriceCollector(db_path=db_path, cache_dir=str(tmp_path / "cache"))
+        collector.bse_nse_mapping = {'500325': 'RELIANCE'}
+        missing = ['2024-11-04', '2024-11-05', '2024-11-08', '2024-12-02']
+
+        def download(ticker, start, end, progress):
+            days = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+            return pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 100}, index=days)
+
+        with patch('yfinance.download', side_effect=download) as mock_yf, patch('time.sleep'):
+            filled = collector.fill_gaps_with_yfinance('500325', missing)
+        close_pooled_connections()
+
+        windows = [(c.kwargs['start'], c.kwargs['end']) for c in mock_yf.call_args_list]
+        conn = sqlite3.connect(db_path)
+        stored = [r[0] for r in conn.execute("SELECT date FROM price_movements ORDER BY date")]
+        conn.close()
+
+        assert windows == [('2024-11-04', '2024-11-09'), ('2024-12-02', '2024-12-03')]
+        assert filled == 4
+        assert stored == missing  # Present days inside a bridged range are not rewritten
@@ -0,0 +1,134 @@
+"""
+Unit tests for the in-process sampling profiler (Story 5.1 follow-up)
+
+Tests cover:
+- Stack sampling of a busy thread
+- Collapsed-stack and speedscope export
+- Background capture lifecycle and single-capture guard
+- CLI wrapper running a script under the profiler
+- Admin endpoint gating behind VCP_PROFILER
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from monitoring import profiler as profiler_module
+from monitoring.profiler import SamplingProfiler, capture_profile, get_capture_status, start_capture
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name='busy-worker')
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+class TestSamplingProfiler:
+    """Test sampling and export"""
+
+    def test_samples_busy_thread(self, busy_thread):
+        """Busy thread's function shows up in collapsed stacks"""
+        with SamplingProfiler(interval=0.002) as profiler:
+            time.sleep(0.1)
+
+        assert profiler.sample_count > 0
+        lines = profiler.collapsed()
+        assert any(line.startswith('busy-worker;') and 'busy_loop' in line for line in lines)
+        assert not any(line.startswith('vcp-sampling-profiler;') for line in lines)
+
+    def test_export_writes_collapsed_and_speedscope(self, busy_thread, tmp_path):
+        """capture_profile writes both formats with consistent contents"""
+        files = capture_profile(0.1, interval=0.002, output_dir=str(tmp_path), name='job')
+
+        collapsed = (tmp_path / 'job.collapsed').read_text().splitlines()
+        assert files['collapsed'] == str(tmp_path / 'job.collapsed')
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in collapsed)
+
+        doc = json.loads((tmp_path / 'job.speedscope.json').read_text())
+        frames = doc['shared']['frames']
+        busy = next(p for p in doc['profiles'] if p['name'] == 'busy-worker')
+        assert busy['type'] == 'sampled'
+        assert len(busy['samples']) == len(busy['weights'])
+        assert any(frames[i]['name'] == 'busy_loop' for stack in busy['samples'] for i in stack)
+
+    def test_invalid_interval(self):
+        """Non-positive interval is rejected"""
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
+
+
+class TestBackgroundCapture:
+    """Test admin-triggered captures"""
+
+    def test_capture_lifecycle(self, tmp_path):
+        """Capture runs, rejects a concurrent start, then reports files"""
+        capture = start_capture(0.1, interval=0.005, output_dir=str(tmp_path))
+        assert capture['status'] == 'running'
+
+        with pytest.raises(RuntimeError):
+            start_capture(0.1, output_dir=str(tmp_path))
+
+        deadline = time.time() + 5
+        while get_capture_status()['status'] == 'running' and time.time() < deadline:
+            time.sleep(0.02)
+
+        status = get_capture_status()
+        assert status['status'] == 'complete'
+        assert status['files']['speedscope'].endswith('.speedscope.json')
+
+    def test_rejects_out_of_range_duration(self):
+        """Durations outside (0, MAX_CAPTURE_SECONDS] raise ValueError"""
+        with pytest.raises(ValueError):
+            start_capture(0)
+        with pytest.raises(ValueError):
+            start_capture(profiler_module.MAX_CAPTURE_SECONDS + 1)
+
+
+class TestEntryPoints:
+    """Test CLI wrapper and API gating"""
+
+    def test_cli_runs_script_and_exports(self, tmp_path):
+        """Wrapped script runs with its own argv and the profile is written on exit"""
+        script = tmp_path / 'run_job.py'
+        marker = tmp_path / 'ran.txt'
+        script.write_text(
+            "import sys\n"
+            "total = sum(i * i for i in range(200000))\n"
+            f"open({str(marker)!r}, 'w').write(sys.argv[1])\n"
+            "sys.exit(3)\n"
+        )
+
+        code = profiler_module.main([
+            '--interval-ms', '1', '--output-dir', str(tmp_path), '--name', 'cli',
+            str(script), 'hello'
+        ])
+
+        assert code == 3
+        assert marker.read_text() == 'hello'
+        assert (tmp_path / 'cli.collapsed').exists()
+        assert (tmp_path / 'cli.speedscope.json').exists()
+
+    def test_api_endpoint_gated_by_env(self, monkeypatch):
+        """Admin profile endpoint is 403 unless VCP_PROFILER=1"""
+        from api.main import app
+
+        client = TestClient(app)
+        monkeypatch.delenv('VCP_PROFILER', raising=False)
+        assert client.get('/api/v1/admin/profile').status_code == 403
+
+        monkeypatch.setenv('VCP_PROFILER', '1')
+        response = client.post('/api/v1/admin/profile', params={'seconds': 0})
+        assert response.status_code == 400
+        assert client.get('/api/v1/admin/profile').status_code == 200
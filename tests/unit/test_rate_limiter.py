@@ -4,9 +4,10 @@ Tests for Rate Limiter
 TDD Approach: RED Phase - All tests will fail initially
 """
 
+import asyncio
 import pytest
 import time
-from src.utils.rate_limiter import RateLimiter
+from src.utils.rate_limiter import AsyncRateLimiter, RateLimiter
 
 
 class TestRateLimiterInitialization:
@@ -163,3 +164,34 @@ class TestStatistics:
 
         # Should have recorded some wait time
         assert stats['total_wait_time'] > 0
+
+
+class TestAsyncRateLimiter:
+    """Test asyncio token bucket"""
+
+    def test_burst_then_throttle(self):
+        """After the burst, acquisitions wait without blocking other tasks"""
+        limiter = AsyncRateLimiter(requests_per_second=10, burst_capacity=5)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        async def scenario():
+            start = time.monotonic()
+            await asyncio.gather(
+                ticker(),
+                *(limiter.acquire(1) for _ in range(10))
+            )
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(scenario())
+
+        # 5 tokens over burst at 10/s
+        assert elapsed >= 0.4
+        assert len(ticks) == 5
+        stats = limiter.get_stats()
+        assert stats['total_requests'] == 10
+        assert stats['total_wait_time'] > 0
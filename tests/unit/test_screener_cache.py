@@ -0,0 +1,180 @@
+"""
+Unit tests for the Screener raw page cache and offline parsing
+
+Tests cover:
+- Page parsing without network access (lxml matches html.parser)
+- Compressed, content-addressed storage with a fetch log
+- Cache-served company data and peer comparison
+- Process-pool re-parse of the whole cache
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import data_sources.screener_enhanced_fetcher as screener
+from data_sources.raw_page_cache import RawPageCache
+from data_sources.screener_enhanced_fetcher import ScreenerEnhancedFetcher
+from tools.db_utils import close_pooled_connections
+
+
+def company_page(name, revenue=100, pe=25.5):
+    quarters = ['Dec 2024', 'Sep 2024', 'Jun 2024', 'Mar 2024', 'Dec 2023']
+    sales = [revenue, 95, 90, 88, 80]
+    profit = [20, 18, 17, 16, 15]
+    header = ''.join(f'<th>{q}</th>' for q in quarters)
+    return f"""
+    <html><body>
+      <h1 class="h2">{name}</h1>
+      <ul>
+        <li class="flex flex-space-between"><span class="name">Market Cap</span>
+            <span class="nowrap value">1,234 Cr</span></li>
+        <li class="flex flex-space-between"><span class="name">Stock P/E</span>
+            <span class="nowrap value">{pe}</span></li>
+      </ul>
+      <section id="quarters"><table class="data-table">
+        <tr><th>Quarterly results</th>{header}</tr>
+        <tr><td>Sales +</td>{''.join(f'<td>{v}</td>' for v in sales)}</tr>
+        <tr><td>Net Profit +</td>{''.join(f'<td>{v}</td>' for v in profit)}</tr>
+      </table></section>
+      <section id="profit-loss"><table class="data-table">
+        <tr><th></th><th>Mar 2024</th><th>Mar 2023</th></tr>
+        <tr><td>Sales +</td><td>400</td><td>350</td></tr>
+      </table></section>
+      <section id="shareholding"><table>
+        <tr><td>Promoters +</td><td>55.5%</td></tr>
+        <tr><td>FIIs +</td><td>20.1%</td></tr>
+      </table></section>
+    </body></html>
+    """
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    """Fetcher with a temp cache whose requests are served from a dict"""
+    pages = {}
+    calls = []
+    fetcher = ScreenerEnhancedFetcher(rate_limit_seconds=0, cache_dir=str(tmp_path / "cache"))
+
+    def fake_request(url, params=None):
+        calls.append(url)
+        code = url.rstrip('/').split('/')[-1]
+        return FakeResponse(pages[code]) if code in pages else None
+
+    monkeypatch.setattr(fetcher, '_make_request', fake_request)
+    fetcher.pages, fetcher.calls = pages, calls
+    yield fetcher
+    close_pooled_connections()
+
+
+class TestParsing:
+    """Test offline parsing of a stored page"""
+
+    def test_parse_company_page(self):
+        data = ScreenerEnhancedFetcher(cache_dir=None).parse_company_page(
+            'ABC', company_page('ABC Ltd'), datetime(2024, 5, 1, 10, 0)
+        )
+
+        assert data['status'] == 'success'
+        assert data['company_name'] == 'ABC Ltd'
+        assert data['ratios'] == {'market_cap': 1234 * 10000000, 'pe_ratio': 25.5}
+        assert data['revenue_yoy'] == pytest.approx(25.0)
+        assert data['annual_results'][0] == {'year': 'Mar 2024', 'revenue': 400.0}
+        assert data['shareholding'] == {'promoter': 55.5, 'fii': 20.1}
+        assert data['fetch_timestamp']['date'] == '2024-05-01'
+
+    def test_fast_parser_matches_html_parser(self, monkeypatch):
+        """The lxml tree yields exactly what html.parser did"""
+        fetcher = ScreenerEnhancedFetcher(cache_dir=None)
+        fetched_at = datetime(2024, 5, 1)
+        fast = fetcher.parse_company_page('ABC', company_page('ABC Ltd'), fetched_at)
+        monkeypatch.setattr(screener, 'HTML_PARSER', 'html.parser')
+        slow = fetcher.parse_company_page('ABC', company_page('ABC Ltd'), fetched_at)
+
+        assert fast == slow
+
+
+class TestRawPageCache:
+    """Test storage and cache-served fetches"""
+
+    def test_pages_stored_compressed_and_deduplicated(self, fetcher):
+        fetcher.pages['ABC'] = company_page('ABC Ltd')
+
+        first = fetcher.fetch_company_data('ABC')
+        fetcher.fetch_company_data('ABC')  # same body, second fetch
+
+        cache = fetcher.cache
+        entry = cache.latest('ABC')
+        blobs = [f for _, _, files in os.walk(cache.objects_dir) for f in files]
+
+        assert first['status'] == 'success'
+        assert blobs == [f"{entry['sha256']}.html.gz"]
+        assert cache.get(entry['sha256']) == fetcher.pages['ABC']
+        assert entry['url'].endswith('/company/ABC/')
+        assert os.path.getsize(cache.blob_path(entry['sha256'])) < len(fetcher.pages['ABC'])
+
+    def test_fresh_cache_served_without_request(self, fetcher):
+        fetcher.pages['ABC'] = company_page('ABC Ltd')
+        fetcher.fetch_company_data('ABC')
+        fetched = len(fetcher.calls)
+
+        cached = fetcher.fetch_company_data('ABC', max_cache_age_hours=1)
+
+        assert len(fetcher.calls) == fetched
+        assert cached['company_name'] == 'ABC Ltd'
+
+    def test_stale_cache_refetched(self, fetcher):
+        fetcher.pages['ABC'] = company_page('ABC Ltd')
+        fetcher.cache.put('ABC', 'old', company_page('Old Name'), datetime.now() - timedelta(days=3))
+
+        data = fetcher.fetch_company_data('ABC', max_cache_age_hours=24)
+
+        assert data['company_name'] == 'ABC Ltd'
+        assert fetcher.calls
+
+    def test_peer_comparison_served_from_cache(self, fetcher):
+        for code, revenue in [('ABC', 120), ('DEF', 90), ('GHI', 100)]:
+            fetcher.pages[code] = company_page(code, revenue=revenue)
+            fetcher.fetch_company_data(code)
+        fetcher.calls.clear()
+
+        comparison = fetcher.fetch_peer_comparison('ABC', ['DEF', 'GHI'])
+
+        assert fetcher.calls == []
+        assert set(comparison['companies']) == {'ABC', 'DEF', 'GHI'}
+        assert comparison['relative_metrics']['revenue_growth_ranking'][0][0] == 'ABC'
+
+    def test_missing_page_is_error(self, fetcher):
+        data = fetcher.fetch_company_data('NOPE')
+        assert data['status'] == 'error'
+        assert fetcher.cache.latest('NOPE') is None
+
+
+class TestReparse:
+    """Test offline re-parse of the cache"""
+
+    def test_parallel_reparse_matches_serial(self, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        cache = RawPageCache(cache_dir)
+        fetched_at = datetime(2024, 6, 1, 9, 30)
+        codes = [f"C{i:03d}" for i in range(screener.PARALLEL_PARSE_MIN_PAGES + 4)]
+        for i, code in enumerate(codes):
+            cache.put(code, f"url/{code}", company_page(code, revenue=100 + i), fetched_at)
+
+        fetcher = ScreenerEnhancedFetcher(cache_dir=cache_dir)
+        results = fetcher.reparse_cache(workers=2)
+        subset = fetcher.reparse_cache(company_codes=codes[:3])
+
+        assert sorted(results) == codes
+        for code in codes[:3]:
+            assert results[code] == subset[code]
+            assert results[code] == fetcher.parse_company_page(code, cache.get(cache.latest(code)['sha256']), fetched_at)
+        close_pooled_connections()
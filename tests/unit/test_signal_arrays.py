@@ -0,0 +1,126 @@
+"""Tests for array versions of the src/signals pipeline (SHORT-028 to SHORT-033)"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.signals.signal_strength_scorer import SignalStrengthScorer
+from src.signals.signal_filter import SignalFilter
+from src.signals.volume_confirmation import VolumeConfirmationChecker
+from src.signals.stop_loss_calculator import StopLossCalculator
+from src.signals.target_calculator import TargetCalculator
+
+
+def make_symbol(seed, bars=120):
+    """Integer-valued prices so many scores land on rounding ties"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'close': rng.integers(95, 115, bars).astype(float),
+        'volume': rng.integers(1, 10, bars) * 1000.0
+    })
+    adx = pd.Series(rng.integers(10, 60, bars).astype(float))
+    adx[:14] = np.nan
+    dma = pd.Series(rng.integers(95, 105, bars).astype(float))
+    dma[:5] = np.nan
+    atr = pd.Series(rng.uniform(0.5, 3.0, bars))
+    return df, adx, dma, atr
+
+
+@pytest.fixture
+def panel():
+    """Five symbols as per-symbol series and stacked (symbols x bars) arrays"""
+    symbols = [make_symbol(seed) for seed in range(5)]
+    stacked = {
+        'close': np.vstack([df['close'] for df, _, _, _ in symbols]),
+        'volume': np.vstack([df['volume'] for df, _, _, _ in symbols]),
+        'adx': np.vstack([adx for _, adx, _, _ in symbols]),
+        'dma': np.vstack([dma for _, _, dma, _ in symbols]),
+        'atr': np.vstack([atr for _, _, _, atr in symbols])
+    }
+    return symbols, stacked
+
+
+def reference_scores(scorer, df, adx, dma, volume_period=20):
+    """Per-bar score_signal loop (the original score_signals)"""
+    avg_volume = df['volume'].rolling(window=volume_period).mean()
+    scores = []
+    for i in range(len(df)):
+        if pd.isna(adx.iloc[i]) or pd.isna(dma.iloc[i]) or pd.isna(avg_volume.iloc[i]):
+            scores.append(0.0)
+        else:
+            scores.append(scorer.score_signal(
+                close=df['close'].iloc[i],
+                adx=adx.iloc[i],
+                dma=dma.iloc[i],
+                volume=df['volume'].iloc[i],
+                avg_volume=avg_volume.iloc[i]
+            ))
+    return np.array(scores)
+
+
+def test_score_signals_matches_scalar_loop(panel):
+    """score_signals returns exactly the per-bar score_signal values"""
+    scorer = SignalStrengthScorer()
+
+    for df, adx, dma, _ in panel[0]:
+        scores = scorer.score_signals(df, adx, dma)
+        np.testing.assert_array_equal(scores.to_numpy(), reference_scores(scorer, df, adx, dma))
+
+
+def test_score_signals_array_2d(panel):
+    """One 2-D call equals scoring each symbol separately"""
+    scorer = SignalStrengthScorer(adx_weight=0.5, dma_weight=0.3, volume_weight=0.2)
+    symbols, stacked = panel
+
+    scores = scorer.score_signals_array(
+        stacked['close'], stacked['volume'], stacked['adx'], stacked['dma']
+    )
+
+    assert scores.shape == stacked['close'].shape
+    for row, (df, adx, dma, _) in zip(scores, symbols):
+        np.testing.assert_array_equal(row, reference_scores(scorer, df, adx, dma))
+
+
+def test_filter_signals_array(panel):
+    """filter_signals_array matches filter_signals for 1-D and 2-D input"""
+    signal_filter = SignalFilter()
+    symbols, stacked = panel
+
+    valid = signal_filter.filter_signals_array(stacked['close'], stacked['adx'], stacked['dma'])
+
+    for row, (df, adx, dma, _) in zip(valid, symbols):
+        expected = signal_filter.filter_signals(df, adx, dma).to_numpy()
+        np.testing.assert_array_equal(row, expected)
+        np.testing.assert_array_equal(
+            signal_filter.filter_signals_array(df['close'], adx, dma), expected
+        )
+
+
+def test_check_signals_array(panel):
+    """check_signals_array matches check_signals for 1-D and 2-D input"""
+    checker = VolumeConfirmationChecker()
+    symbols, stacked = panel
+
+    confirmed = checker.check_signals_array(stacked['volume'])
+
+    for row, (df, _, _, _) in zip(confirmed, symbols):
+        expected = checker.check_signals(df).to_numpy()
+        np.testing.assert_array_equal(row, expected)
+        np.testing.assert_array_equal(checker.check_signals_array(df['volume']), expected)
+
+
+def test_stop_loss_and_target_arrays(panel):
+    """Stop-loss and target arrays match the Series versions in both directions"""
+    stop_calc = StopLossCalculator()
+    target_calc = TargetCalculator()
+    symbols, stacked = panel
+
+    for direction in ("long", "short"):
+        stops = stop_calc.calculate_stop_losses_array(stacked['close'], stacked['atr'], direction)
+        targets = target_calc.calculate_targets_array(stacked['close'], stops, direction)
+
+        for stop_row, target_row, (df, _, _, atr) in zip(stops, targets, symbols):
+            expected_stops = stop_calc.calculate_stop_losses(df, atr, direction)
+            expected_targets = target_calc.calculate_targets(df, expected_stops, direction)
+            np.testing.assert_array_equal(stop_row, expected_stops.to_numpy())
+            np.testing.assert_array_equal(target_row, expected_targets.to_numpy())
@@ -0,0 +1,129 @@
+"""
+Tests for the in-memory symbol master
+
+Covers index construction from the mapping DB + ISIN CSV, bidirectional and
+vectorized lookups, reload on DB change, and StockFilterByEarningsTool
+routing through the shared master.
+
+Author: VCP Financial Research Team
+Created: 2025-11-19
+"""
+
+import sqlite3
+
+import numpy as np
+
+from agents.filtering.tools.stock_filter_by_earnings_tool import StockFilterByEarningsTool
+from src.utils.symbol_master import SymbolMaster, build_symbol_index, get_symbol_master
+
+
+def make_mapping_db(path, rows):
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE bse_nse_mapping (
+            bse_code TEXT PRIMARY KEY, nse_symbol TEXT NOT NULL, company_name TEXT, isin TEXT
+        )
+    """)
+    conn.executemany("INSERT INTO bse_nse_mapping VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+ROWS = [
+    ('500325', 'RELIANCE', 'Reliance Industries', 'INE002A01018'),
+    ('532540', 'TCS', 'Tata Consultancy Services', None),
+    ('500209', 'INFY', None, 'INE009A01021'),
+]
+
+
+class TestSymbolIndex:
+    """Test index construction and lookups"""
+
+    def test_bidirectional_lookups(self, tmp_path):
+        """BSE code, NSE symbol and ISIN resolve in every direction"""
+        db = tmp_path / "mapping.db"
+        make_mapping_db(db, ROWS)
+        master = SymbolMaster(str(db))
+
+        assert len(master) == 3
+        assert master.get_nse_symbol('500325') == 'RELIANCE'
+        assert master.get_nse_symbol(532540) == 'TCS'
+        assert master.get_bse_code('INFY') == '500209'
+        assert master.get_isin('500325') == 'INE002A01018'
+        assert master.from_isin('INE009A01021') == 'INFY'
+        assert master.get_nse_symbol('999999') is None
+
+    def test_map_many_matches_single_lookups(self, tmp_path):
+        """Vectorized mapping is aligned with input and None for misses"""
+        db = tmp_path / "mapping.db"
+        make_mapping_db(db, ROWS)
+        master = SymbolMaster(str(db))
+
+        codes = np.array(['500209', '999999', '500325', '500209'])
+        result = master.map_many(codes)
+
+        assert list(result) == ['INFY', None, 'RELIANCE', 'INFY']
+        assert list(master.map_many(['TCS', 'XYZ'], 'nse_symbol', 'bse_code')) == ['532540', None]
+        assert len(master.map_many([])) == 0
+
+    def test_isin_csv_fills_gaps(self, tmp_path):
+        """ISIN master adds missing ISINs/names and ISIN-only securities"""
+        db = tmp_path / "mapping.db"
+        make_mapping_db(db, ROWS)
+        csv_path = tmp_path / "isin.csv"
+        csv_path.write_text(
+            "ISIN Code,Name of the Company,Symbol\n"
+            "INE467B01029,Tata Consultancy Services Ltd,TCS\n"
+            "INE009A01021,Infosys Ltd,INFY\n"
+            "INE040A01034,HDFC Bank Ltd,HDFCBANK\n"
+        )
+
+        index = build_symbol_index(str(db), str(csv_path))
+
+        assert index.lookup('500325', 'bse_code', 'company_name') == 'Reliance Industries'
+        assert index.lookup('TCS', 'nse_symbol', 'isin') == 'INE467B01029'
+        assert index.lookup('500209', 'bse_code', 'company_name') == 'Infosys Ltd'
+        assert index.lookup('INE040A01034', 'isin', 'nse_symbol') == 'HDFCBANK'
+        assert index.lookup('HDFCBANK', 'nse_symbol', 'bse_code') is None
+
+
+class TestSymbolMasterReload:
+    """Test change detection and sharing"""
+
+    def test_refresh_only_on_change(self, tmp_path):
+        """refresh() rebuilds only after the DB file changes"""
+        db = tmp_path / "mapping.db"
+        make_mapping_db(db, ROWS)
+        master = SymbolMaster(str(db))
+
+        assert master.refresh() is False
+
+        conn = sqlite3.connect(str(db))
+        conn.execute("INSERT INTO bse_nse_mapping VALUES ('500180', 'HDFCBANK', NULL, NULL)")
+        conn.commit()
+        conn.close()
+
+        assert master.refresh() is True
+        assert master.get_nse_symbol('500180') == 'HDFCBANK'
+
+    def test_shared_per_db(self, tmp_path):
+        """One master per mapping DB per process"""
+        db = tmp_path / "mapping.db"
+        make_mapping_db(db, ROWS)
+
+        assert get_symbol_master(str(db)) is get_symbol_master(str(db))
+
+
+class TestStockFilterToolRouting:
+    """StockFilterByEarningsTool resolves through the symbol master"""
+
+    def test_writes_visible_to_lookups(self, tmp_path):
+        """Mappings added through the tool are resolvable immediately"""
+        tool = StockFilterByEarningsTool(mapping_db_path=str(tmp_path / "mapping.db"))
+        tool.load_nifty_mappings()
+        tool.add_mapping('543320', 'ZOMATO', 'Zomato')
+
+        assert tool.get_nse_symbol('543320') == 'ZOMATO'
+        assert tool.get_bse_code('TCS') == '532540'
+        assert tool.map_bse_to_nse(['500325', '000000', '532540']) == {'500325': 'RELIANCE', '532540': 'TCS'}
+        assert tool.get_stats()['unmapped_codes'] == 1
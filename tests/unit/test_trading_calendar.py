@@ -0,0 +1,123 @@
+"""
+Unit tests for the NSE/BSE trading calendar
+
+Tests cover:
+- Holiday file loading (weekday closures and weekend sessions)
+- next/prev/offset/count_between navigation
+- Vectorized trading-day ordinals
+- UpperCircuitLabeler and PriceCollector using exchange sessions
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.trading_calendar import TradingCalendar, get_trading_calendar
+
+
+@pytest.fixture
+def calendar(tmp_path):
+    path = tmp_path / "holidays.csv"
+    path.write_text(
+        "date,kind,description\n"
+        "2024-11-15,holiday,Gurunanak Jayanti\n"
+        "2024-11-20,holiday,Elections\n"
+        "2024-11-23,session,Special Saturday session\n"
+    )
+    return TradingCalendar.from_file(str(path), start="2024-01-01", end="2024-12-31")
+
+
+class TestNavigation:
+    """Test single-date lookups"""
+
+    def test_holidays_and_sessions(self, calendar):
+        assert not calendar.is_trading_day("2024-11-15")
+        assert not calendar.is_trading_day("2024-11-16")
+        assert calendar.is_trading_day("2024-11-23")
+        assert calendar.is_trading_day("2024-11-14")
+
+    def test_next_and_prev_skip_closures(self, calendar):
+        assert calendar.next_trading_day("2024-11-14") == "2024-11-18"
+        assert calendar.prev_trading_day("2024-11-18") == "2024-11-14"
+        assert calendar.next_trading_day("2024-11-22") == "2024-11-23"
+
+    def test_offset_rolls_toward_travel(self, calendar):
+        assert calendar.offset("2024-11-16", 0) == "2024-11-14"
+        assert calendar.offset("2024-11-16", 1) == "2024-11-18"
+        assert calendar.offset("2024-11-16", -1) == "2024-11-14"
+        assert calendar.offset("2024-11-14", 4) == "2024-11-22"
+
+    def test_count_and_range(self, calendar):
+        days = calendar.trading_days("2024-11-01", "2024-11-30")
+
+        assert calendar.count_between("2024-11-01", "2024-11-30") == len(days) == 21 - 2 + 1
+        assert "2024-11-20" not in days and "2024-11-23" in days
+        assert calendar.count_between("2024-11-30", "2024-11-01") == 0
+
+    def test_outside_calendar_raises(self, calendar):
+        with pytest.raises(ValueError):
+            calendar.next_trading_day("2024-12-31")
+        with pytest.raises(ValueError):
+            calendar.count_between("2023-12-01", "2024-01-05")
+
+
+class TestOrdinals:
+    """Test vectorized conversion"""
+
+    def test_ordinals_are_session_positions(self, calendar):
+        ords = calendar.ordinals(["2024-11-14", "2024-11-18", "2024-11-22", "2024-11-23"])
+        assert np.diff(ords).tolist() == [1, 3, 1]  # 15th and 20th closed
+
+    def test_roll_direction_and_input_types(self, calendar):
+        dates = pd.to_datetime(["2024-11-15 00:00", "2024-11-16 09:15"])
+
+        forward = calendar.ordinals(dates)
+        backward = calendar.ordinals(["2024-11-15", "2024-11-16 09:15:00"], roll='backward')
+
+        assert calendar.from_ordinals(forward).astype(str).tolist() == ["2024-11-18", "2024-11-18"]
+        assert calendar.from_ordinals(backward).astype(str).tolist() == ["2024-11-14", "2024-11-14"]
+        with pytest.raises(ValueError):
+            calendar.ordinals(dates, roll='nearest')
+
+    def test_matches_linear_scan(self, calendar):
+        days = pd.date_range("2024-02-01", "2024-11-30")
+        ords = calendar.ordinals(days, roll='backward')
+
+        expected = [sum(calendar.is_trading_day(d) for d in pd.date_range("2024-01-01", day)) - 1 for day in days[::17]]
+        assert ords[::17].tolist() == expected
+
+
+class TestSharedCalendar:
+    """Test the default holiday file and its consumers"""
+
+    def test_default_file_loaded_once(self):
+        calendar = get_trading_calendar()
+
+        assert calendar is get_trading_calendar()
+        assert not calendar.is_trading_day("2024-11-15")
+        assert calendar.is_trading_day("2025-02-01")  # Budget-day Saturday session
+
+    def test_missing_file_falls_back_to_weekdays(self, tmp_path):
+        calendar = get_trading_calendar(str(tmp_path / "none.csv"))
+        assert calendar.is_trading_day("2024-11-15")
+
+    def test_labeler_skips_holidays(self, tmp_path):
+        from agents.ml.ml_data_collector import UpperCircuitLabeler
+
+        labeler = UpperCircuitLabeler(db_path=str(tmp_path / "test.db"), cache_dir=str(tmp_path / "cache"))
+
+        assert labeler.fetch_next_trading_day("2024-11-14") == "2024-11-18"
+        assert labeler.fetch_next_trading_day("2024-11-14", max_days=3) is None
+
+    def test_collector_downloads_sessions_only(self, tmp_path):
+        from agents.ml.ml_data_collector import PriceCollector
+
+        collector = PriceCollector(db_path=str(tmp_path / "test.db"), cache_dir=str(tmp_path / "cache"))
+
+        with patch('requests.get', side_effect=Exception("offline")) as mock_get, patch('time.sleep'):
+            collector.download_bse_bhav_copies("2024-11-14", "2024-11-20")
+
+        urls = [c.args[0] for c in mock_get.call_args_list]
+        assert sorted({u.split('EQ')[1][:6] for u in urls}) == ['141124', '181124', '191124']
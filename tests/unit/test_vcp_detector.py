@@ -0,0 +1,185 @@
+"""
+Unit tests for panel VCP detection
+
+Tests cover:
+- Contraction depths, volume dry-up and pivot proximity over a (days x symbols) panel
+- Ranking and shortlisting across symbols
+- Single-symbol wrappers agreeing with the panel scan
+- Scanning a BhavCopy archive
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from skills.vcp_detector import (
+    calculate_contraction_stages, detect_vcp_pattern, scan_vcp_panel, scan_vcp_universe, swing_highs
+)
+
+
+def vcp_closes(depths=(0.20, 0.10, 0.05), days=180):
+    """Uptrend into a base of pullbacks of the given depths, ending at the highs"""
+    closes = list(np.linspace(70, 100, days - 40 * len(depths)))
+    for depth in depths:
+        closes += list(np.linspace(100, 100 * (1 - depth), 20)) + list(np.linspace(100 * (1 - depth), 100, 20))
+    return np.array(closes)
+
+
+def panels(columns, volumes=None, start="2024-01-01"):
+    """Wide high/low/close/volume panels from {code: closes}"""
+    close = pd.DataFrame(columns)
+    close.index = pd.bdate_range(start, periods=len(close))
+    if volumes is None:
+        volumes = {code: [1_000_000] * (len(close) - 30) + [400_000] * 30 for code in close}
+    return {
+        'high': close * 1.005,
+        'low': close * 0.995,
+        'close': close,
+        'volume': pd.DataFrame(volumes, index=close.index, dtype=float),
+    }
+
+
+class TestSwingHighs:
+    """Test confirmed swing-high detection"""
+
+    def test_pivots_need_confirmation(self):
+        high = np.array([1, 3, 2, 2, 5, 4, 4, 4, 6, 5], dtype=float)[:, None]
+
+        pivots = swing_highs(high, window=2)[:, 0]
+
+        assert np.flatnonzero(pivots).tolist() == [4]  # Day 1 has one day before it, day 8 one after
+
+    def test_window_start_is_not_a_pivot(self):
+        high = np.array([9, 3, 2, 2, 5, 4, 4, 4, 6, 5, 4, 3], dtype=float)[:, None]
+
+        assert np.flatnonzero(swing_highs(high, window=2)[:, 0]).tolist() == [4, 8]
+
+    def test_falling_series_has_no_contractions(self):
+        scan = scan_vcp_panel(**panels({'FALLING': np.linspace(100, 60, 180)}), candidates_only=False)
+
+        assert scan.iloc[0]['num_contractions'] == 0
+        assert scan.iloc[0]['base_start'] is None
+
+
+class TestScanPanel:
+    """Test scoring the whole universe in one pass"""
+
+    def test_detects_tightening_base(self):
+        scan = scan_vcp_panel(**panels({'VCP': vcp_closes()}))
+
+        row = scan.iloc[0]
+        assert row['code'] == 'VCP'
+        assert row['num_contractions'] == 3
+        assert row['depths'] == pytest.approx([20.8, 10.9, 5.95], abs=0.01)
+        assert row['volume_ratio'] == pytest.approx(0.4444, abs=1e-4)
+        assert row['pivot_price'] == pytest.approx(100.5)
+        assert row['prior_gain_pct'] > 30
+
+    def test_rules_reject_and_rank(self):
+        data = panels({
+            'VCP': vcp_closes(),
+            'TIGHT': vcp_closes((0.15, 0.08, 0.04, 0.02)),
+            'WIDENING': vcp_closes((0.05, 0.10, 0.20)),
+            'DEEP': vcp_closes((0.40, 0.10, 0.05)),
+            'FALLING': np.linspace(100, 60, 180),
+        })
+
+        shortlist = scan_vcp_panel(**data)
+        everything = scan_vcp_panel(**data, candidates_only=False)
+
+        assert shortlist['code'].tolist() == ['TIGHT', 'VCP']
+        assert shortlist['rank'].tolist() == [1, 2]
+        assert len(everything) == 5
+        assert everything.set_index('code').loc['WIDENING', 'num_contractions'] == 1
+        assert scan_vcp_panel(**data, top_n=1)['code'].tolist() == ['TIGHT']
+
+    def test_volume_must_dry_up(self):
+        closes = vcp_closes()
+        data = panels({'VCP': closes}, volumes={'VCP': [1_000_000] * 150 + [3_000_000] * 30})
+
+        assert scan_vcp_panel(**data).empty
+
+    def test_sparse_symbols_and_short_history(self):
+        sparse = vcp_closes().copy()
+        sparse[10:40] = np.nan
+        data = panels({'VCP': vcp_closes(), 'SPARSE': sparse})
+
+        everything = scan_vcp_panel(**data, candidates_only=False)
+
+        assert everything['code'].tolist() == ['VCP']
+        assert scan_vcp_panel(**panels({'VCP': vcp_closes()[:100]})).empty
+
+    def test_matches_single_symbol_scans(self):
+        rng = np.random.default_rng(3)
+        walks = {f"S{i}": 100 * np.exp(np.cumsum(rng.normal(0.002, 0.02, 180))) for i in range(30)}
+        walks['VCP'] = vcp_closes()
+
+        joint = scan_vcp_panel(**panels(walks), candidates_only=False).set_index('code')
+        for code, closes in walks.items():
+            alone = scan_vcp_panel(**panels({code: closes}), candidates_only=False).iloc[0]
+            assert joint.loc[code, 'depths'] == alone['depths']
+            assert joint.loc[code, 'score'] == alone['score']
+
+
+class TestSingleSymbol:
+    """Test the per-symbol wrappers"""
+
+    @pytest.fixture
+    def price_data(self):
+        return [
+            {"date": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}", "open": c, "high": c * 1.005, "low": c * 0.995, "close": c}
+            for i, c in enumerate(vcp_closes())
+        ]
+
+    def test_contraction_stages(self, price_data):
+        stages = calculate_contraction_stages(price_data)
+
+        assert [s["stage_num"] for s in stages] == [1, 2, 3]
+        assert [s["depth_pct"] for s in stages] == pytest.approx([20.8, 10.9, 5.95], abs=0.01)
+        assert stages[0]["start_date"] == price_data[59]["date"]
+        assert stages[-1]["end_date"] == price_data[-1]["date"]
+        assert calculate_contraction_stages(price_data[:50]) == []
+
+    def test_detect_vcp_pattern(self, price_data):
+        volumes = [1_000_000] * 150 + [400_000] * 30
+
+        is_vcp, details = detect_vcp_pattern(price_data, volumes)
+
+        assert is_vcp
+        assert details["num_contractions"] == 3
+        assert details["volume_drying_up"] and details["near_highs"] and details["prior_uptrend"]
+        assert details["pattern_quality"] == "POTENTIAL"
+        assert detect_vcp_pattern(price_data, [1_000_000] * 180)[0] is False
+
+
+
+class TestScanUniverse:
+    """Test scanning the lookback window of a BhavCopy archive"""
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Archive with one tightening base and one downtrend"""
+        from tools.bhav_copy_archive import BhavCopyArchive
+
+        data = panels({'500325': vcp_closes(), '500209': np.linspace(100, 60, 180)})
+        archive = BhavCopyArchive(tmp_path / "archive")
+        for day in data['close'].index:
+            close = data['close'].loc[day].to_numpy()
+            archive.write_day("NSE", day.strftime("%Y-%m-%d"), pd.DataFrame({
+                'code': data['close'].columns, 'isin': '', 'name': '', 'series': 'EQ',
+                'open': close, 'high': data['high'].loc[day].to_numpy(), 'low': data['low'].loc[day].to_numpy(),
+                'close': close, 'prev_close': np.nan,
+                'volume': data['volume'].loc[day].to_numpy().astype(int), 'is_circuit': False
+            }))
+        return archive
+
+    def test_scan_archive(self, archive):
+        shortlist = scan_vcp_universe(archive.root, "NSE", top_n=10)
+
+        assert shortlist['code'].tolist() == ['500325']
+        assert shortlist.iloc[0]['num_contractions'] == 3
+        assert shortlist.iloc[0]['as_of'] == archive.dates("NSE")[-1]
+
+    def test_not_enough_history(self, archive, tmp_path):
+        assert scan_vcp_universe(archive, "NSE", end="2024-03-01").empty
+        assert scan_vcp_universe(tmp_path / "empty", "NSE").empty
@@ -382,6 +382,22 @@ class TestVCPWorkflow:
             assert result.symbol == "TCS"
 
 
+class TestVCPShortlist:
+    """Test the panel VCP scan shortlist feeding the per-symbol workflow"""
+
+    @pytest.mark.asyncio
+    async def test_run_shortlist(self):
+        """Test only shortlisted symbols reach the workflow stages, best first"""
+        workflow = VCPWorkflow(use_memory=False)
+        shortlist = pd.DataFrame({'rank': [1, 2, 3], 'code': ['500325', '500209', '532540']})
+
+        with patch.object(workflow, 'run', new_callable=AsyncMock) as mock_run:
+            results = await workflow.run_shortlist(shortlist, "NSE", limit=2)
+
+        assert [c.args for c in mock_run.await_args_list] == [('500325', "NSE"), ('500209', "NSE")]
+        assert len(results) == 2
+
+
 class TestWorkflowEdgeCases:
     """Test edge cases and error handling"""
 
@@ -3,6 +3,8 @@ Tools Library - Reusable utility functions for ML agents
 
 Tools are pure functions that agents can use for common tasks:
 - BhavCopy downloading and parsing
+- Columnar BhavCopy archive (parse once, query many)
+- Price completeness bitmap (gaps and missing ranges)
 - PDF downloading with caching and retry
 - ISIN-based matching for BSE→NSE mapping
 - Fuzzy name matching with configurable thresholds
@@ -17,11 +19,16 @@ Version: 1.0.0
 """
 
 from .bhav_copy_downloader import download_bse_bhav_copy, download_nse_bhav_copy, parse_bhav_copy
+from .bhav_copy_archive import BhavCopyArchive, read_bhav_csv
+from .price_completeness import PresenceBitmap, coalesce_ranges
 from .pdf_downloader import download_pdf, download_pdf_with_retry, cache_pdf
 from .isin_matcher import match_by_isin, build_isin_index
 from .fuzzy_name_matcher import fuzzy_match_companies, clean_company_name
 from .rate_limiter import RateLimiter, respect_rate_limit
-from .db_utils import get_db_connection, execute_query, bulk_insert
+from .db_utils import (
+    get_db_connection, execute_query, bulk_insert,
+    pooled_connection, executemany_batched, close_pooled_connections
+)
 from .validation_utils import validate_ohlc, validate_financials, validate_date_range
 
 __all__ = [
@@ -29,6 +36,12 @@ __all__ = [
     "download_bse_bhav_copy",
     "download_nse_bhav_copy",
     "parse_bhav_copy",
+    "BhavCopyArchive",
+    "read_bhav_csv",
+
+    # Price completeness
+    "PresenceBitmap",
+    "coalesce_ranges",
 
     # PDF tools
     "download_pdf",
@@ -49,6 +62,9 @@ __all__ = [
     "get_db_connection",
     "execute_query",
     "bulk_insert",
+    "pooled_connection",
+    "executemany_batched",
+    "close_pooled_connections",
 
     # Validation
     "validate_ohlc",
@@ -0,0 +1,369 @@
+"""
+BhavCopy Archive - Parse-once columnar store of daily BSE/NSE BhavCopy files
+
+Each day's BhavCopy CSV is read once with a vectorized CSV reader,
+normalized to a common schema and written as one compressed columnar
+partition per exchange and date:
+
+    {root}/{EXCHANGE}/{YYYY}/{YYYY-MM-DD}.npz
+
+Schema (one array per column):
+    code        BSE SC_CODE or NSE SYMBOL
+    isin        ISIN (empty if not published)
+    name        BSE SC_NAME / NSE NAME (empty if not published)
+    series      NSE SERIES, BSE SC_GROUP
+    open, high, low, close, prev_close   float64 (prev_close NaN if absent)
+    volume      int64
+    is_circuit  bool (BSE TDCLOINDI == 'C'; NSE files carry no flag)
+
+Downstream consumers (price storage, symbol mapping, circuit and
+completeness analysis) query the archive instead of re-reading CSVs.
+
+Author: VCP Financial Research Team
+Version: 1.0.0
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = [
+    'code', 'isin', 'name', 'series',
+    'open', 'high', 'low', 'close', 'prev_close', 'volume', 'is_circuit'
+]
+
+# Source column names per exchange (first present wins)
+_SOURCE_COLUMNS = {
+    'BSE': {
+        'code': ['SC_CODE'],
+        'isin': ['ISIN_CODE', 'SC_ISIN'],
+        'name': ['SC_NAME'],
+        'series': ['SC_GROUP'],
+        'open': ['OPEN'],
+        'high': ['HIGH'],
+        'low': ['LOW'],
+        'close': ['CLOSE'],
+        'prev_close': ['PREVCLOSE', 'PREV_CLOSE'],
+        'volume': ['NO_OF_SHRS'],
+        'circuit': ['TDCLOINDI'],
+    },
+    'NSE': {
+        'code': ['SYMBOL'],
+        'isin': ['ISIN'],
+        'name': ['NAME'],
+        'series': ['SERIES'],
+        'open': ['OPEN'],
+        'high': ['HIGH'],
+        'low': ['LOW'],
+        'close': ['CLOSE'],
+        'prev_close': ['PREVCLOSE', 'PREV_CLOSE'],
+        'volume': ['TOTTRDQTY'],
+        'circuit': [],
+    },
+}
+
+_STRING_COLUMNS = ('code', 'isin', 'name', 'series')
+_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'prev_close')
+
+
+def _check_exchange(exchange: str) -> str:
+    exchange = exchange.upper()
+    if exchange not in _SOURCE_COLUMNS:
+        raise ValueError(f"Invalid exchange: {exchange}. Must be 'BSE' or 'NSE'")
+    return exchange
+
+
+def bhav_copy_date(filename: str, exchange: str) -> str:
+    """
+    Trading date encoded in a BhavCopy filename.
+
+    Handles the downloader and collector cache names:
+    BSE: EQ131124.csv, BSE_EQ131124.CSV, EQ131124_CSV.CSV
+    NSE: cm13NOV2024bhav.csv, NSE_cm13NOV2024bhav.csv
+
+    Args:
+        filename: BhavCopy file name (path allowed)
+        exchange: "BSE" or "NSE"
+
+    Returns:
+        ISO date string (YYYY-MM-DD)
+
+    Raises:
+        ValueError: If no date can be found in the name
+    """
+    name = Path(filename).name
+    if _check_exchange(exchange) == 'BSE':
+        match = re.search(r'EQ(\d{6})', name, re.IGNORECASE)
+        fmt = "%d%m%y"
+    else:
+        match = re.search(r'cm(\d{2}[A-Za-z]{3}\d{4})bhav', name, re.IGNORECASE)
+        fmt = "%d%b%Y"
+    if not match:
+        raise ValueError(f"No {exchange} BhavCopy date in filename: {name}")
+    return datetime.strptime(match.group(1).upper(), fmt).strftime("%Y-%m-%d")
+
+
+def read_bhav_csv(csv_path: Union[str, Path], exchange: str) -> pd.DataFrame:
+    """
+    Read one BhavCopy CSV into the archive schema (vectorized).
+
+    Every row is kept; callers filter by series or price as they need.
+    Missing source columns become empty strings, NaN prices, zero volume.
+
+    Args:
+        csv_path: BhavCopy CSV path
+        exchange: "BSE" or "NSE"
+
+    Returns:
+        DataFrame with ARCHIVE_COLUMNS
+
+    Raises:
+        FileNotFoundError: If the CSV doesn't exist
+        ValueError: If exchange is invalid
+
+    Example:
+        df = read_bhav_csv("/tmp/bhav_copy_cache/BSE_EQ131124.CSV", "BSE")
+        circuits = df[df['is_circuit']]
+    """
+    exchange = _check_exchange(exchange)
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"BhavCopy file not found: {csv_path}")
+
+    raw = pd.read_csv(csv_path, dtype=str, keep_default_na=False, skipinitialspace=True)
+    raw.columns = [str(col).strip().upper() for col in raw.columns]
+
+    def source(field: str) -> Optional[pd.Series]:
+        for col in _SOURCE_COLUMNS[exchange][field]:
+            if col in raw.columns:
+                return raw[col]
+        return None
+
+    n = len(raw)
+    out = {}
+    for field in _STRING_COLUMNS:
+        col = source(field)
+        out[field] = col.str.strip().to_numpy(dtype=str) if col is not None else np.full(n, '', dtype=str)
+
+    for field in _PRICE_COLUMNS:
+        col = source(field)
+        out[field] = (
+            pd.to_numeric(col.str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=float)
+            if col is not None else np.full(n, np.nan)
+        )
+
+    volume = source('volume')
+    out['volume'] = (
+        pd.to_numeric(volume.str.replace(',', '', regex=False), errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        if volume is not None else np.zeros(n, dtype=np.int64)
+    )
+
+    circuit = source('circuit')
+    out['is_circuit'] = (
+        (circuit.str.strip().str.upper() == 'C').to_numpy()
+        if circuit is not None else np.zeros(n, dtype=bool)
+    )
+
+    return pd.DataFrame(out, columns=ARCHIVE_COLUMNS)
+
+
+class BhavCopyArchive:
+    """
+    Date-partitioned columnar archive of BhavCopy data.
+
+    A partition remembers the size and mtime of the CSV it was built from,
+    so ingesting the same file again is a cheap partition read while a
+    re-downloaded (changed) file is re-parsed.
+
+    Example:
+        archive = BhavCopyArchive("data/bhav_copy_cache/archive")
+        archive.ingest_file("/tmp/bhav_copy_cache/BSE_EQ131124.CSV", "BSE")
+        closes = archive.panel("close", "BSE", start="2024-01-01")
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def partition_path(self, exchange: str, date: str) -> Path:
+        """Path of one day's partition"""
+        return self.root / _check_exchange(exchange) / date[:4] / f"{date}.npz"
+
+    def has_day(self, exchange: str, date: str) -> bool:
+        return self.partition_path(exchange, date).exists()
+
+    def dates(self, exchange: str) -> List[str]:
+        """Archived trading dates for an exchange, ascending"""
+        base = self.root / _check_exchange(exchange)
+        if not base.exists():
+            return []
+        return sorted(p.stem for p in base.glob("*/*.npz"))
+
+    def write_day(self, exchange: str, date: str, frame: pd.DataFrame, source: Optional[Path] = None) -> Path:
+        """
+        Write (or replace) one day's partition atomically.
+
+        Args:
+            exchange: "BSE" or "NSE"
+            date: Trading date (YYYY-MM-DD)
+            frame: DataFrame with ARCHIVE_COLUMNS
+            source: CSV the frame was parsed from (recorded for re-ingest checks)
+
+        Returns:
+            Partition path
+        """
+        path = self.partition_path(exchange, date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {}
+        for col in ARCHIVE_COLUMNS:
+            values = frame[col].to_numpy()
+            arrays[col] = values.astype(str) if col in _STRING_COLUMNS else values
+        arrays['_source'] = np.array(self._fingerprint(source) if source else '')
+
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    def read_day(self, exchange: str, date: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        One day's partition as a DataFrame (empty if not archived).
+
+        Args:
+            exchange: "BSE" or "NSE"
+            date: Trading date (YYYY-MM-DD)
+            columns: Subset of ARCHIVE_COLUMNS (default: all)
+        """
+        columns = list(columns or ARCHIVE_COLUMNS)
+        path = self.partition_path(exchange, date)
+        if not path.exists():
+            return pd.DataFrame(columns=columns)
+        with np.load(path, allow_pickle=False) as data:
+            return pd.DataFrame({col: data[col] for col in columns}, columns=columns)
+
+    def ingest_file(self, csv_path: Union[str, Path], exchange: str, date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Parse a BhavCopy CSV once and archive it.
+
+        If the day is already archived from this same file (size and mtime
+        unchanged) the partition is returned without touching the CSV.
+
+        Args:
+            csv_path: BhavCopy CSV path
+            exchange: "BSE" or "NSE"
+            date: Trading date (default: parsed from the filename)
+
+        Returns:
+            DataFrame with ARCHIVE_COLUMNS
+        """
+        csv_path = Path(csv_path)
+        date = date or bhav_copy_date(csv_path.name, exchange)
+        path = self.partition_path(exchange, date)
+
+        if path.exists() and csv_path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['_source']) == self._fingerprint(csv_path):
+                    return pd.DataFrame({col: data[col] for col in ARCHIVE_COLUMNS}, columns=ARCHIVE_COLUMNS)
+
+        frame = read_bhav_csv(csv_path, exchange)
+        self.write_day(exchange, date, frame, source=csv_path)
+        logger.debug(f"Archived {exchange} {date}: {len(frame)} rows")
+        return frame
+
+    def ingest_files(self, csv_paths: Iterable[Union[str, Path]], exchange: str) -> int:
+        """
+        Archive many daily files (e.g. a multi-year backfill).
+
+        Returns:
+            Number of days archived
+        """
+        days = 0
+        for csv_path in csv_paths:
+            try:
+                self.ingest_file(csv_path, exchange)
+                days += 1
+            except (ValueError, FileNotFoundError) as e:
+                logger.warning(f"Skipping {csv_path}: {e}")
+        logger.info(f"Archived {days} {exchange} BhavCopy days")
+        return days
+
+    def read(
+        self,
+        exchange: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        codes: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Long-format rows for a date range.
+
+        Args:
+            exchange: "BSE" or "NSE"
+            start: First date, inclusive (default: earliest)
+            end: Last date, inclusive (default: latest)
+            columns: Subset of ARCHIVE_COLUMNS (default: all)
+            codes: Restrict to these codes
+
+        Returns:
+            DataFrame with 'date' followed by the requested columns
+        """
+        columns = list(columns or ARCHIVE_COLUMNS)
+        load = columns if 'code' in columns or codes is None else ['code'] + columns
+        wanted = set(codes) if codes is not None else None
+
+        frames = []
+        for date in self.dates(exchange):
+            if (start and date < start) or (end and date > end):
+                continue
+            day = self.read_day(exchange, date, load)
+            if wanted is not None:
+                day = day[day['code'].isin(wanted)]
+            day.insert(0, 'date', date)
+            frames.append(day[['date'] + columns])
+
+        if not frames:
+            return pd.DataFrame(columns=['date'] + columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def panel(
+        self,
+        field: str,
+        exchange: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        codes: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Wide (date x code) panel of one field.
+
+        Args:
+            field: Numeric or boolean archive column (e.g. 'close', 'is_circuit')
+            exchange: "BSE" or "NSE"
+            start: First date, inclusive
+            end: Last date, inclusive
+            codes: Restrict to these codes
+
+        Returns:
+            DataFrame indexed by date (DatetimeIndex), one column per code;
+            NaN where a code did not trade
+        """
+        rows = self.read(exchange, start, end, columns=['code', field], codes=codes)
+        rows = rows.drop_duplicates(['date', 'code'], keep='last')
+        panel = rows.pivot(index='date', columns='code', values=field)
+        panel.index = pd.to_datetime(panel.index)
+        panel.columns.name = None
+        return panel
+
+    @staticmethod
+    def _fingerprint(path: Path) -> str:
+        stat = Path(path).stat()
+        return f"{Path(path).name}:{stat.st_size}:{stat.st_mtime_ns}"
@@ -14,12 +14,13 @@ Version: 1.0.0
 import logging
 import zipfile
 import io
-import csv
+import pandas as pd
 import requests
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 from .rate_limiter import BSE_RATE_LIMITER, NSE_RATE_LIMITER, respect_rate_limit
+from .bhav_copy_archive import read_bhav_csv
 
 logger = logging.getLogger(__name__)
 
@@ -246,56 +247,33 @@ def parse_bhav_copy(
     if exchange not in ("BSE", "NSE"):
         raise ValueError(f"Invalid exchange: {exchange}. Must be 'BSE' or 'NSE'")
 
-    records = []
-
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                if exchange == "BSE":
-                    # BSE CSV columns: SC_CODE, SC_NAME, OPEN, HIGH, LOW, CLOSE, ...
-                    record = {
-                        "exchange": "BSE",
-                        "symbol": row.get("SC_CODE", "").strip(),
-                        "name": row.get("SC_NAME", "").strip(),
-                        "isin": row.get("ISIN_CODE", "").strip(),
-                        "open": float(row.get("OPEN", 0) or 0),
-                        "high": float(row.get("HIGH", 0) or 0),
-                        "low": float(row.get("LOW", 0) or 0),
-                        "close": float(row.get("CLOSE", 0) or 0),
-                        "volume": int(row.get("NO_OF_SHRS", 0) or 0),
-                        "date": _parse_bse_date(csv_path.name),  # Extract from filename
-                        "is_circuit": False  # Need to compare with prev close to detect
-                    }
-
-                elif exchange == "NSE":
-                    # NSE CSV columns: SYMBOL, SERIES, OPEN, HIGH, LOW, CLOSE, ...
-                    series = row.get("SERIES", "").strip()
-
-                    # Only include equity series (EQ, BE, BZ, etc.)
-                    if series not in ("EQ", "BE", "BZ"):
-                        continue
-
-                    record = {
-                        "exchange": "NSE",
-                        "symbol": row.get("SYMBOL", "").strip(),
-                        "name": row.get("SYMBOL", "").strip(),  # NSE doesn't provide full name
-                        "isin": row.get("ISIN", "").strip(),
-                        "open": float(row.get("OPEN", 0) or 0),
-                        "high": float(row.get("HIGH", 0) or 0),
-                        "low": float(row.get("LOW", 0) or 0),
-                        "close": float(row.get("CLOSE", 0) or 0),
-                        "volume": int(row.get("TOTTRDQTY", 0) or 0),
-                        "date": _parse_nse_date(csv_path.name),
-                        "is_circuit": False
-                    }
-
-                # Skip records with invalid prices
-                if record["close"] <= 0:
-                    continue
-
-                records.append(record)
+        frame = read_bhav_csv(csv_path, exchange)
+
+        if exchange == "BSE":
+            date = _parse_bse_date(csv_path.name)  # Extract from filename
+        else:
+            date = _parse_nse_date(csv_path.name)
+            # Only include equity series (EQ, BE, BZ, etc.); NSE doesn't provide full name
+            frame = frame[frame["series"].isin(("EQ", "BE", "BZ"))]
+            frame = frame.assign(name=frame["code"])
+
+        # Skip records with invalid prices
+        frame = frame[frame["close"] > 0].fillna({"open": 0.0, "high": 0.0, "low": 0.0})
+
+        records = pd.DataFrame({
+            "exchange": exchange,
+            "symbol": frame["code"],
+            "name": frame["name"],
+            "isin": frame["isin"],
+            "open": frame["open"],
+            "high": frame["high"],
+            "low": frame["low"],
+            "close": frame["close"],
+            "volume": frame["volume"],
+            "date": date,
+            "is_circuit": frame["is_circuit"]
+        }).to_dict("records")
 
         logger.info(f"Parsed {len(records)} records from {csv_path.name}")
         return records
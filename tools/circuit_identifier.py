@@ -13,11 +13,55 @@ import pandas as pd
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from skills.circuit_detector import align_prev_close, circuit_bands
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def load_price_changes(
+    db_path: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Day-over-day % change for every row of price_movements in one pass.
+
+    Each row is aligned with the previous trading row of the same company,
+    so Monday moves compare against Friday's close.
+
+    Args:
+        db_path: Path to price_movements.db
+        start_date: First move date to return (YYYY-MM-DD)
+        end_date: Last move date to return (YYYY-MM-DD)
+
+    Returns:
+        DataFrame with bse_code, date, prev_close, close, pct_change, volume
+        (rows without a positive previous close are dropped)
+    """
+    query = "SELECT bse_code, date, close, volume FROM price_movements WHERE bse_code IS NOT NULL"
+    params = []
+    if end_date:
+        query += " AND date <= ?"
+        params.append(end_date)
+    query += " ORDER BY bse_code, date"
+
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    df['prev_close'] = align_prev_close(df['bse_code'].to_numpy(), df['close'].to_numpy())
+    df = df[df['prev_close'] > 0]
+    if start_date:
+        df = df[df['date'] >= start_date]
+
+    df = df.assign(pct_change=(df['close'] - df['prev_close']) / df['prev_close'] * 100)
+    return df[['bse_code', 'date', 'prev_close', 'close', 'pct_change', 'volume']].reset_index(drop=True)
+
+
 def identify_circuits(
     db_path: str,
     threshold: float = 10.0,
@@ -34,42 +78,21 @@ def identify_circuits(
         end_date: End date for analysis (YYYY-MM-DD)
         
     Returns:
-        List of circuit events with details
+        List of circuit events with details (circuit_date is the day of the
+        move; band is the largest SEBI price band the move reached)
     """
-    conn = sqlite3.connect(db_path)
-    
-    # Build query
-    query = """
-        SELECT 
-            p1.bse_code,
-            p1.date as circuit_date,
-            p1.close as prev_close,
-            p2.close as circuit_close,
-            ((p2.close - p1.close) / p1.close * 100) as pct_change,
-            p2.volume
-        FROM price_movements p1
-        JOIN price_movements p2 
-            ON p1.bse_code = p2.bse_code 
-            AND date(p2.date) = date(p1.date, '+1 day')
-        WHERE ((p2.close - p1.close) / p1.close * 100) >= ?
-    """
-    
-    params = [threshold]
-    
-    if start_date:
-        query += " AND p2.date >= ?"
-        params.append(start_date)
-    
-    if end_date:
-        query += " AND p2.date <= ?"
-        params.append(end_date)
-    
-    query += " ORDER BY pct_change DESC"
-    
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
-    
-    circuits = df.to_dict('records')
+    moves = load_price_changes(db_path, start_date, end_date)
+    hits = moves[moves['pct_change'] >= threshold].sort_values('pct_change', ascending=False, kind='stable')
+
+    circuits = pd.DataFrame({
+        'bse_code': hits['bse_code'],
+        'circuit_date': hits['date'],
+        'prev_close': hits['prev_close'],
+        'circuit_close': hits['close'],
+        'pct_change': hits['pct_change'],
+        'band': circuit_bands(hits['pct_change'].to_numpy()),
+        'volume': hits['volume']
+    }).to_dict('records')
     
     logger.info(f"Found {len(circuits)} circuit events with threshold >= {threshold}%")
     
@@ -12,6 +12,8 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools.bhav_copy_archive import read_bhav_csv
+
 NSE_CSV = PROJECT_ROOT / "nse_equity_list.csv"
 BSE_BHAV_COPY = PROJECT_ROOT / "data" / "cache" / "bhav_copy" / "BSE_EQ241224.CSV"
 OUTPUT_DIR = PROJECT_ROOT / "agents" / "backtesting" / "symbol_lists"
@@ -57,21 +59,16 @@ def extract_bse_symbols_from_bhav():
 
     print(f"Reading BSE Bhav Copy from {BSE_BHAV_COPY}...")
 
-    with open(BSE_BHAV_COPY, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # BSE format: SC_NAME contains stock name
-            stock_name = row.get('SC_NAME', '').strip()
-            sc_code = row.get('SC_CODE', '').strip()
-
-            if stock_name and len(stock_name) > 0:
-                # Clean the stock name to create symbol
-                # BSE names like "ABB LTD.    " -> "ABBLTD"
-                clean_sym = clean_symbol(stock_name)
-
-                # Only add if it looks like a valid symbol (not too long)
-                if len(clean_sym) > 0 and len(clean_sym) <= 25:
-                    symbols.add(f"{clean_sym}.NS")
+    # BSE format: SC_NAME contains stock name
+    for stock_name in read_bhav_csv(BSE_BHAV_COPY, "BSE")['name']:
+        if stock_name and len(stock_name) > 0:
+            # Clean the stock name to create symbol
+            # BSE names like "ABB LTD.    " -> "ABBLTD"
+            clean_sym = clean_symbol(stock_name)
+
+            # Only add if it looks like a valid symbol (not too long)
+            if len(clean_sym) > 0 and len(clean_sym) <= 25:
+                symbols.add(f"{clean_sym}.NS")
 
     print(f"  Found {len(symbols)} BSE symbols")
     return symbols
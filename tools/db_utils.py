@@ -4,18 +4,360 @@ Database Utilities - SQLite operations for ML agents
 Provides reusable database connection, query execution, and bulk insert operations.
 All functions are thread-safe and use context managers for proper resource cleanup.
 
+Pooled access (`pooled_connection`) keeps one connection per (thread, db path,
+mode) open for the life of the thread instead of connecting per call:
+- Tuned pragmas: WAL journal, synchronous=NORMAL, 64MB page cache, 256MB mmap,
+  30s busy timeout (concurrent writer/reader jobs wait instead of failing
+  with "database is locked")
+- Read-only URI mode (`read_only=True`) for readers
+- Prepared statements reused through the connection's statement cache
+- Batched writes (`executemany_batched`)
+- Query tracing (`QueryTrace`, or VCP_SQL_TRACE_FILE=<path>) feeding the
+  index advisor in agents/ml/optimization/index_advisor.py
+
 Author: VCP Financial Research Team
-Version: 1.0.0
+Version: 1.1.0
 """
 
+import atexit
+import json
+import os
+import re
 import sqlite3
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Applied to every pooled connection (and get_db_connection)
+DEFAULT_PRAGMAS = {
+    'busy_timeout': 30000,
+    'synchronous': 'NORMAL',
+    'cache_size': -65536,       # KiB (64MB)
+    'mmap_size': 268435456,     # 256MB
+    'temp_store': 'MEMORY',
+}
+
+# Prepared statements kept per connection
+STATEMENT_CACHE_SIZE = 256
+
+
+def configure_connection(conn: sqlite3.Connection, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Apply the standard pragmas to a connection.
+
+    Writers also switch the database to WAL (persistent, so readers opened
+    later see it). Read-only connections are marked query_only.
+    """
+    for pragma, value in DEFAULT_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma}={value}")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    else:
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class ConnectionPool:
+    """
+    Per-thread pooled SQLite connections, one per (db path, mode).
+
+    Connections are reused across calls on the same thread, reopened when the
+    database file is replaced or deleted, and dropped after a fork. An
+    optional trace hook receives (db_path, sql) for every statement run on a
+    pooled connection (see QueryTrace).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: Dict[sqlite3.Connection, str] = {}
+        self._pid = os.getpid()
+        self._trace_hook: Optional[Callable[[str, str], None]] = None
+
+    def _connections(self) -> Dict[Tuple[str, bool], list]:
+        if self._pid != os.getpid():
+            # Forked child: never share the parent's connections
+            self._local = threading.local()
+            self._all = {}
+            self._pid = os.getpid()
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    @staticmethod
+    def _file_id(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def _open(self, path: str, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(
+                Path(path).resolve().as_uri() + '?mode=ro', uri=True, timeout=30.0,
+                check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                path, timeout=30.0, check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+        configure_connection(conn, read_only=read_only)
+        self.install_trace(conn, path)
+        with self._lock:
+            self._all[conn] = path
+        logger.debug(f"Opened pooled {'read-only ' if read_only else ''}connection: {path}")
+        return conn
+
+    def acquire(self, db_path: str, read_only: bool = False) -> list:
+        """
+        The calling thread's pool entry [connection, file id, depth] for db_path.
+
+        Raises:
+            sqlite3.OperationalError: If a read-only database does not exist
+        """
+        path = str(db_path)
+        connections = self._connections()
+        key = (path, read_only)
+        entry = connections.get(key)
+
+        if path == ':memory:':
+            if entry is None:
+                entry = connections[key] = [self._open(path, False), None, 0]
+            return entry
+
+        file_id = self._file_id(path)
+        if entry is not None and (file_id is None or file_id != entry[1]) and entry[2] == 0:
+            # Database deleted or replaced since this connection was opened
+            self._discard(entry[0])
+            entry = None
+
+        if entry is None:
+            conn = self._open(path, read_only)
+            entry = connections[key] = [conn, self._file_id(path), 0]
+        return entry
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._all.pop(conn, None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        """Close every pooled connection (all threads)"""
+        with self._lock:
+            connections, self._all = list(self._all), {}
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def install_trace(self, conn: sqlite3.Connection, db_path: str):
+        """Attach (or clear) the current trace hook on a connection"""
+        hook = self._trace_hook
+        conn.set_trace_callback(None if hook is None else (lambda sql: hook(db_path, sql)))
+
+    def set_trace_hook(self, hook: Optional[Callable[[str, str], None]]):
+        """
+        Route every statement on pooled connections to hook(db_path, sql).
+
+        Applies to open and future connections; None removes tracing.
+        """
+        with self._lock:
+            self._trace_hook = hook
+            connections = list(self._all.items())
+        for conn, path in connections:
+            self.install_trace(conn, path)
+
+    def size(self) -> int:
+        """Number of open pooled connections"""
+        with self._lock:
+            return len(self._all)
+
+
+_pool = ConnectionPool()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Process-wide connection pool"""
+    return _pool
+
+
+@contextmanager
+def pooled_connection(
+    db_path: str,
+    read_only: bool = False,
+    row_factory: Optional[Callable] = None
+):
+    """
+    Borrow the calling thread's pooled connection for db_path.
+
+    The outermost block commits on success and rolls back on error; nested
+    blocks on the same path share the transaction. The connection stays open
+    for reuse, so callers must not close it.
+
+    Args:
+        db_path: Path to SQLite database file
+        read_only: Open with mode=ro (database must exist; writes fail)
+        row_factory: Row factory for this block (e.g. sqlite3.Row), restored on exit
+
+    Yields:
+        sqlite3.Connection
+
+    Example:
+        with pooled_connection("data/price_movements.db", read_only=True) as conn:
+            df = pd.read_sql_query(query, conn, params=(bse_code,))
+    """
+    entry = _pool.acquire(db_path, read_only)
+    conn = entry[0]
+    previous_factory = conn.row_factory
+    conn.row_factory = row_factory
+    entry[2] += 1
+
+    try:
+        yield conn
+        if entry[2] == 1 and conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if entry[2] == 1 and conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        entry[2] -= 1
+        conn.row_factory = previous_factory
+
+
+def close_pooled_connections():
+    """Close all pooled connections (e.g. before deleting database files)"""
+    _pool.close_all()
+
+
+# ============================================================================
+# Query tracing
+# ============================================================================
+
+# Set to a JSON path to trace every pooled query for the life of the process
+ENV_SQL_TRACE_FILE = 'VCP_SQL_TRACE_FILE'
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_UNTRACED = ('PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'RELEASE', 'SAVEPOINT')
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and replace literals with ? (groups calls of one statement)"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    return ' '.join(sql.split())
+
+
+class QueryTrace:
+    """
+    Collects the SQL issued through pooled connections.
+
+    Per database: normalized statement -> call count and one expanded example
+    (parameters inlined, so it can be EXPLAINed and timed as issued).
+
+    Example:
+        with QueryTrace() as trace:
+            extractor.extract_features_batch(samples)
+        trace.save("logs/sql_trace.json")
+    """
+
+    def __init__(self):
+        self.queries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, db_path: str, sql: str):
+        """Trace hook: count one executed statement"""
+        if sql.lstrip().upper().startswith(_UNTRACED):
+            return
+        normalized = normalize_sql(sql)
+        with self._lock:
+            entry = self.queries.setdefault(db_path, {}).setdefault(
+                normalized, {'count': 0, 'example': sql}
+            )
+            entry['count'] += 1
+
+    def start(self) -> "QueryTrace":
+        _pool.set_trace_hook(self.record)
+        return self
+
+    def stop(self):
+        _pool.set_trace_hook(None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+    def save(self, path: str):
+        """Write the trace as JSON"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(path, 'w') as f:
+            json.dump(self.queries, f, indent=2)
+        logger.info(f"SQL trace written: {path} ({sum(len(q) for q in self.queries.values())} statements)")
+
+    @classmethod
+    def load(cls, path: str) -> "QueryTrace":
+        """Read a trace written by save()"""
+        trace = cls()
+        with open(path) as f:
+            trace.queries = json.load(f)
+        return trace
+
+
+if os.environ.get(ENV_SQL_TRACE_FILE):
+    _env_trace = QueryTrace().start()
+    atexit.register(_env_trace.save, os.environ[ENV_SQL_TRACE_FILE])
+
+
+def executemany_batched(
+    db_path: str,
+    query: str,
+    rows: Iterable[Sequence[Any]],
+    batch_size: int = 1000
+) -> int:
+    """
+    Execute a write statement for many rows, one transaction per batch.
+
+    Args:
+        db_path: Path to SQLite database
+        query: Parameterised INSERT/UPDATE statement
+        rows: Parameter tuples
+        batch_size: Rows per transaction (default: 1000)
+
+    Returns:
+        Total rows affected
+    """
+    total = 0
+    batch: List[Sequence[Any]] = []
+
+    with pooled_connection(db_path) as conn:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += conn.executemany(query, batch).rowcount
+                conn.commit()
+                batch = []
+        if batch:
+            total += conn.executemany(query, batch).rowcount
+
+    return total
+
 
 @contextmanager
 def get_db_connection(db_path: str, timeout: float = 30.0):
@@ -44,6 +386,8 @@ def get_db_connection(db_path: str, timeout: float = 30.0):
     conn = None
     try:
         conn = sqlite3.connect(db_path, timeout=timeout)
+        configure_connection(conn)
+        _pool.install_trace(conn, db_path)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         logger.debug(f"Connected to database: {db_path}")
         yield conn
@@ -96,7 +440,7 @@ def execute_query(
             commit=True
         )
     """
-    with get_db_connection(db_path) as conn:
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         cursor = conn.cursor()
 
         try:
@@ -186,7 +530,7 @@ def bulk_insert(
 
     total_inserted = 0
 
-    with get_db_connection(db_path) as conn:
+    with pooled_connection(db_path) as conn:
         cursor = conn.cursor()
 
         # Process in batches
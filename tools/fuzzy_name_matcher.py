@@ -12,11 +12,16 @@ Version: 1.0.0
 
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from difflib import SequenceMatcher
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+_NON_ALNUM = re.compile(r"(?ui)\W")
+_LATIN1_DROP = dict.fromkeys(range(128, 256))
+
 
 def clean_company_name(name: str) -> str:
     """
@@ -204,6 +209,93 @@ def partial_ratio(s1: str, s2: str) -> float:
     return best_ratio
 
 
+def token_sort_key(name: str) -> str:
+    """
+    Normalise a name the way token_sort_ratio compares it.
+
+    Mirrors fuzzywuzzy's token sort preprocessing (Latin-1 range dropped as
+    with force_ascii, non-alphanumerics to spaces, lowercase, tokens sorted),
+    so character-bag bounds computed on this key hold for
+    fuzz.token_sort_ratio as well as token_sort_ratio here.
+
+    Example:
+        >>> token_sort_key("Tata Consultancy-Services")
+        "consultancy services tata"
+    """
+    name = name.translate(_LATIN1_DROP)
+    return " ".join(sorted(_NON_ALNUM.sub(" ", name).lower().split()))
+
+
+class CharBagIndex:
+    """
+    Candidate blocking by character-bag distance.
+
+    For any two strings, the matched characters of difflib's ratio (or the
+    Levenshtein indel ratio) cannot exceed the per-character overlap of
+    their character multisets, so
+
+        ratio(a, b) <= 1 - sum_c |count_a(c) - count_b(c)| / (len(a) + len(b))
+
+    Discarding targets whose bound is below a threshold is therefore
+    lossless: every target that could reach the threshold is kept, in the
+    original order, so first-best tie-breaking is unchanged.
+
+    Example:
+        index = CharBagIndex([token_sort_key(n) for n in nse_names])
+        for i in index.candidates(token_sort_key(bse_name), min_ratio=0.795):
+            score(bse_name, nse_names[i])
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        """
+        Args:
+            keys: Normalised target strings (e.g. token_sort_key of each name)
+        """
+        self.vocab: Dict[str, int] = {}
+        for key in keys:
+            for ch in key:
+                self.vocab.setdefault(ch, len(self.vocab))
+
+        # Last column counts characters outside the target vocabulary (always 0 for targets)
+        self.counts = np.zeros((len(keys), len(self.vocab) + 1), dtype=np.int32)
+        for row, key in enumerate(keys):
+            for ch in key:
+                self.counts[row, self.vocab[ch]] += 1
+        self.lengths = np.fromiter((len(k) for k in keys), dtype=np.int64, count=len(keys))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def _query_vector(self, query: str) -> np.ndarray:
+        vector = np.zeros(self.counts.shape[1], dtype=np.int32)
+        for ch in query:
+            vector[self.vocab.get(ch, -1)] += 1
+        return vector
+
+    def upper_bounds(self, query: str) -> np.ndarray:
+        """Upper bound of ratio(query, target) for every target (0.0 - 1.0)"""
+        distance = np.abs(self.counts - self._query_vector(query)).sum(axis=1)
+        total = self.lengths + len(query)
+        return np.where(total > 0, 1.0 - distance / np.maximum(total, 1), 1.0)
+
+    def candidates(self, query: str, min_ratio: float) -> np.ndarray:
+        """Indices (ascending) of targets whose bound reaches min_ratio"""
+        return np.flatnonzero(self.upper_bounds(query) >= min_ratio - 1e-9)
+
+
+def _weighted(token_score: float, partial_score: float, overall_score: float) -> float:
+    return (
+        token_score * 0.40 +
+        partial_score * 0.30 +
+        overall_score * 0.30
+    )
+
+
+def _combined_score(clean1: str, clean2: str) -> float:
+    """fuzzy_match_companies' combined score for already-cleaned names"""
+    return _weighted(token_sort_ratio(clean1, clean2), partial_ratio(clean1, clean2), fuzzy_ratio(clean1, clean2))
+
+
 def fuzzy_match_companies(
     name1: str,
     name2: str,
@@ -250,11 +342,7 @@ def fuzzy_match_companies(
     overall_score = fuzzy_ratio(clean1, clean2)
 
     # Weighted combination
-    combined_score = (
-        token_score * 0.40 +
-        partial_score * 0.30 +
-        overall_score * 0.30
-    )
+    combined_score = _weighted(token_score, partial_score, overall_score)
 
     scores = {
         "token_sort_ratio": token_score,
@@ -363,26 +451,36 @@ def batch_fuzzy_match(
     """
     matches = []
 
+    # Clean targets once and block on the token-sort / overall components:
+    # score = 0.4*token_sort + 0.3*partial + 0.3*overall <= 0.7*bound + 0.3
+    targets = [
+        (rec, clean_company_name(rec.get(target_name_key, "")))
+        for rec in target_records
+        if rec.get(target_name_key, "")
+    ]
+    index = CharBagIndex([token_sort_key(clean) for _, clean in targets])
+    min_bound = (threshold - 0.3) / 0.7
+
     for source_rec in source_records:
         source_name = source_rec.get(source_name_key, "")
         if not source_name:
             continue
 
+        source_clean = clean_company_name(source_name)
+        if not source_clean:
+            continue
+
         best_match = None
         best_score = 0.0
 
-        for target_rec in target_records:
-            target_name = target_rec.get(target_name_key, "")
-            if not target_name:
+        for i in index.candidates(token_sort_key(source_clean), min_bound):
+            target_rec, target_clean = targets[i]
+            if not target_clean:
                 continue
 
-            is_match, score, details = fuzzy_match_companies(
-                source_name,
-                target_name,
-                threshold=threshold
-            )
+            score = _combined_score(source_clean, target_clean)
 
-            if is_match and score > best_score:
+            if score >= threshold and score > best_score:
                 best_match = target_rec
                 best_score = score
 
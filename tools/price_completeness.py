@@ -0,0 +1,243 @@
+"""
+Price Completeness - Presence bitmap over (codes x trading days)
+
+Loads which (code, date) pairs exist in price_movements with one query and
+answers every completeness question with array operations:
+
+- completeness percentage per code
+- missing trading days per code
+- contiguous missing runs per code
+- missing runs coalesced into the fewest range fetches per code
+
+The day axis is the expected trading calendar (NSE/BSE sessions by default)
+plus any other date that actually has rows. Rows on off-calendar dates count
+as data, but only calendar days can be reported missing.
+
+Author: VCP Financial Research Team
+Version: 1.0.0
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.trading_calendar import get_trading_calendar
+
+from .db_utils import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+DateRange = Tuple[str, str]
+
+
+def weekday_calendar(start_date: str, end_date: str) -> List[str]:
+    """Weekdays from start_date to end_date inclusive, as YYYY-MM-DD"""
+    return pd.bdate_range(start_date, end_date).strftime("%Y-%m-%d").tolist()
+
+
+def coalesce_ranges(positions: Sequence[int], max_gap: int = 0) -> List[Tuple[int, int]]:
+    """
+    Group sorted integer positions into (first, last) runs
+
+    Args:
+        positions: Sorted, unique positions (e.g. trading-day indexes)
+        max_gap: Bridge up to this many absent positions between runs, so
+            one range fetch covers both (0 = strictly contiguous runs)
+
+    Returns:
+        List of inclusive (first, last) tuples
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    starts, ends = _runs(positions, max_gap)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _runs(positions: np.ndarray, max_gap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end of each run in sorted positions"""
+    if len(positions) == 0:
+        return positions[:0], positions[:0]
+    breaks = np.flatnonzero(np.diff(positions) > max_gap + 1)
+    starts = np.r_[positions[0], positions[breaks + 1]]
+    ends = np.r_[positions[breaks], positions[-1]]
+    return starts, ends
+
+
+@dataclass
+class PresenceBitmap:
+    """
+    Boolean (codes x days) matrix of which price rows exist
+
+    Attributes:
+        codes: Row labels (BSE codes)
+        days: Column labels, sorted YYYY-MM-DD strings
+        expected: Per-column flag, True for expected trading days
+        bits: bits[i, j] is True if codes[i] has a row on days[j]
+    """
+    codes: List[str]
+    days: np.ndarray
+    expected: np.ndarray
+    bits: np.ndarray
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        codes: Optional[Iterable[str]] = None,
+        calendar: Optional[Iterable[str]] = None,
+        code_column: str = 'bse_code'
+    ) -> "PresenceBitmap":
+        """
+        Build from a frame of (code, date) rows
+
+        Args:
+            df: Frame with code_column and 'date' (YYYY-MM-DD strings)
+            codes: Row labels (default: every code in df, sorted)
+            calendar: Expected trading days (default: none, i.e. only
+                observed dates form the axis and nothing counts as missing)
+            code_column: Name of the code column
+
+        Returns:
+            PresenceBitmap
+        """
+        row_codes = df[code_column].astype(str).to_numpy()
+        row_dates = df['date'].astype(str).to_numpy()
+
+        codes = sorted(set(row_codes)) if codes is None else [str(c) for c in codes]
+        calendar = np.unique(np.asarray([] if calendar is None else list(calendar), dtype=str))
+        days = np.union1d(calendar, row_dates.astype(str))
+        expected = np.isin(days, calendar)
+
+        bits = np.zeros((len(codes), len(days)), dtype=bool)
+        code_idx = pd.Index(codes).get_indexer(row_codes)
+        day_idx = np.searchsorted(days, row_dates.astype(str))
+        keep = code_idx >= 0
+        bits[code_idx[keep], day_idx[keep]] = True
+
+        return cls(codes=codes, days=days, expected=expected, bits=bits)
+
+    @classmethod
+    def from_db(
+        cls,
+        db_path: str,
+        codes: Optional[Iterable[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        calendar: Optional[Iterable[str]] = None,
+        code_column: str = 'bse_code'
+    ) -> "PresenceBitmap":
+        """
+        Build from price_movements with a single query
+
+        Args:
+            db_path: price_movements database
+            codes: Row labels (default: every code with rows in range)
+            start_date: First date, inclusive (default: unbounded)
+            end_date: Last date, inclusive (default: unbounded)
+            calendar: Expected trading days (default: NSE/BSE sessions
+                from start_date to end_date when both are given)
+            code_column: Code column in price_movements
+
+        Returns:
+            PresenceBitmap
+        """
+        if calendar is None and start_date and end_date:
+            calendar = get_trading_calendar().trading_days(start_date, end_date)
+
+        query = f"SELECT DISTINCT {code_column}, date FROM price_movements WHERE {code_column} IS NOT NULL"
+        params = []
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+
+        rows = []
+        if os.path.exists(db_path):
+            with pooled_connection(db_path, read_only=True) as conn:
+                rows = conn.execute(query, params).fetchall()
+
+        df = pd.DataFrame(rows, columns=[code_column, 'date'])
+        return cls.from_frame(df, codes=codes, calendar=calendar, code_column=code_column)
+
+    @property
+    def expected_days(self) -> int:
+        """Number of expected trading days on the axis"""
+        return int(self.expected.sum())
+
+    def present_counts(self) -> np.ndarray:
+        """Days with data per code"""
+        return self.bits.sum(axis=1)
+
+    def completeness(self, expected_days: Optional[int] = None) -> Dict[str, float]:
+        """
+        Completeness percentage per code
+
+        Args:
+            expected_days: Denominator (default: calendar days on the axis)
+
+        Returns:
+            Dict of code -> present days / expected_days * 100
+        """
+        expected_days = self.expected_days if expected_days is None else expected_days
+        if expected_days <= 0:
+            pct = np.zeros(len(self.codes))
+        else:
+            pct = self.present_counts() * 100.0 / expected_days
+        return dict(zip(self.codes, pct.tolist()))
+
+    def missing_mask(self) -> np.ndarray:
+        """(codes x days) True where an expected day has no row"""
+        return self.expected & ~self.bits
+
+    def missing_dates(self, threshold: Optional[float] = None, expected_days: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Missing trading days per code
+
+        Args:
+            threshold: Only report codes whose completeness is below this
+                percentage (default: every code with a missing day)
+            expected_days: Completeness denominator for threshold
+
+        Returns:
+            Dict of code -> sorted missing dates
+        """
+        missing = self.missing_mask()
+        rows = np.flatnonzero(missing.any(axis=1))
+        if threshold is not None:
+            pct = np.array(list(self.completeness(expected_days).values()))
+            rows = rows[pct[rows] < threshold]
+        return {self.codes[i]: self.days[missing[i]].tolist() for i in rows}
+
+    def missing_ranges(self, max_gap: int = 0) -> Dict[str, List[DateRange]]:
+        """
+        Missing trading days per code as inclusive (first, last) date ranges
+
+        Positions are counted on the expected calendar, so a run of missing
+        days is contiguous across weekends and holidays.
+
+        Args:
+            max_gap: Merge runs separated by at most this many present
+                trading days, so each range is one fetch (0 = exact runs)
+
+        Returns:
+            Dict of code -> list of (first_date, last_date)
+        """
+        calendar_days = self.days[self.expected]
+        missing = self.missing_mask()[:, self.expected]
+        rows, cols = np.nonzero(missing)  # Row-major: sorted within each row
+
+        # Offset rows so runs can never bridge two codes
+        stride = missing.shape[1] + max_gap + 2
+        starts, ends = _runs(rows.astype(np.int64) * stride + cols, max_gap)
+
+        ranges: Dict[str, List[DateRange]] = {}
+        firsts = calendar_days[starts % stride].tolist()
+        lasts = calendar_days[ends % stride].tolist()
+        for row, first, last in zip((starts // stride).tolist(), firsts, lasts):
+            ranges.setdefault(self.codes[row], []).append((first, last))
+        return ranges
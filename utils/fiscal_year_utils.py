@@ -144,11 +144,14 @@ class DataTimestamp:
     """Timestamp tracking for data sources"""
 
     @staticmethod
-    def create_timestamp() -> Dict:
+    def create_timestamp(now: Optional[datetime] = None) -> Dict:
         """
         Create a timestamp with full context
+
+        Args:
+            now: Moment to describe (default: current time)
         """
-        now = datetime.now()
+        now = now or datetime.now()
         quarter, fy = IndianFiscalYear.get_fiscal_quarter(now)
 
         return {
@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.backtest.backtest_engine import BacktestEngine
 from src.paper_trading.virtual_account import VirtualAccount
 from src.order_executor.order_executor import OrderExecutor
+from monitoring.profiler import profiler_enabled, start_capture, get_capture_status
 
 app = Flask(__name__, static_folder='.', template_folder='.')
 CORS(app)
@@ -291,6 +292,29 @@ def health_check():
     })
 
 
+@app.route('/api/admin/profile', methods=['GET', 'POST'])
+def manage_profile():
+    """Start a sampling profile (POST) or get capture status (GET); requires VCP_PROFILER=1"""
+    if not profiler_enabled():
+        return jsonify({'success': False, 'error': 'Profiling disabled (set VCP_PROFILER=1)'}), 403
+
+    if request.method == 'GET':
+        return jsonify({'success': True, 'data': get_capture_status()})
+
+    try:
+        data = request.get_json(silent=True) or {}
+        seconds = float(data.get('seconds', 30))
+        interval_ms = float(data.get('interval_ms', 10))
+        capture = start_capture(seconds, interval=interval_ms / 1000)
+        log_message(f"Profile capture started: {capture['name']} ({seconds}s)")
+        return jsonify({'success': True, 'data': capture})
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+
+
 if __name__ == '__main__':
     log_message('BMAD Trading System API Server Starting...')
     log_message('Dashboard will be available at http://localhost:5000')